@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+키워드 재추출 백필 도구
+모델을 다시 훈련한 뒤, 이미 저장된 최초 답변의 extracted_keywords / ANSWER_KEYWORDS를 새 모델로 다시 계산합니다.
+
+- 답변은 answer_id 키셋 페이지네이션으로 조금씩 읽습니다. (OFFSET 없이, 메모리에 전체를 올리지 않음)
+- 추출은 프로세스 풀의 각 워커가 자기 모델로 배치 단위로 수행합니다. (진행 중인 작업 수를 제한해 읽기가 앞서가지 않음)
+- 결과는 입력 순서대로 모아 write-chunk 단위 트랜잭션으로 씁니다.
+- 커밋할 때마다 마지막 answer_id를 체크포인트 파일에 기록하므로, 중단 후 다시 실행하면 이어서 처리합니다.
+  (체크포인트의 모델 버전이 다르면 처음부터 다시 처리)
+- 추출에 실패한 답변은 KEYWORD_JOBS에 등록해 키워드 작업 워커가 재시도하도록 넘깁니다.
+
+사용법 (UI 디렉토리에서):
+    python backfill_keywords.py --workers 4
+    python backfill_keywords.py --workers 8 --threads-per-worker 1 --task-size 64 --write-chunk 2048
+    python backfill_keywords.py --restart          # 체크포인트를 무시하고 처음부터
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import time
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import database
+
+# --- 워커 프로세스 ---
+
+_worker_extractor = None
+
+
+def _init_worker(model_path: Optional[str], backend: str, threads: int):
+    """워커 프로세스마다 한 번: 추론 스레드 수를 제한하고 모델을 로드합니다."""
+    global _worker_extractor
+    import torch
+    import keyword_extractor
+
+    torch.set_num_threads(threads)
+    # 재추출 결과는 모두 새 텍스트라 캐시 적중이 없고, 여러 프로세스가 캐시 테이블에 쓰면 잠금 경합만 생김.
+    # 캐시를 끄면 워커 프로세스는 DB에 전혀 접근하지 않습니다. (읽기/쓰기는 메인 프로세스만)
+    keyword_extractor.KEYWORD_CACHE_ENABLED = False
+    _worker_extractor = keyword_extractor.KeywordExtractor(model_path, backend=backend)
+
+
+def _worker_model_version() -> str:
+    return _worker_extractor.model_version
+
+
+def _extract_task(rows: List[Tuple[int, str]]) -> Tuple[List[int], Optional[List[List[str]]], Optional[str]]:
+    """(answer_id, answer_text) 목록의 키워드를 추출합니다. 실패하면 (ID 목록, None, 오류 메시지)"""
+    answer_ids = [answer_id for answer_id, _ in rows]
+    try:
+        keywords = _worker_extractor.extract_keywords_batch([text for _, text in rows], batch_size=len(rows),
+                                                            raise_on_failure=True)
+        return answer_ids, keywords, None
+    except Exception as e:
+        return answer_ids, None, str(e)
+
+
+# --- 체크포인트 ---
+
+def default_checkpoint_path(db_path: str) -> str:
+    return f"{db_path}.keyword_backfill.json"
+
+
+def load_checkpoint(path: str) -> Optional[Dict]:
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_checkpoint(path: str, checkpoint: Dict):
+    """임시 파일에 쓴 뒤 교체 (중단되어도 이전 체크포인트가 깨지지 않음)"""
+    checkpoint['updated_at'] = datetime.now().isoformat(timespec='seconds')
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+# --- 메인 프로세스 ---
+
+class _Progress:
+    """처리량(rows/sec)과 남은 시간 출력"""
+
+    def __init__(self, total: int, interval: float):
+        self.total = total
+        self.interval = interval
+        self.start = time.perf_counter()
+        self.last_report = self.start
+        self.done = 0
+
+    def update(self, rows: int, force: bool = False):
+        self.done += rows
+        now = time.perf_counter()
+        if not force and now - self.last_report < self.interval:
+            return
+        self.last_report = now
+        elapsed = now - self.start
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        remaining = (self.total - self.done) / rate if rate > 0 else float('inf')
+        eta = f"{remaining / 60:,.1f}분" if remaining != float('inf') else "-"
+        print(f"   {self.done:,}/{self.total:,} ({self.done / max(self.total, 1):.1%}) "
+              f"{rate:,.1f} rows/sec, 경과 {elapsed / 60:,.1f}분, 남은 시간 {eta}")
+
+
+def run_backfill(args) -> Dict:
+    database.create_tables()
+    checkpoint_path = args.checkpoint or default_checkpoint_path(args.db)
+    threads = args.threads_per_worker or max(1, (os.cpu_count() or 1) // args.workers)
+
+    # spawn: 메인 프로세스의 SQLite 연결을 물려받지 않도록 새 인터프리터로 시작
+    pool = multiprocessing.get_context('spawn').Pool(
+        args.workers, initializer=_init_worker, initargs=(args.model_path, args.backend, threads))
+    try:
+        model_version = pool.apply(_worker_model_version)
+        checkpoint = None if args.restart else load_checkpoint(checkpoint_path)
+        if checkpoint and checkpoint.get('model_version') != model_version:
+            print(f"⚠️ 체크포인트의 모델 버전({checkpoint.get('model_version')})이 현재 모델({model_version})과 "
+                  f"달라 처음부터 다시 처리합니다.")
+            checkpoint = None
+        if checkpoint is None:
+            checkpoint = {'db': os.path.abspath(args.db), 'model_version': model_version, 'last_answer_id': 0,
+                          'processed': 0, 'failed': 0, 'started_at': datetime.now().isoformat(timespec='seconds')}
+        else:
+            print(f"↩️ 체크포인트에서 이어서 처리: answer_id > {checkpoint['last_answer_id']} "
+                  f"(이미 {checkpoint['processed']:,}건 처리)")
+
+        total = database.count_initial_answers(checkpoint['last_answer_id'])
+        if args.limit:
+            total = min(total, args.limit)
+        print(f"🔁 재추출 대상 {total:,}건 (워커 {args.workers}개 × 스레드 {threads}개, 모델 {model_version})")
+        progress = _Progress(total, args.report_seconds)
+
+        cursor = checkpoint['last_answer_id']  # 다음에 읽을 페이지의 시작점 (체크포인트보다 앞서감)
+        remaining = total
+        pending = deque()  # 제출 순서대로의 AsyncResult (결과를 순서대로 써야 체크포인트가 정확함)
+        buffer: Dict[int, List[str]] = {}
+        failed_ids: List[int] = []
+        max_in_flight = args.workers * 2
+
+        def flush():
+            """모아 둔 결과를 한 트랜잭션으로 쓰고 체크포인트를 옮깁니다."""
+            if not buffer and not failed_ids:
+                return
+            with database.transaction():
+                database.set_answer_keywords_many(buffer, model_version)
+                if failed_ids:
+                    database.enqueue_keyword_jobs(failed_ids)
+            last_id = max(list(buffer) + failed_ids)
+            checkpoint.update(last_answer_id=last_id, processed=checkpoint['processed'] + len(buffer),
+                              failed=checkpoint['failed'] + len(failed_ids))
+            save_checkpoint(checkpoint_path, checkpoint)
+            progress.update(len(buffer) + len(failed_ids))
+            buffer.clear()
+            failed_ids.clear()
+
+        while remaining > 0 or pending:
+            # 진행 중인 작업이 max_in_flight개가 될 때까지 다음 페이지를 읽어 제출
+            while remaining > 0 and len(pending) < max_in_flight:
+                rows = database.get_initial_answers_page(cursor, min(args.task_size, remaining))
+                if not rows:
+                    remaining = 0
+                    break
+                cursor = rows[-1]['answer_id']
+                remaining -= len(rows)
+                pending.append(pool.apply_async(_extract_task, ([(r['answer_id'], r['answer_text']) for r in rows],)))
+
+            if not pending:
+                break
+            answer_ids, keywords, error = pending.popleft().get()
+            if keywords is None:
+                print(f"⚠️ 답변 {answer_ids[0]}~{answer_ids[-1]} 추출 실패, 키워드 작업 큐로 넘깁니다: {error}")
+                failed_ids.extend(answer_ids)
+            else:
+                buffer.update(zip(answer_ids, keywords))
+            if len(buffer) + len(failed_ids) >= args.write_chunk:
+                flush()
+        flush()
+    finally:
+        pool.terminate()
+        pool.join()
+
+    progress.update(0, force=True)
+    checkpoint['finished_at'] = datetime.now().isoformat(timespec='seconds')
+    save_checkpoint(checkpoint_path, checkpoint)
+    print(f"✅ 백필 완료: 갱신 {checkpoint['processed']:,}건, 실패(작업 큐로 이관) {checkpoint['failed']:,}건. "
+          f"체크포인트: {checkpoint_path}")
+    return checkpoint
+
+
+def main():
+    parser = argparse.ArgumentParser(description="저장된 최초 답변의 키워드를 현재 모델로 다시 추출")
+    parser.add_argument('--db', default=database.DATABASE_NAME, help="SQLite DB 파일")
+    parser.add_argument('--model-path', help="모델 경로 (생략 시 레지스트리 활성 버전 / 최신 모델)")
+    parser.add_argument('--backend', default=None, help="추론 백엔드 (생략 시 KEYWORD_BACKEND)")
+    parser.add_argument('--workers', type=int, default=max(1, (os.cpu_count() or 1) // 2), help="워커 프로세스 수")
+    parser.add_argument('--threads-per-worker', type=int, help="워커당 torch 스레드 수 (생략 시 CPU 수 / 워커 수)")
+    parser.add_argument('--task-size', type=int, default=64, help="워커에 한 번에 넘기는 답변 수 (= 추론 배치)")
+    parser.add_argument('--write-chunk', type=int, default=1024, help="한 트랜잭션으로 쓰는 답변 수 (= 체크포인트 간격)")
+    parser.add_argument('--limit', type=int, help="이번 실행에서 처리할 최대 답변 수")
+    parser.add_argument('--checkpoint', help="체크포인트 파일 (생략 시 <db>.keyword_backfill.json)")
+    parser.add_argument('--restart', action='store_true', help="체크포인트를 무시하고 처음부터")
+    parser.add_argument('--report-seconds', type=float, default=10.0, help="진행 상황 출력 간격 (초)")
+    args = parser.parse_args()
+
+    if args.backend is None:
+        from utils.constants import KEYWORD_BACKEND
+        args.backend = KEYWORD_BACKEND
+
+    with database.using_database(args.db):
+        run_backfill(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+BIO 디코더 마이크로 벤치마크
+이전 키워드 추출기의 토큰별 파이썬 루프(_spans_from_predictions)와 utils.bio_decoder의 배열 연산 디코더를
+같은 [batch, seq] 예측으로 비교하고, 두 결과가 완전히 같은지 확인합니다. 모델 없이 NumPy만으로 실행됩니다.
+
+사용법 (UI 디렉토리에서):
+    python benchmarks/bio_decoder_benchmark.py
+    python benchmarks/bio_decoder_benchmark.py --batch-sizes 1 16 64 256 --seq-len 128 --repeats 50
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+from utils.bio_decoder import LABEL2ID, decode_char_spans
+from utils.constants import MAX_KEYWORDS_PER_ANSWER
+
+ID2LABEL = {v: k for k, v in LABEL2ID.items()}
+
+
+def loop_decode(offsets: List[Tuple[int, int]], predictions: List[int], max_keywords: int) -> List[Tuple[int, int]]:
+    """비교 기준: 이전 KeywordExtractor._spans_from_predictions와 같은 토큰별 루프 (문자 구간만 반환)"""
+    spans = []
+    span_start = span_end = None
+
+    def close_span():
+        if span_start is not None and len(spans) < max_keywords:
+            spans.append((span_start, span_end))
+
+    for (char_start, char_end), pred_id in zip(offsets, predictions):
+        label = ID2LABEL[pred_id] if char_end > char_start else 'O'
+        if label == 'B-KEY':
+            close_span()
+            span_start, span_end = char_start, char_end
+        elif label == 'I-KEY' and span_start is not None:
+            span_end = char_end
+        else:
+            close_span()
+            span_start = None
+        if len(spans) >= max_keywords:
+            return spans
+
+    close_span()
+    return spans
+
+
+def make_batch(rng: np.random.Generator, batch_size: int, seq_len: int, keyword_rate: float
+               ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    패딩된 배치처럼 보이는 가짜 예측/offset/attention mask를 만듭니다.
+    행마다 길이가 다르고, [CLS]/[SEP]/패딩의 offset은 (0, 0)입니다.
+    """
+    lengths = rng.integers(seq_len // 4, seq_len + 1, size=batch_size)
+    # 키워드 시작 확률 keyword_rate, 시작 다음 토큰은 절반 확률로 I-KEY
+    starts = rng.random((batch_size, seq_len)) < keyword_rate
+    predictions = np.where(starts, LABEL2ID['B-KEY'], LABEL2ID['O'])
+    follows = np.zeros_like(starts)
+    follows[:, 1:] = starts[:, :-1] & (rng.random((batch_size, seq_len - 1)) < 0.5)
+    predictions[follows & ~starts] = LABEL2ID['I-KEY']
+
+    widths = rng.integers(1, 4, size=(batch_size, seq_len))
+    ends = np.cumsum(widths + 1, axis=1)
+    offsets = np.stack([ends - widths, ends], axis=-1)
+    positions = np.arange(seq_len)
+    attention_mask = positions[None, :] < lengths[:, None]
+    special = (positions[None, :] == 0) | (positions[None, :] == lengths[:, None] - 1) | ~attention_mask
+    offsets[special] = 0
+    return predictions, offsets, attention_mask
+
+
+def time_calls(fn, repeats: int) -> float:
+    """repeats번 실행한 호출당 시간의 중앙값 (밀리초)"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def run(batch_size: int, seq_len: int, repeats: int, keyword_rate: float, max_keywords: int,
+        rng: np.random.Generator) -> Dict:
+    predictions, offsets, attention_mask = make_batch(rng, batch_size, seq_len, keyword_rate)
+    lengths = attention_mask.sum(axis=1)
+
+    def loop_version():
+        # 이전 경로: 행마다 텐서를 리스트로 바꾼 뒤 토큰별 루프
+        return [loop_decode(offsets[row, :lengths[row]].tolist(), predictions[row, :lengths[row]].tolist(),
+                            max_keywords) for row in range(batch_size)]
+
+    def vectorized_version():
+        return decode_char_spans(predictions, offsets, attention_mask, max_keywords)
+
+    if loop_version() != vectorized_version():
+        raise AssertionError(f"디코딩 결과가 다릅니다 (batch={batch_size}, seq={seq_len})")
+
+    loop_ms = time_calls(loop_version, repeats)
+    vectorized_ms = time_calls(vectorized_version, repeats)
+    return {'batch_size': batch_size, 'seq_len': seq_len, 'loop_ms': round(loop_ms, 3),
+            'vectorized_ms': round(vectorized_ms, 3), 'speedup': round(loop_ms / max(vectorized_ms, 1e-9), 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="토큰별 루프 vs 배열 연산 BIO 디코더 비교")
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 8, 32, 128], help="측정할 배치 크기들")
+    parser.add_argument('--seq-len', type=int, default=128, help="패딩된 시퀀스 길이 (KEYWORD_MAX_LENGTH)")
+    parser.add_argument('--repeats', type=int, default=30, help="케이스별 반복 횟수")
+    parser.add_argument('--keyword-rate', type=float, default=0.08, help="토큰이 B-KEY일 확률")
+    parser.add_argument('--max-keywords', type=int, default=MAX_KEYWORDS_PER_ANSWER, help="행당 최대 키워드 수")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'배치':>6}{'길이':>6}{'루프 ms':>12}{'배열 ms':>12}{'속도 향상':>10}")
+    for batch_size in args.batch_sizes:
+        result = run(batch_size, args.seq_len, args.repeats, args.keyword_rate, args.max_keywords, rng)
+        print(f"{result['batch_size']:>6}{result['seq_len']:>6}{result['loop_ms']:>12.3f}"
+              f"{result['vectorized_ms']:>12.3f}{result['speedup']:>9.2f}x")
+    print("✅ 모든 케이스에서 두 디코더의 결과가 같습니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+키워드 추출기 콜드 스타트 벤치마크
+모델 경로마다 새 파이썬 프로세스를 띄워 import → 모델 로드 → 첫 추출까지의 시간과 최대 RSS를 측정합니다.
+이전 형식(.pt: 허브 설정 + torch.load)과 번들 형식(config.json + 메모리 맵 safetensors)을 비교할 때 사용합니다.
+
+사용법 (UI 디렉토리에서):
+    python benchmarks/cold_start_benchmark.py --models best_model_20250618_173746.pt best_model_20250618_173746_bundle
+    python benchmarks/cold_start_benchmark.py --models keyword_model_bundle --runs 5 --offline --output cold_start.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+SAMPLE_TEXT = "어제는 딸과 함께 시장에 가서 사과와 배를 샀어요."
+
+
+def run_child(model_path: str):
+    """자식 프로세스: 한 번의 콜드 스타트를 측정하고 결과를 JSON 한 줄로 출력합니다."""
+    import resource
+
+    start = time.perf_counter()
+    from keyword_extractor import KeywordExtractor
+    imported = time.perf_counter()
+    extractor = KeywordExtractor(model_path)
+    loaded = time.perf_counter()
+    extractor.extract_keywords(SAMPLE_TEXT)
+    first = time.perf_counter()
+
+    result = {
+        'import_seconds': imported - start,
+        'load_seconds': loaded - imported,
+        'first_extract_seconds': first - loaded,
+        'total_seconds': first - start,
+        # 리눅스의 ru_maxrss는 KB 단위
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+    print("RESULT " + json.dumps(result))
+
+
+def measure(model_path: str, runs: int, offline: bool) -> dict:
+    """새 프로세스로 runs번 콜드 스타트를 측정해 중앙값(시간)과 최대값(RSS)을 요약합니다."""
+    env = dict(os.environ)
+    if offline:
+        # 네트워크 없이 시작할 수 있는지 확인 (번들은 성공해야 하고, .pt는 HF 캐시가 없으면 실패)
+        env.update({'HF_HUB_OFFLINE': '1', 'TRANSFORMERS_OFFLINE': '1'})
+
+    samples = []
+    for _ in range(runs):
+        completed = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', model_path],
+                                   capture_output=True, text=True, env=env)
+        lines = [line for line in completed.stdout.splitlines() if line.startswith("RESULT ")]
+        if completed.returncode != 0 or not lines:
+            error = (completed.stderr.strip().splitlines() or ["알 수 없는 오류"])[-1]
+            return {'model': model_path, 'error': error}
+        samples.append(json.loads(lines[-1][len("RESULT "):]))
+
+    summary = {'model': model_path, 'runs': runs}
+    for key in ('import_seconds', 'load_seconds', 'first_extract_seconds', 'total_seconds'):
+        summary[key] = round(statistics.median(sample[key] for sample in samples), 3)
+    summary['peak_rss_mb'] = round(max(sample['peak_rss_mb'] for sample in samples), 1)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="키워드 추출기 콜드 스타트 시간/최대 RSS 측정")
+    parser.add_argument('--models', nargs='+', help="비교할 모델 경로들 (.pt 파일, 훈련 디렉토리, 번들 디렉토리)")
+    parser.add_argument('--runs', type=int, default=3, help="모델별 반복 횟수 (프로세스마다 새로 시작)")
+    parser.add_argument('--offline', action='store_true', help="HF_HUB_OFFLINE=1로 네트워크 없이 측정")
+    parser.add_argument('--output', help="결과를 저장할 JSON 파일")
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child)
+        return
+    if not args.models:
+        parser.error("--models를 지정하세요.")
+
+    results = []
+    for model_path in args.models:
+        print(f"⏱️ 측정 중: {model_path} ({args.runs}회)")
+        summary = measure(model_path, args.runs, args.offline)
+        results.append(summary)
+        if 'error' in summary:
+            print(f"   ❌ 시작 실패: {summary['error']}")
+            continue
+        print(f"   import {summary['import_seconds']:.2f}s, 모델 로드 {summary['load_seconds']:.2f}s, "
+              f"첫 추출 {summary['first_extract_seconds']:.2f}s → 합계 {summary['total_seconds']:.2f}s, "
+              f"최대 RSS {summary['peak_rss_mb']:,.0f}MB")
+
+    ok = [r for r in results if 'error' not in r]
+    if len(ok) >= 2:
+        base = ok[0]
+        print(f"\n📊 {base['model']} 대비")
+        for other in ok[1:]:
+            print(f"   {other['model']}: 모델 로드 {base['load_seconds'] / max(other['load_seconds'], 1e-9):.2f}x 빠름, "
+                  f"최대 RSS {other['peak_rss_mb'] - base['peak_rss_mb']:+,.0f}MB")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,486 @@
+#!/usr/bin/env python3
+"""
+데이터베이스 부하/지연 시간 벤치마크
+create_tables()로 만든 스키마에 가상의 사용자 집단(사용자 × 답변 × 매일 기억 점검)을 직접 채워 넣고,
+database.py와 utils/db_operations.py의 공개 함수들을 각각 여러 번 호출하여 p50/p95/p99 지연 시간을 JSON 리포트로 저장합니다.
+기준(baseline) 리포트를 주면 함수별로 비교하여 느려진 함수가 있을 때 종료 코드 1을 반환합니다.
+
+사용법 (UI 디렉토리에서):
+    python benchmarks/db_benchmark.py --users 1000 --answers-per-user 300 --days 365 --output report.json
+    python benchmarks/db_benchmark.py --users 100000 --db /tmp/cohort.db        # 큰 집단은 DB를 남겨 두고 재사용
+    python benchmarks/db_benchmark.py --baseline baseline.json --tolerance 0.25  # 회귀 검사
+"""
+
+import argparse
+import contextlib
+import inspect
+import io
+import json
+import os
+import platform
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Tuple
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+import database
+from utils.db_operations import DBOperations
+
+# 가상 답변에 사용할 키워드 어휘
+KEYWORD_VOCABULARY = [
+    "학교", "운동회", "어머니", "아버지", "고향", "바다", "여름", "겨울", "김장", "소풍",
+    "친구", "결혼식", "시장", "기차", "자전거", "라디오", "공장", "논", "밭", "잔치",
+    "명절", "떡국", "할머니", "강아지", "동생", "형", "누나", "선생님", "편지", "사진",
+]
+KEYWORDS_PER_ANSWER = 3
+START_DAY = date(2024, 1, 1)
+
+# 상태를 바꾸는 설정/연결 관리 함수는 지연 시간 측정 대상이 아닙니다. (이유를 리포트에 남김)
+SKIPPED_FUNCTIONS = {
+    'database.create_tables': "집단 생성 단계에서 한 번 실행 (setup.create_tables_seconds)",
+    'database.apply_migrations': "create_tables()에 포함",
+    'database.connection': "컨텍스트 매니저 (다른 함수 측정에 포함)",
+    'database.transaction': "컨텍스트 매니저 (다른 함수 측정에 포함)",
+    'database.using_database': "컨텍스트 매니저",
+    'database.current_database': "설정 조회",
+    'database.get_db_connection': "연결 생성",
+    'database.close_all_connections': "연결 정리",
+    'database.begin_read_cache_scope': "캐시 범위 설정",
+    'database.end_read_cache_scope': "캐시 범위 설정",
+    'database.invalidate_read_cache': "캐시 무효화",
+}
+
+
+class Cohort:
+    """생성된 가상 집단에 대한 정보 (측정 인자를 만들 때 사용)"""
+
+    def __init__(self, user_ids: List[int], question_ids: List[int], question_texts: List[str],
+                 initial_answers: Dict[Tuple[int, int], int], days: int):
+        self.user_ids = user_ids
+        self.question_ids = question_ids
+        self.question_texts = question_texts
+        self.initial_answers = list((user_id, question_id, answer_id)
+                                    for (user_id, question_id), answer_id in initial_answers.items())
+        self.days = days
+
+    def random_user(self, rng: random.Random) -> int:
+        return rng.choice(self.user_ids)
+
+    def random_initial_answer(self, rng: random.Random) -> Tuple[int, int, int]:
+        """(user_id, question_id, answer_id)"""
+        return rng.choice(self.initial_answers)
+
+    def random_day(self, rng: random.Random) -> str:
+        return (START_DAY + timedelta(days=rng.randrange(self.days))).isoformat()
+
+
+def _count_rows(conn: sqlite3.Connection) -> Dict[str, int]:
+    tables = ['USERS', 'QUESTIONS', 'USER_ANSWERS', 'ANSWER_KEYWORDS', 'MEMORY_CHECKS',
+              'USER_PROGRESS', 'USER_DAILY_ACTIVITY']
+    return {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in tables}
+
+
+def generate_cohort(users: int, answers_per_user: int, days: int, questions: int,
+                    seed: int, chunk_users: int = 200) -> Dict:
+    """
+    현재 DATABASE_NAME의 DB에 가상 집단을 채워 넣습니다.
+    사용자마다 답변 answers_per_user개(앞의 questions개는 최초 답변, 나머지는 재질문 답변)와
+    하루 한 번의 기억 점검을 days일 동안 생성합니다. 일일 활동 집계는 트리거가 그대로 유지합니다.
+    """
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    database.create_tables()
+    create_tables_seconds = time.perf_counter() - start
+
+    question_texts = [f"벤치마크 질문 {index}: 어린 시절 기억나는 일을 말씀해 주세요." for index in range(questions)]
+    database.sync_questions(question_texts, 'benchmark')
+
+    with database.connection() as conn:
+        question_ids = [row[0] for row in conn.execute(
+            "SELECT question_id FROM QUESTIONS WHERE question_type = 'benchmark' ORDER BY question_id")]
+        next_user_id = conn.execute("SELECT COALESCE(MAX(user_id), 0) + 1 FROM USERS").fetchone()[0]
+        next_answer_id = conn.execute("SELECT COALESCE(MAX(answer_id), 0) + 1 FROM USER_ANSWERS").fetchone()[0]
+
+    initial_count = min(questions, answers_per_user)
+    load_start = time.perf_counter()
+    for chunk_start in range(0, users, chunk_users):
+        chunk = range(next_user_id + chunk_start, next_user_id + min(chunk_start + chunk_users, users))
+        user_rows, progress_rows, answer_rows, keyword_rows, check_rows = [], [], [], [], []
+        for user_id in chunk:
+            user_rows.append((user_id, f"사용자{user_id}",
+                              f"{rng.randint(1935, 1960)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                              START_DAY.isoformat()))
+            initial_answer_ids = []
+            for index in range(answers_per_user):
+                answer_id = next_answer_id
+                next_answer_id += 1
+                question_id = question_ids[index % questions]
+                answer_day = (START_DAY + timedelta(days=index * days // max(answers_per_user, 1))).isoformat()
+                is_initial = index < initial_count
+                keywords = rng.sample(KEYWORD_VOCABULARY, KEYWORDS_PER_ANSWER) if is_initial else None
+                answer_rows.append((answer_id, user_id, question_id,
+                                    f"{' '.join(keywords or ['회상'])} 이야기를 기억합니다.", answer_day, is_initial,
+                                    json.dumps(keywords, ensure_ascii=False) if keywords else None))
+                if is_initial:
+                    initial_answer_ids.append((question_id, answer_id))
+                    keyword_rows.extend((answer_id, user_id, keyword, position)
+                                        for position, keyword in enumerate(keywords))
+            for day in range(days):
+                question_id, answer_id = initial_answer_ids[day % len(initial_answer_ids)]
+                hint = rng.random() < 0.3
+                check_rows.append((user_id, question_id, answer_id,
+                                   'post_hint_recall' if hint else 'initial_recall',
+                                   rng.choice(['remembers', 'forgets']), rng.randint(0, KEYWORDS_PER_ANSWER),
+                                   rng.choice(['pass', 'fail']), hint,
+                                   (START_DAY + timedelta(days=day)).isoformat()))
+            progress_rows.append((user_id, initial_count, answers_per_user - initial_count, days,
+                                  (START_DAY + timedelta(days=days - 1)).isoformat()))
+
+        with database.transaction() as conn:
+            conn.executemany("INSERT INTO USERS (user_id, name, birth_date, diagnosis_date) VALUES (?, ?, ?, ?)",
+                             user_rows)
+            conn.executemany("""
+                INSERT INTO USER_ANSWERS (answer_id, user_id, question_id, answer_text, answer_date,
+                                          is_initial_answer, extracted_keywords)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, answer_rows)
+            conn.executemany("INSERT INTO ANSWER_KEYWORDS (answer_id, user_id, keyword, position) VALUES (?, ?, ?, ?)",
+                             keyword_rows)
+            conn.executemany("""
+                INSERT INTO MEMORY_CHECKS (user_id, question_id, original_answer_id, check_step, user_choice,
+                                           keyword_match_count, check_result, hint_provided, check_date)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, check_rows)
+            conn.executemany("""
+                INSERT INTO USER_PROGRESS (user_id, total_initial_memory_questions_answered,
+                                           total_revisit_questions_answered, current_service_day, last_activity_date)
+                VALUES (?, ?, ?, ?, ?)
+            """, progress_rows)
+        print(f"   {chunk_start + len(chunk):,}/{users:,} 명 생성")
+    load_seconds = time.perf_counter() - load_start
+
+    with database.connection() as conn:
+        conn.execute("ANALYZE")
+        rows = _count_rows(conn)
+    return {
+        'create_tables_seconds': round(create_tables_seconds, 4),
+        'load_seconds': round(load_seconds, 2),
+        'rows': rows,
+    }
+
+
+def load_cohort(days: int) -> Cohort:
+    """DB에 이미 있는 집단 정보를 읽어 옵니다. (새로 생성했거나 --db로 재사용하는 경우 모두)"""
+    with database.connection() as conn:
+        user_ids = [row[0] for row in conn.execute("SELECT user_id FROM USERS")]
+        questions = conn.execute("SELECT question_id, question_text FROM QUESTIONS ORDER BY question_id").fetchall()
+        # 전체 최초 답변을 메모리에 올리지 않도록 표본 사용자들의 최초 답변만 읽습니다.
+        sample_users = random.Random(0).sample(user_ids, min(len(user_ids), 2000))
+        initial_answers = {}
+        for user_id in sample_users:
+            for row in conn.execute("""
+                SELECT question_id, answer_id FROM USER_ANSWERS
+                WHERE user_id = ? AND is_initial_answer = 1
+            """, (user_id,)):
+                initial_answers[(user_id, row[0])] = row[1]
+    return Cohort(sample_users, [row[0] for row in questions], [row[1] for row in questions],
+                  initial_answers, days)
+
+
+def build_cases(cohort: Cohort, rng: random.Random) -> Dict[str, Callable[[], Tuple[Callable, tuple, dict]]]:
+    """
+    측정할 함수 이름 -> 호출 한 번에 쓸 (함수, args, kwargs)를 새로 만드는 함수.
+    인자 준비(난수 선택, 선행 데이터 생성)는 측정 시간에 포함되지 않습니다.
+    """
+    counter = iter(range(10 ** 9))
+
+    def call(func, *args, **kwargs):
+        return func, args, kwargs
+
+    def memory_check_args():
+        user_id, question_id, answer_id = cohort.random_initial_answer(rng)
+        return (user_id, question_id, answer_id, cohort.random_day(rng), 'initial_recall', 'pass'), \
+            {'user_choice': 'remembers', 'keyword_match_count': 2}
+
+    def existing_user_info():
+        with database.connection() as conn:
+            row = conn.execute("SELECT name, birth_date FROM USERS WHERE user_id = ?",
+                               (cohort.random_user(rng),)).fetchone()
+        return _user_info(row)
+
+    def generated_image():
+        args, kwargs = memory_check_args()
+        return call(database.add_generated_image, database.add_memory_check(*args, **kwargs),
+                    "https://example.com/hint.png")
+
+    def claimed_jobs():
+        """새 답변의 키워드 작업을 등록하고 벤치마크 워커가 가져간 작업 ID 목록"""
+        user_id, question_id, _ = cohort.random_initial_answer(rng)
+        database.add_user_answer(user_id, question_id, "벤치마크 답변", cohort.random_day(rng), True,
+                                 enqueue_keyword_job=True)
+        return [job['answer_id'] for job in database.claim_keyword_jobs('benchmark', 1, 60)]
+
+    return {
+        # --- database.py: 쓰기 ---
+        'database.add_user': lambda: call(database.add_user, f"벤치{next(counter)}", "1950-01-01", "2024-01-01"),
+        'database.add_question': lambda: call(database.add_question, f"벤치마크 추가 질문 {next(counter)}", 'benchmark'),
+        'database.sync_questions': lambda: call(database.sync_questions, cohort.question_texts, 'benchmark'),
+        'database.add_user_answer': lambda: call(
+            database.add_user_answer, cohort.random_user(rng), rng.choice(cohort.question_ids), "벤치마크 답변",
+            cohort.random_day(rng), True, rng.sample(KEYWORD_VOCABULARY, KEYWORDS_PER_ANSWER)),
+        'database.add_memory_check': lambda: (database.add_memory_check, *memory_check_args()),
+        'database.add_recall_with_memory_check': lambda: call(
+            database.add_recall_with_memory_check, *cohort.random_initial_answer(rng), cohort.random_day(rng),
+            'initial_recall', 'fail', "회상 답변", user_choice='forgets', keyword_match_count=1),
+        'database.add_generated_image': generated_image,
+        'database.update_question_status': lambda: call(
+            database.update_question_status, rng.choice(cohort.question_ids), 'active'),
+        'database.create_or_update_user_progress': lambda: call(
+            database.create_or_update_user_progress, cohort.random_user(rng), last_activity_date=cohort.random_day(rng)),
+        'database.increment_progress': lambda: call(
+            database.increment_progress, cohort.random_user(rng), questions_today=1, total_revisit=1),
+        'database.rebuild_daily_activity': lambda: call(database.rebuild_daily_activity, cohort.random_user(rng)),
+        'database.set_answer_keywords': lambda: call(
+            database.set_answer_keywords, cohort.random_initial_answer(rng)[2],
+            rng.sample(KEYWORD_VOCABULARY, KEYWORDS_PER_ANSWER)),
+        'database.set_answer_keywords_many': lambda: call(database.set_answer_keywords_many, {
+            cohort.random_initial_answer(rng)[2]: rng.sample(KEYWORD_VOCABULARY, KEYWORDS_PER_ANSWER)
+            for _ in range(64)}),
+        'database.get_initial_answers_page': lambda: call(
+            database.get_initial_answers_page, cohort.random_initial_answer(rng)[2], 256),
+        'database.count_initial_answers': lambda: call(database.count_initial_answers),
+        # --- database.py: 키워드 추출 작업 큐 ---
+        'database.enqueue_keyword_jobs': lambda: call(
+            database.enqueue_keyword_jobs, [cohort.random_initial_answer(rng)[2] for _ in range(16)]),
+        'database.claim_keyword_jobs': lambda: call(database.claim_keyword_jobs, 'benchmark', 16, 60),
+        'database.complete_keyword_jobs': lambda: call(
+            database.complete_keyword_jobs, 'benchmark',
+            {answer_id: rng.sample(KEYWORD_VOCABULARY, KEYWORDS_PER_ANSWER) for answer_id in claimed_jobs()}),
+        'database.fail_keyword_jobs': lambda: call(
+            database.fail_keyword_jobs, 'benchmark', claimed_jobs(), "벤치마크 실패", 5, 10, 3600),
+        'database.retry_failed_keyword_jobs': lambda: call(database.retry_failed_keyword_jobs),
+        'database.get_keyword_job_stats': lambda: call(database.get_keyword_job_stats),
+        # --- database.py: 조회 ---
+        'database.get_user': lambda: call(database.get_user, cohort.random_user(rng)),
+        'database.get_user_progress': lambda: call(database.get_user_progress, cohort.random_user(rng)),
+        'database.get_initial_answer_with_keywords': lambda: call(
+            database.get_initial_answer_with_keywords, *cohort.random_initial_answer(rng)[:2]),
+        'database.find_answers_by_keyword': lambda: call(
+            database.find_answers_by_keyword, cohort.random_user(rng), rng.choice(KEYWORD_VOCABULARY)),
+        'database.get_keyword_stats': lambda: call(database.get_keyword_stats, cohort.random_user(rng)),
+        'database.get_keyword_frequencies': lambda: call(database.get_keyword_frequencies, 2),
+        'database.match_recall_keywords': lambda: call(
+            database.match_recall_keywords, cohort.random_initial_answer(rng)[2],
+            " ".join(rng.sample(KEYWORD_VOCABULARY, 5))),
+        'database.get_questions_to_revisit': lambda: call(database.get_questions_to_revisit, cohort.random_user(rng)),
+        'database.get_all_users': lambda: call(database.get_all_users),
+        'database.get_daily_activity': lambda: call(
+            database.get_daily_activity, cohort.random_user(rng), cohort.random_day(rng)),
+        'database.get_today_activity_count': lambda: call(database.get_today_activity_count, cohort.random_user(rng)),
+        'database.get_schema_version': lambda: call(database.get_schema_version),
+        'database.get_read_cache_stats': lambda: call(database.get_read_cache_stats),
+        'database.question_content_hash': lambda: call(
+            database.question_content_hash, rng.choice(cohort.question_texts)),
+        'database.explain_hot_queries': lambda: call(database.explain_hot_queries),
+        'database.find_full_table_scans': lambda: call(database.find_full_table_scans),
+        # --- utils/db_operations.py ---
+        'DBOperations.initialize_questions': lambda: call(DBOperations.initialize_questions, cohort.question_texts),
+        'DBOperations.get_or_create_user': lambda: call(DBOperations.get_or_create_user, existing_user_info()),
+        'DBOperations.get_today_activity_count': lambda: call(
+            DBOperations.get_today_activity_count, cohort.random_user(rng)),
+        'DBOperations.get_completed_questions': lambda: call(
+            DBOperations.get_completed_questions, cohort.random_user(rng)),
+        'DBOperations.get_reusable_questions': lambda: call(
+            DBOperations.get_reusable_questions, cohort.random_user(rng)),
+        'DBOperations.has_pending_memory_check': lambda: call(
+            DBOperations.has_pending_memory_check, cohort.random_user(rng)),
+    }
+
+
+def _user_info(row) -> dict:
+    """USERS 행을 화면에서 입력받는 사용자 정보 형식으로 변환 (기존 사용자 조회 경로 측정용)"""
+    return {
+        '이름': row['name'],
+        '생년월일': datetime.strptime(row['birth_date'], '%Y-%m-%d').date(),
+        '진단일': START_DAY,
+    }
+
+
+def public_functions() -> List[str]:
+    """측정 대상이어야 하는 공개 함수 이름 목록 (빠진 함수가 있는지 확인하는 데 사용)"""
+    names = [f"database.{name}" for name, func in inspect.getmembers(database, inspect.isfunction)
+             if not name.startswith('_') and func.__module__ == database.__name__]
+    names += [f"DBOperations.{name}" for name, _ in inspect.getmembers(DBOperations, inspect.isfunction)
+              if not name.startswith('_')]
+    return sorted(names)
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """선형 보간 백분위수 (sorted_values는 오름차순)"""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def measure(cases: Dict[str, Callable[[], Tuple[Callable, tuple, dict]]], samples: int, slow_samples: int,
+            warmup: int = 5) -> Dict[str, Dict]:
+    """각 함수를 samples번 호출하여 지연 시간 분포를 계산합니다. 실패한 호출은 errors로 셉니다."""
+    # 전체 테이블을 다루는 함수는 큰 집단에서 오래 걸리므로 적게 호출합니다.
+    slow = {'database.get_all_users', 'database.sync_questions', 'DBOperations.initialize_questions',
+            'database.explain_hot_queries', 'database.find_full_table_scans', 'database.get_keyword_frequencies'}
+    results = {}
+    for name in cases:
+        timings, errors, first_error = [], 0, None
+        # 쓰기 함수들이 호출마다 출력하는 안내 메시지는 결과 표를 가리지 않도록 버립니다.
+        with contextlib.redirect_stdout(io.StringIO()):
+            # 문장 캐시/페이지 캐시를 채우기 위한 예열 호출 (측정하지 않음)
+            for _ in range(min(warmup, slow_samples if name in slow else samples)):
+                func, call_args, call_kwargs = cases[name]()
+                try:
+                    func(*call_args, **call_kwargs)
+                except Exception:
+                    pass
+            for _ in range(slow_samples if name in slow else samples):
+                func, call_args, call_kwargs = cases[name]()
+                start = time.perf_counter()
+                try:
+                    func(*call_args, **call_kwargs)
+                except Exception as e:
+                    errors += 1
+                    first_error = first_error or f"{type(e).__name__}: {e}"
+                    continue
+                timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        results[name] = {
+            'samples': len(timings),
+            'errors': errors,
+            'p50_ms': round(_percentile(timings, 50), 4),
+            'p95_ms': round(_percentile(timings, 95), 4),
+            'p99_ms': round(_percentile(timings, 99), 4),
+            'mean_ms': round(sum(timings) / len(timings), 4) if timings else 0.0,
+        }
+        if first_error:
+            results[name]['error'] = first_error
+        status = f"❌ 오류 {errors}회 ({first_error})" if errors else ""
+        print(f"   {name:<45} p50 {results[name]['p50_ms']:>9.3f}ms  p95 {results[name]['p95_ms']:>9.3f}ms  "
+              f"p99 {results[name]['p99_ms']:>9.3f}ms {status}")
+    return results
+
+
+def compare_with_baseline(report: Dict, baseline: Dict, metric: str, tolerance: float,
+                          min_delta_ms: float) -> List[str]:
+    """
+    기준 리포트와 비교하여 회귀한 함수 목록을 반환합니다.
+    metric 값이 기준보다 tolerance 비율 이상, 그리고 min_delta_ms 이상 느려지면 회귀로 봅니다.
+    기준에서 성공하던 함수가 오류를 내기 시작한 경우도 회귀입니다.
+    """
+    regressions = []
+    for name, current in report['results'].items():
+        previous = baseline.get('results', {}).get(name)
+        if previous is None:
+            continue
+        if current['errors'] and not previous.get('errors'):
+            regressions.append(f"{name}: 새 오류 발생 ({current.get('error')})")
+            continue
+        before, after = previous.get(metric, 0.0), current.get(metric, 0.0)
+        if after > before * (1 + tolerance) and after - before > min_delta_ms:
+            regressions.append(f"{name}: {metric} {before:.3f}ms → {after:.3f}ms (+{(after / before - 1) * 100 if before else 0:.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="데이터베이스 부하/지연 시간 벤치마크")
+    parser.add_argument('--users', type=int, default=1000, help="가상 사용자 수")
+    parser.add_argument('--answers-per-user', type=int, default=300, help="사용자당 답변 수")
+    parser.add_argument('--days', type=int, default=365, help="기억 점검 기간 (하루 한 번)")
+    parser.add_argument('--questions', type=int, default=200, help="질문 수 (사용자당 최초 답변 수의 상한)")
+    parser.add_argument('--samples', type=int, default=300, help="함수당 측정 횟수")
+    parser.add_argument('--slow-samples', type=int, default=10, help="전체 테이블을 다루는 함수의 측정 횟수")
+    parser.add_argument('--warmup', type=int, default=5, help="함수당 측정 전 예열 호출 횟수")
+    parser.add_argument('--seed', type=int, default=42, help="난수 시드")
+    parser.add_argument('--db', help="집단 DB 파일 경로. 이미 사용자가 있으면 생성을 건너뛰고 재사용 (생략 시 임시 파일)")
+    parser.add_argument('--output', default='db_benchmark_report.json', help="JSON 리포트 저장 경로")
+    parser.add_argument('--baseline', help="비교할 기준 리포트 (회귀 검사 모드)")
+    parser.add_argument('--metric', choices=['p50_ms', 'p95_ms', 'p99_ms'], default='p95_ms', help="회귀 판단 지표")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="허용하는 느려짐 비율 (0.25 = 25%%)")
+    parser.add_argument('--min-delta-ms', type=float, default=0.05, help="이보다 작은 차이는 측정 잡음으로 무시")
+    args = parser.parse_args()
+
+    tmp_dir = None
+    db_path = args.db
+    if db_path is None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        db_path = os.path.join(tmp_dir.name, "db_benchmark.db")
+    database.DATABASE_NAME = db_path
+    database.end_read_cache_scope()  # 캐시 없이 실제 DB 조회 시간을 측정
+
+    existing_users = 0
+    if os.path.exists(db_path):
+        database.create_tables()
+        with database.connection() as conn:
+            existing_users = conn.execute("SELECT COUNT(*) FROM USERS").fetchone()[0]
+
+    if existing_users:
+        print(f"📂 기존 집단 재사용: {db_path} (사용자 {existing_users:,}명)")
+        with database.connection() as conn:
+            setup = {'reused': True, 'rows': _count_rows(conn)}
+    else:
+        print(f"🏗️ 가상 집단 생성 중: 사용자 {args.users:,}명 × 답변 {args.answers_per_user}개 × 기억 점검 {args.days}일")
+        setup = generate_cohort(args.users, args.answers_per_user, args.days, args.questions, args.seed)
+        print(f"   완료: {setup['load_seconds']}초, {setup['rows']}")
+
+    cohort = load_cohort(args.days)
+    cases = build_cases(cohort, random.Random(args.seed))
+    missing = [name for name in public_functions() if name not in cases and name not in SKIPPED_FUNCTIONS]
+    if missing:
+        print(f"⚠️ 측정 케이스가 없는 공개 함수: {', '.join(missing)}")
+
+    print(f"\n📏 함수별 지연 시간 측정 (함수당 {args.samples}회)")
+    results = measure(cases, args.samples, args.slow_samples, args.warmup)
+
+    report = {
+        'meta': {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+            'schema_version': database.get_schema_version(),
+            'params': {key: value for key, value in vars(args).items()
+                       if key in ('users', 'answers_per_user', 'days', 'questions', 'samples', 'slow_samples', 'seed')},
+        },
+        'setup': setup,
+        'results': results,
+        'skipped': SKIPPED_FUNCTIONS,
+        'uncovered': missing,
+    }
+    database.close_all_connections()
+    if tmp_dir is not None:
+        tmp_dir.cleanup()
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 리포트 저장: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('meta', {}).get('params') != report['meta']['params']:
+            print("⚠️ 기준 리포트와 집단 크기/측정 설정이 다릅니다. 비교 결과를 주의해서 보세요.")
+        regressions = compare_with_baseline(report, baseline, args.metric, args.tolerance, args.min_delta_ms)
+        if regressions:
+            print(f"❌ 성능 회귀 {len(regressions)}건 (기준: {args.baseline}, {args.metric}, 허용 {args.tolerance:.0%})")
+            for line in regressions:
+                print(f"   {line}")
+            sys.exit(1)
+        print(f"✅ 기준 대비 성능 회귀 없음 ({args.metric}, 허용 {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
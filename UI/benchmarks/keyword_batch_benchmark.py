@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+배치 키워드 추출 벤치마크
+텍스트를 하나씩 extract_keywords()로 처리하는 경로와 extract_keywords_batch()의 초당 처리량을 비교하고,
+두 경로의 추출 결과가 얼마나 일치하는지 확인합니다.
+입력 문장은 model/labeled_data의 원본 답변을 사용합니다.
+
+사용법 (UI 디렉토리에서, 훈련된 모델이 있는 위치에서):
+    python benchmarks/keyword_batch_benchmark.py --texts 512 --batch-sizes 8 16 32 64
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from typing import List
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+from keyword_extractor import KeywordExtractor
+
+LABELED_DATA_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(os.path.dirname(__file__)))), "model", "labeled_data")
+
+
+def load_texts(limit: int) -> List[str]:
+    """라벨링 데이터의 원본 답변을 limit개까지 (부족하면 반복해서) 가져옵니다."""
+    texts = []
+    for file_path in sorted(glob.glob(os.path.join(LABELED_DATA_DIR, "KLUE_tokenized_answers*_labeled.json"))):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            texts.extend(sample['original_answer'] for sample in json.load(f) if sample.get('original_answer'))
+    if not texts:
+        raise FileNotFoundError(f"라벨링 데이터를 찾을 수 없습니다: {LABELED_DATA_DIR}")
+    return [texts[i % len(texts)] for i in range(limit)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="배치 키워드 추출 처리량 벤치마크")
+    parser.add_argument('--texts', type=int, default=512, help="처리할 텍스트 수")
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[8, 16, 32, 64], help="측정할 배치 크기들")
+    parser.add_argument('--model-path', help="모델 경로 (생략 시 최신 모델 자동 검색)")
+    args = parser.parse_args()
+
+    texts = load_texts(args.texts)
+    extractor = KeywordExtractor(args.model_path)
+
+    # 예열 (첫 호출의 메모리 할당/스레드 풀 준비 시간 제외)
+    extractor.extract_keywords_batch(texts[:8])
+
+    print(f"📏 텍스트별 반복 측정 중... ({len(texts)}개)")
+    start = time.perf_counter()
+    single_results = [extractor.extract_keywords(text) for text in texts]
+    single_seconds = time.perf_counter() - start
+    print(f"   텍스트별 반복: {len(texts) / single_seconds:,.1f} 건/초 ({single_seconds:.2f}초)")
+
+    for batch_size in args.batch_sizes:
+        start = time.perf_counter()
+        batch_results = extractor.extract_keywords_batch(texts, batch_size=batch_size)
+        batch_seconds = time.perf_counter() - start
+        # 패딩 길이가 달라지면 부동소수점 오차로 드물게 다른 라벨이 나올 수 있습니다.
+        same = sum(a == b for a, b in zip(single_results, batch_results))
+        print(f"   배치 {batch_size:>3}: {len(texts) / batch_seconds:,.1f} 건/초 ({batch_seconds:.2f}초), "
+              f"배율 {single_seconds / batch_seconds:.2f}x, 결과 일치 {same}/{len(texts)}")
+
+    # 최대 길이를 넘어 창으로 나뉜 답변의 비용 (KEYWORD_SLIDING_WINDOW)
+    window_stats = extractor.get_window_stats()
+    print(f"\n🪟 창 나누기: 답변 {window_stats['answers']:,}건 중 {window_stats['windowed_answers']:,}건, "
+          f"답변당 평균 창 {window_stats['windows_per_answer']:.2f}개 (최대 {window_stats['max_windows']}개), "
+          f"추가 추론 시간 {window_stats['extra_window_seconds'] * 1000:,.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+키워드 추출 추론 벤치마크
+모델을 한 번만 로드한 뒤, 답변 길이(토큰 수 구간) × 배치 크기 × torch 스레드 수 조합마다
+배치 지연 시간(p50/p95/p99), 처리량(건/초), 단계별 시간(토크나이징 / forward / 디코딩), 최대 RSS를 측정해 JSON 리포트로 저장합니다.
+입력 문장은 model/labeled_data의 원본 답변을 토큰 수로 나눠 사용합니다. (키워드 캐시는 끈 상태로 측정)
+기준(baseline) 리포트를 주면 케이스별로 비교하여 느려진 케이스가 있을 때 종료 코드 1을 반환합니다.
+
+사용법 (UI 디렉토리에서, 훈련된 모델이 있는 위치에서):
+    python benchmarks/keyword_inference_benchmark.py --output inference_report.json
+    python benchmarks/keyword_inference_benchmark.py --batch-sizes 1 8 32 --threads 1 2 4 --length-edges 32 64 128 256
+    python benchmarks/keyword_inference_benchmark.py --backend onnx-int8 --baseline inference_report.json  # 백엔드 비교
+"""
+
+import argparse
+import glob
+import json
+import os
+import platform
+import resource
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+import torch
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+from keyword_extractor import KeywordExtractor
+from utils.constants import KEYWORD_BACKEND, KEYWORD_MAX_LENGTH
+
+LABELED_DATA_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(os.path.dirname(__file__)))), "model", "labeled_data")
+
+STAGES = ('tokenize', 'forward', 'decode')
+
+
+def peak_rss_mb() -> float:
+    """프로세스 시작 이후 최대 RSS (리눅스의 ru_maxrss는 KB 단위)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """선형 보간 백분위수 (sorted_values는 오름차순)"""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def load_answers() -> List[str]:
+    """라벨링 데이터의 원본 답변 전체 (중복 제거, 파일 순서 유지)"""
+    texts = []
+    for file_path in sorted(glob.glob(os.path.join(LABELED_DATA_DIR, "KLUE_tokenized_answers*_labeled.json"))):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            texts.extend(sample['original_answer'] for sample in json.load(f) if sample.get('original_answer'))
+    if not texts:
+        raise FileNotFoundError(f"라벨링 데이터를 찾을 수 없습니다: {LABELED_DATA_DIR}")
+    return list(dict.fromkeys(texts))
+
+
+def bucket_by_length(tokenizer, texts: List[str], edges: List[int], per_bucket: int) -> Dict[str, Dict]:
+    """
+    답변을 토큰 수([CLS]/[SEP] 제외) 구간으로 나누고, 구간마다 per_bucket개를 (부족하면 반복해서) 고릅니다.
+    마지막 구간은 최대 길이를 넘는 답변까지 포함하므로 창 나누기(KEYWORD_SLIDING_WINDOW) 비용도 측정됩니다.
+    """
+    lengths = [len(ids) for ids in tokenizer(texts, add_special_tokens=False)['input_ids']]
+    bounds = [0] + sorted(edges) + [None]
+    buckets = {}
+    for low, high in zip(bounds, bounds[1:]):
+        name = f"{low}-{high}" if high is not None else f"{low}+"
+        members = [(text, length) for text, length in zip(texts, lengths)
+                   if length >= low and (high is None or length < high)]
+        if not members:
+            print(f"⚠️ {name} 토큰 구간에 해당하는 답변이 없어 건너뜁니다.")
+            continue
+        chosen = [members[i % len(members)] for i in range(per_bucket)]
+        buckets[name] = {
+            'texts': [text for text, _ in chosen],
+            'available': len(members),
+            'mean_tokens': round(sum(length for _, length in chosen) / len(chosen), 1),
+        }
+    return buckets
+
+
+def measure_case(extractor: KeywordExtractor, texts: List[str], batch_size: int, repeats: int,
+                 warmup: int) -> Dict:
+    """texts를 batch_size개씩 extract_keyword_spans_batch로 처리하며 배치 지연 시간과 단계별 시간을 잽니다."""
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    for batch in batches[:warmup]:
+        extractor.extract_keyword_spans_batch(batch, batch_size=batch_size)
+
+    stages_before = extractor.get_stage_stats()
+    timings, errors, first_error = [], 0, None
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for batch in batches:
+            batch_start = time.perf_counter()
+            try:
+                extractor.extract_keyword_spans_batch(batch, batch_size=batch_size, raise_on_failure=True)
+            except Exception as e:
+                errors += 1
+                first_error = first_error or f"{type(e).__name__}: {e}"
+                continue
+            timings.append((time.perf_counter() - batch_start) * 1000)
+    total_seconds = time.perf_counter() - start
+    stages_after = extractor.get_stage_stats()
+
+    processed = len(texts) * repeats
+    timings.sort()
+    result = {
+        'batches': len(timings),
+        'errors': errors,
+        'p50_ms': round(_percentile(timings, 50), 3),
+        'p95_ms': round(_percentile(timings, 95), 3),
+        'p99_ms': round(_percentile(timings, 99), 3),
+        'texts_per_sec': round(processed / total_seconds, 2) if total_seconds > 0 else 0.0,
+        # 답변 한 건당 단계별 평균 시간
+        'stage_ms_per_text': {stage: round((stages_after[stage] - stages_before[stage]) * 1000 / processed, 4)
+                              for stage in STAGES},
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+    }
+    if first_error:
+        result['error'] = first_error
+    return result
+
+
+def compare_with_baseline(report: Dict, baseline: Dict, metric: str, tolerance: float,
+                          min_delta_ms: float) -> List[str]:
+    """
+    기준 리포트와 비교하여 회귀한 케이스 목록을 반환합니다.
+    metric 값이 기준보다 tolerance 비율 이상, 그리고 min_delta_ms 이상 느려지거나
+    처리량이 tolerance 비율 이상 줄어들면 회귀로 봅니다. 기준에서 성공하던 케이스가 오류를 내는 경우도 회귀입니다.
+    """
+    regressions = []
+    for name, current in report['results'].items():
+        previous = baseline.get('results', {}).get(name)
+        if previous is None:
+            continue
+        if current['errors'] and not previous.get('errors'):
+            regressions.append(f"{name}: 새 오류 발생 ({current.get('error')})")
+            continue
+        before, after = previous.get(metric, 0.0), current.get(metric, 0.0)
+        if after > before * (1 + tolerance) and after - before > min_delta_ms:
+            regressions.append(f"{name}: {metric} {before:.2f}ms → {after:.2f}ms "
+                               f"(+{(after / before - 1) * 100 if before else 0:.0f}%)")
+        before_rate, after_rate = previous.get('texts_per_sec', 0.0), current.get('texts_per_sec', 0.0)
+        if before_rate and after_rate < before_rate * (1 - tolerance):
+            regressions.append(f"{name}: 처리량 {before_rate:,.1f} → {after_rate:,.1f} 건/초 "
+                               f"({(after_rate / before_rate - 1) * 100:.0f}%)")
+    return regressions
+
+
+def print_comparison(report: Dict, baseline: Dict, metric: str):
+    """케이스별 기준 대비 배율 (1보다 크면 빨라짐)"""
+    print(f"\n📊 기준 대비 ({baseline.get('meta', {}).get('backend')} → {report['meta']['backend']}, {metric})")
+    for name, current in report['results'].items():
+        previous = baseline.get('results', {}).get(name)
+        if previous is None or current['errors'] or previous.get('errors') or not current.get(metric):
+            continue
+        print(f"   {name:<32} {previous[metric]:>9.2f}ms → {current[metric]:>9.2f}ms "
+              f"({previous[metric] / current[metric]:.2f}x), "
+              f"{previous['texts_per_sec']:,.1f} → {current['texts_per_sec']:,.1f} 건/초")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="키워드 추출 추론 지연 시간/처리량 벤치마크")
+    parser.add_argument('--model-path', help="모델 경로 (생략 시 레지스트리 활성 버전 / 최신 모델)")
+    parser.add_argument('--backend', default=KEYWORD_BACKEND, help="추론 백엔드 (torch, onnx, onnx-int8)")
+    parser.add_argument('--length-edges', type=int, nargs='+', default=[16, 32, 64, KEYWORD_MAX_LENGTH],
+                        help="답변 길이 구간 경계 (토큰 수)")
+    parser.add_argument('--texts-per-bucket', type=int, default=128, help="길이 구간마다 사용할 답변 수")
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 8, 32], help="측정할 배치 크기들")
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, os.cpu_count() or 1],
+                        help="측정할 torch.set_num_threads 값들")
+    parser.add_argument('--repeats', type=int, default=3, help="케이스마다 답변 전체를 처리하는 횟수")
+    parser.add_argument('--warmup', type=int, default=2, help="케이스마다 측정 전 예열 배치 수")
+    parser.add_argument('--output', default='keyword_inference_report.json', help="JSON 리포트 저장 경로")
+    parser.add_argument('--baseline', help="비교할 기준 리포트 (회귀 검사 / 백엔드·모델 비교 모드)")
+    parser.add_argument('--metric', choices=['p50_ms', 'p95_ms', 'p99_ms'], default='p50_ms', help="회귀 판단 지표")
+    parser.add_argument('--tolerance', type=float, default=0.15, help="허용하는 느려짐 비율 (0.15 = 15%%)")
+    parser.add_argument('--min-delta-ms', type=float, default=1.0, help="이보다 작은 차이는 측정 잡음으로 무시")
+    args = parser.parse_args()
+
+    rss_before_load = peak_rss_mb()
+    load_start = time.perf_counter()
+    extractor = KeywordExtractor(args.model_path, backend=args.backend)
+    load_seconds = time.perf_counter() - load_start
+    extractor.cache = None  # 같은 답변을 반복하므로 캐시를 끄고 실제 추론 시간을 측정
+    print(f"📦 모델 로드: {load_seconds:.2f}초 (버전 {extractor.model_version}, 백엔드 {args.backend}), "
+          f"RSS {rss_before_load:,.0f} → {peak_rss_mb():,.0f}MB")
+
+    buckets = bucket_by_length(extractor.tokenizer, load_answers(), args.length_edges, args.texts_per_bucket)
+    for name, bucket in buckets.items():
+        print(f"   길이 {name:>8} 토큰: 답변 {bucket['available']:,}개 중 {len(bucket['texts'])}개 사용, "
+              f"평균 {bucket['mean_tokens']} 토큰")
+
+    results: Dict[str, Dict] = {}
+    cases: List[Tuple[int, str, int]] = [(threads, name, batch_size) for threads in args.threads
+                                          for name in buckets for batch_size in args.batch_sizes]
+    print(f"\n📏 {len(cases)}개 케이스 측정 (케이스당 답변 {args.texts_per_bucket}개 × {args.repeats}회)")
+    for threads, name, batch_size in cases:
+        torch.set_num_threads(threads)
+        case_name = f"len={name}/batch={batch_size}/threads={threads}"
+        result = measure_case(extractor, buckets[name]['texts'], batch_size, args.repeats, args.warmup)
+        result.update({'length_bucket': name, 'mean_tokens': buckets[name]['mean_tokens'],
+                       'batch_size': batch_size, 'threads': threads})
+        results[case_name] = result
+        stages = result['stage_ms_per_text']
+        status = f" ❌ 오류 {result['errors']}회 ({result['error']})" if result['errors'] else ""
+        print(f"   {case_name:<32} p50 {result['p50_ms']:>9.2f}ms  p95 {result['p95_ms']:>9.2f}ms  "
+              f"{result['texts_per_sec']:>8,.1f} 건/초  "
+              f"[건당 토큰화 {stages['tokenize']:.2f} / forward {stages['forward']:.2f} / "
+              f"디코딩 {stages['decode']:.2f}ms]{status}")
+
+    report = {
+        'meta': {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'torch': torch.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'backend': args.backend,
+            'model_version': extractor.model_version,
+            'registry_version': extractor.registry_version,
+            'load_seconds': round(load_seconds, 3),
+            'rss_before_load_mb': round(rss_before_load, 1),
+            'peak_rss_mb': round(peak_rss_mb(), 1),
+            'window_stats': extractor.get_window_stats(),
+            'params': {key: value for key, value in vars(args).items()
+                       if key in ('length_edges', 'texts_per_bucket', 'batch_sizes', 'threads', 'repeats')},
+        },
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 리포트 저장: {args.output} (최대 RSS {report['meta']['peak_rss_mb']:,.0f}MB)")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('meta', {}).get('params') != report['meta']['params']:
+            print("⚠️ 기준 리포트와 측정 설정이 다릅니다. 같은 이름의 케이스만 비교합니다.")
+        print_comparison(report, baseline, args.metric)
+        regressions = compare_with_baseline(report, baseline, args.metric, args.tolerance, args.min_delta_ms)
+        if regressions:
+            print(f"❌ 성능 회귀 {len(regressions)}건 (기준: {args.baseline}, {args.metric}, 허용 {args.tolerance:.0%})")
+            for line in regressions:
+                print(f"   {line}")
+            sys.exit(1)
+        print(f"✅ 기준 대비 성능 회귀 없음 ({args.metric}, 허용 {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
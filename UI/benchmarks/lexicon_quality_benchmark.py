@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+사전(lexicon) 추출기 품질/속도 비교
+라벨링 데이터를 사전 생성용과 평가용(holdout)으로 나눈 뒤, 평가용 답변에서
+사전 추출기와 (선택) 모델 추출기의 정밀도/재현율/F1을 정답 라벨과 비교하고, 두 추출기가 얼마나 같은 키워드를 내는지와
+초당 처리량을 측정합니다. 평가용 답변은 사전에 넣지 않으므로 처음 보는 답변에서의 품질을 봅니다.
+
+지표:
+    span      키워드 문자 구간이 정답과 정확히 같아야 정답 (모델 훈련의 span F1과 같은 기준)
+    keyword   키워드 문자열 집합 기준 (기억 점검은 키워드 문자열로 비교하므로 서비스 품질에 더 가까움)
+
+사용법 (UI 디렉토리에서):
+    python benchmarks/lexicon_quality_benchmark.py                       # 사전만 (모델 불필요)
+    python benchmarks/lexicon_quality_benchmark.py --model --db memory_app.db --output lexicon_report.json
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Set, Tuple
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+from lexicon_extractor import KeywordLexiconExtractor, build_lexicon, load_labeled_spans
+from utils.constants import MAX_KEYWORDS_PER_ANSWER
+
+
+def prf(true_positive: int, predicted: int, gold: int) -> Dict[str, float]:
+    precision = true_positive / predicted if predicted else 0.0
+    recall = true_positive / gold if gold else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {'precision': round(precision, 4), 'recall': round(recall, 4), 'f1': round(f1, 4)}
+
+
+def evaluate(predictions: List[List[Dict]], samples: List[Tuple[str, List[Tuple[int, int]]]]) -> Dict:
+    """span / keyword 기준 micro 정밀도·재현율·F1"""
+    span_counts = [0, 0, 0]
+    keyword_counts = [0, 0, 0]
+    for spans, (text, gold_spans) in zip(predictions, samples):
+        predicted_spans = {(span['start'], span['end']) for span in spans}
+        gold = set(gold_spans)
+        span_counts[0] += len(predicted_spans & gold)
+        span_counts[1] += len(predicted_spans)
+        span_counts[2] += len(gold)
+
+        predicted_keywords = {span['keyword'].strip() for span in spans}
+        gold_keywords = {text[start:end].strip() for start, end in gold_spans}
+        keyword_counts[0] += len(predicted_keywords & gold_keywords)
+        keyword_counts[1] += len(predicted_keywords)
+        keyword_counts[2] += len(gold_keywords)
+    return {'span': prf(*span_counts), 'keyword': prf(*keyword_counts)}
+
+
+def keyword_sets(predictions: List[List[Dict]]) -> List[Set[str]]:
+    return [{span['keyword'].strip() for span in spans} for spans in predictions]
+
+
+def agreement(first: List[Set[str]], second: List[Set[str]]) -> Dict[str, float]:
+    """두 추출기 결과의 답변별 Jaccard 평균과, 결과가 완전히 같은 답변 비율"""
+    jaccards = [len(a & b) / len(a | b) if a | b else 1.0 for a, b in zip(first, second)]
+    return {'mean_jaccard': round(sum(jaccards) / len(jaccards), 4) if jaccards else 0.0,
+            'identical_ratio': round(sum(a == b for a, b in zip(first, second)) / len(first), 4) if first else 0.0}
+
+
+def run_extractor(extractor, texts: List[str], batch_size: int, max_keywords: int, repeats: int
+                  ) -> Tuple[List[List[Dict]], float]:
+    """결과와 초당 처리량 (repeats번 처리한 평균)"""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        predictions = extractor.extract_keyword_spans_batch(texts, batch_size=batch_size, max_keywords=max_keywords)
+    seconds = time.perf_counter() - start
+    return predictions, len(texts) * repeats / seconds if seconds > 0 else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="사전 추출기와 모델 추출기의 품질/처리량 비교")
+    parser.add_argument('--holdout', type=float, default=0.2, help="평가용으로 떼어 둘 라벨링 답변 비율")
+    parser.add_argument('--seed', type=int, default=42, help="나누기 난수 시드")
+    parser.add_argument('--db', help="과거 추출 키워드를 사전에 넣을 SQLite DB (생략 시 라벨링 데이터만)")
+    parser.add_argument('--model', action='store_true', help="모델 추출기와도 비교 (훈련된 모델 필요)")
+    parser.add_argument('--model-path', help="모델 경로 (생략 시 레지스트리 활성 버전 / 최신 모델)")
+    parser.add_argument('--max-keywords', type=int, default=MAX_KEYWORDS_PER_ANSWER, help="답변당 최대 키워드 수")
+    parser.add_argument('--batch-size', type=int, default=32, help="모델 추출 배치 크기")
+    parser.add_argument('--repeats', type=int, default=20, help="사전 추출기 처리량 측정 반복 횟수")
+    parser.add_argument('--output', help="결과를 저장할 JSON 파일")
+    args = parser.parse_args()
+
+    samples = load_labeled_spans()
+    random.Random(args.seed).shuffle(samples)
+    holdout_size = max(1, int(len(samples) * args.holdout))
+    evaluation, training = samples[:holdout_size], samples[holdout_size:]
+
+    if args.db:
+        import database
+        with database.using_database(args.db):
+            lexicon = build_lexicon(training, include_extracted=True)
+    else:
+        lexicon = build_lexicon(training, include_extracted=False)
+    lexicon_extractor = KeywordLexiconExtractor(lexicon)
+    texts = [text for text, _ in evaluation]
+    print(f"📖 사전 {len(lexicon):,}개 키워드 (라벨링 답변 {len(training)}개"
+          f"{' + 과거 추출 결과' if args.db else ''}), 평가 답변 {len(evaluation)}개")
+
+    lexicon_predictions, lexicon_rate = run_extractor(lexicon_extractor, texts, args.batch_size,
+                                                      args.max_keywords, args.repeats)
+    results = {'lexicon': {**evaluate(lexicon_predictions, evaluation), 'texts_per_sec': round(lexicon_rate, 1),
+                           'lexicon_size': len(lexicon), 'automaton_states': lexicon_extractor.automaton.size}}
+
+    if args.model:
+        from keyword_extractor import KeywordExtractor
+
+        model_extractor = KeywordExtractor(args.model_path)
+        model_extractor.cache = None  # 캐시 적중 없이 실제 추론 처리량을 측정
+        model_extractor.extract_keyword_spans_batch(texts[:8], batch_size=args.batch_size)  # 예열
+        model_predictions, model_rate = run_extractor(model_extractor, texts, args.batch_size,
+                                                      args.max_keywords, 1)
+        results['model'] = {**evaluate(model_predictions, evaluation), 'texts_per_sec': round(model_rate, 1),
+                            'model_version': model_extractor.model_version}
+        results['agreement'] = agreement(keyword_sets(lexicon_predictions), keyword_sets(model_predictions))
+
+    print(f"\n{'':10}{'span P':>9}{'span R':>9}{'span F1':>9}{'kw P':>9}{'kw R':>9}{'kw F1':>9}{'건/초':>12}")
+    for name in ('lexicon', 'model'):
+        if name not in results:
+            continue
+        row = results[name]
+        print(f"{name:10}{row['span']['precision']:>9.3f}{row['span']['recall']:>9.3f}{row['span']['f1']:>9.3f}"
+              f"{row['keyword']['precision']:>9.3f}{row['keyword']['recall']:>9.3f}{row['keyword']['f1']:>9.3f}"
+              f"{row['texts_per_sec']:>12,.1f}")
+    if 'agreement' in results:
+        print(f"\n🤝 사전 vs 모델: 답변별 키워드 Jaccard 평균 {results['agreement']['mean_jaccard']:.3f}, "
+              f"완전히 같은 답변 {results['agreement']['identical_ratio']:.1%}, "
+              f"처리량 {results['lexicon']['texts_per_sec'] / max(results['model']['texts_per_sec'], 1e-9):,.0f}배")
+
+    if args.output:
+        report = {'created_at': datetime.now().isoformat(timespec='seconds'),
+                  'params': {key: value for key, value in vars(args).items() if key != 'output'},
+                  'results': results}
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
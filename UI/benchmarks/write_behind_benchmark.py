@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+쓰기 지연(write-behind) 큐 벤치마크
+기억 점검 저장(회상 답변 + 기억 점검 결과)을 직접 커밋하는 경로와 쓰기 큐 경로의 초당 처리량을 비교합니다.
+
+사용법 (UI 디렉토리에서):
+    python benchmarks/write_behind_benchmark.py --operations 2000 --threads 4
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+import database
+from utils.write_behind import WriteBehindQueue
+
+
+def _prepare_database(db_path: str) -> int:
+    """벤치마크용 DB를 만들고 원본 답변 하나를 넣어 둡니다. 원본 답변 ID 반환"""
+    database.DATABASE_NAME = db_path
+    database.create_tables()
+    user_id = database.add_user("벤치마크", "1950-01-01", "2024-01-01")
+    question_id = database.add_question("벤치마크 질문", "benchmark")
+    return database.add_user_answer(user_id, question_id, "원본 답변", "2024-01-01", True, ["원본"])
+
+
+def _save_kwargs(original_answer_id: int, index: int) -> dict:
+    """기억 점검 저장 한 건에 해당하는 인자"""
+    return dict(
+        user_id=1, question_id=1, original_answer_id=original_answer_id,
+        check_date="2024-02-01", check_step="initial_recall", check_result="pass",
+        recall_text=f"회상 답변 {index}", user_choice="remembers", keyword_match_count=3,
+    )
+
+
+def _run_threads(thread_count: int, operations: int, work) -> float:
+    """operations개의 작업을 thread_count개의 스레드로 나눠 실행하고 걸린 시간(초)을 반환합니다."""
+    per_thread = operations // thread_count
+
+    def worker(offset):
+        for index in range(offset, offset + per_thread):
+            work(index)
+
+    threads = [threading.Thread(target=worker, args=(i * per_thread,)) for i in range(thread_count)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def benchmark_direct(original_answer_id: int, operations: int, thread_count: int) -> float:
+    """현재 경로: 호출하는 스레드에서 바로 트랜잭션을 커밋"""
+    return _run_threads(thread_count, operations, lambda index: database.add_recall_with_memory_check(
+        **_save_kwargs(original_answer_id, index)))
+
+
+def benchmark_write_behind(original_answer_id: int, operations: int, thread_count: int,
+                           max_batch: int) -> float:
+    """쓰기 큐 경로: 제출만 하고, 마지막에 모든 작업이 커밋될 때까지 기다린 시간까지 포함"""
+    write_queue = WriteBehindQueue(max_queue_size=operations, max_batch=max_batch)
+    start = time.perf_counter()
+    _run_threads(thread_count, operations, lambda index: write_queue.submit(
+        database.add_recall_with_memory_check, **_save_kwargs(original_answer_id, index)))
+    write_queue.shutdown()
+    elapsed = time.perf_counter() - start
+    print(f"   배치 수: {write_queue.stats['batches']}, 평균 배치 크기: "
+          f"{write_queue.stats['committed'] / max(write_queue.stats['batches'], 1):.1f}")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="쓰기 지연 큐 처리량 벤치마크")
+    parser.add_argument('--operations', type=int, default=2000, help="저장할 기억 점검 수")
+    parser.add_argument('--threads', type=int, default=4, help="동시에 저장하는 스레드 수 (세션 수)")
+    parser.add_argument('--max-batch', type=int, default=64, help="쓰기 큐의 최대 배치 크기")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        print("📏 직접 커밋 경로 측정 중...")
+        original_answer_id = _prepare_database(os.path.join(tmp_dir, "direct.db"))
+        direct_seconds = benchmark_direct(original_answer_id, args.operations, args.threads)
+
+        print("📏 쓰기 큐 경로 측정 중...")
+        original_answer_id = _prepare_database(os.path.join(tmp_dir, "write_behind.db"))
+        queued_seconds = benchmark_write_behind(original_answer_id, args.operations, args.threads, args.max_batch)
+
+        database.close_all_connections()
+
+    print(f"\n📊 결과 ({args.operations}건, 스레드 {args.threads}개)")
+    print(f"   직접 커밋: {args.operations / direct_seconds:,.0f} 건/초 ({direct_seconds:.3f}초)")
+    print(f"   쓰기 큐:   {args.operations / queued_seconds:,.0f} 건/초 ({queued_seconds:.3f}초)")
+    print(f"   배율: {direct_seconds / queued_seconds:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
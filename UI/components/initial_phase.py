@@ -6,7 +6,7 @@ from utils.constants import (
     MAX_DAILY_NEW_QUESTIONS_MAINTENANCE,
     INITIAL_PHASE_DAYS
 )
-from keyword_extractor import get_keyword_extractor
+from keyword_jobs import get_keyword_job_workers
 
 def is_in_initial_phase(user_id: int) -> bool:
     """
@@ -83,15 +83,8 @@ def render_initial_phase(user_id: int, context: str = "main"):
                 f"매일 {phase_info['max_daily_questions']}개의 새로운 질문과 기억 점검을 진행합니다.")
 
     # --- 오늘 답변한 질문 수 확인 ---
-    conn = database.get_db_connection()
-    cursor = conn.cursor()
     today_str = date.today().strftime('%Y-%m-%d')
-    cursor.execute("""
-        SELECT COUNT(*) FROM USER_ANSWERS
-        WHERE user_id = ? AND is_initial_answer = 1 AND answer_date = ?
-    """, (user_id, today_str))
-    new_answers_today = cursor.fetchone()[0]
-    conn.close()
+    new_answers_today, _ = database.get_today_activity_count(user_id)
 
     max_daily_questions = phase_info['max_daily_questions']
     
@@ -105,23 +98,13 @@ def render_initial_phase(user_id: int, context: str = "main"):
 
 
     # --- 답변하지 않은 질문 가져오기 ---
-    conn = database.get_db_connection()
-    cursor = conn.cursor()
-    # 전체 질문 목록 (active 상태만)
-    cursor.execute("""
-        SELECT question_id, question_text FROM QUESTIONS 
-        WHERE status = 'active' 
-        ORDER BY question_id
-    """)
-    all_questions = cursor.fetchall()
-    
-    # 사용자가 이미 답변한 초기 질문 ID 목록
-    cursor.execute("""
-        SELECT DISTINCT question_id FROM USER_ANSWERS 
-        WHERE user_id = ? AND is_initial_answer = 1
-    """, (user_id,))
-    answered_ids = {row['question_id'] for row in cursor.fetchall()}
-    conn.close()
+    with database.connection() as conn:
+        # 전체 질문 목록 (active 상태만)
+        all_questions = conn.execute(database.ACTIVE_QUESTIONS_QUERY).fetchall()
+        
+        # 사용자가 이미 답변한 초기 질문 ID 목록
+        answered_ids = {row['question_id'] for row in conn.execute(database.ANSWERED_QUESTION_IDS_QUERY,
+                                                                   (user_id,)).fetchall()}
     
     # 답변하지 않은 질문 필터링
     unanswered_questions = [q for q in all_questions if q['question_id'] not in answered_ids]
@@ -160,45 +143,27 @@ def render_initial_phase(user_id: int, context: str = "main"):
             st.info("💡 건너뛴 질문은 나중에 다시 나타날 수 있습니다.")
 
 def _save_answer_with_keywords(user_id: int, question_id: int, answer_text: str, today_str: str, phase_info: dict):
-    """답변과 키워드를 저장하고 진행 상황 업데이트"""
-    with st.spinner("답변을 분석하여 당신의 기억을 저장하고 있습니다... 잠시만 기다려주세요."):
-        try:
-            # 1. 키워드 추출
-            extractor = get_keyword_extractor()
-            if extractor:
-                extracted_keywords = extractor.extract_keywords(answer_text)
-            else:
-                st.warning("⚠️ 키워드 추출기를 사용할 수 없어 답변만 저장됩니다.")
-                extracted_keywords = []
-        except Exception as e:
-            st.error(f"키워드 추출 중 오류가 발생했습니다: {e}")
-            extracted_keywords = []
-
-        # 2. 답변과 키워드 DB 저장
+    """
+    답변을 저장하고 진행 상황을 업데이트합니다.
+    키워드는 기다리지 않고 KEYWORD_JOBS에 추출 작업으로 등록하며, 백그라운드 워커가 채웁니다.
+    """
+    # 1. 답변 저장, 키워드 추출 작업 등록, 진행 상황 증가를 하나의 트랜잭션으로 처리
+    with database.transaction():
         database.add_user_answer(
             user_id=user_id,
             question_id=question_id,
             answer_text=answer_text,
             answer_date=today_str,
             is_initial_answer=True,
-            extracted_keywords=extracted_keywords
+            enqueue_keyword_job=True
         )
-        print(extracted_keywords)
         
-        # 3. 사용자 진행 상황 업데이트
-        conn = database.get_db_connection()
-        progress = conn.execute(
-            "SELECT total_initial_memory_questions_answered FROM USER_PROGRESS WHERE user_id = ?", 
-            (user_id,)
-        ).fetchone()
-        total_answered = progress['total_initial_memory_questions_answered'] + 1 if progress else 1
-        conn.close()
+        # 2. 사용자 진행 상황 업데이트 (원자적 증가)
+        progress = database.increment_progress(user_id, total_initial=1, last_activity_date=today_str)
+    total_answered = progress['total_initial_memory_questions_answered']
 
-        database.create_or_update_user_progress(
-            user_id,
-            total_initial_memory_questions_answered=total_answered,
-            last_activity_date=today_str
-        )
+    # 3. 커밋된 작업을 바로 처리하도록 워커를 깨움
+    get_keyword_job_workers().notify()
 
     st.success("✅ 당신의 소중한 기억이 안전하게 저장되었습니다!")
     
@@ -16,6 +16,7 @@ from utils.constants import (
 )
 from utils.memory_check import MemoryChecker
 from utils.image_generation import ImageGenerator
+from utils.write_behind import flush_writes, submit_write
 import json
 
 class MemoryCheckPhase:
@@ -30,8 +31,10 @@ class MemoryCheckPhase:
     def render(self):
         """기억 점검 단계 메인 렌더링"""
         st.info(f"🧠 **기억 점검 단계**: 하루에 {MAX_DAILY_MEMORY_CHECKS}개의 기억 점검을 진행합니다.")
+        self._show_failed_saves()
         
-        # 오늘 완료된 기억 점검 수 확인
+        # 오늘 완료된 기억 점검 수 확인 (쓰기 지연 모드에서 직전에 제출한 점검 결과가 커밋된 뒤에 집계)
+        flush_writes()
         _, memory_checks_today = database.get_today_activity_count(self.user_id)
         
         if memory_checks_today >= MAX_DAILY_MEMORY_CHECKS:
@@ -60,17 +63,27 @@ class MemoryCheckPhase:
             st.info("📝 현재 점검할 수 있는 기억이 없습니다. 더 많은 질문에 답변해주세요.")
             return
         
-        # 첫 번째 질문 선택
-        question = questions_to_revisit[0]
+        # 키워드 추출이 끝난 질문 중 가장 오래된 것 선택
+        # (키워드가 아직 대기 중인 답변은 회상 답변을 비교할 기준이 없어 모두 실패로 판정되므로 건너뜀)
+        question, original_answer_info, any_pending = None, None, False
+        for candidate in questions_to_revisit:
+            info = database.get_initial_answer_with_keywords(self.user_id, candidate['question_id'])
+            if info and info['keywords_pending']:
+                any_pending = True
+            elif info:
+                question, original_answer_info = candidate, info
+                break
+        
+        if question is None:
+            if any_pending:
+                st.info("⏳ 이전 답변을 아직 분석하고 있어요. 잠시 후 다시 시도해주세요.")
+            else:
+                st.error("원본 답변 정보를 찾을 수 없습니다.")
+            return
+        
         question_id = question['question_id']
         question_text = question['question_text']
         
-        # 원본 답변 정보 가져오기
-        original_answer_info = database.get_initial_answer_with_keywords(self.user_id, question_id)
-        if not original_answer_info:
-            st.error("원본 답변 정보를 찾을 수 없습니다.")
-            return
-        
         original_answer_id = original_answer_info['answer_id']
         original_answer_text = original_answer_info['answer_text']
         original_keywords = original_answer_info['keywords']
@@ -355,29 +368,38 @@ class MemoryCheckPhase:
             return False
     
     def _save_memory_check_result(self, check_info, recall_text, result, match_count, hint_provided=False):
-        """기억 점검 결과를 DB에 저장"""
-        # 회상 답변 저장
-        recall_answer_id = database.add_user_answer(
-            user_id=self.user_id,
-            question_id=check_info['question_id'],
-            answer_text=recall_text,
-            answer_date=self.today_str,
-            is_initial_answer=False
-        )
-        
-        # 기억 점검 결과 저장
-        database.add_memory_check(
+        """기억 점검 결과를 DB에 저장 (쓰기 지연 모드에서는 백그라운드 쓰기 스레드가 커밋)"""
+        # 회상 답변과 기억 점검 결과를 하나의 쓰기 작업으로 저장
+        future = submit_write(
+            database.add_recall_with_memory_check,
             user_id=self.user_id,
             question_id=check_info['question_id'],
             original_answer_id=check_info['original_answer_id'],
             check_date=self.today_str,
             check_step=CHECK_STEP_POST_HINT_RECALL if hint_provided else CHECK_STEP_INITIAL_RECALL,
             check_result=result,
-            recall_answer_id=recall_answer_id,
+            recall_text=recall_text,
             user_choice=check_info['user_choice'],
             keyword_match_count=match_count,
             hint_provided=hint_provided
         )
+        # 쓰기 지연 모드에서는 화면이 먼저 넘어가므로, 커밋이 실패하면 다음 렌더링에서 알리도록 기록해 둡니다.
+        # (콜백은 쓰기 스레드에서 실행되므로 st.* 대신 세션에 보관된 리스트에만 추가)
+        failed_saves = st.session_state.setdefault('failed_memory_check_saves', [])
+        question_id = check_info['question_id']
+
+        def record_failure(done):
+            if done.exception() is not None:
+                failed_saves.append((question_id, done.exception()))
+
+        future.add_done_callback(record_failure)
+    
+    def _show_failed_saves(self):
+        """쓰기 지연 모드에서 커밋에 실패한 기억 점검 결과를 알립니다."""
+        failed_saves = st.session_state.get('failed_memory_check_saves')
+        while failed_saves:
+            question_id, error = failed_saves.pop(0)
+            st.error(f"❌ 기억 점검 결과를 저장하지 못했습니다 (질문 {question_id}): {error}")
     
     def _complete_memory_check(self):
         """기억 점검 완료 처리"""
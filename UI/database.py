@@ -1,19 +1,293 @@
 import sqlite3
 import datetime
 import json
-from typing import List, Dict, Optional, Tuple
+import hashlib
+import threading
+import time
+import atexit
+import functools
+from contextlib import contextmanager
+from typing import List, Dict, Optional, Tuple, Callable
 
 DATABASE_NAME = 'memory_app.db'  # SQLite 데이터베이스 파일 이름
 
-def get_db_connection():
-    """데이터베이스 연결 객체를 반환합니다."""
-    conn = sqlite3.connect(DATABASE_NAME)
+# --- 연결 관리 설정 ---
+POOL_MAX_SIZE = 8  # DB 파일당 유지할 유휴 연결 최대 개수
+BUSY_TIMEOUT_MS = 5000  # 다른 연결이 잠금을 잡고 있을 때 대기할 최대 시간 (ms)
+STATEMENT_CACHE_SIZE = 256  # 연결당 준비된(prepared) 구문 캐시 크기
+
+
+def _open_connection(db_path: str) -> sqlite3.Connection:
+    """WAL 저널링, busy timeout, 구문 캐시가 설정된 새 연결을 엽니다."""
+    conn = sqlite3.connect(
+        db_path,
+        timeout=BUSY_TIMEOUT_MS / 1000,
+        cached_statements=STATEMENT_CACHE_SIZE,
+        check_same_thread=False,  # 풀을 통해 스레드 간에 전달되므로 비활성화
+        isolation_level=None,  # 트랜잭션은 transaction()에서 명시적으로 관리
+    )
     conn.row_factory = sqlite3.Row  # 컬럼 이름으로 데이터 접근 가능하도록 설정
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    conn.execute("PRAGMA journal_mode = WAL")  # 읽기와 쓰기가 서로를 막지 않도록 설정
+    conn.execute("PRAGMA synchronous = NORMAL")  # WAL 모드에서 안전한 수준의 fsync
     return conn
 
+
+class ConnectionPool:
+    """하나의 SQLite 파일에 대한 스레드 안전한 연결 풀"""
+
+    def __init__(self, db_path: str, max_size: int = POOL_MAX_SIZE):
+        self.db_path = db_path
+        self.max_size = max_size
+        self._idle: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+    def acquire(self) -> sqlite3.Connection:
+        """유휴 연결을 꺼내거나, 없으면 새로 엽니다."""
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return _open_connection(self.db_path)
+
+    def release(self, conn: sqlite3.Connection):
+        """연결을 풀에 반납합니다. 풀이 가득 찼으면 닫습니다."""
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            if len(self._idle) < self.max_size:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def close_all(self):
+        """풀에 있는 모든 유휴 연결을 닫습니다."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+_local = threading.local()  # 스레드별로 현재 사용 중인 연결 (중첩 호출 시 재사용)
+
+
+def current_database() -> str:
+    """이 스레드에서 DB 함수들이 사용할 DB 파일 경로 (using_database()로 전환 가능)"""
+    return getattr(_local, 'db_path', None) or DATABASE_NAME
+
+
+@contextmanager
+def using_database(db_path: str):
+    """블록 안에서 이 스레드의 DB 함수들이 db_path 파일을 사용하도록 임시로 전환합니다."""
+    previous = getattr(_local, 'db_path', None)
+    _local.db_path = db_path
+    try:
+        yield
+    finally:
+        _local.db_path = previous
+
+
+def _get_pool(db_path: Optional[str] = None) -> ConnectionPool:
+    """DB 파일 경로에 해당하는 연결 풀을 반환합니다."""
+    db_path = db_path or current_database()
+    pool = _pools.get(db_path)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.setdefault(db_path, ConnectionPool(db_path))
+    return pool
+
+
+def close_all_connections():
+    """모든 풀의 연결을 닫습니다. (프로세스 종료 시 자동 호출)"""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close_all()
+
+
+atexit.register(close_all_connections)
+
+
+@contextmanager
+def connection():
+    """
+    풀에서 연결을 빌려 사용하고 반납하는 컨텍스트 매니저.
+    같은 스레드에서 중첩 호출되면 바깥에서 빌린 연결을 그대로 재사용합니다.
+    """
+    pool = _get_pool()
+    active = getattr(_local, 'connections', None)
+    if active is None:
+        active = _local.connections = {}
+
+    conn = active.get(pool.db_path)
+    if conn is not None:
+        yield conn
+        return
+
+    conn = pool.acquire()
+    active[pool.db_path] = conn
+    try:
+        yield conn
+    finally:
+        del active[pool.db_path]
+        pool.release(conn)
+
+
+@contextmanager
+def transaction():
+    """
+    하나의 트랜잭션 안에서 작업을 실행하는 컨텍스트 매니저.
+    예외 없이 끝나면 커밋, 예외가 발생하면 롤백합니다.
+    이미 트랜잭션이 열려 있으면 바깥 트랜잭션에 합류합니다.
+    """
+    with connection() as conn:
+        if conn.in_transaction:
+            yield conn
+            return
+
+        # 쓰기 잠금을 먼저 잡아 읽기 -> 쓰기 승격 중 교착(SQLITE_BUSY)을 피합니다.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            _local.pending_invalidations = set()
+            raise
+        else:
+            conn.commit()
+            _apply_pending_invalidations()
+
+
+def get_db_connection():
+    """
+    풀을 거치지 않는 독립 연결 객체를 반환합니다. 사용 후 직접 close() 해야 합니다.
+    새 코드는 connection() / transaction() 컨텍스트 매니저를 사용하세요.
+    """
+    conn = _open_connection(current_database())
+    conn.isolation_level = ''  # 기존 호출부처럼 commit()이 필요한 기본 동작 유지
+    return conn
+
+# --- 조회 결과 캐시 ---
+# 한 번의 Streamlit rerun(선택적으로 세션 전체) 동안 같은 조회를 반복하지 않도록 결과를 기억합니다.
+# 쓰기 함수가 커밋 후 해당 사용자의 세대(generation)를 올리면, 이전 세대의 캐시 항목은 모두 무효가 됩니다.
+
+_ALL_USERS = None  # 전체 무효화(질문 변경 등)에 사용하는 세대 키
+_cache_generations: Dict[Optional[int], int] = {}
+_cache_lock = threading.Lock()
+_cache_stats: Dict[str, Dict[str, int]] = {}
+
+
+def begin_read_cache_scope(session_cache: Optional[dict] = None):
+    """
+    이 스레드에서 새 조회 캐시 범위를 시작합니다. (Streamlit rerun 시작 시 호출)
+
+    Args:
+        session_cache: 세션 범위 캐시로 사용할 dict (예: st.session_state에 보관한 dict).
+            주어지면 session_scoped 조회는 rerun이 바뀌어도 이 dict에 남습니다.
+    """
+    _local.rerun_cache = {}
+    _local.session_cache = session_cache
+
+
+def end_read_cache_scope():
+    """이 스레드의 조회 캐시 범위를 끝냅니다. 이후 조회는 캐시 없이 실행됩니다."""
+    _local.rerun_cache = None
+    _local.session_cache = None
+
+
+def invalidate_read_cache(user_id: Optional[int] = None):
+    """
+    사용자(생략 시 전체)의 캐시된 조회 결과를 무효화합니다.
+    트랜잭션 안에서 호출되면 커밋된 뒤에 적용되어, 다른 스레드가 커밋 전 데이터를 캐시하지 않습니다.
+    """
+    pending = getattr(_local, 'pending_invalidations', None)
+    if _in_transaction():
+        if pending is None:
+            pending = _local.pending_invalidations = set()
+        pending.add(user_id)
+        return
+    with _cache_lock:
+        _cache_generations[user_id] = _cache_generations.get(user_id, 0) + 1
+
+
+def _apply_pending_invalidations():
+    """커밋 후, 트랜잭션 중에 모아 둔 무효화를 적용합니다."""
+    pending = getattr(_local, 'pending_invalidations', None)
+    if not pending:
+        return
+    _local.pending_invalidations = set()
+    with _cache_lock:
+        for user_id in pending:
+            _cache_generations[user_id] = _cache_generations.get(user_id, 0) + 1
+
+
+def _in_transaction() -> bool:
+    """이 스레드가 빌려 쓰는 연결 중 트랜잭션이 열린 것이 있는지 확인합니다."""
+    active = getattr(_local, 'connections', None) or {}
+    return any(conn.in_transaction for conn in active.values())
+
+
+def get_read_cache_stats() -> Dict[str, Dict[str, int]]:
+    """조회 함수별 캐시 적중(hits)/실패(misses) 횟수"""
+    with _cache_lock:
+        return {name: dict(counts) for name, counts in _cache_stats.items()}
+
+
+def _count_cache(name: str, outcome: str):
+    with _cache_lock:
+        counts = _cache_stats.setdefault(name, {'hits': 0, 'misses': 0})
+        counts[outcome] += 1
+
+
+def _copy_result(result):
+    """호출부가 수정해도 캐시가 바뀌지 않도록 dict/list는 얕은 복사본을 돌려줍니다. (sqlite3.Row는 불변)"""
+    if isinstance(result, (dict, list)):
+        return result.copy()
+    return result
+
+
+def _cached_read(session_scoped: bool = False):
+    """
+    첫 번째 인자가 user_id인 조회 함수의 결과를 현재 캐시 범위에 기억하는 데코레이터.
+    캐시 범위가 없거나 트랜잭션 중이면 캐시 없이 바로 조회합니다.
+
+    Args:
+        session_scoped: True면 세션 캐시가 있을 때 rerun이 바뀌어도 결과를 유지합니다.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(user_id, *args, **kwargs):
+            cache = getattr(_local, 'session_cache', None) if session_scoped else None
+            if cache is None:
+                cache = getattr(_local, 'rerun_cache', None)
+            if cache is None or _in_transaction():
+                return func(user_id, *args, **kwargs)
+
+            key = (func.__name__, current_database(), user_id, args, tuple(sorted(kwargs.items())))
+            generation = (_cache_generations.get(_ALL_USERS, 0), _cache_generations.get(user_id, 0))
+            entry = cache.get(key)
+            if entry is not None and entry[0] == generation:
+                _count_cache(func.__name__, 'hits')
+                return _copy_result(entry[1])
+
+            _count_cache(func.__name__, 'misses')
+            result = func(user_id, *args, **kwargs)
+            cache[key] = (generation, result)
+            return _copy_result(result)
+        return wrapper
+    return decorator
+
+
 def create_tables():
-    """데이터베이스 테이블들을 생성합니다."""
-    conn = get_db_connection()
+    """데이터베이스 테이블들을 생성하고, 아직 적용되지 않은 스키마 마이그레이션을 적용합니다."""
+    apply_migrations()
+    print("데이터베이스 테이블이 성공적으로 생성되거나 이미 존재합니다.")
+
+
+def _create_base_tables(conn: sqlite3.Connection):
+    """기본 테이블 스키마를 생성합니다."""
     cursor = conn.cursor()
 
     # USERS 테이블
@@ -106,199 +380,1035 @@ def create_tables():
         );
     """)
 
-    conn.commit()
-    conn.close()
-    print("데이터베이스 테이블이 성공적으로 생성되거나 이미 존재합니다.")
+
+def _create_hot_query_indexes(conn: sqlite3.Connection):
+    """자주 실행되는 조회 패턴에 맞춘 복합/부분 인덱스를 생성합니다."""
+    # DBOperations.get_or_create_user: 이름 + 생년월일로 사용자 조회
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_users_name_birth
+        ON USERS (name, birth_date)
+    """)
+    # get_today_activity_count: 오늘 작성한 최초 답변 수
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_answers_initial_user_date
+        ON USER_ANSWERS (user_id, answer_date)
+        WHERE is_initial_answer = 1
+    """)
+    # get_initial_answer_with_keywords / get_questions_to_revisit / 미답변 질문 조회
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_answers_initial_user_question
+        ON USER_ANSWERS (user_id, question_id)
+        WHERE is_initial_answer = 1
+    """)
+    # get_today_activity_count: 오늘 완료한 기억 점검 수 (인덱스만으로 처리되는 커버링 인덱스)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_memory_checks_user_date
+        ON MEMORY_CHECKS (user_id, check_date, check_result, question_id)
+    """)
+    # 미답변 질문 조회: 활성 질문 목록을 question_id 순으로
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_questions_status
+        ON QUESTIONS (status, question_id)
+    """)
+
+
+def _normalize_question_text(question_text: str) -> str:
+    """질문 비교용 정규화: 앞뒤 공백 제거 및 연속 공백을 하나로 합칩니다."""
+    return ' '.join(question_text.split())
+
+
+def question_content_hash(question_text: str) -> str:
+    """정규화된 질문 텍스트의 SHA-256 해시 (질문의 내용 기반 식별자)"""
+    return hashlib.sha256(_normalize_question_text(question_text).encode('utf-8')).hexdigest()
+
+
+def _add_question_content_hash(conn: sqlite3.Connection):
+    """QUESTIONS에 content_hash 컬럼을 추가하고 기존 질문의 해시를 채웁니다."""
+    conn.execute("ALTER TABLE QUESTIONS ADD COLUMN content_hash TEXT")
+
+    # 같은 내용의 질문이 여러 번 들어가 있으면 가장 먼저 생성된 질문만 해시를 가집니다.
+    seen_hashes = set()
+    updates = []
+    for row in conn.execute("SELECT question_id, question_text FROM QUESTIONS ORDER BY question_id"):
+        content_hash = question_content_hash(row['question_text'])
+        if content_hash in seen_hashes:
+            continue
+        seen_hashes.add(content_hash)
+        updates.append((content_hash, row['question_id']))
+    conn.executemany("UPDATE QUESTIONS SET content_hash = ? WHERE question_id = ?", updates)
+
+    conn.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_questions_content_hash
+        ON QUESTIONS (content_hash)
+        WHERE content_hash IS NOT NULL
+    """)
+
+
+# 같은 날 같은 질문에 이미 pass/fail 기억 점검이 있는지 확인하는 쿼리
+# (트리거에서는 NEW.<컬럼>, 쿼리 플랜 점검에서는 ? 자리 표시자로 채움)
+_MEMORY_CHECK_DEDUP_QUERY = """
+    SELECT 1 FROM MEMORY_CHECKS
+    WHERE user_id = {user_id} AND check_date = {check_date}
+        AND check_result IN ('pass', 'fail') AND question_id = {question_id}
+        AND check_id != {check_id}
+"""
+
+# 날짜별 활동 집계를 처음부터 다시 계산하는 쿼리 (user_filter 자리에 사용자 조건이 들어감)
+_DAILY_ACTIVITY_REBUILD_QUERY = """
+    INSERT INTO USER_DAILY_ACTIVITY (user_id, day, new_answers, memory_checks_done, hints_used)
+    SELECT user_id, day, SUM(new_answers), SUM(memory_checks_done), SUM(hints_used)
+    FROM (
+        SELECT user_id, answer_date AS day, COUNT(*) AS new_answers,
+               0 AS memory_checks_done, 0 AS hints_used
+        FROM USER_ANSWERS
+        WHERE is_initial_answer = 1 {user_filter}
+        GROUP BY user_id, answer_date
+        UNION ALL
+        SELECT user_id, check_date AS day, 0 AS new_answers,
+               COUNT(DISTINCT CASE WHEN check_result IN ('pass', 'fail') THEN question_id END) AS memory_checks_done,
+               SUM(hint_provided = 1) AS hints_used
+        FROM MEMORY_CHECKS
+        WHERE 1 = 1 {user_filter}
+        GROUP BY user_id, check_date
+    )
+    GROUP BY user_id, day
+"""
+
+
+def _rebuild_daily_activity(conn: sqlite3.Connection, user_id: Optional[int] = None):
+    """USER_DAILY_ACTIVITY를 USER_ANSWERS / MEMORY_CHECKS 기록으로부터 다시 계산합니다."""
+    if user_id is None:
+        conn.execute("DELETE FROM USER_DAILY_ACTIVITY")
+        conn.execute(_DAILY_ACTIVITY_REBUILD_QUERY.format(user_filter=""))
+    else:
+        conn.execute("DELETE FROM USER_DAILY_ACTIVITY WHERE user_id = ?", (user_id,))
+        conn.execute(_DAILY_ACTIVITY_REBUILD_QUERY.format(user_filter="AND user_id = :user_id"),
+                     {'user_id': user_id})
+
+
+def _create_daily_activity_rollup(conn: sqlite3.Connection):
+    """사용자별 일일 활동 집계 테이블과, 쓰기 시점에 이를 갱신하는 트리거를 생성합니다."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS USER_DAILY_ACTIVITY (
+            user_id INTEGER NOT NULL,
+            day TEXT NOT NULL, -- YYYY-MM-DD
+            new_answers INTEGER NOT NULL DEFAULT 0, -- 그날 작성한 최초 답변 수
+            memory_checks_done INTEGER NOT NULL DEFAULT 0, -- 그날 pass/fail로 끝난 기억 점검 질문 수
+            hints_used INTEGER NOT NULL DEFAULT 0, -- 그날 이미지 힌트를 제공한 기억 점검 수
+            PRIMARY KEY (user_id, day),
+            FOREIGN KEY (user_id) REFERENCES USERS(user_id)
+        ) WITHOUT ROWID;
+    """)
+
+    # 최초 답변이 저장되면 new_answers 증가
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_daily_activity_new_answer
+        AFTER INSERT ON USER_ANSWERS
+        WHEN NEW.is_initial_answer = 1
+        BEGIN
+            INSERT INTO USER_DAILY_ACTIVITY (user_id, day, new_answers)
+            VALUES (NEW.user_id, NEW.answer_date, 1)
+            ON CONFLICT (user_id, day) DO UPDATE SET new_answers = new_answers + 1;
+        END;
+    """)
+
+    # 같은 날 같은 질문의 첫 pass/fail 결과일 때만 memory_checks_done 증가 (COUNT DISTINCT와 동일)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_daily_activity_memory_check
+        AFTER INSERT ON MEMORY_CHECKS
+        WHEN NEW.check_result IN ('pass', 'fail')
+            AND NOT EXISTS ({dedup_query})
+        BEGIN
+            INSERT INTO USER_DAILY_ACTIVITY (user_id, day, memory_checks_done)
+            VALUES (NEW.user_id, NEW.check_date, 1)
+            ON CONFLICT (user_id, day) DO UPDATE SET memory_checks_done = memory_checks_done + 1;
+        END;
+    """.format(dedup_query=_MEMORY_CHECK_DEDUP_QUERY.format(
+        user_id='NEW.user_id', check_date='NEW.check_date', question_id='NEW.question_id', check_id='NEW.check_id')))
+
+    # 힌트가 제공된 기억 점검이면 hints_used 증가
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_daily_activity_hint
+        AFTER INSERT ON MEMORY_CHECKS
+        WHEN NEW.hint_provided = 1
+        BEGIN
+            INSERT INTO USER_DAILY_ACTIVITY (user_id, day, hints_used)
+            VALUES (NEW.user_id, NEW.check_date, 1)
+            ON CONFLICT (user_id, day) DO UPDATE SET hints_used = hints_used + 1;
+        END;
+    """)
+
+    # 기존 기록으로 집계 채우기
+    _rebuild_daily_activity(conn)
+
+
+def _write_answer_keywords(conn: sqlite3.Connection, answer_id: int, user_id: int, keywords: List[str]):
+    """답변의 키워드를 ANSWER_KEYWORDS에 순서(position)와 함께 저장합니다. (기존 키워드는 교체)"""
+    conn.execute("DELETE FROM ANSWER_KEYWORDS WHERE answer_id = ?", (answer_id,))
+    conn.executemany(
+        "INSERT INTO ANSWER_KEYWORDS (answer_id, user_id, keyword, position) VALUES (?, ?, ?, ?)",
+        [(answer_id, user_id, keyword, position) for position, keyword in enumerate(keywords)]
+    )
+
+
+def _create_answer_keywords(conn: sqlite3.Connection):
+    """정규화된 키워드 테이블을 만들고 USER_ANSWERS.extracted_keywords(JSON)에서 옮겨 담습니다."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS ANSWER_KEYWORDS (
+            answer_id INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            keyword TEXT NOT NULL,
+            position INTEGER NOT NULL, -- 답변 안에서 키워드가 추출된 순서 (0부터)
+            PRIMARY KEY (answer_id, position),
+            FOREIGN KEY (answer_id) REFERENCES USER_ANSWERS(answer_id),
+            FOREIGN KEY (user_id) REFERENCES USERS(user_id)
+        ) WITHOUT ROWID;
+    """)
+    # 사용자별 키워드 역색인: "이 키워드가 나온 답변" / 키워드 통계 조회용
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_answer_keywords_user_keyword
+        ON ANSWER_KEYWORDS (user_id, keyword)
+    """)
+
+    rows = conn.execute("""
+        SELECT answer_id, user_id, extracted_keywords FROM USER_ANSWERS
+        WHERE extracted_keywords IS NOT NULL
+    """).fetchall()
+    for row in rows:
+        try:
+            keywords = json.loads(row['extracted_keywords'])
+        except json.JSONDecodeError:
+            print(f"⚠️ 답변 {row['answer_id']}의 키워드 JSON을 해석할 수 없어 건너뜁니다.")
+            continue
+        _write_answer_keywords(conn, row['answer_id'], row['user_id'], keywords)
+
+
+def _create_keyword_cache(conn: sqlite3.Connection):
+    """키워드 추출 결과 캐시 테이블 (모델 버전 + 답변 텍스트 해시 + 최대 키워드 수로 조회)"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS KEYWORD_CACHE (
+            model_version TEXT NOT NULL, -- 모델 가중치/추론 설정 해시
+            text_hash TEXT NOT NULL, -- 앞뒤 공백을 제거한 답변 텍스트의 SHA-256
+            max_keywords INTEGER NOT NULL,
+            spans TEXT NOT NULL, -- JSON: [{"keyword", "start", "end"}, ...] (공백 제거한 텍스트 기준 위치)
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (model_version, text_hash, max_keywords)
+        ) WITHOUT ROWID;
+    """)
+
+
+def _create_keyword_jobs(conn: sqlite3.Connection):
+    """
+    키워드 추출 작업 큐 테이블 (최초 답변당 작업 하나, 완료되면 행 삭제)
+    키워드가 아직 없는 기존 최초 답변도 작업으로 등록해, 추출에 실패했던 답변을 다시 처리합니다.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS KEYWORD_JOBS (
+            answer_id INTEGER PRIMARY KEY,
+            status TEXT NOT NULL DEFAULT 'pending', -- 'pending', 'running', 'failed' (재시도 횟수 초과)
+            attempts INTEGER NOT NULL DEFAULT 0,
+            available_at REAL NOT NULL, -- 이 시각(unix time) 이후에 처리 (재시도 지연)
+            lease_owner TEXT, -- 작업을 가져간 워커 ID
+            lease_expires_at REAL, -- 워커가 죽으면 이 시각 이후 다른 워커가 다시 가져감
+            last_error TEXT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (answer_id) REFERENCES USER_ANSWERS(answer_id)
+        );
+    """)
+    # claim_keyword_jobs: 처리할 차례가 된 대기 작업 / 임대가 만료된 실행 중 작업
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_keyword_jobs_pending
+        ON KEYWORD_JOBS (available_at)
+        WHERE status = 'pending'
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_keyword_jobs_running
+        ON KEYWORD_JOBS (lease_expires_at)
+        WHERE status = 'running'
+    """)
+    conn.execute("""
+        INSERT OR IGNORE INTO KEYWORD_JOBS (answer_id, available_at)
+        SELECT answer_id, ? FROM USER_ANSWERS
+        WHERE is_initial_answer = 1 AND extracted_keywords IS NULL
+    """, (time.time(),))
+
+
+def _add_keyword_model_version(conn: sqlite3.Connection):
+    """
+    USER_ANSWERS에 키워드를 만든 추출기 버전 컬럼을 추가합니다.
+    사전 추출기의 결과('lexicon-' 접두사)는 키워드 사전 생성에서 제외하고, 나중에 모델로 다시 채울 대상을 찾는 데 씁니다.
+    기존 답변은 NULL(모델 버전 미상)로 둡니다.
+    """
+    conn.execute("ALTER TABLE USER_ANSWERS ADD COLUMN keyword_model_version TEXT")
+
+
+def _create_id_ranges(conn: sqlite3.Connection):
+    """
+    ID 발급 구간 테이블 (storage_router 샤드 전용, 샤딩하지 않은 DB에서는 비어 있음)
+    행이 있는 테이블은 AUTOINCREMENT 대신 이 구간의 next_id로 ID를 발급합니다.
+    SQLite의 AUTOINCREMENT는 테이블의 최대 ID 다음 값을 쓰므로, 다른 샤드에서 옮겨 온 더 큰 ID가 있으면
+    그 샤드의 구간에서 ID를 발급해 버리기 때문입니다.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS ID_RANGES (
+            table_name TEXT PRIMARY KEY,
+            next_id INTEGER NOT NULL, -- 다음에 발급할 ID
+            ceiling INTEGER NOT NULL -- 구간의 끝 (이 값부터는 다른 샤드의 ID)
+        ) WITHOUT ROWID;
+    """)
+
+
+def _allocate_id(conn: sqlite3.Connection, table: str) -> Optional[int]:
+    """ID_RANGES에 구간이 있으면 다음 ID를 발급하고, 없으면 None (AUTOINCREMENT에 맡김)"""
+    row = conn.execute("""
+        UPDATE ID_RANGES SET next_id = next_id + 1 WHERE table_name = ?
+        RETURNING next_id - 1 AS allocated_id, ceiling
+    """, (table,)).fetchone()
+    if row is None:
+        return None
+    if row['allocated_id'] >= row['ceiling']:
+        raise RuntimeError(f"{table}: 이 샤드의 ID 구간을 모두 사용했습니다.")
+    return row['allocated_id']
+
+
+# --- 스키마 마이그레이션 ---
+
+# (버전, 설명, 마이그레이션 함수) 목록. 버전 순서대로 한 번씩만 적용됩니다.
+# 새 마이그레이션은 항상 목록 끝에 다음 버전 번호로 추가하세요.
+SCHEMA_MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Connection], None]]] = [
+    (1, '기본 테이블 생성', _create_base_tables),
+    (2, '조회 패턴별 복합/부분 인덱스 추가', _create_hot_query_indexes),
+    (3, '질문 내용 해시 컬럼 및 고유 인덱스 추가', _add_question_content_hash),
+    (4, '일일 활동 집계 테이블 및 트리거 추가', _create_daily_activity_rollup),
+    (5, '정규화된 답변 키워드 테이블 추가 및 JSON 키워드 이전', _create_answer_keywords),
+    (6, '키워드 추출 결과 캐시 테이블 추가', _create_keyword_cache),
+    (7, '키워드 추출 작업 큐 테이블 추가', _create_keyword_jobs),
+    (8, '답변 키워드 추출기 버전 컬럼 추가', _add_keyword_model_version),
+    (9, '샤드별 ID 발급 구간 테이블 추가', _create_id_ranges),
+]
+
+
+def get_schema_version() -> int:
+    """현재 DB에 적용된 스키마 버전을 반환합니다. (마이그레이션 전이면 0)"""
+    with connection() as conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                description TEXT NOT NULL,
+                applied_at TEXT DEFAULT CURRENT_TIMESTAMP
+            );
+        """)
+        return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+
+def apply_migrations() -> int:
+    """
+    아직 적용되지 않은 마이그레이션을 버전 순서대로 적용합니다.
+    각 마이그레이션은 자체 트랜잭션에서 실행되며, 여러 프로세스가 동시에 실행해도 한 번만 적용됩니다.
+
+    Returns:
+        int: 적용 후 스키마 버전
+    """
+    current_version = get_schema_version()
+    for version, description, migrate in SCHEMA_MIGRATIONS:
+        if version <= current_version:
+            continue
+        with transaction() as conn:
+            # 쓰기 잠금을 잡은 뒤 다시 확인 (다른 프로세스가 먼저 적용했을 수 있음)
+            applied = conn.execute("SELECT 1 FROM schema_version WHERE version = ?", (version,)).fetchone()
+            if not applied:
+                migrate(conn)
+                conn.execute("INSERT INTO schema_version (version, description) VALUES (?, ?)",
+                             (version, description))
+                print(f"스키마 마이그레이션 적용: v{version} - {description}")
+        current_version = version
+    return current_version
+
+
+# --- 쿼리 플랜 점검 ---
+
+# 주요 조회 SQL. 조회 함수와 아래 HOT_QUERIES가 같은 문자열을 쓰므로 쿼리 플랜 점검이 실제 조회와 어긋나지 않습니다.
+# 다른 모듈에서 직접 실행하는 조회는 공개 이름으로 두고 그 모듈에서 가져다 씁니다.
+USER_BY_NAME_BIRTH_QUERY = """
+    SELECT user_id FROM USERS
+    WHERE name = ? AND birth_date = ?
+"""
+
+ACTIVE_QUESTIONS_QUERY = """
+    SELECT question_id, question_text FROM QUESTIONS
+    WHERE status = 'active'
+    ORDER BY question_id
+"""
+
+ANSWERED_QUESTION_IDS_QUERY = """
+    SELECT DISTINCT question_id FROM USER_ANSWERS
+    WHERE user_id = ? AND is_initial_answer = 1
+"""
+
+_DAILY_ACTIVITY_QUERY = """
+    SELECT new_answers, memory_checks_done, hints_used FROM USER_DAILY_ACTIVITY
+    WHERE user_id = ? AND day = ?
+"""
+
+_INITIAL_ANSWER_QUERY = """
+    SELECT UA.answer_id, UA.answer_text, KJ.status AS job_status
+    FROM USER_ANSWERS UA
+    LEFT JOIN KEYWORD_JOBS KJ ON KJ.answer_id = UA.answer_id
+    WHERE UA.user_id = ? AND UA.question_id = ? AND UA.is_initial_answer = 1
+"""
+
+_ANSWER_KEYWORDS_QUERY = """
+    SELECT keyword FROM ANSWER_KEYWORDS WHERE answer_id = ? ORDER BY position
+"""
+
+_QUESTIONS_TO_REVISIT_QUERY = """
+    SELECT Q.question_id, Q.question_text
+    FROM QUESTIONS Q
+    JOIN USER_ANSWERS UA ON Q.question_id = UA.question_id
+    WHERE UA.user_id = ? AND UA.is_initial_answer = 1 AND Q.status = 'active'
+    ORDER BY Q.created_at ASC
+"""
+
+_ANSWERS_BY_KEYWORD_QUERY = """
+    SELECT UA.answer_id, UA.question_id, UA.answer_text, UA.answer_date
+    FROM USER_ANSWERS UA
+    WHERE UA.answer_id IN (
+        SELECT answer_id FROM ANSWER_KEYWORDS
+        WHERE user_id = ? AND keyword = ?
+    )
+    ORDER BY UA.answer_id DESC
+"""
+
+_KEYWORD_STATS_QUERY = """
+    SELECT keyword, COUNT(DISTINCT answer_id) AS answer_count
+    FROM ANSWER_KEYWORDS
+    WHERE user_id = ?
+    GROUP BY keyword
+    ORDER BY answer_count DESC, keyword
+    LIMIT ?
+"""
+
+# placeholders 자리에 텍스트 해시 개수만큼 ?가 들어감
+_CACHED_KEYWORDS_QUERY = """
+    SELECT text_hash, spans FROM KEYWORD_CACHE
+    WHERE model_version = ? AND max_keywords = ? AND text_hash IN ({placeholders})
+"""
+
+_CLAIM_KEYWORD_JOBS_QUERY = """
+    UPDATE KEYWORD_JOBS
+    SET status = 'running', lease_owner = ?, lease_expires_at = ?,
+        attempts = attempts + 1, updated_at = CURRENT_TIMESTAMP
+    WHERE answer_id IN (
+        SELECT answer_id FROM KEYWORD_JOBS
+        WHERE (status = 'pending' AND available_at <= ?)
+            OR (status = 'running' AND lease_expires_at < ?)
+        LIMIT ?
+    )
+    RETURNING answer_id, attempts
+"""
+
+_INITIAL_ANSWERS_PAGE_QUERY = """
+    SELECT answer_id, answer_text FROM USER_ANSWERS
+    WHERE answer_id > ? AND is_initial_answer = 1
+    ORDER BY answer_id
+    LIMIT ?
+"""
+
+# 데이터가 늘어도 전체 테이블 스캔이 일어나면 안 되는 조회들 (이름 -> (SQL, 예시 파라미터))
+HOT_QUERIES: Dict[str, Tuple[str, tuple]] = {
+    'get_daily_activity': (_DAILY_ACTIVITY_QUERY, (1, '2025-01-01')),
+    'trg_daily_activity_memory_check.dedup': (_MEMORY_CHECK_DEDUP_QUERY.format(
+        user_id='?', check_date='?', question_id='?', check_id='?'), (1, '2025-01-01', 1, 1)),
+    'get_initial_answer_with_keywords': (_INITIAL_ANSWER_QUERY, (1, 1)),
+    'get_initial_answer_with_keywords.keywords': (_ANSWER_KEYWORDS_QUERY, (1,)),
+    'get_questions_to_revisit': (_QUESTIONS_TO_REVISIT_QUERY, (1,)),
+    'initial_phase.active_questions': (ACTIVE_QUESTIONS_QUERY, ()),
+    'initial_phase.answered_question_ids': (ANSWERED_QUESTION_IDS_QUERY, (1,)),
+    'find_answers_by_keyword': (_ANSWERS_BY_KEYWORD_QUERY, (1, '벚꽃')),
+    'get_keyword_stats': (_KEYWORD_STATS_QUERY, (1, 20)),
+    'get_cached_keywords': (_CACHED_KEYWORDS_QUERY.format(placeholders='?'), ('v1', 6, 'hash')),
+    'claim_keyword_jobs': (_CLAIM_KEYWORD_JOBS_QUERY, ('worker', 30.0, 0.0, 0.0, 16)),
+    'get_initial_answers_page': (_INITIAL_ANSWERS_PAGE_QUERY, (0, 256)),
+    'DBOperations.get_or_create_user': (USER_BY_NAME_BIRTH_QUERY, ('홍길동', '1950-01-01')),
+}
+
+
+def explain_hot_queries() -> Dict[str, List[str]]:
+    """HOT_QUERIES 각각의 EXPLAIN QUERY PLAN 결과를 반환합니다."""
+    plans = {}
+    with connection() as conn:
+        for name, (query, params) in HOT_QUERIES.items():
+            rows = conn.execute(f"EXPLAIN QUERY PLAN {query}", params).fetchall()
+            plans[name] = [row['detail'] for row in rows]
+    return plans
+
+
+def find_full_table_scans() -> Dict[str, List[str]]:
+    """인덱스 없이 테이블 전체를 스캔하는 조회와 해당 플랜 단계를 반환합니다."""
+    scans = {}
+    for name, details in explain_hot_queries().items():
+        # 'SCAN <table>'은 전체 스캔, 'SCAN <table> USING ... INDEX'는 인덱스 전체 스캔
+        bad_steps = [detail for detail in details if detail.startswith('SCAN ')]
+        if bad_steps:
+            scans[name] = bad_steps
+    return scans
 
 
 # --- 데이터 삽입/수정 함수 ---
 
 def add_user(name: str, birth_date: str, diagnosis_date: str) -> int:
     """사용자 추가"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("INSERT INTO USERS (name, birth_date, diagnosis_date) VALUES (?, ?, ?)",
-                   (name, birth_date, diagnosis_date))
-    user_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    return user_id
+    with transaction() as conn:
+        cursor = conn.execute("INSERT INTO USERS (name, birth_date, diagnosis_date) VALUES (?, ?, ?)",
+                              (name, birth_date, diagnosis_date))
+        invalidate_read_cache(cursor.lastrowid)  # 미리 조회되어 캐시된 "없음" 결과 제거
+        return cursor.lastrowid
 
 def add_question(question_text: str, question_type: str) -> int:
-    """질문 추가"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("INSERT INTO QUESTIONS (question_text, question_type) VALUES (?, ?)",
-                   (question_text, question_type))
-    question_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    return question_id
+    """질문 추가. 같은 내용의 질문이 이미 있으면 기존 질문 ID를 반환합니다."""
+    content_hash = question_content_hash(question_text)
+    with transaction() as conn:
+        existing = conn.execute("SELECT question_id FROM QUESTIONS WHERE content_hash = ?",
+                                (content_hash,)).fetchone()
+        if existing:
+            return existing['question_id']
+        cursor = conn.execute("INSERT INTO QUESTIONS (question_text, question_type, content_hash) VALUES (?, ?, ?)",
+                              (question_text, question_type, content_hash))
+        invalidate_read_cache()
+        return cursor.lastrowid
+
+def sync_questions(question_texts: List[str], question_type: str) -> Dict[str, int]:
+    """
+    질문 목록을 QUESTIONS 테이블과 동기화합니다.
+    내용 해시가 같은 질문은 기존 question_id를 그대로 유지하고,
+    새 질문만 추가하며 표기만 달라진 질문(공백 등)만 갱신합니다. 기존 질문은 삭제하지 않습니다.
+
+    Args:
+        question_texts: 동기화할 질문 텍스트 목록 (순서대로 추가됨)
+        question_type: 새로 추가되는 질문의 타입
+
+    Returns:
+        Dict[str, int]: {'inserted', 'updated', 'unchanged', 'missing'} 개수
+    """
+    # 입력 내 중복 제거 (처음 나온 순서 유지)
+    incoming: Dict[str, str] = {}
+    for question_text in question_texts:
+        question_text = question_text.strip()
+        if question_text:
+            incoming.setdefault(question_content_hash(question_text), question_text)
+
+    with connection() as conn:
+        existing = {row['content_hash']: row['question_text'] for row in conn.execute(
+            "SELECT content_hash, question_text FROM QUESTIONS WHERE content_hash IS NOT NULL")}
+        existing_of_type = {row['content_hash'] for row in conn.execute(
+            "SELECT content_hash FROM QUESTIONS WHERE content_hash IS NOT NULL AND question_type = ?",
+            (question_type,))}
+
+    new_rows = [(text, question_type, content_hash) for content_hash, text in incoming.items()
+                if content_hash not in existing]
+    changed_rows = [(text, question_type, content_hash) for content_hash, text in incoming.items()
+                    if content_hash in existing and existing[content_hash] != text]
+
+    # 바뀐 것이 없으면 쓰기 잠금 없이 바로 반환 (앱 재실행 시 일반적인 경우)
+    if new_rows or changed_rows:
+        with transaction() as conn:
+            conn.executemany("""
+                INSERT INTO QUESTIONS (question_text, question_type, content_hash) VALUES (?, ?, ?)
+                ON CONFLICT (content_hash) WHERE content_hash IS NOT NULL
+                DO UPDATE SET question_text = excluded.question_text
+                WHERE question_text != excluded.question_text
+            """, new_rows + changed_rows)
+            invalidate_read_cache()
+
+    return {
+        'inserted': len(new_rows),
+        'updated': len(changed_rows),
+        'unchanged': len(incoming) - len(new_rows) - len(changed_rows),
+        'missing': len(existing_of_type - incoming.keys()),
+    }
     
 def add_user_answer(user_id: int, question_id: int, answer_text: str, answer_date: str, 
-                    is_initial_answer: bool, extracted_keywords: Optional[List[str]] = None) -> int:
-    """사용자 답변 추가. 최초 답변일 경우 키워드도 함께 저장합니다."""
-    conn = get_db_connection()
-    cursor = conn.cursor()
+                    is_initial_answer: bool, extracted_keywords: Optional[List[str]] = None,
+                    enqueue_keyword_job: bool = False) -> int:
+    """
+    사용자 답변 추가. 최초 답변일 경우 키워드도 함께 저장합니다.
+    enqueue_keyword_job=True면 키워드 대신 추출 작업을 같은 트랜잭션으로 KEYWORD_JOBS에 등록합니다.
+    """
     keywords_json = None
     if is_initial_answer and extracted_keywords:
         # 한글 깨짐 방지를 위해 ensure_ascii=False 사용
         keywords_json = json.dumps(extracted_keywords, ensure_ascii=False)
 
-    cursor.execute("""
-        INSERT INTO USER_ANSWERS (user_id, question_id, answer_text, answer_date, is_initial_answer, extracted_keywords)
-        VALUES (?, ?, ?, ?, ?, ?);
-    """, (user_id, question_id, answer_text, answer_date, is_initial_answer, keywords_json))
-    answer_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    return answer_id
+    with transaction() as conn:
+        cursor = conn.execute("""
+            INSERT INTO USER_ANSWERS (answer_id, user_id, question_id, answer_text, answer_date, is_initial_answer,
+                                      extracted_keywords)
+            VALUES (?, ?, ?, ?, ?, ?, ?);
+        """, (_allocate_id(conn, 'USER_ANSWERS'), user_id, question_id, answer_text, answer_date, is_initial_answer,
+              keywords_json))
+        answer_id = cursor.lastrowid
+        # JSON 컬럼과 정규화된 키워드 테이블에 함께 기록 (dual-write)
+        if keywords_json is not None:
+            _write_answer_keywords(conn, answer_id, user_id, extracted_keywords)
+        elif is_initial_answer and enqueue_keyword_job:
+            conn.execute("INSERT OR IGNORE INTO KEYWORD_JOBS (answer_id, available_at) VALUES (?, ?)",
+                         (answer_id, time.time()))
+        invalidate_read_cache(user_id)
+        return answer_id
+
+def set_answer_keywords(answer_id: int, keywords: List[str], model_version: Optional[str] = None):
+    """
+    이미 저장된 답변의 키워드를 채우거나 교체합니다. (JSON 컬럼과 ANSWER_KEYWORDS 함께 갱신)
+    키워드가 없으면 '[]'로 저장해 "추출했지만 키워드 없음"과 "아직 추출 전(NULL)"을 구분합니다.
+    """
+    if not set_answer_keywords_many({answer_id: keywords}, model_version):
+        raise ValueError(f"답변을 찾을 수 없습니다: {answer_id}")
+
+def set_answer_keywords_many(keywords_by_answer: Dict[int, List[str]], model_version: Optional[str] = None) -> int:
+    """
+    여러 답변의 키워드를 한 트랜잭션으로 채우거나 교체합니다. (재추출 백필용 일괄 쓰기)
+    model_version은 키워드를 만든 추출기 버전으로 USER_ANSWERS.keyword_model_version에 기록합니다.
+    없는 답변은 건너뜁니다. 갱신한 답변 수 반환
+    """
+    if not keywords_by_answer:
+        return 0
+    with transaction() as conn:
+        user_ids = {}
+        answer_ids = list(keywords_by_answer)
+        # SQLite 변수 개수 제한을 넘지 않도록 나눠서 조회
+        for start in range(0, len(answer_ids), 500):
+            chunk = answer_ids[start:start + 500]
+            user_ids.update(conn.execute(f"""
+                SELECT answer_id, user_id FROM USER_ANSWERS
+                WHERE answer_id IN ({', '.join('?' * len(chunk))})
+            """, chunk).fetchall())
+        if not user_ids:
+            return 0
+
+        conn.executemany("""
+            UPDATE USER_ANSWERS SET extracted_keywords = ?, keyword_model_version = ? WHERE answer_id = ?
+        """, [(json.dumps(keywords_by_answer[answer_id], ensure_ascii=False), model_version, answer_id)
+              for answer_id in user_ids])
+        conn.executemany("DELETE FROM ANSWER_KEYWORDS WHERE answer_id = ?", [(answer_id,) for answer_id in user_ids])
+        conn.executemany(
+            "INSERT INTO ANSWER_KEYWORDS (answer_id, user_id, keyword, position) VALUES (?, ?, ?, ?)",
+            [(answer_id, user_id, keyword, position)
+             for answer_id, user_id in user_ids.items()
+             for position, keyword in enumerate(keywords_by_answer[answer_id])]
+        )
+        for user_id in set(user_ids.values()):
+            invalidate_read_cache(user_id)
+        return len(user_ids)
+
+def get_initial_answers_page(after_answer_id: int, limit: int) -> List[sqlite3.Row]:
+    """answer_id가 after_answer_id보다 큰 최초 답변을 answer_id 순으로 limit개 (키셋 페이지네이션)"""
+    with connection() as conn:
+        return conn.execute(_INITIAL_ANSWERS_PAGE_QUERY, (after_answer_id, limit)).fetchall()
+
+def count_initial_answers(after_answer_id: int = 0) -> int:
+    """answer_id가 after_answer_id보다 큰 최초 답변 수"""
+    with connection() as conn:
+        return conn.execute("""
+            SELECT COUNT(*) FROM USER_ANSWERS WHERE answer_id > ? AND is_initial_answer = 1
+        """, (after_answer_id,)).fetchone()[0]
 
 def add_memory_check(user_id: int, question_id: int, original_answer_id: int, check_date: str, 
                      check_step: str, check_result: str, recall_answer_id: Optional[int] = None, 
                      user_choice: Optional[str] = None, keyword_match_count: Optional[int] = None, 
                      hint_provided: bool = False) -> int:
     """기억 확인 결과 추가"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        INSERT INTO MEMORY_CHECKS (
+    with transaction() as conn:
+        cursor = conn.execute("""
+            INSERT INTO MEMORY_CHECKS (
+                check_id, user_id, question_id, original_answer_id, check_date, check_step, check_result,
+                recall_answer_id, user_choice, keyword_match_count, hint_provided
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+        """, (_allocate_id(conn, 'MEMORY_CHECKS'), user_id, question_id, original_answer_id, check_date, check_step, check_result,
+              recall_answer_id, user_choice, keyword_match_count, hint_provided))
+        invalidate_read_cache(user_id)
+        return cursor.lastrowid
+
+def add_recall_with_memory_check(user_id: int, question_id: int, original_answer_id: int, check_date: str,
+                                 check_step: str, check_result: str, recall_text: str,
+                                 user_choice: Optional[str] = None, keyword_match_count: Optional[int] = None,
+                                 hint_provided: bool = False) -> Tuple[int, int]:
+    """회상 답변과 기억 확인 결과를 하나의 트랜잭션으로 저장합니다. (recall_answer_id, check_id) 반환"""
+    with transaction():
+        recall_answer_id = add_user_answer(user_id, question_id, recall_text, check_date, is_initial_answer=False)
+        check_id = add_memory_check(
             user_id, question_id, original_answer_id, check_date, check_step, check_result,
-            recall_answer_id, user_choice, keyword_match_count, hint_provided
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
-    """, (user_id, question_id, original_answer_id, check_date, check_step, check_result,
-          recall_answer_id, user_choice, keyword_match_count, hint_provided))
-    check_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    return check_id
+            recall_answer_id=recall_answer_id, user_choice=user_choice,
+            keyword_match_count=keyword_match_count, hint_provided=hint_provided
+        )
+    return recall_answer_id, check_id
 
 def add_generated_image(memory_check_id: int, image_url: str) -> int:
     """생성된 이미지 정보 추가"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("INSERT INTO GENERATED_IMAGES (memory_check_id, image_url) VALUES (?, ?)",
-                   (memory_check_id, image_url))
-    image_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    return image_id
+    with transaction() as conn:
+        cursor = conn.execute("INSERT INTO GENERATED_IMAGES (image_id, memory_check_id, image_url) VALUES (?, ?, ?)",
+                              (_allocate_id(conn, 'GENERATED_IMAGES'), memory_check_id, image_url))
+        return cursor.lastrowid
 
 def update_question_status(question_id: int, status: str):
     """질문의 상태를 변경합니다 ('active' 또는 'archived')."""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("UPDATE QUESTIONS SET status = ? WHERE question_id = ?", (status, question_id))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        conn.execute("UPDATE QUESTIONS SET status = ? WHERE question_id = ?", (status, question_id))
+        invalidate_read_cache()
     print(f"질문 ID {question_id}의 상태가 '{status}'로 변경되었습니다.")
 
 def create_or_update_user_progress(user_id: int, **kwargs):
     """사용자 진행 상황 생성 또는 업데이트"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    # 기존 진행 상황 확인
-    cursor.execute("SELECT * FROM USER_PROGRESS WHERE user_id = ?", (user_id,))
-    existing = cursor.fetchone()
-    
-    if existing:
-        # 업데이트
-        set_clauses = [f"{key} = ?" for key in kwargs]
-        values = list(kwargs.values())
-        if set_clauses:
-            values.append(user_id)
-            query = f"UPDATE USER_PROGRESS SET {', '.join(set_clauses)}, updated_at = CURRENT_TIMESTAMP WHERE user_id = ?"
-            cursor.execute(query, values)
-    else:
-        # 새로 생성
-        columns = ['user_id'] + list(kwargs.keys())
-        placeholders = ['?'] * len(columns)
-        values = [user_id] + list(kwargs.values())
-        query = f"INSERT INTO USER_PROGRESS ({', '.join(columns)}) VALUES ({', '.join(placeholders)})"
-        cursor.execute(query, values)
-    
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        # 기존 진행 상황 확인
+        existing = conn.execute("SELECT 1 FROM USER_PROGRESS WHERE user_id = ?", (user_id,)).fetchone()
+        
+        if existing:
+            # 업데이트
+            set_clauses = [f"{key} = ?" for key in kwargs]
+            values = list(kwargs.values())
+            if set_clauses:
+                values.append(user_id)
+                query = f"UPDATE USER_PROGRESS SET {', '.join(set_clauses)}, updated_at = CURRENT_TIMESTAMP WHERE user_id = ?"
+                conn.execute(query, values)
+        else:
+            # 새로 생성
+            columns = ['user_id'] + list(kwargs.keys())
+            placeholders = ['?'] * len(columns)
+            values = [user_id] + list(kwargs.values())
+            query = f"INSERT INTO USER_PROGRESS ({', '.join(columns)}) VALUES ({', '.join(placeholders)})"
+            conn.execute(query, values)
+        invalidate_read_cache(user_id)
+
+# increment_progress에서 사용하는 짧은 이름 -> USER_PROGRESS 카운터 컬럼
+PROGRESS_COUNTERS = {
+    'questions_today': 'questions_answered_today',
+    'total_initial': 'total_initial_memory_questions_answered',
+    'total_revisit': 'total_revisit_questions_answered',
+    'total_new_general': 'total_new_general_questions_answered',
+    'service_day': 'current_service_day',
+}
+
+def increment_progress(user_id: int, last_activity_date: Optional[str] = None, **deltas: int) -> sqlite3.Row:
+    """
+    사용자 진행 상황 카운터를 하나의 INSERT ... ON CONFLICT 문으로 원자적으로 증가시킵니다.
+    진행 상황 행이 없으면 새로 만들고, 같은 사용자의 동시 제출에도 증가분이 유실되지 않습니다.
+    transaction() 안에서 호출하면 답변 저장과 같은 트랜잭션으로 묶입니다.
+
+    Args:
+        user_id: 사용자 ID
+        last_activity_date: 함께 기록할 마지막 활동일 (YYYY-MM-DD, 생략 시 기존 값 유지)
+        **deltas: PROGRESS_COUNTERS의 짧은 이름 = 증가량 (예: total_initial=1)
+
+    Returns:
+        sqlite3.Row: 갱신된 USER_PROGRESS 행
+    """
+    unknown = set(deltas) - set(PROGRESS_COUNTERS)
+    if unknown:
+        raise ValueError(f"알 수 없는 진행 상황 카운터: {', '.join(sorted(unknown))}")
+
+    columns = [PROGRESS_COUNTERS[name] for name in deltas]
+    insert_columns = ['user_id'] + columns + ['last_activity_date']
+    update_clauses = [f"{column} = {column} + excluded.{column}" for column in columns]
+    update_clauses.append("last_activity_date = COALESCE(excluded.last_activity_date, last_activity_date)")
+    update_clauses.append("updated_at = CURRENT_TIMESTAMP")
+
+    query = f"""
+        INSERT INTO USER_PROGRESS ({', '.join(insert_columns)})
+        VALUES ({', '.join(['?'] * len(insert_columns))})
+        ON CONFLICT (user_id) DO UPDATE SET {', '.join(update_clauses)}
+        RETURNING *
+    """
+    with transaction() as conn:
+        progress = conn.execute(query, [user_id, *deltas.values(), last_activity_date]).fetchone()
+        invalidate_read_cache(user_id)
+        return progress
 
 # --- 데이터 조회 함수 ---
 
+@_cached_read(session_scoped=True)
 def get_user(user_id: int) -> Optional[sqlite3.Row]:
     """특정 사용자 정보 가져오기"""
-    conn = get_db_connection()
-    user = conn.execute("SELECT * FROM USERS WHERE user_id = ?", (user_id,)).fetchone()
-    conn.close()
-    return user
+    with connection() as conn:
+        return conn.execute("SELECT * FROM USERS WHERE user_id = ?", (user_id,)).fetchone()
 
+@_cached_read()
 def get_user_progress(user_id: int) -> Optional[sqlite3.Row]:
     """사용자 진행 상황 가져오기"""
-    conn = get_db_connection()
-    progress = conn.execute("SELECT * FROM USER_PROGRESS WHERE user_id = ?", (user_id,)).fetchone()
-    conn.close()
-    return progress
+    with connection() as conn:
+        return conn.execute("SELECT * FROM USER_PROGRESS WHERE user_id = ?", (user_id,)).fetchone()
 
+@_cached_read()
 def get_initial_answer_with_keywords(user_id: int, question_id: int) -> Optional[Dict]:
-    """특정 질문에 대한 사용자의 최초 답변과 키워드를 가져옵니다."""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT answer_id, answer_text, extracted_keywords 
-        FROM USER_ANSWERS 
-        WHERE user_id = ? AND question_id = ? AND is_initial_answer = 1
-    """, (user_id, question_id))
-    result = cursor.fetchone()
-    conn.close()
+    """
+    특정 질문에 대한 사용자의 최초 답변과 키워드를 가져옵니다.
+    keywords_pending은 키워드 추출 작업이 아직 대기/실행 중이라 keywords가 비어 있을 수 있음을 뜻합니다.
+    """
+    with connection() as conn:
+        result = conn.execute(_INITIAL_ANSWER_QUERY, (user_id, question_id)).fetchone()
+        if not result:
+            return None
+        
+        keywords = [row['keyword'] for row in conn.execute(_ANSWER_KEYWORDS_QUERY, (result['answer_id'],))]
     
-    if result:
-        keywords = json.loads(result['extracted_keywords']) if result['extracted_keywords'] else []
-        return {
-            'answer_id': result['answer_id'],
-            'answer_text': result['answer_text'],
-            'keywords': keywords
-        }
-    return None
+    return {
+        'answer_id': result['answer_id'],
+        'answer_text': result['answer_text'],
+        'keywords': keywords,
+        'keywords_pending': result['job_status'] in ('pending', 'running'),
+    }
+
+def find_answers_by_keyword(user_id: int, keyword: str) -> List[sqlite3.Row]:
+    """특정 키워드가 추출된 사용자의 답변 목록을 최신순으로 가져옵니다."""
+    with connection() as conn:
+        return conn.execute(_ANSWERS_BY_KEYWORD_QUERY, (user_id, keyword)).fetchall()
+
+def get_keyword_stats(user_id: int, limit: int = 20) -> List[sqlite3.Row]:
+    """사용자의 답변 전체에서 자주 등장한 키워드와 등장한 답변 수를 가져옵니다."""
+    with connection() as conn:
+        return conn.execute(_KEYWORD_STATS_QUERY, (user_id, limit)).fetchall()
 
+def get_keyword_frequencies(min_answer_count: int = 1) -> List[sqlite3.Row]:
+    """
+    전체 사용자의 답변에서 추출된 키워드와 등장한 답변 수를 가져옵니다. (키워드 사전 생성용)
+    사전이 자기 결과를 다시 배우지 않도록 사전 추출기가 만든 키워드('lexicon-' 버전)는 제외합니다.
+    ANSWER_KEYWORDS 전체를 훑으므로 요청 처리 중이 아니라 시작 시/오프라인에서만 호출합니다.
+    """
+    with connection() as conn:
+        return conn.execute("""
+            SELECT AK.keyword, COUNT(DISTINCT AK.answer_id) AS answer_count
+            FROM ANSWER_KEYWORDS AK
+            JOIN USER_ANSWERS UA ON UA.answer_id = AK.answer_id
+            WHERE UA.keyword_model_version IS NULL OR UA.keyword_model_version NOT LIKE 'lexicon-%'
+            GROUP BY AK.keyword
+            HAVING answer_count >= ?
+            ORDER BY answer_count DESC, keyword
+        """, (min_answer_count,)).fetchall()
+
+def match_recall_keywords(answer_id: int, recall_text: str) -> List[str]:
+    """원본 답변의 키워드 중 회상 답변에 포함된 키워드 목록을 가져옵니다. (MemoryChecker와 같은 포함 기준)"""
+    with connection() as conn:
+        return [row['keyword'] for row in conn.execute("""
+            SELECT keyword FROM ANSWER_KEYWORDS
+            WHERE answer_id = ? AND instr(lower(?), lower(keyword)) > 0
+            ORDER BY position
+        """, (answer_id, recall_text))]
+
+@_cached_read()
 def get_questions_to_revisit(user_id: int) -> List[sqlite3.Row]:
     """사용자에게 재방문할 질문 목록을 오래된 순으로 가져옵니다."""
-    conn = get_db_connection()
-    query = """
-        SELECT Q.question_id, Q.question_text
-        FROM QUESTIONS Q
-        JOIN USER_ANSWERS UA ON Q.question_id = UA.question_id
-        WHERE UA.user_id = ? AND UA.is_initial_answer = 1 AND Q.status = 'active'
-        ORDER BY Q.created_at ASC
-    """
-    questions = conn.execute(query, (user_id,)).fetchall()
-    conn.close()
-    return questions
+    with connection() as conn:
+        return conn.execute(_QUESTIONS_TO_REVISIT_QUERY, (user_id,)).fetchall()
 
 def get_all_users() -> List[sqlite3.Row]:
     """모든 사용자 목록 가져오기"""
-    conn = get_db_connection()
-    users = conn.execute("SELECT * FROM USERS ORDER BY created_at DESC").fetchall()
-    conn.close()
-    return users
+    with connection() as conn:
+        return conn.execute("SELECT * FROM USERS ORDER BY created_at DESC").fetchall()
+
+@_cached_read()
+def get_daily_activity(user_id: int, day: Optional[str] = None) -> Dict[str, int]:
+    """
+    특정 날짜의 활동 집계를 USER_DAILY_ACTIVITY 기본키 조회 한 번으로 가져옵니다.
+
+    Args:
+        user_id: 사용자 ID
+        day: 날짜 (YYYY-MM-DD, 생략 시 오늘)
+
+    Returns:
+        Dict[str, int]: {'new_answers', 'memory_checks_done', 'hints_used'}
+    """
+    day = day or datetime.date.today().strftime('%Y-%m-%d')
+    with connection() as conn:
+        row = conn.execute(_DAILY_ACTIVITY_QUERY, (user_id, day)).fetchone()
+    if row is None:
+        return {'new_answers': 0, 'memory_checks_done': 0, 'hints_used': 0}
+    return dict(row)
 
 def get_today_activity_count(user_id):
     """오늘의 활동 현황을 가져옵니다 (새로운 답변 수, 기억 점검 수)"""
-    conn = get_db_connection()
-    today_str = datetime.date.today().strftime('%Y-%m-%d')
-    
-    # 오늘 새로운 답변 수
-    new_answers_count = conn.execute("""
-        SELECT COUNT(*) FROM USER_ANSWERS
-        WHERE user_id = ? AND is_initial_answer = 1 AND answer_date = ?
-    """, (user_id, today_str)).fetchone()[0]
-    
-    # 오늘 완료된 기억 점검 수 (pass 또는 fail 결과가 있는 것)
-    memory_checks_count = conn.execute("""
-        SELECT COUNT(DISTINCT question_id) FROM MEMORY_CHECKS
-        WHERE user_id = ? AND check_date = ? AND check_result IN ('pass', 'fail')
-    """, (user_id, today_str)).fetchone()[0]
-    
-    conn.close()
-    return new_answers_count, memory_checks_count
+    activity = get_daily_activity(user_id)
+    return activity['new_answers'], activity['memory_checks_done']
+
+def rebuild_daily_activity(user_id: Optional[int] = None):
+    """
+    일일 활동 집계를 전체 기록으로부터 다시 계산합니다.
+    user_id를 지정하면 해당 사용자만, 생략하면 전체 사용자를 다시 계산합니다.
+    """
+    with transaction() as conn:
+        _rebuild_daily_activity(conn, user_id)
+        invalidate_read_cache(user_id)
+
+def get_cached_keywords(model_version: str, text_hashes: List[str], max_keywords: int) -> Dict[str, List[Dict]]:
+    """키워드 캐시에서 텍스트 해시별 키워드 구간을 조회합니다. 없는 해시는 결과에서 빠집니다."""
+    found = {}
+    with connection() as conn:
+        # SQLite 변수 개수 제한을 넘지 않도록 나눠서 조회
+        for start in range(0, len(text_hashes), 500):
+            chunk = text_hashes[start:start + 500]
+            rows = conn.execute(_CACHED_KEYWORDS_QUERY.format(placeholders=', '.join('?' * len(chunk))),
+                                (model_version, max_keywords, *chunk)).fetchall()
+            found.update((row['text_hash'], json.loads(row['spans'])) for row in rows)
+    return found
+
+def put_cached_keywords(model_version: str, max_keywords: int, spans_by_hash: Dict[str, List[Dict]]):
+    """키워드 추출 결과를 캐시에 저장합니다. (같은 키가 있으면 교체)"""
+    if not spans_by_hash:
+        return
+    with transaction() as conn:
+        conn.executemany("""
+            INSERT OR REPLACE INTO KEYWORD_CACHE (model_version, text_hash, max_keywords, spans)
+            VALUES (?, ?, ?, ?)
+        """, [(model_version, text_hash, max_keywords, json.dumps(spans, ensure_ascii=False))
+              for text_hash, spans in spans_by_hash.items()])
+
+def purge_keyword_cache(keep_model_version: Optional[str] = None, limit: Optional[int] = None) -> int:
+    """
+    keep_model_version이 아닌 (생략 시 모든) 모델 버전의 캐시를 삭제합니다. 삭제된 행 수 반환
+    limit을 주면 최대 limit행만 삭제합니다. (쓰기 잠금을 짧게 잡도록 나눠서 지울 때)
+    """
+    condition, params = "", []
+    if keep_model_version is not None:
+        condition, params = "WHERE model_version != ?", [keep_model_version]
+    with transaction() as conn:
+        if limit is None:
+            return conn.execute(f"DELETE FROM KEYWORD_CACHE {condition}", params).rowcount
+        return conn.execute(f"""
+            DELETE FROM KEYWORD_CACHE
+            WHERE (model_version, text_hash, max_keywords) IN (
+                SELECT model_version, text_hash, max_keywords FROM KEYWORD_CACHE {condition} LIMIT ?
+            )
+        """, params + [limit]).rowcount
+
+def count_cached_keywords(model_version: str) -> int:
+    """해당 모델 버전의 캐시 행 수"""
+    with connection() as conn:
+        return conn.execute("SELECT COUNT(*) FROM KEYWORD_CACHE WHERE model_version = ?",
+                            (model_version,)).fetchone()[0]
+
+# --- 키워드 추출 작업 큐 ---
+# 작업은 임대(lease) 방식으로 가져갑니다. 워커가 처리 중에 죽어도 임대가 만료되면 다른 워커가 다시 가져가고,
+# 실패한 작업은 지수적으로 늘어나는 지연 후 재시도하다가 최대 횟수를 넘으면 'failed'로 남습니다.
+
+def claim_keyword_jobs(worker_id: str, limit: int, lease_seconds: float) -> List[Dict]:
+    """
+    처리할 차례가 된 작업을 최대 limit개 가져와 이 워커에 임대합니다.
+
+    Returns:
+        (answer_id, answer_text, attempts) 행 목록. attempts는 이번 시도를 포함한 횟수
+    """
+    now = time.time()
+    with transaction() as conn:
+        claimed = conn.execute(_CLAIM_KEYWORD_JOBS_QUERY,
+                               (worker_id, now + lease_seconds, now, now, limit)).fetchall()
+        if not claimed:
+            return []
+        attempts = {row['answer_id']: row['attempts'] for row in claimed}
+        rows = conn.execute(f"""
+            SELECT answer_id, answer_text FROM USER_ANSWERS
+            WHERE answer_id IN ({', '.join('?' * len(attempts))})
+        """, list(attempts)).fetchall()
+        # 답변이 지워진 작업은 처리할 수 없으므로 삭제
+        orphaned = set(attempts) - {row['answer_id'] for row in rows}
+        if orphaned:
+            conn.executemany("DELETE FROM KEYWORD_JOBS WHERE answer_id = ?", [(i,) for i in orphaned])
+    return [{'answer_id': row['answer_id'], 'answer_text': row['answer_text'],
+             'attempts': attempts[row['answer_id']]} for row in rows]
+
+def complete_keyword_jobs(worker_id: str, keywords_by_answer: Dict[int, List[str]],
+                          model_version: Optional[str] = None) -> int:
+    """
+    추출한 키워드를 답변에 저장하고 작업을 삭제합니다. 한 트랜잭션으로 처리됩니다.
+    임대가 만료되어 다른 워커가 가져간 작업은 건너뜁니다. 저장한 작업 수 반환
+    """
+    with transaction() as conn:
+        owned = {answer_id: keywords for answer_id, keywords in keywords_by_answer.items()
+                 if conn.execute("DELETE FROM KEYWORD_JOBS WHERE answer_id = ? AND lease_owner = ?",
+                                 (answer_id, worker_id)).rowcount}
+        return set_answer_keywords_many(owned, model_version)
+
+def fail_keyword_jobs(worker_id: str, answer_ids: List[int], error: str, max_attempts: int,
+                      retry_base_seconds: float, retry_max_seconds: float) -> int:
+    """
+    실패한 작업을 지연 후 재시도하도록 되돌립니다. (지연: retry_base_seconds * 2^(시도 횟수-1), 최대 retry_max_seconds)
+    max_attempts번 시도한 작업은 'failed'로 남깁니다. 'failed'가 된 작업 수 반환
+    """
+    now = time.time()
+    given_up = 0
+    with transaction() as conn:
+        for answer_id in answer_ids:
+            row = conn.execute("SELECT attempts FROM KEYWORD_JOBS WHERE answer_id = ? AND lease_owner = ?",
+                               (answer_id, worker_id)).fetchone()
+            if row is None:
+                continue
+            if row['attempts'] >= max_attempts:
+                status, available_at = 'failed', now
+                given_up += 1
+            else:
+                status = 'pending'
+                available_at = now + min(retry_base_seconds * 2 ** (row['attempts'] - 1), retry_max_seconds)
+            conn.execute("""
+                UPDATE KEYWORD_JOBS
+                SET status = ?, available_at = ?, lease_owner = NULL, lease_expires_at = NULL,
+                    last_error = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE answer_id = ?
+            """, (status, available_at, error[:500], answer_id))
+    return given_up
+
+def enqueue_keyword_jobs(answer_ids: List[int]) -> int:
+    """답변들의 키워드 추출 작업을 등록합니다. (이미 있는 작업은 유지) 새로 등록한 작업 수 반환"""
+    now = time.time()
+    with transaction() as conn:
+        return conn.executemany("INSERT OR IGNORE INTO KEYWORD_JOBS (answer_id, available_at) VALUES (?, ?)",
+                                [(answer_id, now) for answer_id in answer_ids]).rowcount
+
+def retry_failed_keyword_jobs() -> int:
+    """'failed'로 남은 작업을 시도 횟수를 초기화해 다시 대기열에 넣습니다. (모델 교체 후 등) 작업 수 반환"""
+    with transaction() as conn:
+        return conn.execute("""
+            UPDATE KEYWORD_JOBS
+            SET status = 'pending', attempts = 0, available_at = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE status = 'failed'
+        """, (time.time(),)).rowcount
+
+def get_keyword_job_stats() -> Dict[str, int]:
+    """상태별 키워드 추출 작업 수 (pending, running, failed)"""
+    with connection() as conn:
+        counts = dict(conn.execute("SELECT status, COUNT(*) FROM KEYWORD_JOBS GROUP BY status").fetchall())
+    return {status: counts.get(status, 0) for status in ('pending', 'running', 'failed')}
 
 if __name__ == "__main__":
     # 이 파일을 직접 실행하면 데이터베이스 테이블을 생성/확인합니다.
-    create_tables()
\ No newline at end of file
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="memory_app 데이터베이스 관리")
+    parser.add_argument('--check-plans', action='store_true',
+                        help="주요 조회의 쿼리 플랜을 출력하고 전체 테이블 스캔이 있으면 실패")
+    parser.add_argument('--rebuild-activity', action='store_true',
+                        help="USER_DAILY_ACTIVITY 집계를 전체 기록으로부터 다시 계산")
+    parser.add_argument('--purge-keyword-cache', nargs='?', const='', metavar='KEEP_MODEL_VERSION',
+                        help="KEEP_MODEL_VERSION이 아닌 (생략 시 모든) 모델 버전의 키워드 캐시 삭제 "
+                             "(모든 프로세스가 새 모델로 교체된 뒤 실행)")
+    args = parser.parse_args()
+
+    create_tables()
+    print(f"현재 스키마 버전: v{get_schema_version()}")
+
+    if args.rebuild_activity:
+        rebuild_daily_activity()
+        print("✅ 일일 활동 집계를 다시 계산했습니다.")
+
+    if args.purge_keyword_cache is not None:
+        purged = purge_keyword_cache(keep_model_version=args.purge_keyword_cache or None)
+        print(f"🧹 키워드 캐시 {purged}건을 삭제했습니다.")
+
+    if args.check_plans:
+        for name, details in explain_hot_queries().items():
+            print(f"[{name}]")
+            for detail in details:
+                print(f"    {detail}")
+        full_scans = find_full_table_scans()
+        if full_scans:
+            print(f"❌ 전체 테이블 스캔 발생: {', '.join(full_scans)}")
+            sys.exit(1)
+        print("✅ 모든 주요 조회가 인덱스를 사용합니다.")
\ No newline at end of file
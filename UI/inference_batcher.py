@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+키워드 추출 마이크로 배칭(micro-batching) 큐
+여러 연결(앱 프로세스의 스레드)에서 들어온 키워드 추출 요청을 하나의 추론 스레드가 받아서,
+짧은 대기 시간(window) 안에 들어온 요청들을 한 번의 배치 forward pass로 처리합니다.
+키워드 추출 사이드카(keyword_sidecar.py)가 사용합니다. 프로세스 안의 추출은 KEYWORD_JOBS 워커가
+작업을 배치로 가져와 extract_keywords_batch()로 처리하므로 이 큐를 거치지 않습니다.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Dict, List, Optional
+
+try:
+    from utils.constants import (INFERENCE_BATCH_WINDOW_MS, INFERENCE_MAX_BATCH,
+                                 INFERENCE_QUEUE_SIZE, INFERENCE_TIMEOUT_SECONDS)
+except ImportError:
+    # 단독으로 사용되거나 경로 문제가 있을 경우를 대비한 기본값
+    INFERENCE_BATCH_WINDOW_MS = 10
+    INFERENCE_MAX_BATCH = 32
+    INFERENCE_QUEUE_SIZE = 1000
+    INFERENCE_TIMEOUT_SECONDS = 10.0
+
+
+class _Histogram:
+    """2의 거듭제곱 구간(0, 1, 2, 3-4, 5-8, ...)으로 값을 세는 간단한 히스토그램"""
+
+    def __init__(self):
+        self._counts: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: int):
+        upper = 0 if value <= 0 else 1
+        while upper < value:
+            upper *= 2
+        with self._lock:
+            self._counts[upper] = self._counts.get(upper, 0) + 1
+
+    def snapshot(self) -> Dict[str, int]:
+        """구간 이름 -> 횟수 (예: {'0': 3, '1': 10, '3-4': 2})"""
+        with self._lock:
+            counts = sorted(self._counts.items())
+        snapshot = {}
+        for upper, count in counts:
+            lower = upper // 2 + 1
+            snapshot[str(upper) if lower >= upper else f"{lower}-{upper}"] = count
+        return snapshot
+
+
+class _InferenceRequest:
+    """큐에 들어가는 추출 요청 하나"""
+
+    __slots__ = ('text', 'max_keywords', 'deadline', 'future')
+
+    def __init__(self, text: str, max_keywords: Optional[int], timeout: float):
+        self.text = text
+        self.max_keywords = max_keywords
+        self.deadline = time.monotonic() + timeout
+        self.future: Future = Future()
+
+
+class InferenceBatcher:
+    """여러 세션의 키워드 추출 요청을 모아 extract_keywords_batch()로 한 번에 처리하는 클래스"""
+
+    def __init__(self, extractor, window_ms: float = INFERENCE_BATCH_WINDOW_MS,
+                 max_batch: int = INFERENCE_MAX_BATCH, max_queue_size: int = INFERENCE_QUEUE_SIZE,
+                 spans: bool = False, raise_on_failure: bool = False):
+        """
+        Args:
+            extractor: extract_keywords_batch() / extract_keyword_spans_batch()를 가진 키워드 추출기
+            window_ms: 첫 요청이 도착한 뒤 다른 요청을 더 기다리는 최대 시간 (밀리초)
+            max_batch: 한 번의 forward pass에 넣는 최대 요청 수. 다 차면 window를 기다리지 않습니다.
+            max_queue_size: 대기 중인 요청 최대 개수. 가득 차면 submit()이 자리가 날 때까지 대기합니다.
+            spans: True면 Future가 키워드 리스트 대신 키워드 구간 리스트({'keyword', 'start', 'end'})로 완료됩니다.
+            raise_on_failure: True면 추론에 실패한 텍스트가 있을 때 빈 리스트 대신 배치의 Future들을 예외로 완료합니다.
+        """
+        self.extractor = extractor
+        self.spans = spans
+        self.raise_on_failure = raise_on_failure
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._queue: "queue.Queue[_InferenceRequest]" = queue.Queue(maxsize=max_queue_size)
+        self.queue_depth = _Histogram()  # 배치를 만들기 시작할 때 큐에 남아 있던 요청 수
+        self.batch_size = _Histogram()  # 실제 forward pass에 들어간 요청 수
+        self.stats = {'requests': 0, 'batches': 0, 'timeouts': 0, 'failed': 0}
+        self._thread = threading.Thread(target=self._run, name="inference-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, text: str, max_keywords: Optional[int] = None,
+               timeout: float = INFERENCE_TIMEOUT_SECONDS) -> Future:
+        """
+        추출 요청을 큐에 넣고 바로 반환합니다. Future는 키워드 리스트로 완료됩니다.
+        timeout 안에 배치에 들어가지 못한 요청은 TimeoutError로 완료되고,
+        timeout 동안 큐에 자리가 나지 않으면 TimeoutError(concurrent.futures)가 발생합니다.
+        """
+        request = _InferenceRequest(text, max_keywords, timeout)
+        try:
+            self._queue.put(request, timeout=timeout)
+        except queue.Full:
+            self.stats['timeouts'] += 1
+            raise FutureTimeoutError("키워드 추출 대기열이 가득 차 요청이 시간 초과되었습니다.")
+        return request.future
+
+    def extract(self, text: str, max_keywords: Optional[int] = None,
+                timeout: float = INFERENCE_TIMEOUT_SECONDS) -> List[str]:
+        """요청을 제출하고 결과를 기다립니다. 시간 초과 시 concurrent.futures.TimeoutError 발생"""
+        return self.submit(text, max_keywords, timeout).result(timeout=timeout)
+
+    def get_stats(self) -> Dict:
+        """처리 통계와 큐 깊이/배치 크기 히스토그램 (window 조정용)"""
+        return {
+            **self.stats,
+            'pending': self._queue.qsize(),
+            'window_ms': self.window * 1000,
+            'max_batch': self.max_batch,
+            'queue_depth_histogram': self.queue_depth.snapshot(),
+            'batch_size_histogram': self.batch_size.snapshot(),
+        }
+
+    def _collect_batch(self) -> List[_InferenceRequest]:
+        """첫 요청을 기다린 뒤, window 동안 (또는 max_batch개가 찰 때까지) 들어오는 요청을 모읍니다."""
+        batch = [self._queue.get()]
+        self.queue_depth.observe(self._queue.qsize())
+        closes_at = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            remaining = closes_at - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        """추론 스레드 메인 루프"""
+        while True:
+            batch = self._collect_batch()
+
+            # 기다리는 동안 시간이 초과된 요청은 추론하지 않고 바로 실패 처리
+            now = time.monotonic()
+            live = []
+            for request in batch:
+                if request.future.set_running_or_notify_cancel() is False:
+                    continue
+                if request.deadline < now:
+                    self.stats['timeouts'] += 1
+                    request.future.set_exception(FutureTimeoutError("키워드 추출 요청이 시간 초과되었습니다."))
+                else:
+                    live.append(request)
+            if not live:
+                continue
+
+            # extract_keywords_batch()는 max_keywords 하나만 받으므로 값별로 나눠서 실행
+            groups: Dict[Optional[int], List[_InferenceRequest]] = {}
+            for request in live:
+                groups.setdefault(request.max_keywords, []).append(request)
+            for max_keywords, requests in groups.items():
+                self._infer(requests, max_keywords)
+
+    def _infer(self, requests: List[_InferenceRequest], max_keywords: Optional[int]):
+        """요청들을 한 번의 배치 추론으로 처리하고 각 Future를 완료합니다."""
+        extract = self.extractor.extract_keyword_spans_batch if self.spans else self.extractor.extract_keywords_batch
+        try:
+            results = extract(
+                [request.text for request in requests],
+                batch_size=len(requests),
+                max_keywords=max_keywords,
+                raise_on_failure=self.raise_on_failure
+            )
+        except Exception as e:
+            print(f"❌ 배치 키워드 추출 실패: {e}")
+            self.stats['failed'] += len(requests)
+            for request in requests:
+                request.future.set_exception(e)
+            return
+
+        self.batch_size.observe(len(requests))
+        self.stats['batches'] += 1
+        self.stats['requests'] += len(requests)
+        for request, keywords in zip(requests, results):
+            request.future.set_result(keywords)
+
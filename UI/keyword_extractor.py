@@ -6,20 +6,54 @@ KLUE-BERT 기반 키워드 추출기
 
 import torch
 import torch.nn as nn
-from transformers import AutoTokenizer, AutoModel
+from transformers import AutoTokenizer, AutoModel, AutoConfig
+from safetensors import safe_open
 import json
 import glob
+import hashlib
+import time
+import numpy as np
 import os
-from typing import List, Optional, Dict, Tuple
+import sqlite3
+import threading
+from typing import List, Optional, Dict, Sequence, Tuple
 import streamlit as st
-from utils.constants import MAX_KEYWORDS_PER_ANSWER
+from utils.constants import (MAX_KEYWORDS_PER_ANSWER, KEYWORD_BATCH_SIZE, KEYWORD_MAX_LENGTH, KEYWORD_BACKEND,
+                             KEYWORD_SLIDING_WINDOW, KEYWORD_WINDOW_STRIDE, KEYWORD_CACHE_ENABLED)
+from utils.keyword_cache import KeywordCache
+from utils.bio_decoder import decode_char_spans, pad_rows
+from model_registry import ModelRegistry
+
+try:
+    from utils.constants import MODEL_REGISTRY_POLL_SECONDS, KEYWORD_LEXICON_MODE
+except ImportError:
+    # 단독으로 사용되거나 경로 문제가 있을 경우를 대비한 기본값
+    MODEL_REGISTRY_POLL_SECONDS = 5.0
+    KEYWORD_LEXICON_MODE = 'fallback'
+
+try:
+    from transformers.modeling_utils import no_init_weights
+except ImportError:
+    # 구버전 transformers: 무작위 초기화를 생략하지 못할 뿐 결과는 같습니다.
+    from contextlib import nullcontext as no_init_weights
+
+BASE_MODEL = "klue/bert-base"
 
 class KeywordBERTModel(nn.Module):
-    """KLUE-BERT 기반 키워드 추출 모델"""
+    """KLUE-BERT 기반 키워드 추출 모델 (추론 전용: 가중치는 훈련된 state_dict로 채웁니다)"""
     
-    def __init__(self, num_labels=3, dropout_rate=0.1):
+    def __init__(self, num_labels=3, dropout_rate=0.1, num_hidden_layers: Optional[int] = None, config=None):
         super().__init__()
-        self.bert = AutoModel.from_pretrained("klue/bert-base")
+        # 사전학습 가중치는 어차피 훈련된 가중치로 덮어쓰므로 내려받지 않고 설정(config)으로 구조만 만듭니다.
+        # config가 없으면 허브(또는 HF 캐시)에서 klue/bert-base의 config.json만 가져옵니다.
+        if config is None:
+            config = AutoConfig.from_pretrained(BASE_MODEL)
+        # 증류된 학생 모델은 training_config.json의 num_hidden_layers만큼의 층만 가집니다.
+        if num_hidden_layers:
+            config.num_hidden_layers = num_hidden_layers
+        with no_init_weights():
+            self.bert = AutoModel.from_config(config)
+        self.num_labels = num_labels
         self.dropout = nn.Dropout(dropout_rate)
         self.classifier = nn.Linear(self.bert.config.hidden_size, num_labels)
         
@@ -49,23 +83,72 @@ class KeywordBERTModel(nn.Module):
 class KeywordExtractor:
     """키워드 추출기 클래스 (비상 플랜 로직 제거)"""
     
-    def __init__(self, model_path: Optional[str] = None):
+    # 백엔드 이름 -> ONNX 그래프 파일 이름 (model/export_onnx.py가 만드는 *_onnx 디렉토리 안)
+    ONNX_FILES = {"onnx": "model.onnx", "onnx-int8": "model.int8.onnx"}
+    # 번들 디렉토리 (model/export_assets.py 또는 훈련 스크립트의 save_model이 만듦) 안의 파일 이름
+    BUNDLE_CONFIG = "config.json"
+    BUNDLE_WEIGHTS = "model.safetensors"
+
+    def __init__(self, model_path: Optional[str] = None, backend: str = KEYWORD_BACKEND):
         """
         Args:
             model_path: 모델 경로. None이면 최신 모델 자동 검색
+            backend: 'torch' (state_dict), 'onnx' (ONNX Runtime fp32), 'onnx-int8' (ONNX Runtime int8)
         """
+        if backend != "torch" and backend not in self.ONNX_FILES:
+            raise ValueError(f"지원하지 않는 백엔드입니다: {backend}")
+        self.backend = backend
         self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
         self.model = None
+        self.session = None  # ONNX Runtime 세션 (onnx 백엔드)
         self.tokenizer = None
         self.label2id = {"O": 0, "B-KEY": 1, "I-KEY": 2}
         self.id2label = {v: k for k, v in self.label2id.items()}
         self.max_keywords = MAX_KEYWORDS_PER_ANSWER
+        # 긴 답변을 겹치는 창(window)으로 나눠 처리할 때의 통계
+        self.window_stats = {'answers': 0, 'windowed_answers': 0, 'windows': 0, 'max_windows': 0,
+                             'extra_window_seconds': 0.0}
+        # 단계별 누적 시간 (토크나이징+패딩 / 모델 forward / BIO 디코딩), 벤치마크에서 호출 전후 차이로 사용
+        self.stage_seconds = {'tokenize': 0.0, 'forward': 0.0, 'decode': 0.0}
+        # 추출기 하나를 여러 스레드(작업 워커, 사이드카)가 함께 쓰므로 누적 통계는 잠금 안에서 갱신하고,
+        # 호출별 창 보고서는 호출한 스레드에만 남깁니다.
+        self._stats_lock = threading.Lock()
+        self._thread_local = threading.local()
+        self.model_version = None  # 가중치 파일 + 추론 설정 해시 (캐시 키)
+        self.cache: Optional[KeywordCache] = None
+        self.registry_version: Optional[str] = None  # 모델 레지스트리에서 로드한 경우 그 버전 이름
         
         # 모델 로드 (실패 시 예외 발생)
         self.load_model(model_path)
     
+    @property
+    def last_window_report(self) -> List[Dict]:
+        """이 스레드의 마지막 호출에서 창이 2개 이상이었던 답변별 비용 ({'index', 'windows', 'extra_latency_ms'})"""
+        return getattr(self._thread_local, 'window_report', [])
+
     def find_latest_model(self) -> str:
-        """가장 최근에 훈련된 모델 찾기. 없으면 FileNotFoundError 발생"""
+        """
+        서비스할 모델 찾기. 모델 레지스트리의 활성 버전이 있으면 그 버전을 쓰고,
+        없으면 현재 디렉토리에서 가장 최근에 훈련된 모델을 찾습니다. 둘 다 없으면 FileNotFoundError 발생
+        """
+        registry_path = self._active_registry_path()
+        if registry_path:
+            return registry_path
+        print("⚠️ 모델 레지스트리에 활성 버전이 없어 현재 디렉토리에서 최신 모델을 찾습니다.")
+
+        if self.backend in self.ONNX_FILES:
+            # export_onnx.py가 만든 *_onnx 폴더 중 가장 최신
+            onnx_dirs = [d for d in glob.glob("*_onnx")
+                         if os.path.exists(os.path.join(d, self.ONNX_FILES[self.backend]))]
+            if not onnx_dirs:
+                raise FileNotFoundError("ONNX 모델 디렉토리를 찾을 수 없습니다. model/export_onnx.py로 먼저 변환하세요.")
+            return max(onnx_dirs, key=os.path.getctime)
+
+        # config.json + model.safetensors가 있는 번들 디렉토리를 우선 사용 (오프라인, 빠른 시작)
+        bundle_dirs = [d for d in glob.glob("*_bundle") + glob.glob("klue_keyword_extractor_*") if self._is_bundle(d)]
+        if bundle_dirs:
+            return max(bundle_dirs, key=os.path.getctime)
+
         # klue_keyword_extractor_* 폴더들 찾기
         model_dirs = glob.glob("klue_keyword_extractor_*")
         
@@ -83,7 +166,10 @@ class KeywordExtractor:
         return latest_dir
    
     def load_model(self, model_path: Optional[str] = None):
-        """state_dict(.pt)를 로드하여 모델을 조립합니다."""
+        """
+        모델을 조립합니다. 번들 디렉토리면 config.json + model.safetensors로, 아니면 state_dict(.pt)로
+        조립하고, onnx 백엔드면 ONNX Runtime 세션을 만듭니다.
+        """
         try:
             if model_path is None:
                 model_path = self.find_latest_model()
@@ -91,112 +177,420 @@ class KeywordExtractor:
             if not os.path.exists(model_path):
                 raise FileNotFoundError(f"모델 파일을 찾을 수 없습니다: {model_path}")
 
-            # --- 여기가 핵심 수정 부분입니다 ---
-            # 1. 먼저 모델의 빈 설계도를 준비합니다.
-            self.model = KeywordBERTModel(num_labels=len(self.label2id))
-            
-            # 2. .pt 파일에서 '부품 상자(state_dict)'를 불러옵니다.
-            state_dict = torch.load(model_path, map_location=self.device)
-            
-            # 3. 빈 설계도에 불러온 부품들을 조립합니다.
-            self.model.load_state_dict(state_dict)
-            
-            # 4. 이제 완전한 모델을 평가 모드로 전환하고, 장치로 보냅니다.
+            if self.backend in self.ONNX_FILES:
+                self._load_onnx_session(model_path)
+                self._init_cache(model_path)
+                print(f"✅ ONNX 모델 로드 완료 ({self.backend}): {model_path}")
+                return
+
+            if self._is_bundle(model_path):
+                self._load_bundle(model_path)
+            else:
+                self._load_state_dict_file(model_path)
+
+            # 이제 완전한 모델을 평가 모드로 전환하고, 장치로 보냅니다.
             self.model.to(self.device)
             self.model.eval()
-            # ------------------------------------
-            
-            # 토크나이저는 KLUE-BERT 기본 토크나이저 사용
-            self.tokenizer = AutoTokenizer.from_pretrained("klue/bert-base")
-            
+
+            self._init_cache(model_path)
             print(f"✅ 모델 로드 및 조립 완료: {model_path}")
                 
         except Exception as e:
             print(f"❌ 모델 로드 중 심각한 오류 발생: {e}")
             self.model = None
+            self.session = None
             raise
 
+    def _active_registry_path(self) -> Optional[str]:
+        """
+        레지스트리 활성 버전의 디렉토리 (활성 버전이 없으면 None).
+        onnx 백엔드인데 활성 버전에 ONNX 그래프가 없으면, 현재 디렉토리의 다른 모델로 넘어가지 않고
+        FileNotFoundError를 냅니다.
+        """
+        registry = ModelRegistry()
+        version = registry.active_version()
+        if version is None:
+            return None
+        path = registry.version_path(version)
+        if self.backend in self.ONNX_FILES and not os.path.exists(os.path.join(path, self.ONNX_FILES[self.backend])):
+            raise FileNotFoundError(
+                f"레지스트리 활성 버전 {version}에 {self.ONNX_FILES[self.backend]}이(가) 없습니다. "
+                f"model/export_onnx.py --model <모델 디렉토리> --publish로 ONNX 그래프를 포함한 버전을 등록하세요.")
+        # 시작 시간을 늘리지 않도록 크기만 확인 (체크섬 전체 검사는 백그라운드 교체 시 수행)
+        try:
+            registry.verify(version, full=False)
+        except ValueError as e:
+            print(f"❌ 레지스트리 활성 버전이 손상되었습니다: {e}")
+            return None
+        self.registry_version = version
+        return path
+
+    @classmethod
+    def _is_bundle(cls, model_path: str) -> bool:
+        """구조 설정(config.json)과 safetensors 가중치가 함께 있는 번들 디렉토리인지 확인"""
+        return (os.path.isdir(model_path)
+                and os.path.exists(os.path.join(model_path, cls.BUNDLE_CONFIG))
+                and os.path.exists(os.path.join(model_path, cls.BUNDLE_WEIGHTS)))
+
+    def _load_bundle(self, model_dir: str):
+        """
+        번들 디렉토리에서 네트워크 없이 모델을 조립합니다.
+        config.json으로 구조만 만들고, 메모리 맵된 model.safetensors에서 텐서를 하나씩 읽어
+        모델 파라미터에 바로 복사하므로 가중치는 한 번만 읽고 전체 사본을 따로 만들지 않습니다.
+        """
+        config = AutoConfig.from_pretrained(model_dir)
+        self.model = KeywordBERTModel(num_labels=len(self.label2id), config=config)
+
+        params = self.model.state_dict()
+        with safe_open(os.path.join(model_dir, self.BUNDLE_WEIGHTS), framework="pt", device="cpu") as f:
+            keys = set(f.keys())
+            # position_ids 버퍼는 transformers 버전에 따라 state_dict에 없을 수 있어 비교에서 제외
+            missing = {k for k in set(params) - keys if not k.endswith("position_ids")}
+            unexpected = {k for k in keys - set(params) if not k.endswith("position_ids")}
+            if missing or unexpected:
+                raise ValueError(f"번들 가중치가 모델 구조와 맞지 않습니다. "
+                                 f"누락: {sorted(missing)[:5]}, 불필요: {sorted(unexpected)[:5]}")
+            with torch.no_grad():
+                for key in keys & set(params):
+                    params[key].copy_(f.get_tensor(key))
+
+        # 번들에 함께 저장한 토크나이저 사용
+        self.tokenizer = self._load_tokenizer(model_dir)
+
+    def _load_state_dict_file(self, model_path: str):
+        """
+        번들이 없는 이전 형식(.pt 파일 또는 pytorch_model.bin 디렉토리)을 조립합니다.
+        구조 설정과 토크나이저는 허브(또는 HF 캐시)의 klue/bert-base를 사용합니다.
+        """
+        print("⚠️ 번들(config.json + model.safetensors)이 아니어서 허브 설정으로 조립합니다. "
+              "model/export_assets.py로 변환하면 오프라인에서 더 빨리 시작합니다.")
+        # klue_keyword_extractor_* 폴더는 그 안의 가중치 파일과 설정(층 수)을 사용
+        num_hidden_layers = None
+        if os.path.isdir(model_path):
+            config_path = os.path.join(model_path, "training_config.json")
+            if os.path.exists(config_path):
+                with open(config_path, 'r', encoding='utf-8') as f:
+                    num_hidden_layers = json.load(f).get("num_hidden_layers")
+            model_path = os.path.join(model_path, "pytorch_model.bin")
+
+        # 1. 먼저 모델의 빈 설계도를 준비합니다.
+        self.model = KeywordBERTModel(num_labels=len(self.label2id), num_hidden_layers=num_hidden_layers)
+        # 2. .pt 파일에서 '부품 상자(state_dict)'를 불러와 조립합니다.
+        self.model.load_state_dict(torch.load(model_path, map_location='cpu'))
+        # 토크나이저는 KLUE-BERT 기본 토크나이저 사용
+        self.tokenizer = self._load_tokenizer(BASE_MODEL)
+
+    def _load_onnx_session(self, model_path: str):
+        """ONNX 그래프(디렉토리 또는 .onnx 파일)로 ONNX Runtime 세션을 만듭니다."""
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise ImportError("onnx 백엔드를 사용하려면 onnxruntime 패키지가 필요합니다.") from e
+
+        model_dir = model_path
+        if os.path.isdir(model_path):
+            model_path = os.path.join(model_path, self.ONNX_FILES[self.backend])
+        else:
+            model_dir = os.path.dirname(model_path)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(model_path, options, providers=['CPUExecutionProvider'])
+
+        # 변환 시 함께 저장한 토크나이저가 있으면 사용
+        if os.path.exists(os.path.join(model_dir, "tokenizer_config.json")):
+            self.tokenizer = self._load_tokenizer(model_dir)
+        else:
+            self.tokenizer = self._load_tokenizer(BASE_MODEL)
+
+    def _init_cache(self, model_path: str):
+        """
+        로드한 모델의 버전 해시를 계산하고 키워드 캐시를 준비합니다.
+        버전은 가중치 파일 식별값과 결과에 영향을 주는 추론 설정으로 만들므로, 새 모델이 로드되면
+        이전 모델의 캐시 항목은 조회되지 않습니다. (이전 버전의 DB 캐시는 레지스트리 감시 스레드가 정리)
+        가중치 파일을 다시 읽지 않도록 레지스트리 manifest에 기록된 SHA-256을 쓰고,
+        레지스트리 밖의 모델이면 (파일 크기, 수정 시각, 구조 설정)을 씁니다.
+        """
+        model_dir = model_path if os.path.isdir(model_path) else None
+        if model_dir:
+            if self.backend in self.ONNX_FILES:
+                weights_file = self.ONNX_FILES[self.backend]
+            elif self._is_bundle(model_path):
+                weights_file = self.BUNDLE_WEIGHTS
+            else:
+                weights_file = "pytorch_model.bin"
+            model_path = os.path.join(model_path, weights_file)
+
+        digest = hashlib.sha256()
+        recorded_sha256 = ModelRegistry().recorded_sha256(model_path)
+        if recorded_sha256:
+            digest.update(f"sha256:{recorded_sha256}".encode())
+        else:
+            stat = os.stat(model_path)
+            digest.update(f"{os.path.abspath(model_path)}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+            for config_file in (self.BUNDLE_CONFIG, "training_config.json"):
+                config_path = os.path.join(model_dir, config_file) if model_dir else None
+                if config_path and os.path.exists(config_path):
+                    with open(config_path, 'rb') as f:
+                        digest.update(f.read())
+        digest.update(f"{self.backend}:{KEYWORD_MAX_LENGTH}:{KEYWORD_SLIDING_WINDOW}:{KEYWORD_WINDOW_STRIDE}".encode())
+        self.model_version = digest.hexdigest()[:16]
+        self.cache = KeywordCache(self.model_version) if KEYWORD_CACHE_ENABLED else None
+
+    def get_cache_stats(self) -> Dict:
+        """키워드 캐시 적중률/메모리 사용량 (캐시를 끄면 빈 통계)"""
+        return self.cache.get_stats() if self.cache else {}
+
+    @staticmethod
+    def _load_tokenizer(name_or_path: str):
+        """offset_mapping(토큰별 원문 문자 위치)을 지원하는 fast 토크나이저를 로드합니다."""
+        tokenizer = AutoTokenizer.from_pretrained(name_or_path, use_fast=True)
+        if not tokenizer.is_fast:
+            raise ValueError(f"fast 토크나이저를 로드할 수 없습니다: {name_or_path}")
+        return tokenizer
+
+    def _predict_labels(self, input_ids: torch.Tensor, attention_mask: torch.Tensor):
+        """선택된 백엔드로 배치의 토큰별 라벨 ID를 예측합니다. (batch, sequence)"""
+        if self.session is not None:
+            logits = self.session.run(['logits'], {
+                'input_ids': input_ids.numpy().astype(np.int64),
+                'attention_mask': attention_mask.numpy().astype(np.int64),
+            })[0]
+            return torch.from_numpy(logits.argmax(-1))
+
+        with torch.no_grad():
+            outputs = self.model(input_ids=input_ids.to(self.device), attention_mask=attention_mask.to(self.device))
+            return torch.argmax(outputs['logits'], dim=-1).cpu()
+
     def extract_keywords(self, text: str, max_keywords: Optional[int] = None) -> List[str]:
         """텍스트에서 키워드 추출 (모델 전용)"""
+        return self.extract_keywords_batch([text], max_keywords=max_keywords)[0]
+
+    def extract_keywords_batch(self, texts: List[str], batch_size: int = KEYWORD_BATCH_SIZE,
+                               max_keywords: Optional[int] = None, raise_on_failure: bool = False) -> List[List[str]]:
+        """
+        여러 텍스트에서 키워드를 한 번에 추출합니다. 결과는 입력 순서와 같습니다.
+        raise_on_failure=True면 추론에 실패한 텍스트를 빈 리스트로 돌려주지 않고 RuntimeError를 발생시킵니다.
+        """
+        return [[span['keyword'] for span in spans]
+                for spans in self.extract_keyword_spans_batch(texts, batch_size, max_keywords,
+                                                              raise_on_failure=raise_on_failure)]
+
+    def extract_keyword_spans(self, text: str, max_keywords: Optional[int] = None) -> List[Dict]:
+        """
+        텍스트에서 키워드와 원문 위치를 추출합니다.
+
+        Returns:
+            [{'keyword': 원문 그대로의 키워드, 'start': 시작 문자 위치, 'end': 끝 문자 위치(미포함)}, ...]
+        """
+        return self.extract_keyword_spans_batch([text], max_keywords=max_keywords)[0]
+
+    def extract_keyword_spans_batch(self, texts: List[str], batch_size: int = KEYWORD_BATCH_SIZE,
+                                    max_keywords: Optional[int] = None,
+                                    sliding_window: bool = KEYWORD_SLIDING_WINDOW,
+                                    stride: int = KEYWORD_WINDOW_STRIDE,
+                                    raise_on_failure: bool = False) -> List[List[Dict]]:
+        """
+        여러 텍스트의 키워드 구간을 한 번에 추출합니다. 결과는 입력 순서와 같습니다.
+        기본 추론 설정이면 키워드 캐시(메모리 LRU → SQLite)를 먼저 확인하고, 없는 텍스트만 모델로 추출합니다.
+
+        Args:
+            sliding_window: True면 최대 길이를 넘는 답변을 stride 토큰씩 겹치는 창들로 나눠 모두 예측하고,
+                False면 최대 길이에서 잘라 뒷부분을 무시합니다.
+            stride: 이웃한 창끼리 겹치는 토큰 수
+            raise_on_failure: True면 추론에 실패한 텍스트가 있을 때 RuntimeError 발생 (기본은 빈 리스트)
+        """
+        max_keywords = max_keywords or self.max_keywords
+        use_cache = (self.cache is not None and sliding_window == KEYWORD_SLIDING_WINDOW
+                     and stride == KEYWORD_WINDOW_STRIDE)
+        if not use_cache:
+            extracted, self._thread_local.window_report = self._extract_spans_uncached(
+                texts, batch_size, max_keywords, sliding_window, stride)
+            if raise_on_failure and any(spans is None for spans in extracted):
+                raise RuntimeError(f"키워드 추출 실패: {sum(spans is None for spans in extracted)}개 텍스트")
+            return [spans or [] for spans in extracted]
+
+        results: List[List[Dict]] = [[] for _ in texts]
+        indices = [i for i, text in enumerate(texts) if text and text.strip()]
+        cached = self.cache.get_many([texts[i] for i in indices], max_keywords)
+        for position, spans in cached.items():
+            results[indices[position]] = spans
+
+        misses = [i for position, i in enumerate(indices) if position not in cached]
+        window_report = []
+        if misses:
+            extracted, window_report = self._extract_spans_uncached([texts[i] for i in misses], batch_size,
+                                                                    max_keywords, sliding_window, stride)
+            for report in window_report:
+                report['index'] = misses[report['index']]
+            # 추론에 실패한 텍스트(None)는 캐시하지 않습니다.
+            succeeded = [(i, spans) for i, spans in zip(misses, extracted) if spans is not None]
+            self.cache.put_many([texts[i] for i, _ in succeeded], [spans for _, spans in succeeded], max_keywords)
+            if raise_on_failure and len(succeeded) < len(misses):
+                raise RuntimeError(f"키워드 추출 실패: {len(misses) - len(succeeded)}개 텍스트")
+            for i, spans in succeeded:
+                results[i] = spans
+        self._thread_local.window_report = window_report
+        return results
+
+    def _extract_spans_uncached(self, texts: List[str], batch_size: int, max_keywords: int,
+                                sliding_window: bool, stride: int) -> Tuple[List[Optional[List[Dict]]], List[Dict]]:
+        """
+        캐시 없이 모델로 키워드 구간을 추출합니다. 결과는 입력 순서와 같습니다.
+        fast 토크나이저를 한 번만 호출해 토큰 ID와 원문 문자 위치(offset_mapping)를 함께 얻고,
+        토큰 길이순으로 정렬해 비슷한 길이끼리 배치를 만든 뒤 각 배치의 가장 긴 문장까지만 패딩하여
+        배치당 한 번의 forward pass로 예측합니다. 키워드는 원문 문자열에서 그대로 잘라냅니다.
+
+        Returns:
+            (텍스트별 키워드 구간, 이 호출의 창 보고서). 보고서의 index는 texts 안의 위치
+        """
         # 초기화 시점에 모델 로드가 보장되므로, 모델 존재 여부만 확인
-        if self.model is None or self.tokenizer is None:
+        if (self.model is None and self.session is None) or self.tokenizer is None:
             st.error("키워드 추출 모델이 정상적으로 로드되지 않았습니다.")
-            return []
+            return [None for _ in texts], []
 
-        if not text or not text.strip():
-            return []
-        
+        # 빈 텍스트는 [], 추론에 실패한 텍스트는 None으로 남습니다.
+        results: List[Optional[List[Dict]]] = [[] for _ in texts]
+        window_report: List[Dict] = []
+        indices = [i for i, text in enumerate(texts) if text and text.strip()]
+        if not indices:
+            return results, window_report
+        for i in indices:
+            results[i] = None
+
+        tokenize_start = time.perf_counter()
         try:
-            # 토크나이징
-            encoding = self.tokenizer(
-                text,
-                return_tensors='pt',
+            # 패딩 없이 한 번만 토크나이징 ([CLS] ... [SEP], 최대 길이 단위로 자르거나 창으로 나눔)
+            encodings = self.tokenizer(
+                [texts[i] for i in indices],
                 truncation=True,
-                padding=True,
-                max_length=128
-            )
-            
-            # GPU로 이동
-            input_ids = encoding['input_ids'].to(self.device)
-            attention_mask = encoding['attention_mask'].to(self.device)
-            
-            # 예측
-            with torch.no_grad():
-                outputs = self.model(input_ids=input_ids, attention_mask=attention_mask)
-                predictions = torch.argmax(outputs['logits'], dim=-1)
-            
-            # 토큰 가져오기
-            tokens = self.tokenizer.tokenize(text)
-            
-            # 키워드 추출
-            keywords = self._extract_keywords_from_predictions(
-                tokens, 
-                predictions[0][1:len(tokens)+1],  # 특수 토큰 제외
-                max_keywords or self.max_keywords
+                max_length=KEYWORD_MAX_LENGTH,
+                return_offsets_mapping=True,
+                return_overflowing_tokens=sliding_window,
+                stride=stride if sliding_window else 0
             )
-            
-            return keywords
-            
         except Exception as e:
-            # 추론 과정에서 오류 발생 시, 사용자에게 알리고 빈 리스트 반환
-            st.warning(f"⚠️ 모델 추론 중 오류 발생: {e}")
-            return []
-    
-    def _extract_keywords_from_predictions(self, tokens: List[str], predictions: torch.Tensor, 
-                                            max_keywords: int) -> List[str]:
-        """예측 결과에서 키워드 추출"""
-        keywords_found = []
-        current_keyword = ""
-        
-        for token, pred_id in zip(tokens, predictions):
-            # 이미 최대 개수만큼 키워드를 찾았으면 중단
-            if len(keywords_found) >= max_keywords:
-                break
-            
-            label = self.id2label[pred_id.item()]
-            clean_token = token.replace('##', '')
-            
-            if label == 'B-KEY':
-                if current_keyword:  # 이전 키워드 완료
-                    keywords_found.append(current_keyword)
-                    if len(keywords_found) >= max_keywords:
-                        break
-                current_keyword = clean_token
-                
-            elif label == 'I-KEY' and current_keyword:
-                current_keyword += clean_token
-                
-            else:
-                if current_keyword:  # 키워드 완료
-                    keywords_found.append(current_keyword)
-                    current_keyword = ""
-        
-        # 마지막 키워드 처리
-        if current_keyword and len(keywords_found) < max_keywords:
-            keywords_found.append(current_keyword)
-        
-        return keywords_found
-    
+            st.warning(f"⚠️ 토크나이징 중 오류 발생: {e}")
+            return results, window_report
+        input_ids = encodings['input_ids']
+        offsets = encodings['offset_mapping']
+        self._add_stage_seconds(tokenize=time.perf_counter() - tokenize_start)
+
+        # 답변(k)별 창(row) 목록. 창으로 나누지 않으면 답변마다 창이 하나입니다.
+        sample_of_row = encodings.get('overflow_to_sample_mapping', list(range(len(indices))))
+        windows_of: List[List[int]] = [[] for _ in indices]
+        for row, k in enumerate(sample_of_row):
+            windows_of[k].append(row)
+
+        # 토큰 수순으로 정렬한 뒤, 한 답변의 창들이 같은 배치에 들어가도록 답변 단위로 배치를 채웁니다.
+        order = sorted(range(len(indices)), key=lambda k: sum(len(input_ids[row]) for row in windows_of[k]))
+        buckets, bucket, bucket_rows = [], [], 0
+        for k in order:
+            if bucket and bucket_rows + len(windows_of[k]) > batch_size:
+                buckets.append(bucket)
+                bucket, bucket_rows = [], 0
+            bucket.append(k)
+            bucket_rows += len(windows_of[k])
+        if bucket:
+            buckets.append(bucket)
+
+        for bucket in buckets:
+            rows = [row for k in bucket for row in windows_of[k]]
+            try:
+                pad_start = time.perf_counter()
+                batch = self.tokenizer.pad(
+                    {'input_ids': [input_ids[row] for row in rows]},
+                    padding='longest',
+                    return_tensors='pt'
+                )
+                batch_start = time.perf_counter()
+                predictions = self._predict_labels(batch['input_ids'], batch['attention_mask'])
+                decode_start = time.perf_counter()
+                batch_seconds = decode_start - batch_start
+                prediction_of = {row: predictions[position].numpy() for position, row in enumerate(rows)}
+
+                # 답변별로 창을 합친 뒤, 배치 전체를 [답변, 토큰] 배열로 채워 한 번에 디코딩합니다.
+                merged = [self._merge_windows([offsets[row] for row in windows_of[k]],
+                                              [prediction_of[row][:len(offsets[row])] for row in windows_of[k]])
+                          for k in bucket]
+                merged_predictions, merged_offsets = pad_rows([p for _, p in merged], [o for o, _ in merged])
+                char_spans = decode_char_spans(merged_predictions, merged_offsets, max_keywords=max_keywords)
+
+                for k, spans in zip(bucket, char_spans):
+                    text = texts[indices[k]]
+                    results[indices[k]] = [{'keyword': text[start:end], 'start': start, 'end': end}
+                                           for start, end in spans]
+                    window_count = len(windows_of[k])
+                    self._record_windows(window_report, indices[k], window_count,
+                                         batch_seconds * window_count / len(rows))
+                self._add_stage_seconds(tokenize=batch_start - pad_start, forward=batch_seconds,
+                                        decode=time.perf_counter() - decode_start)
+            except Exception as e:
+                # 추론 과정에서 오류 발생 시, 사용자에게 알리고 해당 배치는 빈 리스트로 둡니다.
+                st.warning(f"⚠️ 모델 추론 중 오류 발생: {e}")
+
+        return results, window_report
+
+    @staticmethod
+    def _merge_windows(window_offsets: List[List[Tuple[int, int]]],
+                       window_predictions: List[np.ndarray]) -> Tuple[List[Tuple[int, int]], Sequence[int]]:
+        """
+        겹치는 창들의 토큰별 예측을 원문 위치 기준 하나의 시퀀스로 합칩니다.
+        같은 토큰이 여러 창에 있으면 창 가장자리에서 더 먼(앞뒤 문맥이 더 많은) 창의 예측을 사용하므로,
+        겹친 구간의 키워드가 중복되지 않습니다. 특수 토큰은 제외됩니다.
+        """
+        if len(window_offsets) == 1:
+            return window_offsets[0], window_predictions[0]
+
+        best: Dict[Tuple[int, int], Tuple[int, int]] = {}  # (시작, 끝) -> (문맥 길이, 예측)
+        for offsets, predictions in zip(window_offsets, window_predictions):
+            last = len(offsets) - 1
+            for position, (offset, pred_id) in enumerate(zip(offsets, predictions.tolist())):
+                offset = tuple(offset)
+                if offset[1] <= offset[0]:
+                    continue
+                context = min(position, last - position)
+                if offset not in best or context > best[offset][0]:
+                    best[offset] = (context, pred_id)
+
+        merged_offsets = sorted(best)
+        return merged_offsets, [best[offset][1] for offset in merged_offsets]
+
+    def _record_windows(self, window_report: List[Dict], text_index: int, windows: int, seconds: float):
+        """
+        답변 하나의 창 개수와, 창이 하나였을 때보다 더 든 추론 시간(추정)을 누적 통계에 더하고,
+        창이 2개 이상이면 호출별 보고서(window_report)에 추가합니다.
+        """
+        extra_seconds = seconds * (windows - 1) / windows
+        with self._stats_lock:
+            self.window_stats['answers'] += 1
+            self.window_stats['windows'] += windows
+            self.window_stats['max_windows'] = max(self.window_stats['max_windows'], windows)
+            if windows > 1:
+                self.window_stats['windowed_answers'] += 1
+                self.window_stats['extra_window_seconds'] += extra_seconds
+        if windows > 1:
+            window_report.append({'index': text_index, 'windows': windows,
+                                  'extra_latency_ms': round(extra_seconds * 1000, 2)})
+
+    def _add_stage_seconds(self, **seconds: float):
+        """단계별 누적 시간에 더합니다. (여러 스레드가 동시에 호출)"""
+        with self._stats_lock:
+            for stage, elapsed in seconds.items():
+                self.stage_seconds[stage] += elapsed
+
+    def get_stage_stats(self) -> Dict:
+        """단계별 누적 시간 (초)"""
+        with self._stats_lock:
+            return dict(self.stage_seconds)
+
+    def get_window_stats(self) -> Dict:
+        """창 나누기 통계: 창으로 나뉜 답변 수, 답변당 평균 창 수, 추가 추론 시간 합계"""
+        with self._stats_lock:
+            stats = dict(self.window_stats)
+        stats['windows_per_answer'] = stats['windows'] / stats['answers'] if stats['answers'] else 0.0
+        return stats
+
     # def calculate_keyword_similarity(self, keywords1: List[str], keywords2: List[str]) -> float:
     #     """두 키워드 리스트 간의 유사도 계산 (0~1)"""
     #     if not keywords1 or not keywords2:
@@ -229,20 +623,128 @@ class KeywordExtractor:
         
     #     return matching, only_in_1, only_in_2
 
+class _RegistryWatcher:
+    """
+    모델 레지스트리의 ACTIVE 포인터를 주기적으로 확인하고, 바뀌면 새 버전의 추출기를 백그라운드에서
+    만든 뒤 싱글톤을 교체합니다. 이미 이전 추출기를 받아 간 요청은 그 추출기로 끝까지 처리되고,
+    이후 get_local_keyword_extractor() 호출부터 새 추출기를 받습니다. (교체 직후 잠시 두 모델이 메모리에 있음)
+    활성 버전을 서비스하게 되면 (교체 직후 또는 재시작 후 첫 확인) 다른 모델 버전의 DB 키워드 캐시를 한 번 정리합니다.
+    """
+
+    def __init__(self, poll_seconds: float = MODEL_REGISTRY_POLL_SECONDS):
+        self.registry = ModelRegistry()
+        self.poll_seconds = poll_seconds
+        self.failed_versions = set()  # 검증/로드에 실패한 버전은 포인터가 바뀔 때까지 다시 시도하지 않음
+        self.purged_model_version = None  # 다른 버전의 캐시를 정리한 마지막 모델 버전 해시
+        self.swaps = 0
+        self._thread = threading.Thread(target=self._run, name="keyword-model-watcher", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.poll_seconds)
+            try:
+                self.check()
+            except Exception as e:
+                print(f"⚠️ 모델 레지스트리 확인 실패: {e}")
+
+    def check(self) -> bool:
+        """활성 버전이 로드된 버전과 다르면 교체합니다. 교체했으면 True"""
+        version = self.registry.active_version()
+        current = _keyword_extractor
+        if version is None or version in self.failed_versions:
+            return False
+        if current is not None and current.registry_version == version:
+            self._purge_other_cache_versions(current)
+            return False
+
+        print(f"🔄 새 키워드 모델 버전 감지: {version}. 백그라운드에서 로드합니다.")
+        try:
+            self.registry.verify(version)
+            extractor = KeywordExtractor(self.registry.version_path(version),
+                                         backend=current.backend if current else KEYWORD_BACKEND)
+            extractor.registry_version = version
+        except Exception as e:
+            # 새 버전이 잘못되어도 기존 추출기로 계속 서비스
+            self.failed_versions.add(version)
+            print(f"❌ 모델 버전 {version} 로드 실패, 기존 모델을 유지합니다: {e}")
+            return False
+
+        _set_keyword_extractor(extractor)
+        self.swaps += 1
+        print(f"✅ 키워드 모델 교체 완료: {current.registry_version if current else '없음'} → {version}")
+        self._purge_other_cache_versions(extractor)
+        return True
+
+    def _purge_other_cache_versions(self, extractor: KeywordExtractor):
+        """활성 버전을 서비스하는 추출기 기준으로, 다른 모델 버전의 DB 캐시를 한 번 나눠서 삭제 (감시 스레드에서 실행)"""
+        if extractor.cache is None or extractor.model_version == self.purged_model_version:
+            return
+        try:
+            extractor.cache.purge_other_versions()
+        except sqlite3.Error as e:
+            print(f"⚠️ 이전 모델 버전의 키워드 캐시 정리 실패 (다음 확인 때 다시 시도): {e}")
+            return
+        self.purged_model_version = extractor.model_version
+
+
 # 싱글톤 인스턴스
 _keyword_extractor = None
+_keyword_extractor_lock = threading.Lock()
+_registry_watcher = None
+_guarded_extractor = None
 
-def get_keyword_extractor() -> Optional[KeywordExtractor]:
-    """키워드 추출기 싱글톤 인스턴스 반환. 초기화 실패 시 None 반환."""
+def _set_keyword_extractor(extractor: KeywordExtractor):
     global _keyword_extractor
+    with _keyword_extractor_lock:
+        _keyword_extractor = extractor
+
+def get_model_keyword_extractor():
+    """
+    사전 대체 없이 모델 추출기만 반환합니다. (실패를 그대로 받아 재시도해야 하는 작업 워커용)
+    사이드카 소켓(KEYWORD_SIDECAR_SOCKET)이 설정되어 있으면 같은 추출 메서드를 가진 사이드카 클라이언트
+    (연결할 수 없으면 프로세스 내 모델로 대체), 아니면 프로세스 내 싱글톤을 반환합니다. 초기화 실패 시 None
+    """
+    from keyword_sidecar import get_sidecar_client
+    client = get_sidecar_client()
+    return client if client is not None else get_local_keyword_extractor()
+
+def get_keyword_extractor():
+    """
+    키워드 추출기 반환. KEYWORD_LEXICON_MODE가 'off'면 모델 추출기(초기화 실패 시 None)를,
+    'fallback'/'shed'면 모델을 쓸 수 없거나 호출이 몰릴 때 사전 추출기로 대신 처리하는 래퍼를 반환합니다.
+    """
+    global _guarded_extractor
+    if KEYWORD_LEXICON_MODE == 'off':
+        return get_model_keyword_extractor()
+    if _guarded_extractor is None:
+        from lexicon_extractor import LexiconGuardedExtractor, get_lexicon_extractor
+        with _keyword_extractor_lock:
+            if _guarded_extractor is None:
+                _guarded_extractor = LexiconGuardedExtractor(get_model_keyword_extractor, get_lexicon_extractor,
+                                                             mode=KEYWORD_LEXICON_MODE)
+    return _guarded_extractor
+
+def get_local_keyword_extractor() -> Optional[KeywordExtractor]:
+    """이 프로세스에 로드한 키워드 추출기 싱글톤 인스턴스 반환. 초기화 실패 시 None 반환."""
+    global _keyword_extractor, _registry_watcher
+    # 첫 호출 때 레지스트리 감시 시작 (지금 모델이 없어도 새 버전이 등록되면 로드됨)
+    if _registry_watcher is None and MODEL_REGISTRY_POLL_SECONDS > 0:
+        with _keyword_extractor_lock:
+            if _registry_watcher is None:
+                _registry_watcher = _RegistryWatcher()
+
     if _keyword_extractor is None:
         try:
             # KeywordExtractor 초기화 시도. 실패하면 예외 발생
-            _keyword_extractor = KeywordExtractor()
+            extractor = KeywordExtractor()
         except Exception as e:
             # 초기화 실패 시 _keyword_extractor는 None으로 유지됨
             st.error(f"키워드 추출기 인스턴스 생성에 실패했습니다: {e}")
             return None
+        with _keyword_extractor_lock:
+            if _keyword_extractor is None:
+                _keyword_extractor = extractor
             
     return _keyword_extractor
 
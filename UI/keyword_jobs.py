@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+키워드 추출 작업 워커
+답변 제출은 답변과 KEYWORD_JOBS 작업만 저장하고 바로 끝나며, 이 모듈의 워커 스레드가 작업을 배치로
+가져와 키워드를 추출한 뒤 USER_ANSWERS.extracted_keywords / ANSWER_KEYWORDS를 채웁니다.
+작업은 임대(lease) 방식으로 가져가므로 Streamlit 프로세스 안의 스레드와 별도 워커 프로세스를 함께 띄워도 됩니다.
+워커 묶음 하나는 만들 때의 DB 파일 하나만 처리합니다. (Streamlit 프로세스의 싱글톤은 기본 DB만 처리)
+storage_router로 샤딩한 경우에는 --base-dir/--shards로 샤드마다 워커 묶음을 띄웁니다.
+
+별도 프로세스로 실행 (UI 디렉토리에서):
+    python keyword_jobs.py --workers 2
+    python keyword_jobs.py --drain            # 남은 작업을 모두 처리하고 종료
+    python keyword_jobs.py --retry-failed     # 재시도 횟수를 넘긴 작업을 다시 대기열에 넣고 실행
+    python keyword_jobs.py --base-dir shards --shards 4   # 모든 샤드 DB의 작업 처리
+"""
+
+import os
+import socket
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List, Optional
+
+import database
+
+try:
+    from utils.constants import (KEYWORD_JOB_WORKERS, KEYWORD_JOB_BATCH_SIZE, KEYWORD_JOB_POLL_SECONDS,
+                                 KEYWORD_JOB_LEASE_SECONDS, KEYWORD_JOB_MAX_ATTEMPTS,
+                                 KEYWORD_JOB_RETRY_BASE_SECONDS, KEYWORD_JOB_RETRY_MAX_SECONDS)
+except ImportError:
+    # 단독으로 사용되거나 경로 문제가 있을 경우를 대비한 기본값
+    KEYWORD_JOB_WORKERS = 1
+    KEYWORD_JOB_BATCH_SIZE = 16
+    KEYWORD_JOB_POLL_SECONDS = 2.0
+    KEYWORD_JOB_LEASE_SECONDS = 120
+    KEYWORD_JOB_MAX_ATTEMPTS = 5
+    KEYWORD_JOB_RETRY_BASE_SECONDS = 10
+    KEYWORD_JOB_RETRY_MAX_SECONDS = 3600
+
+
+def _default_extractor():
+    """
+    모델 키워드 추출기 (레지스트리 교체를 따라가도록 배치마다 다시 가져옴)
+    사전 대체 래퍼를 쓰지 않으므로 모델이 실패하면 작업은 재시도 대기열로 돌아갑니다.
+    """
+    from keyword_extractor import get_model_keyword_extractor
+    return get_model_keyword_extractor()
+
+
+class KeywordJobWorkers:
+    """KEYWORD_JOBS 대기열을 비우는 워커 스레드 묶음"""
+
+    def __init__(self, num_workers: int = KEYWORD_JOB_WORKERS, batch_size: int = KEYWORD_JOB_BATCH_SIZE,
+                 poll_seconds: float = KEYWORD_JOB_POLL_SECONDS,
+                 extractor_provider: Callable = _default_extractor):
+        """
+        Args:
+            num_workers: 워커 스레드 수 (모델 추론은 배치 단위이므로 보통 1~2개면 충분)
+            batch_size: 한 번에 가져와 한 배치로 추출할 작업 수
+            poll_seconds: 대기열이 비었을 때 다시 확인하기까지 기다리는 시간 (notify()로 즉시 깨움)
+            extractor_provider: extract_keywords_batch()를 가진 추출기를 돌려주는 함수 (없으면 None)
+        """
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self.extractor_provider = extractor_provider
+        self.db_path = database.current_database()  # 만든 스레드가 사용하던 DB 파일
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._stats_lock = threading.Lock()
+        self.stats = {'completed': 0, 'failed_attempts': 0, 'given_up': 0, 'batches': 0}
+        prefix = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._threads = [
+            threading.Thread(target=self._run, args=(f"{prefix}:{i}",), name=f"keyword-job-{i}", daemon=True)
+            for i in range(num_workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def notify(self):
+        """새 작업이 등록되었음을 알려 대기 중인 워커를 바로 깨웁니다."""
+        self._wakeup.set()
+
+    def stop(self, timeout: Optional[float] = None):
+        """진행 중인 배치를 마친 뒤 워커를 종료합니다."""
+        self._stop.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def get_stats(self) -> Dict:
+        """처리 통계와 DB의 상태별 작업 수"""
+        with self._stats_lock:
+            stats = dict(self.stats)
+        with database.using_database(self.db_path):
+            stats.update(database.get_keyword_job_stats())
+        return stats
+
+    def _count(self, name: str, amount: int = 1):
+        with self._stats_lock:
+            self.stats[name] += amount
+
+    def _run(self, worker_id: str):
+        """워커 스레드 메인 루프"""
+        with database.using_database(self.db_path):
+            while not self._stop.is_set():
+                try:
+                    processed = self.process_batch(worker_id)
+                except Exception as e:
+                    print(f"❌ 키워드 작업 워커 오류: {e}")
+                    processed = 0
+                if not processed:
+                    self._wakeup.wait(self.poll_seconds)
+                    self._wakeup.clear()
+
+    def process_batch(self, worker_id: str) -> int:
+        """작업을 한 배치 가져와 처리합니다. 가져온 작업 수 반환 (0이면 대기열이 빈 상태)"""
+        jobs = database.claim_keyword_jobs(worker_id, self.batch_size, KEYWORD_JOB_LEASE_SECONDS)
+        if not jobs:
+            return 0
+        answer_ids = [job['answer_id'] for job in jobs]
+        try:
+            extractor = self.extractor_provider()
+            if extractor is None:
+                raise RuntimeError("키워드 추출기를 사용할 수 없습니다.")
+            keywords = extractor.extract_keywords_batch([job['answer_text'] for job in jobs],
+                                                        batch_size=len(jobs), raise_on_failure=True)
+        except Exception as e:
+            given_up = database.fail_keyword_jobs(worker_id, answer_ids, str(e), KEYWORD_JOB_MAX_ATTEMPTS,
+                                                  KEYWORD_JOB_RETRY_BASE_SECONDS, KEYWORD_JOB_RETRY_MAX_SECONDS)
+            self._count('failed_attempts', len(jobs))
+            self._count('given_up', given_up)
+            print(f"⚠️ 키워드 추출 작업 {len(jobs)}건 실패 (재시도 예정, 포기 {given_up}건): {e}")
+            return len(jobs)
+
+        completed = database.complete_keyword_jobs(worker_id, dict(zip(answer_ids, keywords)),
+                                                   getattr(extractor, 'model_version', None))
+        self._count('completed', completed)
+        self._count('batches')
+        return len(jobs)
+
+    def drain(self, worker_id: Optional[str] = None) -> int:
+        """
+        지금 처리할 수 있는 작업이 없을 때까지 현재 스레드에서 처리합니다. (재시도 지연 중인 작업은 남음)
+        처리한 작업 수 반환
+        """
+        worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:drain"
+        total = 0
+        with database.using_database(self.db_path):
+            while True:
+                processed = self.process_batch(worker_id)
+                if not processed:
+                    return total
+                total += processed
+
+
+# 싱글톤 패턴으로 워커 관리 (Streamlit 프로세스당 하나)
+_keyword_job_workers = None
+_keyword_job_workers_lock = threading.Lock()
+
+def get_keyword_job_workers() -> KeywordJobWorkers:
+    """워커 싱글톤 인스턴스 반환 (처음 호출할 때 스레드 시작)"""
+    global _keyword_job_workers
+    if _keyword_job_workers is None:
+        with _keyword_job_workers_lock:
+            if _keyword_job_workers is None:
+                _keyword_job_workers = KeywordJobWorkers()
+    return _keyword_job_workers
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="키워드 추출 작업 워커")
+    parser.add_argument('--workers', type=int, default=KEYWORD_JOB_WORKERS, help="워커 스레드 수")
+    parser.add_argument('--batch-size', type=int, default=KEYWORD_JOB_BATCH_SIZE, help="배치당 작업 수")
+    parser.add_argument('--db', default=database.DATABASE_NAME, help="SQLite DB 파일")
+    parser.add_argument('--base-dir', help="storage_router 샤드 디렉토리 (지정하면 --db 대신 모든 샤드 DB 처리)")
+    parser.add_argument('--shards', type=int, help="샤드 개수 (--base-dir와 함께 사용)")
+    parser.add_argument('--drain', action='store_true', help="남은 작업을 모두 처리하고 종료")
+    parser.add_argument('--retry-failed', action='store_true', help="'failed' 작업을 다시 대기열에 넣음")
+    args = parser.parse_args()
+
+    if args.base_dir:
+        if not args.shards:
+            parser.error("--base-dir에는 --shards가 필요합니다.")
+        from storage_router import ShardRouter
+        db_paths = ShardRouter.from_directory(args.base_dir, args.shards).shard_paths
+    else:
+        db_paths = [args.db]
+
+    workers_by_db = {}
+    for db_path in db_paths:
+        with database.using_database(db_path):
+            database.create_tables()
+            if args.retry_failed:
+                print(f"🔁 [{db_path}] 실패한 작업 {database.retry_failed_keyword_jobs()}건을 다시 대기열에 넣었습니다.")
+            print(f"📋 [{db_path}] 대기열: {database.get_keyword_job_stats()}")
+
+            if args.drain:
+                workers = KeywordJobWorkers(num_workers=0, batch_size=args.batch_size)
+                start = time.perf_counter()
+                total = workers.drain()
+                print(f"✅ [{db_path}] {total}건 처리 ({time.perf_counter() - start:.1f}초), "
+                      f"결과: {workers.get_stats()}")
+                continue
+
+            workers_by_db[db_path] = KeywordJobWorkers(num_workers=args.workers, batch_size=args.batch_size)
+    if args.drain:
+        return
+
+    print(f"🚀 키워드 작업 워커 {args.workers}개 × DB {len(workers_by_db)}개 실행 중 (Ctrl+C로 종료)")
+    try:
+        while True:
+            time.sleep(60)
+            for db_path, workers in workers_by_db.items():
+                print(f"📊 [{db_path}] {workers.get_stats()}")
+    except KeyboardInterrupt:
+        for workers in workers_by_db.values():
+            workers.stop(timeout=30)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,506 @@
+#!/usr/bin/env python3
+"""
+키워드 추출 사이드카
+모델을 가진 프로세스 하나가 Unix 소켓으로 키워드 추출을 제공하고, 여러 Streamlit 서버 프로세스는 클라이언트로 요청만 보냅니다.
+앱 프로세스를 몇 개 띄우든 BERT 모델은 사이드카에 한 벌만 올라가며, 앱 프로세스는 콜드 스타트 없이 바로 추출할 수 있습니다.
+여러 연결에서 들어온 요청은 InferenceBatcher가 짧은 window 동안 모아 한 번의 forward pass로 처리합니다.
+
+get_keyword_extractor()는 KEYWORD_SIDECAR_SOCKET이 설정되어 있으면 이 모듈의 클라이언트를 돌려주고,
+사이드카에 연결할 수 없으면 KEYWORD_SIDECAR_RETRY_SECONDS 동안 프로세스 내 모델로 대신 처리합니다.
+소켓은 다른 사용자가 쓸 수 없는 디렉토리(예: /run/memory_app, $XDG_RUNTIME_DIR)에 두어야 합니다.
+서버와 클라이언트 모두 /tmp처럼 누구나 쓸 수 있는 디렉토리의 소켓은 거부하고, 클라이언트는 연결 전에 소켓 소유자를 확인합니다.
+(다른 사용자가 같은 경로를 먼저 열어 환자의 답변을 받아 가거나 가짜 결과를 돌려주지 못하도록)
+
+프로토콜 (모든 정수는 네트워크 바이트 순서):
+    요청  헤더 '!2sBBBI'  매직 b'KW', 버전, 명령, max_keywords(0이면 기본값, 최대 255), 본문 길이
+          EXTRACT 본문    텍스트 수 '!H' + 텍스트마다 (UTF-8 길이 '!I' + UTF-8 바이트)
+          INFO 본문       없음
+    응답  헤더 '!2sBBI'   매직 b'KW', 버전, 상태(0 성공 / 1 오류), 본문 길이
+          EXTRACT 본문    텍스트마다 (구간 수 '!B' + 구간마다 (시작, 끝) 문자 위치 '!II')
+          INFO 본문       UTF-8 JSON (모델 버전, 배처 통계 등)
+          오류 본문       UTF-8 오류 메시지
+    키워드 문자열은 보내지 않고 원문 문자 위치만 돌려주며, 클라이언트가 자기 원문에서 잘라냅니다.
+
+사이드카 실행 (UI 디렉토리에서):
+    KEYWORD_SIDECAR_SOCKET=/run/memory_app/keyword.sock python keyword_sidecar.py
+    python keyword_sidecar.py --socket /run/memory_app/keyword.sock --backend onnx-int8 --window-ms 5
+"""
+
+import json
+import os
+import socket
+import socketserver
+import stat
+import struct
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    from utils.constants import (KEYWORD_SIDECAR_SOCKET, KEYWORD_SIDECAR_TIMEOUT_SECONDS,
+                                 KEYWORD_SIDECAR_RETRY_SECONDS, KEYWORD_BATCH_SIZE)
+except ImportError:
+    # 단독으로 사용되거나 경로 문제가 있을 경우를 대비한 기본값
+    KEYWORD_SIDECAR_SOCKET = ''
+    KEYWORD_SIDECAR_TIMEOUT_SECONDS = 30.0
+    KEYWORD_SIDECAR_RETRY_SECONDS = 30.0
+    KEYWORD_BATCH_SIZE = 32
+
+# 배포 환경마다 소켓 위치가 다를 수 있으므로 환경 변수로 덮어쓸 수 있습니다. (빈 문자열이면 사이드카 사용 안 함)
+SIDECAR_SOCKET = os.environ.get("KEYWORD_SIDECAR_SOCKET", KEYWORD_SIDECAR_SOCKET)
+
+MAGIC = b'KW'
+PROTOCOL_VERSION = 1
+OP_EXTRACT = 1
+OP_INFO = 2
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+_REQUEST_HEADER = struct.Struct('!2sBBBI')
+_RESPONSE_HEADER = struct.Struct('!2sBBI')
+_COUNT = struct.Struct('!H')
+_LENGTH = struct.Struct('!I')
+_SPAN_COUNT = struct.Struct('!B')
+_SPAN = struct.Struct('!II')
+
+MAX_TEXTS_PER_REQUEST = 0xFFFF
+MAX_SPANS_PER_TEXT = 0xFF  # 요청 헤더의 max_keywords와 응답의 구간 수가 1바이트
+MAX_PAYLOAD_BYTES = 64 * 1024 * 1024  # 잘못된 길이 헤더로 메모리를 잡아먹지 않도록 하는 상한
+
+
+class SidecarProtocolError(Exception):
+    """프레임 형식이 맞지 않음 (연결을 더 이상 쓸 수 없음)"""
+
+
+class SidecarInferenceError(RuntimeError):
+    """사이드카가 요청을 받았지만 추출에 실패함 (사이드카가 보낸 오류 메시지)"""
+
+
+def check_socket_directory(socket_path: str):
+    """소켓이 있는 디렉토리를 다른 사용자가 쓸 수 있으면 PermissionError (/tmp 등)"""
+    directory = os.path.dirname(os.path.abspath(socket_path))
+    if os.stat(directory).st_mode & stat.S_IWOTH:
+        raise PermissionError(f"누구나 쓸 수 있는 디렉토리의 소켓은 사용하지 않습니다: {directory}")
+
+
+def check_socket_owner(socket_path: str):
+    """
+    연결하기 전에 소켓을 확인합니다. 소켓 파일이어야 하고, 소유자가 이 프로세스의 사용자이거나
+    소켓 디렉토리의 소유자(사이드카 전용 계정)여야 합니다. 아니면 PermissionError
+    """
+    check_socket_directory(socket_path)
+    info = os.stat(socket_path)
+    if not stat.S_ISSOCK(info.st_mode):
+        raise PermissionError(f"소켓 파일이 아닙니다: {socket_path}")
+    directory_owner = os.stat(os.path.dirname(os.path.abspath(socket_path))).st_uid
+    if info.st_uid not in (os.getuid(), directory_owner):
+        raise PermissionError(f"소켓 소유자(uid {info.st_uid})를 신뢰할 수 없습니다: {socket_path}")
+
+
+def _request_max_keywords(max_keywords: Optional[int]) -> int:
+    """요청 헤더에 넣을 max_keywords (None이면 0 = 사이드카 기본값, 프로토콜 상한 255를 넘으면 255)"""
+    if max_keywords is None:
+        return 0
+    if max_keywords < 1:
+        raise ValueError(f"max_keywords는 1 이상이어야 합니다: {max_keywords}")
+    return min(max_keywords, MAX_SPANS_PER_TEXT)
+
+
+# --- 인코딩 / 디코딩 ---
+
+def encode_texts(texts: Sequence[str]) -> bytes:
+    parts = [_COUNT.pack(len(texts))]
+    for text in texts:
+        data = (text or '').encode('utf-8')
+        parts.append(_LENGTH.pack(len(data)))
+        parts.append(data)
+    return b''.join(parts)
+
+
+def decode_texts(payload: bytes) -> List[str]:
+    try:
+        (count,) = _COUNT.unpack_from(payload, 0)
+        position = _COUNT.size
+        texts = []
+        for _ in range(count):
+            (length,) = _LENGTH.unpack_from(payload, position)
+            position += _LENGTH.size
+            if position + length > len(payload):
+                raise SidecarProtocolError("텍스트 길이가 본문을 넘습니다.")
+            texts.append(payload[position:position + length].decode('utf-8'))
+            position += length
+    except (struct.error, UnicodeDecodeError) as e:
+        raise SidecarProtocolError(f"잘못된 EXTRACT 요청 본문: {e}")
+    return texts
+
+
+def encode_spans(span_lists: Sequence[Sequence[Tuple[int, int]]]) -> bytes:
+    parts = []
+    for spans in span_lists:
+        parts.append(_SPAN_COUNT.pack(len(spans)))
+        parts.extend(_SPAN.pack(start, end) for start, end in spans)
+    return b''.join(parts)
+
+
+def decode_spans(payload: bytes, count: int) -> List[List[Tuple[int, int]]]:
+    try:
+        position = 0
+        span_lists = []
+        for _ in range(count):
+            (span_count,) = _SPAN_COUNT.unpack_from(payload, position)
+            position += _SPAN_COUNT.size
+            spans = []
+            for _ in range(span_count):
+                spans.append(_SPAN.unpack_from(payload, position))
+                position += _SPAN.size
+            span_lists.append(spans)
+    except struct.error as e:
+        raise SidecarProtocolError(f"잘못된 EXTRACT 응답 본문: {e}")
+    return span_lists
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            raise ConnectionError("연결이 닫혔습니다.")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def _read_frame(sock: socket.socket, header: struct.Struct) -> Tuple[tuple, bytes]:
+    """헤더와 본문을 읽습니다. 헤더의 마지막 필드가 본문 길이입니다."""
+    fields = header.unpack(_recv_exact(sock, header.size))
+    if fields[0] != MAGIC or fields[1] != PROTOCOL_VERSION:
+        raise SidecarProtocolError(f"알 수 없는 프레임 (매직 {fields[0]!r}, 버전 {fields[1]})")
+    if fields[-1] > MAX_PAYLOAD_BYTES:
+        raise SidecarProtocolError(f"본문이 너무 큽니다: {fields[-1]} bytes")
+    return fields, _recv_exact(sock, fields[-1])
+
+
+# --- 서버 (사이드카 프로세스) ---
+
+class _SidecarHandler(socketserver.BaseRequestHandler):
+    """연결 하나를 담당하는 스레드: 연결이 닫힐 때까지 요청을 차례로 처리합니다."""
+
+    def handle(self):
+        server: KeywordSidecarServer = self.server
+        while True:
+            try:
+                (_, _, op, max_keywords, _), payload = _read_frame(self.request, _REQUEST_HEADER)
+            except (ConnectionError, OSError):
+                return
+            except SidecarProtocolError as e:
+                self._respond(STATUS_ERROR, str(e).encode('utf-8'))
+                return
+
+            try:
+                if op == OP_EXTRACT:
+                    body = encode_spans(server.extract(decode_texts(payload), max_keywords or None))
+                elif op == OP_INFO:
+                    body = json.dumps(server.get_info(), ensure_ascii=False).encode('utf-8')
+                else:
+                    raise SidecarProtocolError(f"알 수 없는 명령: {op}")
+                status = STATUS_OK
+            except Exception as e:
+                status, body = STATUS_ERROR, f"{type(e).__name__}: {e}".encode('utf-8')
+            if not self._respond(status, body):
+                return
+
+    def _respond(self, status: int, body: bytes) -> bool:
+        try:
+            self.request.sendall(_RESPONSE_HEADER.pack(MAGIC, PROTOCOL_VERSION, status, len(body)) + body)
+            return True
+        except OSError:
+            return False
+
+
+class KeywordSidecarServer(socketserver.ThreadingUnixStreamServer):
+    """모델을 한 벌만 로드하고 Unix 소켓으로 키워드 추출을 제공하는 서버"""
+
+    daemon_threads = True
+    request_queue_size = 128  # 여러 앱 프로세스의 스레드가 한꺼번에 연결해도 거절하지 않도록 (기본값 5)
+
+    def __init__(self, socket_path: str, extractor_provider: Callable, window_ms: Optional[float] = None,
+                 max_batch: Optional[int] = None, timeout: float = KEYWORD_SIDECAR_TIMEOUT_SECONDS):
+        """
+        Args:
+            extractor_provider: 현재 추출기를 돌려주는 함수 (레지스트리 교체를 따라가도록 요청마다 호출)
+            window_ms / max_batch: InferenceBatcher 설정 (None이면 INFERENCE_* 상수)
+            timeout: 텍스트 하나가 배치를 기다리는 최대 시간 (초)
+        """
+        from inference_batcher import InferenceBatcher
+
+        self.socket_path = socket_path
+        self._prepare_socket_directory()
+        self.extractor_provider = extractor_provider
+        self.timeout = timeout
+        options = {key: value for key, value in (('window_ms', window_ms), ('max_batch', max_batch))
+                   if value is not None}
+        self.batcher = InferenceBatcher(extractor_provider(), spans=True, raise_on_failure=True, **options)
+        self.started_at = time.time()
+        self._remove_stale_socket()
+        super().__init__(socket_path, _SidecarHandler)
+        os.chmod(socket_path, 0o660)  # 같은 그룹의 앱 프로세스만 연결
+
+    def _prepare_socket_directory(self):
+        """소켓 디렉토리가 없으면 이 사용자만 쓸 수 있게(0700) 만들고, 누구나 쓸 수 있는 디렉토리면 시작하지 않습니다."""
+        directory = os.path.dirname(os.path.abspath(self.socket_path))
+        if not os.path.isdir(directory):
+            os.makedirs(directory, mode=0o700)
+        check_socket_directory(self.socket_path)
+
+    def _remove_stale_socket(self):
+        """이전 실행이 남긴 소켓 파일을 지웁니다. 다른 사이드카가 응답하면 시작하지 않습니다."""
+        if not os.path.exists(self.socket_path):
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.socket_path)
+        except OSError:
+            os.unlink(self.socket_path)
+        else:
+            raise RuntimeError(f"이미 실행 중인 사이드카가 있습니다: {self.socket_path}")
+        finally:
+            probe.close()
+
+    def extract(self, texts: List[str], max_keywords: Optional[int]) -> List[List[Tuple[int, int]]]:
+        extractor = self.extractor_provider()
+        if extractor is None:
+            raise RuntimeError("사이드카에 키워드 추출기가 로드되지 않았습니다.")
+        self.batcher.extractor = extractor
+        futures = [self.batcher.submit(text, max_keywords, timeout=self.timeout) for text in texts]
+        return [[(span['start'], span['end']) for span in future.result(timeout=self.timeout)] for future in futures]
+
+    def get_info(self) -> Dict:
+        extractor = self.extractor_provider()
+        return {
+            'pid': os.getpid(),
+            'uptime_seconds': round(time.time() - self.started_at, 1),
+            'model_version': getattr(extractor, 'model_version', None),
+            'registry_version': getattr(extractor, 'registry_version', None),
+            'backend': getattr(extractor, 'backend', None),
+            'batcher': self.batcher.get_stats(),
+        }
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+# --- 클라이언트 (앱 프로세스) ---
+
+def _local_extractor():
+    """사이드카에 연결할 수 없을 때 쓰는 프로세스 내 추출기 (처음 필요할 때 로드)"""
+    from keyword_extractor import get_local_keyword_extractor
+    return get_local_keyword_extractor()
+
+
+class KeywordSidecarClient:
+    """
+    KeywordExtractor와 같은 추출 메서드를 제공하는 사이드카 클라이언트.
+    스레드마다 연결 하나를 유지하고, 사이드카에 연결할 수 없으면 retry_seconds 동안 프로세스 내 추출기를 사용합니다.
+    """
+
+    def __init__(self, socket_path: str = SIDECAR_SOCKET, timeout: float = KEYWORD_SIDECAR_TIMEOUT_SECONDS,
+                 retry_seconds: float = KEYWORD_SIDECAR_RETRY_SECONDS,
+                 fallback_provider: Callable = _local_extractor):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.retry_seconds = retry_seconds
+        self.fallback_provider = fallback_provider
+        self._local = threading.local()
+        self._down_until = 0.0
+        self._down_reported = False  # 연결 실패를 이미 알렸는지 (다시 연결될 때까지 한 번만 출력)
+        self._stats_lock = threading.Lock()
+        self.stats = {'remote_requests': 0, 'remote_texts': 0, 'fallback_requests': 0, 'connect_failures': 0}
+
+    # --- 연결 ---
+
+    def _connection(self) -> Tuple[socket.socket, bool]:
+        """이 스레드의 연결과, 새로 만든 연결인지 여부"""
+        sock = getattr(self._local, 'sock', None)
+        if sock is not None:
+            return sock, False
+        check_socket_owner(self.socket_path)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        self._local.sock = sock
+        return sock, True
+
+    def _close(self):
+        sock = getattr(self._local, 'sock', None)
+        self._local.sock = None
+        if sock is not None:
+            sock.close()
+
+    def _request(self, op: int, max_keywords: int, payload: bytes) -> bytes:
+        """요청을 보내고 성공 응답 본문을 반환합니다. 재사용하던 연결이 끊겼으면 한 번 다시 연결합니다."""
+        while True:
+            sock, fresh = self._connection()
+            try:
+                sock.sendall(_REQUEST_HEADER.pack(MAGIC, PROTOCOL_VERSION, op, max_keywords, len(payload)) + payload)
+                (_, _, status, _), body = _read_frame(sock, _RESPONSE_HEADER)
+                break
+            except (OSError, SidecarProtocolError):
+                self._close()
+                if fresh:
+                    raise
+        if status != STATUS_OK:
+            raise SidecarInferenceError(body.decode('utf-8', errors='replace'))
+        return body
+
+    def is_available(self) -> bool:
+        """사이드카를 사용할 차례인지 (최근 연결 실패 후 retry_seconds가 지나지 않았으면 False)"""
+        return bool(self.socket_path) and time.monotonic() >= self._down_until
+
+    def _mark_down(self, error: Exception):
+        self._close()
+        self._down_until = time.monotonic() + self.retry_seconds
+        with self._stats_lock:
+            self.stats['connect_failures'] += 1
+        if not self._down_reported:
+            self._down_reported = True
+            print(f"⚠️ 키워드 추출 사이드카({self.socket_path})에 연결할 수 없어 "
+                  f"다시 연결될 때까지 프로세스 내 모델을 사용합니다: {error}")
+
+    def get_server_info(self) -> Optional[Dict]:
+        """사이드카의 모델 버전/배처 통계 (연결할 수 없으면 None)"""
+        if not self.is_available():
+            return None
+        try:
+            return json.loads(self._request(OP_INFO, 0, b'').decode('utf-8'))
+        except (OSError, SidecarProtocolError) as e:
+            self._mark_down(e)
+            return None
+
+    @property
+    def model_version(self) -> Optional[str]:
+        info = self.get_server_info()
+        return info.get('model_version') if info else None
+
+    def get_stats(self) -> Dict:
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats['sidecar_available'] = self.is_available()
+        return stats
+
+    # --- KeywordExtractor와 같은 추출 메서드 ---
+
+    def extract_keywords(self, text: str, max_keywords: Optional[int] = None) -> List[str]:
+        return self.extract_keywords_batch([text], max_keywords=max_keywords)[0]
+
+    def extract_keywords_batch(self, texts: List[str], batch_size: int = KEYWORD_BATCH_SIZE,
+                               max_keywords: Optional[int] = None, raise_on_failure: bool = False) -> List[List[str]]:
+        return [[span['keyword'] for span in spans]
+                for spans in self.extract_keyword_spans_batch(texts, batch_size, max_keywords,
+                                                              raise_on_failure=raise_on_failure)]
+
+    def extract_keyword_spans(self, text: str, max_keywords: Optional[int] = None) -> List[Dict]:
+        return self.extract_keyword_spans_batch([text], max_keywords=max_keywords)[0]
+
+    def extract_keyword_spans_batch(self, texts: List[str], batch_size: int = KEYWORD_BATCH_SIZE,
+                                    max_keywords: Optional[int] = None,
+                                    raise_on_failure: bool = False) -> List[List[Dict]]:
+        """
+        사이드카로 키워드 구간을 추출합니다. 배치 구성은 사이드카의 배처가 정하므로 batch_size는 대체 경로에서만 쓰입니다.
+        사이드카가 추출에 실패하면 raise_on_failure에 따라 RuntimeError 또는 빈 리스트,
+        사이드카에 연결할 수 없으면 프로세스 내 추출기로 처리합니다.
+        """
+        request_max_keywords = _request_max_keywords(max_keywords)
+        if self.is_available():
+            try:
+                results = []
+                for start in range(0, len(texts), MAX_TEXTS_PER_REQUEST):
+                    chunk = texts[start:start + MAX_TEXTS_PER_REQUEST]
+                    body = self._request(OP_EXTRACT, request_max_keywords, encode_texts(chunk))
+                    for text, spans in zip(chunk, decode_spans(body, len(chunk))):
+                        results.append([{'keyword': text[span_start:span_end], 'start': span_start, 'end': span_end}
+                                        for span_start, span_end in spans])
+                with self._stats_lock:
+                    self.stats['remote_requests'] += 1
+                    self.stats['remote_texts'] += len(texts)
+                self._down_reported = False
+                return results
+            except SidecarInferenceError as e:
+                if raise_on_failure:
+                    raise
+                print(f"⚠️ 사이드카 키워드 추출 실패: {e}")
+                return [[] for _ in texts]
+            except (OSError, SidecarProtocolError) as e:
+                self._mark_down(e)
+
+        extractor = self.fallback_provider()
+        if extractor is None:
+            if raise_on_failure:
+                raise RuntimeError("사이드카와 프로세스 내 키워드 추출기를 모두 사용할 수 없습니다.")
+            return [[] for _ in texts]
+        with self._stats_lock:
+            self.stats['fallback_requests'] += 1
+        return extractor.extract_keyword_spans_batch(texts, batch_size, max_keywords,
+                                                     raise_on_failure=raise_on_failure)
+
+
+# 싱글톤 패턴으로 클라이언트 관리 (앱 프로세스당 하나)
+_sidecar_client = None
+_sidecar_client_lock = threading.Lock()
+
+def get_sidecar_client() -> Optional[KeywordSidecarClient]:
+    """사이드카 클라이언트 싱글톤 (KEYWORD_SIDECAR_SOCKET이 비어 있으면 None)"""
+    global _sidecar_client
+    if not SIDECAR_SOCKET:
+        return None
+    if _sidecar_client is None:
+        with _sidecar_client_lock:
+            if _sidecar_client is None:
+                _sidecar_client = KeywordSidecarClient()
+    return _sidecar_client
+
+
+def main():
+    import argparse
+    import signal
+
+    parser = argparse.ArgumentParser(description="키워드 추출 사이드카 (Unix 소켓 추론 서버)")
+    parser.add_argument('--socket', default=SIDECAR_SOCKET or None, required=not SIDECAR_SOCKET,
+                        help="Unix 소켓 경로 (다른 사용자가 쓸 수 없는 디렉토리, 생략 시 KEYWORD_SIDECAR_SOCKET)")
+    parser.add_argument('--model-path', help="모델 경로 (생략 시 레지스트리 활성 버전 / 최신 모델)")
+    parser.add_argument('--backend', help="추론 백엔드 (생략 시 KEYWORD_BACKEND)")
+    parser.add_argument('--window-ms', type=float, help="요청을 더 모으는 최대 대기 시간 (생략 시 INFERENCE_BATCH_WINDOW_MS)")
+    parser.add_argument('--max-batch', type=int, help="한 번의 forward pass에 넣는 최대 텍스트 수 (생략 시 INFERENCE_MAX_BATCH)")
+    args = parser.parse_args()
+
+    import keyword_extractor
+
+    if args.model_path or args.backend:
+        options = {'backend': args.backend} if args.backend else {}
+        keyword_extractor._set_keyword_extractor(keyword_extractor.KeywordExtractor(args.model_path, **options))
+    # 모델은 시작할 때 로드해 두고, 이후 레지스트리 교체는 get_local_keyword_extractor()의 감시 스레드가 처리
+    extractor = keyword_extractor.get_local_keyword_extractor()
+    if extractor is None:
+        print("❌ 키워드 추출기를 로드할 수 없어 사이드카를 시작하지 않습니다.")
+        raise SystemExit(1)
+
+    server = KeywordSidecarServer(args.socket, keyword_extractor.get_local_keyword_extractor,
+                                  window_ms=args.window_ms, max_batch=args.max_batch)
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown, daemon=True).start())
+    print(f"🚀 키워드 추출 사이드카 실행 중: {args.socket} (모델 {extractor.model_version}, 백엔드 {extractor.backend})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print("👋 키워드 추출 사이드카 종료")
+
+
+if __name__ == "__main__":
+    main()
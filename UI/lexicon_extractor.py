@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+사전(lexicon) 기반 빠른 키워드 추출기
+라벨링 데이터(model/labeled_data)의 B-KEY/I-KEY 구간과 과거에 모델이 추출한 키워드(ANSWER_KEYWORDS)로 키워드 사전을 만들고,
+Aho–Corasick 오토마톤으로 컴파일해 텍스트를 한 번 훑으면서 사전에 있는 키워드를 모두 찾습니다.
+모델이 없어도 동작하고 답변 하나에 수십 마이크로초 수준이라, 모델을 쓸 수 없을 때(fallback)나
+모델 호출이 몰릴 때(shed) KeywordExtractor 대신 사용합니다. (품질 비교: benchmarks/lexicon_quality_benchmark.py)
+
+키워드 선택 규칙:
+    - 어절 중간에서 시작하는 일치는 버립니다. (예: "학생"은 "학생이"에는 맞고 "대학생"에는 맞지 않음)
+    - 겹치는 일치 중에서는 먼저 시작하는 것, 같으면 더 긴 것을 고릅니다. (leftmost-longest)
+    - 같은 키워드가 여러 번 나오면 처음 한 번만, 텍스트 순서대로 max_keywords개까지 돌려줍니다.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import threading
+from collections import Counter, deque
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from utils.bio_decoder import LABEL2ID, decode_bio_batch
+
+try:
+    from utils.constants import (MAX_KEYWORDS_PER_ANSWER, KEYWORD_BATCH_SIZE, KEYWORD_LEXICON_MODE,
+                                 KEYWORD_LEXICON_SHED_IN_FLIGHT, KEYWORD_LEXICON_MIN_LENGTH,
+                                 KEYWORD_LEXICON_MIN_ANSWERS)
+except ImportError:
+    # 단독으로 사용되거나 경로 문제가 있을 경우를 대비한 기본값
+    MAX_KEYWORDS_PER_ANSWER = 6
+    KEYWORD_BATCH_SIZE = 32
+    KEYWORD_LEXICON_MODE = 'fallback'
+    KEYWORD_LEXICON_SHED_IN_FLIGHT = 2
+    KEYWORD_LEXICON_MIN_LENGTH = 2
+    KEYWORD_LEXICON_MIN_ANSWERS = 2
+
+LABELED_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "model", "labeled_data")
+
+
+class AhoCorasick:
+    """문자 단위 Aho–Corasick 오토마톤 (상태마다 다음 문자 딕셔너리 + 실패 링크)"""
+
+    def __init__(self, patterns: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # 이 상태에서 끝나는 패턴 길이들 (실패 링크로 이어진 더 짧은 패턴 포함)
+        self._lengths: List[Tuple[int, ...]] = [()]
+        for pattern in patterns:
+            self._insert(pattern)
+        self._build_failure_links()
+
+    def _insert(self, pattern: str):
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._lengths.append(())
+            state = next_state
+        if pattern and len(pattern) not in self._lengths[state]:
+            self._lengths[state] = (len(pattern),)
+
+    def _build_failure_links(self):
+        """너비 우선으로 실패 링크를 채우고, 실패 링크 쪽 상태의 패턴 길이를 합칩니다."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(char, 0)
+                self._fail[next_state] = fail if fail != next_state else 0
+                self._lengths[next_state] = self._lengths[next_state] + self._lengths[self._fail[next_state]]
+                queue.append(next_state)
+
+    @property
+    def size(self) -> int:
+        return len(self._goto)
+
+    def find_all(self, text: str) -> Iterator[Tuple[int, int]]:
+        """텍스트를 한 번 훑으며 사전에 있는 모든 (시작, 끝(미포함)) 일치를 끝 위치 순서로 돌려줍니다."""
+        goto, fail, lengths = self._goto, self._fail, self._lengths
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length in lengths[state]:
+                yield position + 1 - length, position + 1
+
+
+# --- 사전 만들기 ---
+
+def _token_offsets(text: str, tokens: List[str]) -> Optional[List[Tuple[int, int]]]:
+    """WordPiece 토큰을 원문 문자 위치에 맞춥니다. 맞출 수 없으면([UNK], 정규화된 문자 등) None"""
+    offsets = []
+    position = 0
+    for token in tokens:
+        if token == '[UNK]':
+            return None
+        piece = token[2:] if token.startswith('##') else token
+        if not token.startswith('##'):
+            while position < len(text) and text[position].isspace():
+                position += 1
+        if not text.startswith(piece, position):
+            return None
+        offsets.append((position, position + len(piece)))
+        position += len(piece)
+    return offsets
+
+
+def load_labeled_spans(data_dir: str = LABELED_DATA_DIR) -> List[Tuple[str, List[Tuple[int, int]]]]:
+    """
+    라벨링 데이터의 (원본 답변, 키워드 문자 구간 목록)을 가져옵니다.
+    토큰별 BIO 라벨은 훈련/추론과 같은 utils.bio_decoder로 구간으로 바꿉니다.
+    """
+    samples = []
+    skipped = 0
+    for file_path in sorted(glob.glob(os.path.join(data_dir, "KLUE_tokenized_answers*_labeled.json"))):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for sample in json.load(f):
+                text, tokens, labels = sample.get('original_answer'), sample.get('tokens'), sample.get('labels')
+                if not text or not tokens or not labels or len(tokens) != len(labels):
+                    skipped += 1
+                    continue
+                offsets = _token_offsets(text, tokens)
+                if offsets is None:
+                    skipped += 1
+                    continue
+                label_ids = np.array([[LABEL2ID.get(label, 0) for label in labels]])
+                token_spans = decode_bio_batch(label_ids)[0]
+                samples.append((text, [(offsets[start][0], offsets[end - 1][1]) for start, end in token_spans]))
+    if skipped:
+        print(f"⚠️ 원문 위치를 맞출 수 없는 라벨링 샘플 {skipped}개는 사전에서 제외했습니다.")
+    return samples
+
+
+def build_lexicon(samples: Iterable[Tuple[str, List[Tuple[int, int]]]] = None, include_extracted: bool = True,
+                  min_length: int = KEYWORD_LEXICON_MIN_LENGTH,
+                  min_answers: int = KEYWORD_LEXICON_MIN_ANSWERS) -> Counter:
+    """
+    키워드 -> 등장 횟수 사전을 만듭니다.
+
+    Args:
+        samples: (텍스트, 키워드 문자 구간 목록). None이면 라벨링 데이터 전체
+        include_extracted: True면 ANSWER_KEYWORDS에서 min_answers개 이상의 답변에 나온 키워드도 포함
+    """
+    lexicon: Counter = Counter()
+    for text, spans in (load_labeled_spans() if samples is None else samples):
+        for start, end in spans:
+            lexicon[text[start:end].strip()] += 1
+
+    if include_extracted:
+        try:
+            import database
+            for row in database.get_keyword_frequencies(min_answers):
+                lexicon[row['keyword'].strip()] += row['answer_count']
+        except Exception as e:
+            # DB가 없거나 아직 키워드 테이블이 없으면 라벨링 데이터만 사용
+            print(f"⚠️ 과거 추출 키워드를 사전에 넣지 못했습니다: {e}")
+
+    return Counter({keyword: count for keyword, count in lexicon.items() if len(keyword) >= min_length})
+
+
+# --- 추출기 ---
+
+class KeywordLexiconExtractor:
+    """KeywordExtractor와 같은 추출 메서드를 가진 사전 기반 추출기"""
+
+    backend = 'lexicon'
+    registry_version = None
+
+    def __init__(self, lexicon: Dict[str, int]):
+        self.lexicon = dict(lexicon)
+        self.automaton = AhoCorasick(self.lexicon)
+        self.max_keywords = MAX_KEYWORDS_PER_ANSWER
+        digest = hashlib.sha256('\n'.join(sorted(self.lexicon)).encode('utf-8')).hexdigest()
+        self.model_version = f"lexicon-{digest[:16]}"
+
+    def extract_keywords(self, text: str, max_keywords: Optional[int] = None) -> List[str]:
+        return self.extract_keywords_batch([text], max_keywords=max_keywords)[0]
+
+    def extract_keywords_batch(self, texts: List[str], batch_size: int = KEYWORD_BATCH_SIZE,
+                               max_keywords: Optional[int] = None, raise_on_failure: bool = False) -> List[List[str]]:
+        return [[span['keyword'] for span in spans]
+                for spans in self.extract_keyword_spans_batch(texts, batch_size, max_keywords)]
+
+    def extract_keyword_spans(self, text: str, max_keywords: Optional[int] = None) -> List[Dict]:
+        return self.extract_keyword_spans_batch([text], max_keywords=max_keywords)[0]
+
+    def extract_keyword_spans_batch(self, texts: List[str], batch_size: int = KEYWORD_BATCH_SIZE,
+                                    max_keywords: Optional[int] = None,
+                                    raise_on_failure: bool = False) -> List[List[Dict]]:
+        """batch_size는 호환용이며 사용하지 않습니다. (텍스트마다 독립적으로 한 번 훑음)"""
+        max_keywords = max_keywords or self.max_keywords
+        return [self._spans(text or '', max_keywords) for text in texts]
+
+    def _spans(self, text: str, max_keywords: int) -> List[Dict]:
+        spans, seen = [], set()
+        covered_until = 0
+        # 시작 위치 순, 같은 시작이면 긴 일치 먼저 (leftmost-longest)
+        for start, end in sorted(self.automaton.find_all(text), key=lambda match: (match[0], -match[1])):
+            if start < covered_until or (start > 0 and text[start - 1].isalnum()):
+                continue
+            covered_until = end
+            keyword = text[start:end]
+            if keyword in seen:
+                continue
+            seen.add(keyword)
+            spans.append({'keyword': keyword, 'start': start, 'end': end})
+            if len(spans) >= max_keywords:
+                break
+        return spans
+
+
+class LexiconGuardedExtractor:
+    """
+    모델 추출기 앞에 두는 래퍼.
+    fallback: 모델을 쓸 수 없거나(None) 추출에 실패하면 사전 추출기로 처리합니다.
+    shed: fallback에 더해, 이 프로세스에서 동시에 모델로 가는 호출이 shed_in_flight개를 넘으면
+          기다리지 않고 바로 사전 추출기로 처리합니다.
+    raise_on_failure=True로 호출하면 사전으로 대신하지 않고(shed도 하지 않음) 모델 결과만 돌려주며,
+    모델을 쓸 수 없거나 실패하면 예외를 그대로 올립니다. 결과를 DB에 저장하는 호출부는 이 방식으로 부르거나
+    get_model_keyword_extractor()를 직접 사용합니다.
+    """
+
+    def __init__(self, primary_provider: Callable, lexicon_provider: Callable,
+                 mode: str = KEYWORD_LEXICON_MODE, shed_in_flight: int = KEYWORD_LEXICON_SHED_IN_FLIGHT):
+        if mode not in ('fallback', 'shed'):
+            raise ValueError(f"지원하지 않는 사전 추출 모드입니다: {mode}")
+        self.primary_provider = primary_provider
+        self.lexicon_provider = lexicon_provider
+        self.mode = mode
+        self._slots = threading.BoundedSemaphore(shed_in_flight) if mode == 'shed' else None
+        self._stats_lock = threading.Lock()
+        self.stats = {'model': 0, 'fallback': 0, 'shed': 0}
+
+    @property
+    def model_version(self) -> Optional[str]:
+        primary = self.primary_provider()
+        return primary.model_version if primary is not None else None
+
+    def get_stats(self) -> Dict:
+        with self._stats_lock:
+            return dict(self.stats)
+
+    def _count(self, name: str):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def extract_keywords(self, text: str, max_keywords: Optional[int] = None) -> List[str]:
+        return self.extract_keywords_batch([text], max_keywords=max_keywords)[0]
+
+    def extract_keywords_batch(self, texts: List[str], batch_size: int = KEYWORD_BATCH_SIZE,
+                               max_keywords: Optional[int] = None, raise_on_failure: bool = False) -> List[List[str]]:
+        return [[span['keyword'] for span in spans]
+                for spans in self.extract_keyword_spans_batch(texts, batch_size, max_keywords,
+                                                              raise_on_failure=raise_on_failure)]
+
+    def extract_keyword_spans(self, text: str, max_keywords: Optional[int] = None) -> List[Dict]:
+        return self.extract_keyword_spans_batch([text], max_keywords=max_keywords)[0]
+
+    def extract_keyword_spans_batch(self, texts: List[str], batch_size: int = KEYWORD_BATCH_SIZE,
+                                    max_keywords: Optional[int] = None,
+                                    raise_on_failure: bool = False) -> List[List[Dict]]:
+        if raise_on_failure:
+            # 호출부가 실패를 직접 처리(재시도 등)하므로 사전으로 대신하지 않음
+            primary = self.primary_provider()
+            if primary is None:
+                raise RuntimeError("키워드 추출 모델을 사용할 수 없습니다.")
+            spans = primary.extract_keyword_spans_batch(texts, batch_size, max_keywords, raise_on_failure=True)
+            self._count('model')
+            return spans
+
+        if self._slots is not None and not self._slots.acquire(blocking=False):
+            self._count('shed')
+            return self._lexicon_spans(texts, batch_size, max_keywords)
+        try:
+            primary = self.primary_provider()
+            if primary is not None:
+                try:
+                    spans = primary.extract_keyword_spans_batch(texts, batch_size, max_keywords,
+                                                                raise_on_failure=True)
+                    self._count('model')
+                    return spans
+                except Exception as e:
+                    print(f"⚠️ 모델 키워드 추출 실패, 사전으로 대신 추출합니다: {e}")
+            self._count('fallback')
+            return self._lexicon_spans(texts, batch_size, max_keywords)
+        finally:
+            if self._slots is not None:
+                self._slots.release()
+
+    def _lexicon_spans(self, texts: List[str], batch_size: int, max_keywords: Optional[int]) -> List[List[Dict]]:
+        lexicon = self.lexicon_provider()
+        if lexicon is None:
+            return [[] for _ in texts]
+        return lexicon.extract_keyword_spans_batch(texts, batch_size, max_keywords)
+
+
+# 싱글톤 패턴으로 사전 추출기 관리 (처음 필요할 때 한 번 생성)
+_lexicon_extractor = None
+_lexicon_extractor_failed = False
+_lexicon_extractor_lock = threading.Lock()
+
+def get_lexicon_extractor() -> Optional[KeywordLexiconExtractor]:
+    """사전 추출기 싱글톤 반환. 사전을 만들 수 없으면 None (다시 시도하지 않음)"""
+    global _lexicon_extractor, _lexicon_extractor_failed
+    if _lexicon_extractor is None and not _lexicon_extractor_failed:
+        with _lexicon_extractor_lock:
+            if _lexicon_extractor is None and not _lexicon_extractor_failed:
+                try:
+                    lexicon = build_lexicon()
+                    if not lexicon:
+                        raise ValueError("사전이 비어 있습니다.")
+                    _lexicon_extractor = KeywordLexiconExtractor(lexicon)
+                    print(f"📖 키워드 사전 로드: {len(lexicon):,}개 키워드, "
+                          f"오토마톤 상태 {_lexicon_extractor.automaton.size:,}개")
+                except Exception as e:
+                    _lexicon_extractor_failed = True
+                    print(f"❌ 키워드 사전을 만들 수 없습니다: {e}")
+    return _lexicon_extractor
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="라벨링 데이터/과거 추출 결과로 키워드 사전을 만들어 확인")
+    parser.add_argument('--db', help="과거 추출 키워드를 읽을 SQLite DB 파일 (생략 시 기본 DB)")
+    parser.add_argument('--no-extracted', action='store_true', help="라벨링 데이터만 사용")
+    parser.add_argument('--top', type=int, default=30, help="많이 나온 키워드 몇 개를 출력할지")
+    parser.add_argument('--text', help="이 텍스트에서 키워드를 추출해 보기")
+    args = parser.parse_args()
+
+    import database
+    with database.using_database(args.db or database.DATABASE_NAME):
+        lexicon = build_lexicon(include_extracted=not args.no_extracted)
+    extractor = KeywordLexiconExtractor(lexicon)
+    print(f"📖 사전 {len(lexicon):,}개 키워드, 오토마톤 상태 {extractor.automaton.size:,}개 ({extractor.model_version})")
+    for keyword, count in lexicon.most_common(args.top):
+        print(f"   {keyword:<20} {count:>6}")
+    if args.text:
+        print(f"🎯 {extractor.extract_keywords(args.text)}")
+
+
+if __name__ == "__main__":
+    main()
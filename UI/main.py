@@ -29,50 +29,32 @@ def initialize_database():
         st.error(f"데이터베이스 초기화 오류: {e}")
 
 def auto_load_questions_from_csv():
-    """앱 실행시 자동으로 CSV에서 질문 로딩"""
+    """앱 실행시 자동으로 CSV의 질문을 DB와 동기화 (기존 질문 ID는 유지)"""
     from utils.question_loader import load_questions_from_csv
-    import os
-    
-    # 현재 DB의 질문 개수 확인
-    conn = database.get_db_connection()
-    existing_count = conn.execute("SELECT COUNT(*) FROM QUESTIONS").fetchone()[0]
-    conn.close()
     
     # CSV 파일에서 질문 로딩 시도
     csv_questions = load_questions_from_csv("questions.csv")
     
-    if csv_questions and len(csv_questions) > existing_count:
-        # 🔧 수정: CSV에 더 많은 질문이 있으면 기존 질문 삭제하고 CSV 질문으로 교체
-        
-        # 기존 질문 모두 삭제
-        conn = database.get_db_connection()
-        conn.execute("DELETE FROM QUESTIONS")
-        conn.commit()
-        conn.close()
-        
-        # CSV 질문들 추가
-        for question_text in csv_questions:
-            database.add_question(question_text.strip(), "csv_import")
+    if csv_questions:
+        # 새로 추가되거나 바뀐 질문만 반영 (기존 답변 기록이 참조하는 question_id는 그대로 유지)
+        sync_result = database.sync_questions(csv_questions, "csv_import")
         
-        # 저장 확인
-        conn = database.get_db_connection()
-        new_count = conn.execute("SELECT COUNT(*) FROM QUESTIONS").fetchone()[0]
-        conn.close()
-        
-        #st.success(f"✅ CSV에서 {len(csv_questions)}개 질문을 DB에 저장! (기존 {existing_count}개 교체)")
-        # st.write(f"🔍 **확인**: 현재 DB 질문 개수: {new_count}")
-        
-    elif not csv_questions and existing_count == 0:
+        #st.success(f"✅ CSV 질문 동기화: 추가 {sync_result['inserted']}개, 변경 {sync_result['updated']}개")
+        return
+    
+    with database.connection() as conn:
+        existing_count = conn.execute("SELECT COUNT(*) FROM QUESTIONS").fetchone()[0]
+    
+    if existing_count == 0:
         # CSV 로딩 실패시 기본 질문 사용 (기존 로직)
         default_questions = [
             "가장 기억에 남는 여행은 어디였나요?",
             "어린 시절 가장 좋아했던 음식은 무엇인가요?",
         ]
-        for question_text in default_questions:
-            database.add_question(question_text, "default")
+        database.sync_questions(default_questions, "default")
         st.warning(f"⚠️ CSV를 찾을 수 없어 기본 질문 {len(default_questions)}개 사용")
     else:
-        st.info(f"⚠️ 기존 질문 {existing_count}개 사용 중 (CSV: {len(csv_questions) if csv_questions else 0}개)")
+        st.info(f"⚠️ 기존 질문 {existing_count}개 사용 중 (CSV: 0개)")
 
 def render_sidebar(user_id=None):
     """사이드바 렌더링"""    
@@ -235,15 +217,14 @@ def show_detailed_stats(user_id):
     
     # 최근 활동 내역
     st.subheader("📅 최근 활동")
-    conn = database.get_db_connection()
-    
-    recent_answers = conn.execute("""
-        SELECT Q.question_text, UA.answer_text, UA.answer_date 
-        FROM USER_ANSWERS UA
-        JOIN QUESTIONS Q ON UA.question_id = Q.question_id
-        WHERE UA.user_id = ? AND UA.is_initial_answer = 1
-        ORDER BY UA.created_at DESC LIMIT 5
-    """, (user_id,)).fetchall()
+    with database.connection() as conn:
+        recent_answers = conn.execute("""
+            SELECT Q.question_text, UA.answer_text, UA.answer_date 
+            FROM USER_ANSWERS UA
+            JOIN QUESTIONS Q ON UA.question_id = Q.question_id
+            WHERE UA.user_id = ? AND UA.is_initial_answer = 1
+            ORDER BY UA.created_at DESC LIMIT 5
+        """, (user_id,)).fetchall()
     
     if recent_answers:
         for answer in recent_answers:
@@ -252,8 +233,6 @@ def show_detailed_stats(user_id):
                 st.write(f"**답변:** {answer['answer_text']}")
     else:
         st.info("아직 답변한 질문이 없습니다.")
-    
-    conn.close()
 
 def show_settings(user_id):
     """설정 페이지"""
@@ -276,6 +255,11 @@ def show_settings(user_id):
 
 def main():
     """메인 애플리케이션"""
+    # 이번 rerun 동안의 조회 캐시 시작 (사용자 정보처럼 잘 바뀌지 않는 조회는 세션 동안 유지)
+    if '_db_read_cache' not in st.session_state:
+        st.session_state['_db_read_cache'] = {}
+    database.begin_read_cache_scope(st.session_state['_db_read_cache'])
+    
     # 데이터베이스 초기화
     initialize_database()
     
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+키워드 추출 모델 레지스트리
+훈련 스크립트가 만든 모델 디렉토리를 버전별로 보관하고, 어떤 버전을 서비스할지 가리키는
+"active" 포인터를 관리합니다. 실행 위치(cwd)나 파일 복사 순서와 상관없이 같은 모델을 찾을 수 있습니다.
+
+디렉토리 구조:
+    model_registry/
+        manifest.json          버전 목록 (파일별 SHA-256, 평가 지표, 원본 경로, 등록 시각)
+        ACTIVE                 서비스 중인 버전 이름 한 줄
+        versions/<버전>/        모델 번들 (config.json, model.safetensors, 토크나이저, training_config.json ...,
+                               export_onnx.py --publish로 등록하면 model.onnx, model.int8.onnx도 포함)
+
+사용법 (UI 디렉토리에서):
+    python model_registry.py list
+    python model_registry.py publish ../model/klue_keyword_extractor_20250618_173746
+    python model_registry.py activate 0002_20250618_173746   # 이전 버전으로 되돌리기
+    python model_registry.py verify 0002_20250618_173746
+"""
+
+import argparse
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# 저장소 루트의 model_registry/ (KEYWORD_MODEL_REGISTRY 환경 변수로 변경 가능)
+DEFAULT_REGISTRY_DIR = os.environ.get(
+    "KEYWORD_MODEL_REGISTRY",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "model_registry")
+)
+
+MANIFEST_FILE = "manifest.json"
+ACTIVE_FILE = "ACTIVE"
+VERSIONS_DIR = "versions"
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_atomic(path: str, content: str):
+    """임시 파일에 쓴 뒤 os.replace로 바꿔서, 읽는 쪽이 반쯤 쓰인 파일을 보지 않도록 합니다."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class ModelRegistry:
+    """모델 버전 등록/활성화/검증"""
+
+    def __init__(self, root: str = DEFAULT_REGISTRY_DIR):
+        self.root = os.path.abspath(root)
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.root, MANIFEST_FILE)
+
+    @property
+    def active_path(self) -> str:
+        return os.path.join(self.root, ACTIVE_FILE)
+
+    def version_path(self, version: str) -> str:
+        return os.path.join(self.root, VERSIONS_DIR, version)
+
+    @contextmanager
+    def _locked(self):
+        """여러 프로세스(훈련 스크립트, CLI)가 동시에 manifest를 고치지 않도록 파일 잠금"""
+        os.makedirs(self.root, exist_ok=True)
+        with open(os.path.join(self.root, ".lock"), 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def load_manifest(self) -> Dict:
+        if not os.path.exists(self.manifest_path):
+            return {"versions": []}
+        with open(self.manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _save_manifest(self, manifest: Dict):
+        _write_atomic(self.manifest_path, json.dumps(manifest, ensure_ascii=False, indent=2))
+
+    def list_versions(self) -> List[Dict]:
+        return self.load_manifest()["versions"]
+
+    def get_version(self, version: str) -> Dict:
+        for entry in self.list_versions():
+            if entry["version"] == version:
+                return entry
+        raise ValueError(f"레지스트리에 없는 버전입니다: {version}")
+
+    def recorded_sha256(self, path: str) -> Optional[str]:
+        """레지스트리 버전 디렉토리 안의 파일이면 manifest에 기록된 SHA-256 (아니면 None)"""
+        relpath = os.path.relpath(os.path.abspath(path), os.path.join(self.root, VERSIONS_DIR))
+        parts = relpath.split(os.sep, 1)
+        if relpath.startswith(os.pardir) or len(parts) != 2:
+            return None
+        version, file_relpath = parts
+        try:
+            entry = self.get_version(version)
+        except ValueError:
+            return None
+        return entry["files"].get(file_relpath, {}).get("sha256")
+
+    def active_version(self) -> Optional[str]:
+        """ACTIVE 포인터가 가리키는 버전 이름 (없으면 None)"""
+        try:
+            with open(self.active_path, 'r', encoding='utf-8') as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def publish(self, model_dir: str, metrics: Optional[Dict] = None, activate: bool = True,
+                notes: Optional[str] = None, extra_files: Optional[Dict[str, str]] = None) -> str:
+        """
+        모델 디렉토리를 새 버전으로 복사하고 manifest에 등록합니다.
+        복사는 임시 디렉토리에서 끝낸 뒤 이름을 바꾸므로, 등록 중인 버전이 반쯤 보이는 일은 없습니다.
+        extra_files({번들 안 파일 이름: 원본 경로})는 같은 버전에 함께 넣습니다. (예: export_onnx.py의 model.onnx)
+
+        Returns:
+            등록된 버전 이름 (예: 0003_20250618_173746)
+        """
+        if not os.path.isdir(model_dir):
+            raise FileNotFoundError(f"모델 디렉토리를 찾을 수 없습니다: {model_dir}")
+
+        with self._locked():
+            manifest = self.load_manifest()
+            suffix = os.path.basename(os.path.normpath(model_dir)).split("klue_keyword_extractor_")[-1]
+            version = f"{len(manifest['versions']) + 1:04d}_{suffix}"
+
+            target = self.version_path(version)
+            tmp_target = os.path.join(self.root, VERSIONS_DIR, f".tmp_{version}")
+            shutil.rmtree(tmp_target, ignore_errors=True)
+            shutil.copytree(model_dir, tmp_target)
+            for relpath, source_path in (extra_files or {}).items():
+                shutil.copy2(source_path, os.path.join(tmp_target, relpath))
+            files = {}
+            for dirpath, _, filenames in os.walk(tmp_target):
+                for filename in filenames:
+                    path = os.path.join(dirpath, filename)
+                    files[os.path.relpath(path, tmp_target)] = {"sha256": file_sha256(path),
+                                                                "size": os.path.getsize(path)}
+            os.replace(tmp_target, target)
+
+            training_config = {}
+            config_path = os.path.join(target, "training_config.json")
+            if os.path.exists(config_path):
+                with open(config_path, 'r', encoding='utf-8') as f:
+                    training_config = json.load(f)
+
+            manifest["versions"].append({
+                "version": version,
+                "source": os.path.abspath(model_dir),
+                "created_at": datetime.now().isoformat(),
+                "num_hidden_layers": training_config.get("num_hidden_layers"),
+                "metrics": metrics or {},
+                "files": files,
+                "notes": notes,
+            })
+            self._save_manifest(manifest)
+            if activate:
+                _write_atomic(self.active_path, version + "\n")
+
+        print(f"📦 모델 레지스트리에 등록: {version}" + (" (활성화)" if activate else ""))
+        return version
+
+    def activate(self, version: str, verify: bool = True):
+        """ACTIVE 포인터를 다른 버전으로 옮깁니다. (실행 중인 추출기는 백그라운드에서 교체)"""
+        with self._locked():
+            self.get_version(version)
+            if verify:
+                self.verify(version)
+            _write_atomic(self.active_path, version + "\n")
+        print(f"✅ 활성 모델 버전: {version}")
+
+    def verify(self, version: str, full: bool = True):
+        """
+        버전 디렉토리의 파일이 manifest와 같은지 확인합니다. 다르면 ValueError.
+        full=False면 파일 크기만 비교합니다. (시작 시간을 늘리지 않는 빠른 검사)
+        """
+        entry = self.get_version(version)
+        base = self.version_path(version)
+        for relpath, expected in entry["files"].items():
+            path = os.path.join(base, relpath)
+            if not os.path.exists(path):
+                raise ValueError(f"{version}: 파일이 없습니다: {relpath}")
+            if os.path.getsize(path) != expected["size"]:
+                raise ValueError(f"{version}: 파일 크기가 다릅니다: {relpath}")
+            if full and file_sha256(path) != expected["sha256"]:
+                raise ValueError(f"{version}: 체크섬이 다릅니다: {relpath}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="키워드 추출 모델 레지스트리 관리")
+    parser.add_argument('--root', default=DEFAULT_REGISTRY_DIR, help="레지스트리 디렉토리")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('list', help="등록된 버전 목록")
+    publish_parser = subparsers.add_parser('publish', help="모델 디렉토리를 새 버전으로 등록")
+    publish_parser.add_argument('model_dir')
+    publish_parser.add_argument('--no-activate', action='store_true', help="등록만 하고 활성화하지 않음")
+    activate_parser = subparsers.add_parser('activate', help="활성 버전 변경")
+    activate_parser.add_argument('version')
+    verify_parser = subparsers.add_parser('verify', help="버전 파일 체크섬 검사")
+    verify_parser.add_argument('version')
+    args = parser.parse_args()
+
+    registry = ModelRegistry(args.root)
+    if args.command == 'list':
+        active = registry.active_version()
+        for entry in registry.list_versions():
+            marker = "▶" if entry["version"] == active else " "
+            f1 = entry["metrics"].get("span_f1", entry["metrics"].get("f1"))
+            f1_text = f"F1 {f1:.4f}" if isinstance(f1, (int, float)) else "F1 -"
+            print(f"{marker} {entry['version']:<28} {f1_text}  층 {entry.get('num_hidden_layers') or '-'}  "
+                  f"{entry['created_at'][:19]}")
+    elif args.command == 'publish':
+        registry.publish(args.model_dir, activate=not args.no_activate)
+    else:
+        try:
+            if args.command == 'activate':
+                registry.activate(args.version)
+            else:
+                registry.verify(args.version)
+                print(f"✅ 체크섬 일치: {args.version}")
+        except ValueError as e:
+            print(f"❌ {e}")
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -59,10 +59,9 @@ def get_or_create_user(user_info: dict) -> int:
         st.error(f"필수 정보가 없습니다: {missing_keys}")
         return None
     
-    conn = database.get_db_connection()
-    user = conn.execute("SELECT user_id FROM USERS WHERE name = ? AND birth_date = ?", 
-                        (user_info['이름'], user_info['생년월일'].strftime('%Y-%m-%d'))).fetchone()
-    conn.close()
+    with database.connection() as conn:
+        user = conn.execute("SELECT user_id FROM USERS WHERE name = ? AND birth_date = ?", 
+                            (user_info['이름'], user_info['생년월일'].strftime('%Y-%m-%d'))).fetchone()
     
     if user:
         return user['user_id']
@@ -72,6 +71,9 @@ def get_or_create_user(user_info: dict) -> int:
 def main():
     """메인 실행 함수"""
     init_session_state()
+    if '_db_read_cache' not in st.session_state:
+        st.session_state['_db_read_cache'] = {}
+    database.begin_read_cache_scope(st.session_state['_db_read_cache'])
     
     if not initialize_database():
         st.error("데이터베이스 초기화에 실패하여 앱을 실행할 수 없습니다.")
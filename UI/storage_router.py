@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+"""
+사용자 단위 SQLite 샤딩 라우터
+사용자 데이터를 N개의 샤드 DB 파일로 나누고, database.py의 함수들을 사용자 ID로 알맞은 샤드에 보냅니다.
+
+- 카탈로그 DB: USERS(사용자 ID 발급), QUESTIONS(원본), USER_SHARDS(사용자 -> 샤드 디렉토리)
+- 샤드 DB: database.py와 같은 전체 스키마. QUESTIONS는 카탈로그에서 같은 ID로 복제되고,
+  USERS에는 그 샤드에 속한 사용자 행이 복제됩니다.
+- 각 샤드는 ID_RANGES에 기록한 서로 겹치지 않는 구간에서 답변/기억 점검/이미지 ID를 발급하므로,
+  샤드 간 이동 시 ID를 그대로 유지합니다. (USER_PROGRESS의 progress_id는 참조하는 곳이 없어 대상 샤드에서 새로 발급)
+- 사용자 이동 중에는 카탈로그 옆의 디렉토리 잠금 파일을 단독으로 잡아, 라우터를 거치는 그 사이의 읽기/쓰기를 기다리게 합니다.
+
+사용법 (UI 디렉토리에서):
+    python storage_router.py --base-dir shards --shards 4 init
+    python storage_router.py --base-dir shards --shards 4 status
+    python storage_router.py --base-dir shards --shards 4 move 17 2
+    python storage_router.py --base-dir shards --shards 4 rebalance
+"""
+
+import fcntl
+import os
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+import database
+
+# 샤드별 ID 발급 구간 시작 (샤드 번호 << SHARD_ID_BITS)
+SHARD_ID_BITS = 40
+
+# 샤드 구간 안에서 ID를 발급하는 테이블과 기본키 컬럼 (샤드 이동 시 ID를 그대로 옮기는 테이블)
+ID_RANGE_TABLES = {
+    'USER_ANSWERS': 'answer_id',
+    'MEMORY_CHECKS': 'check_id',
+    'GENERATED_IMAGES': 'image_id',
+}
+
+# 샤드 이동 시 복사하지 않고 대상 샤드에서 새로 발급받는 컬럼
+REASSIGNED_COLUMNS = {'USER_PROGRESS': 'progress_id'}
+
+# 샤드에서 사용자 ID로 행을 가져오는 테이블들 (샤드 이동 시 복사 순서)
+USER_SCOPED_TABLES = ['USERS', 'USER_PROGRESS', 'USER_ANSWERS', 'MEMORY_CHECKS', 'ANSWER_KEYWORDS']
+
+# user_id 컬럼이 없어 사용자의 답변 ID로 행을 가져오는 테이블들 (USER_ANSWERS 다음에 복사, 먼저 삭제)
+ANSWER_SCOPED_TABLES = ['KEYWORD_JOBS']
+
+# 샤드 이동 시 복사한 행만 지우기 위한 테이블별 기본키
+TABLE_PRIMARY_KEYS = {
+    'USERS': ('user_id',),
+    'USER_PROGRESS': ('progress_id',),
+    'USER_ANSWERS': ('answer_id',),
+    'MEMORY_CHECKS': ('check_id',),
+    'ANSWER_KEYWORDS': ('answer_id', 'position'),
+    'KEYWORD_JOBS': ('answer_id',),
+    'GENERATED_IMAGES': ('image_id',),
+}
+
+# 첫 번째 인자(또는 user_id 키워드 인자)로 사용자의 샤드에 라우팅되는 database.py 함수들
+USER_ROUTED_FUNCTIONS = {
+    'add_user_answer', 'add_memory_check', 'add_recall_with_memory_check',
+    'create_or_update_user_progress', 'increment_progress',
+    'get_user_progress', 'get_initial_answer_with_keywords', 'get_questions_to_revisit',
+    'get_daily_activity', 'get_today_activity_count',
+    'find_answers_by_keyword', 'get_keyword_stats',
+}
+
+# 사용자 ID 인자가 없어 ShardRouter에 같은 이름의 메서드로 따로 구현한 database.py 함수들
+# (카탈로그 원본이거나, user_id를 첫 인자로 받아 샤드를 고르는 버전)
+ROUTER_METHODS = {
+    'create_tables', 'add_user', 'get_user', 'get_all_users',
+    'add_question', 'sync_questions', 'update_question_status',
+    'set_answer_keywords', 'add_generated_image', 'match_recall_keywords', 'rebuild_daily_activity',
+}
+
+# 한 DB 파일 전체를 대상으로 하는 함수들: 라우터로 부르지 않고, 샤드마다 database.using_database 안에서 실행
+# (키워드 작업 워커, 백필, 키워드 캐시, 스키마 점검)
+SHARD_LOCAL_FUNCTIONS = {
+    'set_answer_keywords_many', 'get_initial_answers_page', 'count_initial_answers',
+    'get_keyword_frequencies',
+    'get_cached_keywords', 'put_cached_keywords', 'purge_keyword_cache', 'count_cached_keywords',
+    'claim_keyword_jobs', 'complete_keyword_jobs', 'fail_keyword_jobs', 'enqueue_keyword_jobs',
+    'retry_failed_keyword_jobs', 'get_keyword_job_stats',
+    'get_schema_version', 'apply_migrations', 'explain_hot_queries', 'find_full_table_scans',
+}
+
+# 데이터를 읽고 쓰지 않는 연결/캐시 도우미들 (라우팅 대상 아님)
+DATABASE_HELPERS = {
+    'current_database', 'using_database', 'close_all_connections', 'connection', 'transaction',
+    'get_db_connection', 'begin_read_cache_scope', 'end_read_cache_scope', 'invalidate_read_cache',
+    'get_read_cache_stats', 'question_content_hash',
+}
+
+
+class ShardRouter:
+    """사용자 ID를 샤드 DB 파일에 매핑하고, database.py 함수들의 샤드 버전을 제공하는 클래스"""
+
+    def __init__(self, catalog_path: str, shard_paths: List[str]):
+        """
+        Args:
+            catalog_path: 카탈로그 DB 파일 경로
+            shard_paths: 샤드 DB 파일 경로 목록 (목록의 순서가 샤드 번호)
+        """
+        if not shard_paths:
+            raise ValueError("샤드가 하나 이상 필요합니다.")
+        self.catalog_path = catalog_path
+        self.shard_paths = list(shard_paths)
+
+    @classmethod
+    def from_directory(cls, base_dir: str, shard_count: int) -> "ShardRouter":
+        """base_dir 아래 catalog.db, shard_00.db ... 파일들로 라우터를 만듭니다."""
+        os.makedirs(base_dir, exist_ok=True)
+        return cls(
+            os.path.join(base_dir, 'catalog.db'),
+            [os.path.join(base_dir, f'shard_{shard_no:02d}.db') for shard_no in range(shard_count)]
+        )
+
+    # --- 스키마 ---
+
+    def create_tables(self):
+        """카탈로그와 모든 샤드에 스키마를 만들고 마이그레이션을 적용합니다."""
+        with database.using_database(self.catalog_path):
+            database.create_tables()
+            with database.transaction() as conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS USER_SHARDS (
+                        user_id INTEGER PRIMARY KEY,
+                        shard_no INTEGER NOT NULL,
+                        updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+                    );
+                """)
+
+        for shard_no, shard_path in enumerate(self.shard_paths):
+            with database.using_database(shard_path):
+                database.create_tables()
+                with database.transaction() as conn:
+                    self._reserve_id_range(conn, shard_no)
+        self.replicate_questions()
+
+    @staticmethod
+    def _reserve_id_range(conn, shard_no: int):
+        """
+        이 샤드가 구간 [shard_no << 40, (shard_no + 1) << 40)에서 ID를 발급하도록 ID_RANGES를 맞춥니다.
+        이미 발급한 값은 낮추지 않습니다. (낮추면 다른 샤드로 옮겨 간 행의 ID를 다시 발급)
+        """
+        id_floor = shard_no << SHARD_ID_BITS
+        id_ceiling = (shard_no + 1) << SHARD_ID_BITS
+        for table, id_column in ID_RANGE_TABLES.items():
+            max_in_range = conn.execute(
+                f"SELECT COALESCE(MAX({id_column}), 0) FROM {table} WHERE {id_column} >= ? AND {id_column} < ?",
+                (id_floor, id_ceiling)).fetchone()[0]
+            # ID_RANGES 이전에 만든 샤드는 sqlite_sequence에 구간 안의 발급 기록이 남아 있음
+            row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,)).fetchone()
+            issued = row['seq'] if row is not None and id_floor <= row['seq'] < id_ceiling else 0
+            conn.execute("""
+                INSERT INTO ID_RANGES (table_name, next_id, ceiling) VALUES (?, ?, ?)
+                ON CONFLICT (table_name) DO UPDATE SET next_id = MAX(next_id, excluded.next_id), ceiling = excluded.ceiling
+            """, (table, max(id_floor, max_in_range, issued) + 1, id_ceiling))
+
+    @contextmanager
+    def _directory_lock(self, exclusive: bool = False):
+        """
+        사용자 디렉토리 잠금 (카탈로그 옆 .lock 파일, 여러 프로세스 공유).
+        라우팅된 호출은 공유 잠금을, 사용자 이동은 단독 잠금을 잡아 이동 중인 샤드에 쓰지 않도록 합니다.
+        """
+        with open(f"{self.catalog_path}.lock", 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @contextmanager
+    def _user_shard(self, user_id: int):
+        """디렉토리 공유 잠금을 잡은 채로 사용자의 샤드 DB를 기본 DB로 사용합니다."""
+        with self._directory_lock(), database.using_database(self.path_for_user(user_id)):
+            yield
+
+    # --- 라우팅 ---
+
+    def shard_of(self, user_id: int) -> int:
+        """
+        사용자가 속한 샤드 번호 (카탈로그의 USER_SHARDS 디렉토리 기본키 조회).
+        다른 프로세스가 사용자를 옮겨도 바로 반영되도록 캐시하지 않습니다.
+        """
+        with database.using_database(self.catalog_path), database.connection() as conn:
+            row = conn.execute("SELECT shard_no FROM USER_SHARDS WHERE user_id = ?", (user_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"샤드가 배정되지 않은 사용자입니다: {user_id}")
+        return row['shard_no']
+
+    def path_for_user(self, user_id: int) -> str:
+        """사용자의 데이터가 저장된 샤드 DB 파일 경로"""
+        return self.shard_paths[self.shard_of(user_id)]
+
+    def _route(self, func: Callable) -> Callable:
+        """database.py 함수를 사용자의 샤드에서 실행되도록 감쌉니다."""
+        def routed(*args, **kwargs):
+            user_id = kwargs['user_id'] if 'user_id' in kwargs else args[0]
+            with self._user_shard(user_id):
+                return func(*args, **kwargs)
+        routed.__name__ = func.__name__
+        routed.__doc__ = func.__doc__
+        return routed
+
+    def __getattr__(self, name: str):
+        """
+        USER_ROUTED_FUNCTIONS에 있는 database.py 함수의 샤드 버전을 반환합니다.
+        샤드별로 실행해야 하거나 라우팅이 정해지지 않은 database.py 함수는 기본 DB로 흘려보내지 않고 오류를 냅니다.
+        """
+        if name in USER_ROUTED_FUNCTIONS:
+            return self._route(getattr(database, name))
+        if name in SHARD_LOCAL_FUNCTIONS:
+            raise AttributeError(f"{name}: 샤드마다 실행하는 함수입니다. "
+                                 f"shard_paths의 각 DB에서 database.using_database로 실행하세요.")
+        if callable(getattr(database, name, None)) and not name.startswith('_'):
+            raise AttributeError(f"{name}: 샤드 라우팅이 정해지지 않은 database 함수입니다. "
+                                 f"storage_router의 라우팅 목록에 추가하세요.")
+        raise AttributeError(name)
+
+    def _for_each_shard(self, func: Callable, *args, **kwargs) -> list:
+        """모든 샤드에서 같은 함수를 실행하고 결과 목록을 반환합니다."""
+        results = []
+        for shard_path in self.shard_paths:
+            with database.using_database(shard_path):
+                results.append(func(*args, **kwargs))
+        return results
+
+    # --- 사용자 (카탈로그에서 ID 발급 후 샤드에 복제) ---
+
+    def add_user(self, name: str, birth_date: str, diagnosis_date: str) -> int:
+        """카탈로그에서 사용자 ID를 발급받고, 배정된 샤드에 사용자 행을 복제합니다."""
+        with database.using_database(self.catalog_path):
+            with database.transaction() as conn:
+                user_id = database.add_user(name, birth_date, diagnosis_date)
+                shard_no = user_id % len(self.shard_paths)
+                conn.execute("INSERT INTO USER_SHARDS (user_id, shard_no) VALUES (?, ?)", (user_id, shard_no))
+                user_row = conn.execute("SELECT * FROM USERS WHERE user_id = ?", (user_id,)).fetchone()
+
+        with database.using_database(self.shard_paths[shard_no]), database.transaction() as conn:
+            self._insert_rows(conn, 'USERS', [user_row])
+        return user_id
+
+    def get_user(self, user_id: int):
+        """사용자 정보 (카탈로그가 원본)"""
+        with database.using_database(self.catalog_path):
+            return database.get_user(user_id)
+
+    def get_all_users(self):
+        """모든 사용자 목록 (카탈로그가 원본)"""
+        with database.using_database(self.catalog_path):
+            return database.get_all_users()
+
+    def find_user(self, name: str, birth_date: str) -> Optional[int]:
+        """이름과 생년월일로 사용자 ID를 찾습니다. (DBOperations.get_or_create_user의 샤드 버전)"""
+        with database.using_database(self.catalog_path), database.connection() as conn:
+            row = conn.execute("SELECT user_id FROM USERS WHERE name = ? AND birth_date = ?",
+                               (name, birth_date)).fetchone()
+        return row['user_id'] if row else None
+
+    # --- 질문 (카탈로그가 원본, 샤드에는 같은 ID로 복제) ---
+
+    def replicate_questions(self):
+        """카탈로그의 QUESTIONS를 모든 샤드에 같은 question_id로 복제합니다. (바뀐 행만 갱신)"""
+        for shard_path in self.shard_paths:
+            with database.using_database(shard_path), database.connection() as conn:
+                # ATTACH는 트랜잭션 밖에서만 가능
+                conn.execute("ATTACH DATABASE ? AS catalog", (self.catalog_path,))
+                try:
+                    with database.transaction():
+                        conn.execute("""
+                            INSERT INTO main.QUESTIONS (question_id, question_text, question_type, status,
+                                                        created_at, content_hash)
+                            SELECT question_id, question_text, question_type, status, created_at, content_hash
+                            FROM catalog.QUESTIONS WHERE true
+                            ON CONFLICT (question_id) DO UPDATE SET
+                                question_text = excluded.question_text,
+                                question_type = excluded.question_type,
+                                status = excluded.status,
+                                content_hash = excluded.content_hash
+                            WHERE question_text != excluded.question_text OR status != excluded.status
+                                OR content_hash IS NOT excluded.content_hash
+                        """)
+                finally:
+                    conn.execute("DETACH DATABASE catalog")
+
+    def add_question(self, question_text: str, question_type: str) -> int:
+        """카탈로그에 질문을 추가하고 샤드에 복제합니다."""
+        with database.using_database(self.catalog_path):
+            question_id = database.add_question(question_text, question_type)
+        self.replicate_questions()
+        return question_id
+
+    def sync_questions(self, question_texts: List[str], question_type: str) -> Dict[str, int]:
+        """카탈로그와 질문 목록을 동기화하고, 바뀐 것이 있으면 샤드에 복제합니다."""
+        with database.using_database(self.catalog_path):
+            result = database.sync_questions(question_texts, question_type)
+        if result['inserted'] or result['updated']:
+            self.replicate_questions()
+        return result
+
+    def update_question_status(self, question_id: int, status: str):
+        """카탈로그와 모든 샤드에서 질문 상태를 변경합니다."""
+        with database.using_database(self.catalog_path):
+            database.update_question_status(question_id, status)
+        self._for_each_shard(database.update_question_status, question_id, status)
+
+    # --- 사용자 ID가 인자에 없는 함수들의 샤드 버전 ---
+
+    def set_answer_keywords(self, user_id: int, answer_id: int, keywords: List[str],
+                            model_version: Optional[str] = None):
+        """답변 키워드 채우기/교체 (답변 작성자의 샤드에서)"""
+        with self._user_shard(user_id):
+            database.set_answer_keywords(answer_id, keywords, model_version)
+
+    def add_generated_image(self, user_id: int, memory_check_id: int, image_url: str) -> int:
+        """생성된 이미지 정보 추가 (기억 점검을 한 사용자의 샤드에 저장)"""
+        with self._user_shard(user_id):
+            return database.add_generated_image(memory_check_id, image_url)
+
+    def match_recall_keywords(self, user_id: int, answer_id: int, recall_text: str) -> List[str]:
+        """원본 답변 키워드 중 회상 답변에 포함된 키워드 (답변 작성자의 샤드에서 조회)"""
+        with self._user_shard(user_id):
+            return database.match_recall_keywords(answer_id, recall_text)
+
+    def rebuild_daily_activity(self, user_id: Optional[int] = None):
+        """일일 활동 집계 재계산 (사용자를 지정하면 그 사용자의 샤드만)"""
+        if user_id is None:
+            self._for_each_shard(database.rebuild_daily_activity)
+            return
+        with self._user_shard(user_id):
+            database.rebuild_daily_activity(user_id)
+
+    # --- 리밸런싱 ---
+
+    @staticmethod
+    def _insert_rows(conn, table: str, rows: list):
+        """
+        행 목록을 같은 컬럼으로 그대로 넣습니다. (REASSIGNED_COLUMNS는 빼고 넣어 새로 발급)
+        이미 있는 기본키와 충돌하면 IntegrityError로 트랜잭션이 취소되므로, 행을 버린 채 이동이 진행되지 않습니다.
+        """
+        if not rows:
+            return
+        columns = [column for column in rows[0].keys() if column != REASSIGNED_COLUMNS.get(table)]
+        conn.executemany(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['?'] * len(columns))})",
+            [tuple(row[column] for column in columns) for row in rows]
+        )
+
+    def _read_user_rows(self, shard_no: int, user_id: int) -> Dict[str, list]:
+        """샤드에서 사용자의 모든 행을 테이블별로 읽습니다."""
+        with database.using_database(self.shard_paths[shard_no]), database.connection() as conn:
+            rows_by_table = {
+                table: conn.execute(f"SELECT * FROM {table} WHERE user_id = ?", (user_id,)).fetchall()
+                for table in USER_SCOPED_TABLES
+            }
+            rows_by_table['GENERATED_IMAGES'] = conn.execute("""
+                SELECT GI.* FROM GENERATED_IMAGES GI
+                JOIN MEMORY_CHECKS MC ON GI.memory_check_id = MC.check_id
+                WHERE MC.user_id = ?
+            """, (user_id,)).fetchall()
+            for table in ANSWER_SCOPED_TABLES:
+                rows_by_table[table] = conn.execute(f"""
+                    SELECT * FROM {table}
+                    WHERE answer_id IN (SELECT answer_id FROM USER_ANSWERS WHERE user_id = ?)
+                """, (user_id,)).fetchall()
+        return rows_by_table
+
+    def _copy_user_rows(self, shard_no: int, user_id: int, rows_by_table: Dict[str, list]):
+        """읽어 온 행들을 샤드에 넣고, ID 발급 구간과 일일 활동 집계를 다시 맞춥니다. (한 트랜잭션)"""
+        with database.using_database(self.shard_paths[shard_no]), database.transaction() as conn:
+            for table in USER_SCOPED_TABLES + ANSWER_SCOPED_TABLES + ['GENERATED_IMAGES']:
+                self._insert_rows(conn, table, rows_by_table[table])
+            # 원래 샤드의 워커가 임대 중이던 작업은 대상 샤드의 워커가 바로 가져가도록 대기 상태로 되돌림
+            # (원래 샤드의 워커는 작업 행이 삭제되어 있으므로 결과를 저장하지 못하고 건너뜀)
+            conn.execute("""
+                UPDATE KEYWORD_JOBS
+                SET status = 'pending', lease_owner = NULL, lease_expires_at = NULL
+                WHERE status = 'running'
+                    AND answer_id IN (SELECT answer_id FROM USER_ANSWERS WHERE user_id = ?)
+            """, (user_id,))
+            # 트리거가 쌓은 집계는 복사한 기록으로 다시 계산
+            database.rebuild_daily_activity(user_id)
+
+    def _delete_copied_rows(self, shard_no: int, user_id: int, rows_by_table: Dict[str, list]):
+        """샤드에서 복사해 간 행만 기본키로 삭제합니다. (읽은 뒤에 새로 쓰인 행은 남김)"""
+        with database.using_database(self.shard_paths[shard_no]), database.transaction() as conn:
+            for table in ['GENERATED_IMAGES'] + ANSWER_SCOPED_TABLES + list(reversed(USER_SCOPED_TABLES)):
+                key_columns = TABLE_PRIMARY_KEYS[table]
+                conn.executemany(
+                    f"DELETE FROM {table} WHERE {' AND '.join(f'{column} = ?' for column in key_columns)}",
+                    [tuple(row[column] for column in key_columns) for row in rows_by_table[table]]
+                )
+            database.rebuild_daily_activity(user_id)
+
+    def move_user(self, user_id: int, target_shard: int):
+        """
+        사용자의 모든 데이터를 다른 샤드로 옮깁니다.
+        대상 샤드에 복사 -> 카탈로그 디렉토리 변경 -> 원래 샤드에서 복사한 행만 삭제 순서로 진행하므로,
+        중간에 중단되어도 디렉토리가 가리키는 샤드에는 항상 완전한 데이터가 있습니다.
+
+        이동하는 동안 디렉토리 잠금을 단독으로 잡으므로, 라우터를 거치는 읽기/쓰기는 이동이 끝난 뒤 새 샤드에서 실행됩니다.
+        라우터를 거치지 않는 키워드 작업 워커가 그 사이 원래 샤드에 쓴 행은 남은 행이 없을 때까지 다시 옮기고,
+        옮긴 작업은 대상 샤드에서 대기 상태로 되돌려 다시 추출합니다.
+        """
+        with self._directory_lock(exclusive=True):
+            source_shard = self.shard_of(user_id)
+            if source_shard == target_shard:
+                return
+
+            # 1. 원래 샤드에서 읽어 대상 샤드에 복사
+            rows_by_table = self._read_user_rows(source_shard, user_id)
+            self._copy_user_rows(target_shard, user_id, rows_by_table)
+
+            # 2. 디렉토리 변경
+            with database.using_database(self.catalog_path), database.transaction() as conn:
+                conn.execute("UPDATE USER_SHARDS SET shard_no = ?, updated_at = CURRENT_TIMESTAMP WHERE user_id = ?",
+                             (target_shard, user_id))
+
+            # 3. 원래 샤드에서 복사한 행 삭제, 그 사이 새로 쓰인 행이 있으면 다시 복사
+            while True:
+                self._delete_copied_rows(source_shard, user_id, rows_by_table)
+                rows_by_table = self._read_user_rows(source_shard, user_id)
+                if not any(rows_by_table.values()):
+                    break
+                self._copy_user_rows(target_shard, user_id, rows_by_table)
+
+        print(f"사용자 {user_id}: 샤드 {source_shard} -> {target_shard} 이동 완료")
+
+    def shard_user_counts(self) -> List[int]:
+        """샤드별 사용자 수"""
+        counts = [0] * len(self.shard_paths)
+        with database.using_database(self.catalog_path), database.connection() as conn:
+            for row in conn.execute("SELECT shard_no, COUNT(*) AS user_count FROM USER_SHARDS GROUP BY shard_no"):
+                if row['shard_no'] < len(counts):
+                    counts[row['shard_no']] = row['user_count']
+        return counts
+
+    def rebalance(self) -> int:
+        """
+        샤드별 사용자 수가 고르게 되도록 사용자를 옮깁니다.
+        샤드를 늘린 뒤(샤드 경로 추가) 실행하면 기존 사용자 일부가 새 샤드로 이동합니다.
+
+        Returns:
+            int: 이동한 사용자 수
+        """
+        with database.using_database(self.catalog_path), database.connection() as conn:
+            assignments = [(row['user_id'], row['shard_no'])
+                           for row in conn.execute("SELECT user_id, shard_no FROM USER_SHARDS ORDER BY user_id")]
+
+        shard_count = len(self.shard_paths)
+        users_by_shard: Dict[int, List[int]] = {shard_no: [] for shard_no in range(shard_count)}
+        orphaned = []  # 샤드 수를 줄인 경우 범위를 벗어난 샤드의 사용자
+        for user_id, shard_no in assignments:
+            (users_by_shard[shard_no] if shard_no < shard_count else orphaned).append(user_id)
+
+        # 샤드당 목표 인원(올림)을 넘는 사용자만 옮깁니다.
+        target_size = -(-len(assignments) // shard_count)
+        movable = list(orphaned)
+        for shard_no, users in users_by_shard.items():
+            movable.extend(users[target_size:])
+            users_by_shard[shard_no] = users[:target_size]
+
+        for user_id in movable:
+            target_shard = min(users_by_shard, key=lambda shard_no: len(users_by_shard[shard_no]))
+            self.move_user(user_id, target_shard)
+            users_by_shard[target_shard].append(user_id)
+        return len(movable)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="사용자 샤드 관리 도구")
+    parser.add_argument('--base-dir', default='shards', help="카탈로그/샤드 DB 파일이 있는 디렉토리")
+    parser.add_argument('--shards', type=int, required=True, help="샤드 개수")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('init', help="카탈로그와 샤드 스키마 생성")
+    subparsers.add_parser('status', help="샤드별 사용자 수 출력")
+    move_parser = subparsers.add_parser('move', help="사용자 한 명을 다른 샤드로 이동")
+    move_parser.add_argument('user_id', type=int)
+    move_parser.add_argument('target_shard', type=int)
+    subparsers.add_parser('rebalance', help="샤드별 사용자 수를 고르게 재배치")
+    args = parser.parse_args()
+
+    router = ShardRouter.from_directory(args.base_dir, args.shards)
+    router.create_tables()
+
+    if args.command == 'move':
+        router.move_user(args.user_id, args.target_shard)
+    elif args.command == 'rebalance':
+        print(f"✅ {router.rebalance()}명 이동")
+
+    for shard_no, user_count in enumerate(router.shard_user_counts()):
+        print(f"   샤드 {shard_no}: {user_count}명")
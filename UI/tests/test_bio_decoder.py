@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+BIO 디코더 점검
+NumPy 배열 연산으로 만든 디코더가 토큰마다 도는 기존 파이썬 루프와 같은 구간을 돌려주는지
+무작위 라벨/마스크/offset으로 비교합니다.
+
+실행 (UI 디렉토리에서):
+    python -m pytest -q tests
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+from utils.bio_decoder import B_KEY, I_KEY, decode_bio_batch, decode_char_spans, decode_keywords_batch, pad_rows
+
+
+def reference_token_spans(labels, mask, max_keywords=None):
+    """기존 토큰 루프: B-KEY에서 시작해 이어지는 I-KEY까지, 그 밖의 토큰은 키워드를 끝냄"""
+    spans, start = [], None
+    for position, (label, valid) in enumerate(zip(labels, mask)):
+        if valid and label == I_KEY and start is not None:
+            continue
+        if start is not None:
+            spans.append((start, position))
+            start = None
+        if valid and label == B_KEY:
+            start = position
+    if start is not None:
+        spans.append((start, len(labels)))
+    return spans if max_keywords is None else spans[:max_keywords]
+
+
+def _random_batch(rng, batch, seq):
+    predictions = rng.integers(0, 3, size=(batch, seq))
+    mask = rng.random((batch, seq)) > 0.15
+    return predictions, mask
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("max_keywords", [None, 1, 3])
+def test_token_spans_match_reference_loop(seed, max_keywords):
+    rng = np.random.default_rng(seed)
+    predictions, mask = _random_batch(rng, batch=int(rng.integers(1, 9)), seq=int(rng.integers(1, 40)))
+    expected = [reference_token_spans(row, row_mask, max_keywords) for row, row_mask in zip(predictions, mask)]
+    assert decode_bio_batch(predictions, mask, max_keywords) == expected
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_char_spans_match_reference_loop(seed):
+    rng = np.random.default_rng(seed)
+    batch, seq = 4, 24
+    predictions, attention_mask = _random_batch(rng, batch, seq)
+    # 토큰 길이 1~3자, 맨 앞 [CLS]와 패딩은 (0, 0)
+    lengths = rng.integers(1, 4, size=(batch, seq))
+    ends = np.cumsum(lengths, axis=1)
+    offsets = np.stack([ends - lengths, ends], axis=-1)
+    offsets[:, 0] = 0
+    for row in range(batch):
+        offsets[row, int(rng.integers(seq // 2, seq + 1)):] = 0
+
+    mask = (offsets[..., 1] > offsets[..., 0]) & attention_mask
+    expected = [[(int(row_offsets[start][0]), int(row_offsets[end - 1][1]))
+                 for start, end in reference_token_spans(row, row_mask, 6)]
+                for row, row_mask, row_offsets in zip(predictions, mask, offsets)]
+    assert decode_char_spans(predictions, offsets, attention_mask, max_keywords=6) == expected
+
+
+def test_keywords_are_sliced_from_original_text():
+    texts = ["고향 마을 학교", "부산"]
+    # [CLS] 고향 마을 학교 [SEP] / [CLS] 부 ##산 [SEP] [PAD]
+    predictions = [[0, B_KEY, 0, B_KEY, 0], [0, B_KEY, I_KEY, 0, B_KEY]]
+    offsets = [[(0, 0), (0, 2), (3, 5), (6, 8), (0, 0)], [(0, 0), (0, 1), (1, 2), (0, 0), (0, 0)]]
+    assert decode_keywords_batch(texts, predictions, offsets) == [['고향', '학교'], ['부산']]
+    assert decode_keywords_batch(texts, predictions, offsets, max_keywords=1) == [['고향'], ['부산']]
+
+
+def test_pad_rows_and_empty_inputs():
+    predictions, offsets = pad_rows([[B_KEY, I_KEY], [B_KEY]], [[(0, 1), (1, 2)], [(0, 2)]])
+    assert predictions.shape == (2, 2) and offsets.shape == (2, 2, 2)
+    assert decode_char_spans(predictions, offsets) == [[(0, 2)], [(0, 2)]]
+    assert decode_bio_batch(np.zeros((0, 5), dtype=np.int64)) == []
+    assert decode_bio_batch([[I_KEY, I_KEY, 0]]) == [[]]
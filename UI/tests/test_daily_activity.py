@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+일일 활동 집계 점검
+쓰기 시점에 트리거로 갱신한 USER_DAILY_ACTIVITY가 전체 기록으로부터 다시 계산한 결과
+(rebuild_daily_activity, database.py --rebuild-activity)와 같은지 확인합니다.
+
+실행 (UI 디렉토리에서):
+    python -m pytest -q tests
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+UI_DIR = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(UI_DIR)
+import database
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    db_path = str(tmp_path / database.DATABASE_NAME)
+    with database.using_database(db_path):
+        database.create_tables()
+        yield db_path
+
+
+def _activity_rows():
+    with database.connection() as conn:
+        return [tuple(row) for row in conn.execute("""
+            SELECT user_id, day, new_answers, memory_checks_done, hints_used
+            FROM USER_DAILY_ACTIVITY ORDER BY user_id, day
+        """)]
+
+
+def _record_history():
+    """최초/회상 답변, 같은 날 같은 질문의 중복 점검, 힌트 점검이 섞인 기록"""
+    users = [database.add_user(f"사용자{i}", '1950-01-01', '2024-01-01') for i in range(2)]
+    questions = [database.add_question(f"질문 {i}", 'default') for i in range(3)]
+    for user_id in users:
+        answers = [database.add_user_answer(user_id, question_id, "답변", '2025-06-01', is_initial_answer=True,
+                                            extracted_keywords=['고향'])
+                   for question_id in questions[:2]]
+        database.add_user_answer(user_id, questions[2], "답변", '2025-06-02', is_initial_answer=True)
+        # 6/2: 같은 질문에 fail 뒤 힌트 후 pass (질문 1개로 집계), 다른 질문 pass
+        database.add_recall_with_memory_check(user_id, questions[0], answers[0], '2025-06-02',
+                                              'initial_recall', 'fail', "기억 안 남", user_choice='forgets')
+        database.add_recall_with_memory_check(user_id, questions[0], answers[0], '2025-06-02',
+                                              'post_hint_recall', 'pass', "고향", hint_provided=True)
+        database.add_recall_with_memory_check(user_id, questions[1], answers[1], '2025-06-02',
+                                              'initial_recall', 'pass', "고향")
+        # 6/3: 답변 없이 기억 점검만
+        database.add_memory_check(user_id, questions[0], answers[0], '2025-06-03', 'initial_recall', 'pass')
+    return users
+
+
+def test_triggers_match_rebuild(db_path):
+    users = _record_history()
+    from_triggers = _activity_rows()
+    assert (users[0], '2025-06-01', 2, 0, 0) in from_triggers
+    assert (users[0], '2025-06-02', 1, 2, 1) in from_triggers
+    assert (users[0], '2025-06-03', 0, 1, 0) in from_triggers
+
+    database.rebuild_daily_activity()
+    assert _activity_rows() == from_triggers
+    database.rebuild_daily_activity(users[1])
+    assert _activity_rows() == from_triggers
+
+
+def test_rebuild_repairs_drifted_rows(db_path):
+    users = _record_history()
+    expected = _activity_rows()
+    with database.transaction() as conn:
+        conn.execute("UPDATE USER_DAILY_ACTIVITY SET new_answers = 99 WHERE user_id = ?", (users[0],))
+        conn.execute("DELETE FROM USER_DAILY_ACTIVITY WHERE user_id = ? AND day = '2025-06-03'", (users[1],))
+
+    database.rebuild_daily_activity(users[0])
+    assert (users[0], '2025-06-01', 2, 0, 0) in _activity_rows()
+    database.invalidate_read_cache()
+    assert database.get_daily_activity(users[0], '2025-06-02') == {
+        'new_answers': 1, 'memory_checks_done': 2, 'hints_used': 1}
+
+    # 명령줄 --rebuild-activity는 전체 사용자를 다시 계산
+    database.close_all_connections()
+    subprocess.run([sys.executable, os.path.join(UI_DIR, 'database.py'), '--rebuild-activity'],
+                   cwd=os.path.dirname(db_path), check=True, capture_output=True)
+    assert _activity_rows() == expected
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+진행 상황 카운터 점검
+increment_progress가 행을 만들거나 증가시키는 INSERT ... ON CONFLICT ... RETURNING 한 문으로
+갱신된 행을 돌려주고, 여러 스레드가 동시에 증가시켜도 증가분이 유실되지 않는지 확인합니다.
+
+실행 (UI 디렉토리에서):
+    python -m pytest -q tests
+"""
+
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+import database
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    db_path = str(tmp_path / 'progress.db')
+    with database.using_database(db_path):
+        database.create_tables()
+        yield db_path
+
+
+@pytest.fixture
+def user_id(db_path):
+    return database.add_user("사용자", '1950-01-01', '2024-01-01')
+
+
+def test_first_call_creates_row_and_returns_it(user_id):
+    progress = database.increment_progress(user_id, last_activity_date='2025-06-01', total_initial=1,
+                                           questions_today=1)
+    assert progress['user_id'] == user_id
+    assert progress['total_initial_memory_questions_answered'] == 1
+    assert progress['questions_answered_today'] == 1
+    assert progress['total_revisit_questions_answered'] == 0
+    assert progress['last_activity_date'] == '2025-06-01'
+
+
+def test_later_calls_add_and_keep_last_activity_date(user_id):
+    database.increment_progress(user_id, last_activity_date='2025-06-01', total_revisit=2)
+    progress = database.increment_progress(user_id, total_revisit=3, questions_today=1)
+    assert progress['total_revisit_questions_answered'] == 5
+    assert progress['questions_answered_today'] == 1
+    assert progress['last_activity_date'] == '2025-06-01'
+    assert dict(database.get_user_progress(user_id)) == dict(progress)
+
+
+def test_unknown_counter_is_rejected(user_id):
+    with pytest.raises(ValueError):
+        database.increment_progress(user_id, questions_answered_today=1)
+    assert database.get_user_progress(user_id) is None
+
+
+def test_increment_rolls_back_with_outer_transaction(user_id):
+    database.increment_progress(user_id, total_initial=1)
+    with pytest.raises(RuntimeError):
+        with database.transaction():
+            database.increment_progress(user_id, total_initial=1)
+            raise RuntimeError("답변 저장 실패")
+    assert database.get_user_progress(user_id)['total_initial_memory_questions_answered'] == 1
+
+
+def test_concurrent_increments_are_not_lost(db_path, user_id):
+    threads_count, per_thread = 8, 25
+    errors = []
+
+    def work():
+        try:
+            with database.using_database(db_path):
+                for _ in range(per_thread):
+                    database.increment_progress(user_id, total_new_general=1)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=work) for _ in range(threads_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    database.invalidate_read_cache(user_id)
+    assert database.get_user_progress(user_id)['total_new_general_questions_answered'] == threads_count * per_thread
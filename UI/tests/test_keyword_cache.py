@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+키워드 캐시 점검
+2단계 캐시(메모리 LRU + KEYWORD_CACHE)가 모델 버전별로 분리되는지, 앞뒤 공백만 다른 텍스트가
+같은 항목을 쓰면서 키워드 위치는 각 텍스트 기준으로 옮겨지는지 확인합니다.
+
+실행 (UI 디렉토리에서):
+    python -m pytest -q tests
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+import database
+from utils.keyword_cache import KeywordCache, text_hash
+
+TEXT = "고향 마을 학교"
+SPANS = [{'keyword': '고향', 'start': 0, 'end': 2}, {'keyword': '학교', 'start': 6, 'end': 8}]
+
+
+@pytest.fixture
+def db(tmp_path):
+    with database.using_database(str(tmp_path / 'cache.db')):
+        database.create_tables()
+        yield
+
+
+def _keywords(text, spans):
+    return [text[span['start']:span['end']] for span in spans]
+
+
+def test_whitespace_variants_share_an_entry_with_shifted_offsets(db):
+    cache = KeywordCache('model-a')
+    padded = "  " + TEXT + "\n"
+    cache.put_many([padded], [[{**span, 'start': span['start'] + 2, 'end': span['end'] + 2} for span in SPANS]], 6)
+
+    found = cache.get_many([TEXT, "\t" + TEXT, padded], 6)
+    assert found[0] == SPANS
+    assert [span['start'] for span in found[1]] == [1, 7]
+    for position, text in enumerate([TEXT, "\t" + TEXT, padded]):
+        assert _keywords(text, found[position]) == ['고향', '학교']
+    # DB에는 공백 제거한 텍스트 기준 위치로 저장
+    assert database.get_cached_keywords('model-a', [text_hash(padded)], 6) == {text_hash(TEXT): SPANS}
+
+def test_entries_are_scoped_by_model_version_and_max_keywords(db):
+    KeywordCache('model-a').put_many([TEXT], [SPANS], 6)
+
+    other_version = KeywordCache('model-b')
+    assert other_version.get_many([TEXT], 6) == {}
+    assert KeywordCache('model-a').get_many([TEXT], 3) == {}
+
+    # 새 프로세스(빈 메모리 LRU)에서도 같은 버전이면 DB 캐시에서 찾음
+    restarted = KeywordCache('model-a')
+    assert restarted.get_many([TEXT], 6) == {0: SPANS}
+    assert restarted.get_many([TEXT], 6) == {0: SPANS}
+    stats = restarted.get_stats()
+    assert (stats['db_hits'], stats['memory_hits'], stats['misses']) == (1, 1, 0)
+    assert other_version.get_stats()['misses'] == 1
+
+
+def test_purge_other_versions_keeps_own_rows(db):
+    KeywordCache('model-a').put_many([TEXT, "부산 바다"], [SPANS, []], 6)
+    current = KeywordCache('model-b')
+    current.put_many([TEXT], [SPANS[:1]], 6)
+
+    assert current.purge_other_versions() == 2
+    assert database.count_cached_keywords('model-a') == 0
+    assert database.count_cached_keywords('model-b') == 1
+    assert KeywordCache('model-b').get_many([TEXT], 6) == {0: SPANS[:1]}
+
+
+def test_memory_only_cache_does_not_touch_database(db):
+    cache = KeywordCache('model-a', memory_size=1, persistent=False)
+    cache.put_many([TEXT, "부산 바다"], [SPANS, []], 6)
+    assert cache.get_many([TEXT, "부산 바다"], 6) == {1: []}  # LRU 크기 1: 먼저 넣은 항목은 밀려남
+    assert database.count_cached_keywords('model-a') == 0
+
+
+def test_purge_runs_in_bounded_batches(db):
+    texts = [f"답변 {i}" for i in range(7)]
+    KeywordCache('model-a').put_many(texts, [[]] * len(texts), 6)
+    KeywordCache('model-b').put_many(texts[:2], [[]] * 2, 6)
+
+    assert database.purge_keyword_cache(keep_model_version='model-c', limit=3) == 3
+    current = KeywordCache('model-c')
+    assert current.purge_other_versions(batch_size=2) == 6
+    assert current.get_stats()['purged_rows'] == 6
+    assert database.count_cached_keywords('model-a') == database.count_cached_keywords('model-b') == 0
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+키워드 추출 작업 큐 점검
+KEYWORD_JOBS의 임대(claim), 임대 만료 후 재할당, 실패 시 지수 지연 재시도와 최대 시도 후 'failed' 처리를
+시계를 고정해 확인합니다.
+
+실행 (UI 디렉토리에서):
+    python -m pytest -q tests
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+import database
+
+
+class FakeClock:
+    """database 모듈이 보는 time.time()을 대신하는 고정 시계"""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(database, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def answers(tmp_path, clock):
+    with database.using_database(str(tmp_path / 'jobs.db')):
+        database.create_tables()
+        user_id = database.add_user("사용자", '1950-01-01', '2024-01-01')
+        question_id = database.add_question("고향은 어디인가요?", 'default')
+        yield [database.add_user_answer(user_id, question_id, f"답변 {i}", '2025-06-01',
+                                        is_initial_answer=True, enqueue_keyword_job=True) for i in range(3)]
+
+
+def _job(answer_id):
+    with database.connection() as conn:
+        return dict(conn.execute("SELECT * FROM KEYWORD_JOBS WHERE answer_id = ?", (answer_id,)).fetchone())
+
+
+def _claimed_ids(worker_id, limit=10, lease_seconds=60):
+    return sorted(job['answer_id'] for job in database.claim_keyword_jobs(worker_id, limit, lease_seconds))
+
+
+def test_claim_leases_each_job_to_one_worker(answers):
+    assert _claimed_ids('worker-a', limit=2) == answers[:2]
+    assert _claimed_ids('worker-b') == answers[2:]
+    assert _claimed_ids('worker-c') == []
+    assert database.get_keyword_job_stats() == {'pending': 0, 'running': 3, 'failed': 0}
+
+    assert database.complete_keyword_jobs('worker-a', {answers[0]: ['고향'], answers[1]: []}, 'model-1') == 2
+    assert database.get_keyword_job_stats()['running'] == 1
+    with database.connection() as conn:
+        row = conn.execute("SELECT extracted_keywords, keyword_model_version FROM USER_ANSWERS WHERE answer_id = ?",
+                           (answers[1],)).fetchone()
+    assert tuple(row) == ('[]', 'model-1')
+
+
+def test_expired_lease_is_reclaimed_and_old_worker_cannot_complete(answers, clock):
+    _claimed_ids('worker-a', lease_seconds=30)
+    clock.now += 30
+    assert _claimed_ids('worker-b') == []  # 만료 시각 전에는 다시 가져갈 수 없음
+    clock.now += 1
+    assert _claimed_ids('worker-b') == answers
+    assert _job(answers[0])['attempts'] == 2
+
+    assert database.complete_keyword_jobs('worker-a', {answers[0]: ['고향']}) == 0
+    assert database.fail_keyword_jobs('worker-a', [answers[0]], "늦은 실패", 5, 10, 60) == 0
+    assert _job(answers[0])['lease_owner'] == 'worker-b'
+    assert database.complete_keyword_jobs('worker-b', {answers[0]: ['고향']}) == 1
+
+
+@pytest.fixture
+def single_job(answers):
+    """첫 답변의 작업만 남김"""
+    with database.transaction() as conn:
+        conn.execute("DELETE FROM KEYWORD_JOBS WHERE answer_id != ?", (answers[0],))
+    return answers[0]
+
+
+def _fail_until_given_up(answer_id, clock, max_attempts, retry_base_seconds, retry_max_seconds):
+    """매번 지연 시간이 지나자마자 다시 가져가 실패시키고, 재시도 지연 시간 목록을 반환"""
+    delays = []
+    for attempt in range(1, max_attempts + 1):
+        assert _claimed_ids(f'worker-{attempt}') == [answer_id]
+        given_up = database.fail_keyword_jobs(f'worker-{attempt}', [answer_id], "추출 실패", max_attempts,
+                                              retry_base_seconds, retry_max_seconds)
+        job = _job(answer_id)
+        if job['status'] == 'failed':
+            assert given_up == 1 and attempt == max_attempts
+            return delays
+        assert given_up == 0 and job['status'] == 'pending'
+        delays.append(job['available_at'] - clock.now)
+        clock.now = job['available_at'] - 1
+        assert _claimed_ids('early-worker') == []  # 지연 시간이 지나기 전에는 가져가지 않음
+        clock.now += 1
+    return delays
+
+
+def test_failed_jobs_back_off_then_give_up(single_job, clock):
+    assert _fail_until_given_up(single_job, clock, 4, 10, 60) == [10, 20, 40]
+    job = _job(single_job)
+    assert (job['status'], job['attempts'], job['last_error']) == ('failed', 4, "추출 실패")
+    assert _claimed_ids('worker-5') == []
+
+    assert database.retry_failed_keyword_jobs() == 1
+    job = _job(single_job)
+    assert (job['status'], job['attempts']) == ('pending', 0)
+    assert _claimed_ids('worker-6') == [single_job]
+
+
+def test_backoff_is_capped(single_job, clock):
+    assert _fail_until_given_up(single_job, clock, 5, 10, 25) == [10, 20, 25, 25]
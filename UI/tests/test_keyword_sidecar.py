@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+키워드 추출 사이드카 점검
+가짜 추출기로 사이드카를 띄워, 요청/응답 프로토콜과 소켓 위치 검사, max_keywords 범위 처리를 확인합니다.
+
+실행 (UI 디렉토리에서):
+    python -m pytest -q tests
+"""
+
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+from keyword_sidecar import KeywordSidecarClient, KeywordSidecarServer
+
+
+class FakeExtractor:
+    """공백으로 나눈 단어를 앞에서부터 max_keywords개 돌려주는 추출기"""
+
+    model_version = 'fake-1'
+
+    def __init__(self):
+        self.max_keywords_seen = []
+
+    def extract_keyword_spans_batch(self, texts, batch_size=32, max_keywords=None, raise_on_failure=False):
+        self.max_keywords_seen.append(max_keywords)
+        results = []
+        for text in texts:
+            spans, position = [], 0
+            for word in text.split():
+                start = text.index(word, position)
+                position = start + len(word)
+                spans.append({'keyword': word, 'start': start, 'end': position})
+            results.append(spans[:max_keywords or 6])
+        return results
+
+
+@pytest.fixture
+def sidecar(tmp_path):
+    run_dir = tmp_path / 'run'
+    extractor = FakeExtractor()
+    server = KeywordSidecarServer(str(run_dir / 'keyword.sock'), lambda: extractor, window_ms=1)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, extractor
+    server.shutdown()
+    server.server_close()
+
+
+def test_round_trip_slices_keywords_from_client_text(sidecar):
+    server, _ = sidecar
+    client = KeywordSidecarClient(server.socket_path, fallback_provider=lambda: None)
+    assert client.extract_keywords_batch(["고향 마을 학교", "", "부산 바다"]) == [
+        ['고향', '마을', '학교'], [], ['부산', '바다']]
+    assert client.model_version == 'fake-1'
+    assert client.get_stats()['remote_requests'] == 1
+
+
+def test_server_creates_private_socket_directory(sidecar):
+    server, _ = sidecar
+    assert os.stat(os.path.dirname(server.socket_path)).st_mode & 0o777 == 0o700
+
+
+def test_max_keywords_above_protocol_limit_is_clamped(sidecar):
+    server, extractor = sidecar
+    client = KeywordSidecarClient(server.socket_path, fallback_provider=lambda: None)
+    text = ' '.join(f"단어{i}" for i in range(300))
+    assert len(client.extract_keywords(text, max_keywords=300)) == 255
+    assert extractor.max_keywords_seen[-1] == 255
+    with pytest.raises(ValueError):
+        client.extract_keywords(text, max_keywords=0)
+
+
+def test_world_writable_socket_directory_is_refused(tmp_path):
+    shared_dir = tmp_path / 'shared'
+    shared_dir.mkdir()
+    os.chmod(shared_dir, 0o1777)
+    with pytest.raises(PermissionError):
+        KeywordSidecarServer(str(shared_dir / 'keyword.sock'), FakeExtractor)
+
+    # 클라이언트는 연결하지 않고 프로세스 내 추출기로 처리
+    local = FakeExtractor()
+    client = KeywordSidecarClient(str(shared_dir / 'keyword.sock'), fallback_provider=lambda: local)
+    assert client.extract_keywords("가족 사진") == ['가족', '사진']
+    assert client.get_stats()['fallback_requests'] == 1
+    assert not client.is_available()
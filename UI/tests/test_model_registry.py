@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+모델 레지스트리 점검
+함께 등록한 파일(ONNX 그래프)이 버전 번들과 manifest 체크섬에 들어가는지 확인합니다.
+
+실행 (UI 디렉토리에서):
+    python -m pytest -q tests
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+from model_registry import ModelRegistry, file_sha256
+
+
+@pytest.fixture
+def model_dir(tmp_path):
+    model_dir = tmp_path / "klue_keyword_extractor_20250618_173746"
+    model_dir.mkdir()
+    (model_dir / "config.json").write_text('{"num_hidden_layers": 2}', encoding='utf-8')
+    (model_dir / "model.safetensors").write_bytes(b"weights")
+    (model_dir / "training_config.json").write_text('{"num_hidden_layers": 2}', encoding='utf-8')
+    return str(model_dir)
+
+
+def test_publish_with_extra_files_bundles_onnx_graph(tmp_path, model_dir):
+    onnx_path = tmp_path / "model.onnx"
+    onnx_path.write_bytes(b"onnx graph")
+    registry = ModelRegistry(str(tmp_path / "registry"))
+
+    version = registry.publish(model_dir, extra_files={"model.onnx": str(onnx_path)})
+    bundled = os.path.join(registry.version_path(version), "model.onnx")
+    assert registry.active_version() == version
+    assert os.path.exists(bundled)
+    assert registry.recorded_sha256(bundled) == file_sha256(str(onnx_path))
+    assert registry.get_version(version)["num_hidden_layers"] == 2
+    registry.verify(version)
+
+    # 번들 밖에서 원본을 바꿔도 등록된 버전에는 영향이 없어야 함
+    onnx_path.write_bytes(b"changed")
+    registry.verify(version)
+
+
+def test_publish_without_extra_files_has_no_onnx_graph(tmp_path, model_dir):
+    registry = ModelRegistry(str(tmp_path / "registry"))
+    version = registry.publish(model_dir)
+    assert not os.path.exists(os.path.join(registry.version_path(version), "model.onnx"))
+    assert set(registry.get_version(version)["files"]) == {"config.json", "model.safetensors", "training_config.json"}
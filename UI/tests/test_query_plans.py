@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+주요 조회의 쿼리 플랜 점검
+새로 만든 스키마에서 HOT_QUERIES의 EXPLAIN QUERY PLAN에 전체 테이블 스캔이 없는지 확인합니다.
+HOT_QUERIES는 조회 함수와 같은 SQL 상수를 쓰므로, 실제로 실행되는 조회의 플랜을 점검하게 됩니다.
+
+실행 (UI 디렉토리에서):
+    python -m pytest -q tests
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+import database
+
+
+def test_hot_queries_use_indexes(tmp_path):
+    with database.using_database(str(tmp_path / 'plans.db')):
+        database.create_tables()
+        assert database.find_full_table_scans() == {}
+
+
+def test_hot_queries_cover_every_plan_step(tmp_path):
+    # 모든 HOT_QUERIES가 실제로 실행 가능한 SQL인지 (플랜이 비어 있지 않은지) 확인
+    with database.using_database(str(tmp_path / 'plans.db')):
+        database.create_tables()
+        plans = database.explain_hot_queries()
+    assert set(plans) == set(database.HOT_QUERIES)
+    assert all(plans.values())
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+샤드 라우터 점검
+사용자를 샤드 사이에서 옮겨도 행이 빠지지 않고, 샤드마다 자기 구간의 ID만 발급하는지 확인합니다.
+
+실행 (UI 디렉토리에서):
+    python -m pytest -q tests
+"""
+
+import inspect
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+import database
+import storage_router
+from storage_router import SHARD_ID_BITS, ShardRouter
+
+
+@pytest.fixture
+def router(tmp_path):
+    router = ShardRouter.from_directory(str(tmp_path), 2)
+    router.create_tables()
+    return router
+
+
+def _add_activity(router, user_id, question_id, day):
+    answer_id = router.add_user_answer(user_id, question_id, f"{user_id}번 사용자의 답변", day,
+                                       is_initial_answer=True, enqueue_keyword_job=True)
+    router.set_answer_keywords(user_id, answer_id, ['고향', '학교'])
+    router.add_recall_with_memory_check(user_id, question_id, answer_id, day, 'initial_recall', 'pass', '고향')
+    router.increment_progress(user_id, last_activity_date=day, questions_today=1)
+    return answer_id
+
+
+def _row_counts(router, user_id):
+    with database.using_database(router.path_for_user(user_id)), database.connection() as conn:
+        return {table: conn.execute(f"SELECT COUNT(*) FROM {table} WHERE user_id = ?", (user_id,)).fetchone()[0]
+                for table in storage_router.USER_SCOPED_TABLES + ['USER_DAILY_ACTIVITY']}
+
+
+def _shard_ids(router, shard_no):
+    with database.using_database(router.shard_paths[shard_no]), database.connection() as conn:
+        return [row[0] for row in conn.execute("SELECT answer_id FROM USER_ANSWERS")]
+
+
+def test_move_users_both_ways_keeps_rows_and_id_ranges(router):
+    question_id = router.add_question("어린 시절 살던 동네는 어디인가요?", 'initial_memory')
+    users = [router.add_user(f"사용자{i}", '1950-01-01', '2024-01-01') for i in range(4)]
+    for user_id in users:
+        _add_activity(router, user_id, question_id, '2025-06-01')
+    counts_before = {user_id: _row_counts(router, user_id) for user_id in users}
+
+    # 샤드 1 -> 0, 샤드 0 -> 1로 옮긴 뒤 다시 원래 샤드로
+    first, second = users[0], users[1]
+    first_shard, second_shard = router.shard_of(first), router.shard_of(second)
+    router.move_user(first, second_shard)
+    router.move_user(second, first_shard)
+    assert (router.shard_of(first), router.shard_of(second)) == (second_shard, first_shard)
+
+    # 옮긴 뒤에 새로 발급되는 ID는 각 샤드 자기 구간 안에서, 서로 겹치지 않아야 함
+    for user_id in users:
+        answer_id = _add_activity(router, user_id, question_id, '2025-06-02')
+        assert answer_id >> SHARD_ID_BITS == router.shard_of(user_id)
+    all_ids = _shard_ids(router, 0) + _shard_ids(router, 1)
+    assert len(all_ids) == len(set(all_ids))
+
+    router.move_user(first, first_shard)
+    router.move_user(second, second_shard)
+    for user_id in users:
+        counts = _row_counts(router, user_id)
+        assert counts['USER_ANSWERS'] == 2 * counts_before[user_id]['USER_ANSWERS']
+        assert counts['MEMORY_CHECKS'] == 2 * counts_before[user_id]['MEMORY_CHECKS']
+        assert counts['ANSWER_KEYWORDS'] == 2 * counts_before[user_id]['ANSWER_KEYWORDS']
+        assert counts['USERS'] == counts['USER_PROGRESS'] == 1
+        assert counts['USER_DAILY_ACTIVITY'] == 2
+        assert router.get_daily_activity(user_id, '2025-06-02') == {
+            'new_answers': 1, 'memory_checks_done': 1, 'hints_used': 0}
+        assert router.get_user_progress(user_id)['questions_answered_today'] == 2
+
+    # 원래 샤드에는 옮긴 사용자의 행이 남지 않아야 함
+    with database.using_database(router.shard_paths[second_shard]), database.connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM USER_ANSWERS WHERE user_id = ?", (first,)).fetchone()[0] == 0
+
+
+def test_moved_keyword_jobs_are_claimable_on_target(router):
+    question_id = router.add_question("첫 직장은 어디였나요?", 'initial_memory')
+    user_id = router.add_user("사용자", '1950-01-01', '2024-01-01')
+    answer_id = router.add_user_answer(user_id, question_id, "시장 옆 양복점", '2025-06-01',
+                                       is_initial_answer=True, enqueue_keyword_job=True)
+    source_shard = router.shard_of(user_id)
+    with database.using_database(router.shard_paths[source_shard]):
+        assert [job['answer_id'] for job in database.claim_keyword_jobs('old-worker', 10, 60)] == [answer_id]
+
+    router.move_user(user_id, 1 - source_shard)
+    with database.using_database(router.shard_paths[1 - source_shard]):
+        assert [job['answer_id'] for job in database.claim_keyword_jobs('new-worker', 10, 60)] == [answer_id]
+    with database.using_database(router.shard_paths[source_shard]):
+        assert database.complete_keyword_jobs('old-worker', {answer_id: ['양복점']}) == 0
+
+
+def test_conflicting_copy_aborts_move(router):
+    question_id = router.add_question("결혼식은 어디서 했나요?", 'initial_memory')
+    user_id = router.add_user("사용자", '1950-01-01', '2024-01-01')
+    answer_id = _add_activity(router, user_id, question_id, '2025-06-01')
+    source_shard = router.shard_of(user_id)
+    target_shard = 1 - source_shard
+    # 대상 샤드에 같은 answer_id의 행이 이미 있으면 이동은 취소되고 원래 샤드의 데이터는 그대로 남아야 함
+    with database.using_database(router.shard_paths[target_shard]), database.transaction() as conn:
+        conn.execute("""
+            INSERT INTO USER_ANSWERS (answer_id, user_id, question_id, answer_text, answer_date, is_initial_answer)
+            VALUES (?, 999, ?, '다른 사용자', '2025-06-01', 1)
+        """, (answer_id, question_id))
+
+    with pytest.raises(database.sqlite3.IntegrityError):
+        router.move_user(user_id, target_shard)
+    assert router.shard_of(user_id) == source_shard
+    assert _row_counts(router, user_id)['USER_ANSWERS'] == 2
+
+
+def test_every_database_function_has_a_routing_rule(router):
+    rules = [storage_router.USER_ROUTED_FUNCTIONS, storage_router.ROUTER_METHODS,
+             storage_router.SHARD_LOCAL_FUNCTIONS, storage_router.DATABASE_HELPERS]
+    functions = {name for name, func in vars(database).items()
+                 if inspect.isfunction(func) and func.__module__ == 'database' and not name.startswith('_')}
+    for name in functions:
+        assert sum(name in rule for rule in rules) == 1, name
+    for name in storage_router.ROUTER_METHODS:
+        assert name in vars(ShardRouter), name
+    for name in storage_router.SHARD_LOCAL_FUNCTIONS:
+        with pytest.raises(AttributeError, match="샤드마다"):
+            getattr(router, name)
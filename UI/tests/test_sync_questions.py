@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+질문 동기화 점검
+sync_questions가 내용 해시로 기존 question_id를 유지하면서 새 질문만 추가하고,
+공백만 달라진 질문은 표기만 갱신하는지 확인합니다.
+
+실행 (UI 디렉토리에서):
+    python -m pytest -q tests
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+import database
+
+
+@pytest.fixture
+def db(tmp_path):
+    with database.using_database(str(tmp_path / 'questions.db')):
+        database.create_tables()
+        yield
+
+
+def _questions():
+    with database.connection() as conn:
+        return {row['question_text']: (row['question_id'], row['question_type'])
+                for row in conn.execute("SELECT question_id, question_text, question_type FROM QUESTIONS")}
+
+
+def test_first_sync_inserts_each_question_once(db):
+    result = database.sync_questions(["고향은 어디인가요?", "  고향은 어디인가요?  ", "첫 직장은?", ""], 'default')
+    assert result == {'inserted': 2, 'updated': 0, 'unchanged': 0, 'missing': 0}
+    assert set(_questions()) == {"고향은 어디인가요?", "첫 직장은?"}
+
+
+def test_resync_keeps_ids_and_updates_only_changed_spacing(db):
+    database.sync_questions(["고향은 어디인가요?", "첫 직장은?", "좋아하던 노래는?"], 'default')
+    ids_before = {text: question_id for text, (question_id, _) in _questions().items()}
+
+    result = database.sync_questions(["고향은  어디인가요?", "첫 직장은?", "결혼식 장소는?"], 'default')
+    assert result == {'inserted': 1, 'updated': 1, 'unchanged': 1, 'missing': 1}
+
+    questions = _questions()
+    assert questions["고향은  어디인가요?"][0] == ids_before["고향은 어디인가요?"]
+    assert questions["첫 직장은?"][0] == ids_before["첫 직장은?"]
+    # 목록에서 빠진 질문은 삭제하지 않음
+    assert questions["좋아하던 노래는?"][0] == ids_before["좋아하던 노래는?"]
+    assert "고향은 어디인가요?" not in questions
+
+
+def test_unchanged_sync_writes_nothing(db):
+    database.sync_questions(["고향은 어디인가요?"], 'default')
+    with database.connection() as conn:
+        changes_before = conn.total_changes
+        assert database.sync_questions(["고향은 어디인가요?"], 'default') == {
+            'inserted': 0, 'updated': 0, 'unchanged': 1, 'missing': 0}
+        assert conn.total_changes == changes_before
+
+
+def test_existing_question_of_other_type_keeps_its_type(db):
+    question_id = database.add_question("고향은 어디인가요?", 'csv_import')
+    result = database.sync_questions(["고향은 어디인가요?", "첫 직장은?"], 'default')
+    assert result == {'inserted': 1, 'updated': 0, 'unchanged': 1, 'missing': 0}
+    assert _questions()["고향은 어디인가요?"] == (question_id, 'csv_import')
+    assert database.add_question("  고향은   어디인가요? ", 'default') == question_id
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+쓰기 지연 큐 점검
+flush가 앞서 제출한 작업의 커밋을 기다리는지, 실패한 작업만 격리되는지,
+종료와 제출이 겹쳐도 받아들인 작업은 모두 커밋되고 나머지는 거절되는지 확인합니다.
+
+실행 (UI 디렉토리에서):
+    python -m pytest -q tests
+"""
+
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+import database
+from utils.write_behind import WriteBehindQueue
+
+
+@pytest.fixture
+def db(tmp_path):
+    with database.using_database(str(tmp_path / 'write_behind.db')):
+        database.create_tables()
+        user_id = database.add_user("사용자", '1950-01-01', '2024-01-01')
+        question_id = database.add_question("고향은 어디인가요?", 'default')
+        yield user_id, question_id
+
+
+@pytest.fixture
+def write_queue():
+    write_queue = WriteBehindQueue(max_queue_size=16, max_batch=4)
+    yield write_queue
+    write_queue.shutdown(timeout=5)
+
+
+def _answer_count(user_id):
+    with database.connection() as conn:
+        return conn.execute("SELECT COUNT(*) FROM USER_ANSWERS WHERE user_id = ?", (user_id,)).fetchone()[0]
+
+
+def _submit_answer(write_queue, user_id, question_id, text="답변"):
+    return write_queue.submit(database.add_user_answer, user_id, question_id, text, '2025-06-01',
+                              is_initial_answer=True, extracted_keywords=['고향'])
+
+
+def test_flush_waits_for_earlier_writes(db, write_queue):
+    user_id, question_id = db
+    futures = [_submit_answer(write_queue, user_id, question_id) for _ in range(10)]
+    write_queue.flush(timeout=5)
+    assert all(future.done() for future in futures)
+    assert _answer_count(user_id) == 10
+    assert database.get_daily_activity(user_id, '2025-06-01')['new_answers'] == 10
+    assert write_queue.stats['committed'] == 10
+    assert len({future.result() for future in futures}) == 10
+
+
+def test_failed_write_is_isolated_from_its_batch(db, write_queue):
+    user_id, question_id = db
+
+    def broken_write():
+        raise ValueError("잘못된 쓰기")
+
+    first = _submit_answer(write_queue, user_id, question_id)
+    broken = write_queue.submit(broken_write)
+    last = _submit_answer(write_queue, user_id, question_id)
+    write_queue.flush(timeout=5)
+
+    with pytest.raises(ValueError):
+        broken.result()
+    assert first.result() and last.result()
+    assert _answer_count(user_id) == 2
+    assert write_queue.stats['failed'] == 1
+
+
+def test_shutdown_commits_pending_and_rejects_new_writes(db, write_queue):
+    user_id, question_id = db
+    futures = [_submit_answer(write_queue, user_id, question_id) for _ in range(5)]
+    write_queue.shutdown(timeout=5)
+    assert all(future.done() and future.exception() is None for future in futures)
+    assert _answer_count(user_id) == 5
+    with pytest.raises(RuntimeError):
+        _submit_answer(write_queue, user_id, question_id)
+    write_queue.flush(timeout=5)  # 종료 뒤 flush는 바로 반환
+
+
+def test_shutdown_racing_with_submitters(db, tmp_path):
+    user_id, question_id = db
+    db_path = database.current_database()
+    write_queue = WriteBehindQueue(max_queue_size=4, max_batch=2)
+    accepted, rejected = [], []
+    start = threading.Barrier(5)
+
+    def submitter():
+        with database.using_database(db_path):
+            start.wait()
+            for _ in range(50):
+                try:
+                    accepted.append(_submit_answer(write_queue, user_id, question_id))
+                except RuntimeError:
+                    rejected.append(1)
+
+    threads = [threading.Thread(target=submitter) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    start.wait()
+    write_queue.shutdown(timeout=10)
+    for thread in threads:
+        thread.join(timeout=10)
+
+    # 받아들인 작업은 모두 커밋되고, 종료 뒤에 제출된 작업은 거절됨
+    assert len(accepted) + len(rejected) == 200
+    assert all(future.done() and future.exception() is None for future in accepted)
+    assert _answer_count(user_id) == len(accepted) == write_queue.stats['committed']
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+BIO 키워드 구간 디코더 (훈련 스크립트와 UI 키워드 추출기가 함께 사용)
+[batch, seq] 라벨 ID 배열 전체를 NumPy 배열 연산으로 한 번에 디코딩합니다. 토큰마다 파이썬 루프를 돌지 않습니다.
+
+규칙 (기존 토큰 루프와 같음):
+    - B-KEY 토큰에서 새 키워드가 시작되고, 바로 이어지는 I-KEY 토큰들까지가 한 키워드입니다.
+    - 앞에 B-KEY가 없는 I-KEY, O, 마스크된 토큰(특수 토큰/패딩)은 키워드를 끝냅니다.
+    - 행마다 앞에서부터 max_keywords개까지만 돌려줍니다.
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from utils.constants import MAX_KEYWORDS_PER_ANSWER
+except ImportError:
+    # 단독으로 사용되거나 경로 문제가 있을 경우를 대비한 기본값
+    MAX_KEYWORDS_PER_ANSWER = 6
+
+LABEL2ID = {"O": 0, "B-KEY": 1, "I-KEY": 2}
+B_KEY = LABEL2ID["B-KEY"]
+I_KEY = LABEL2ID["I-KEY"]
+
+
+def _token_spans(predictions, mask=None, max_keywords: Optional[int] = None
+                 ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    행 번호, 시작 토큰, 끝 토큰(포함), 행별 구간 수를 평평한 배열로 돌려줍니다. (행 → 시작 위치 순서)
+    predictions/mask는 NumPy 배열, CPU torch 텐서, 중첩 리스트 모두 가능합니다.
+    """
+    predictions = np.asarray(predictions)
+    batch, seq = predictions.shape
+    valid = np.ones((batch, seq), dtype=bool) if mask is None else np.asarray(mask, dtype=bool)
+    is_b = valid & (predictions == B_KEY)
+    is_i = valid & (predictions == I_KEY)
+
+    # 각 위치에서 (자신 포함) 가장 가까운 앞쪽의 I-KEY가 아닌 토큰 위치.
+    # 그 토큰이 B-KEY면 현재 토큰은 키워드 안에 있습니다. (B-KEY 자신, 또는 B-KEY에 이어진 I-KEY)
+    anchor = np.maximum.accumulate(np.where(is_i, -1, np.arange(seq)), axis=1)
+    inside = (anchor >= 0) & np.take_along_axis(is_b, np.maximum(anchor, 0), axis=1)
+
+    # 키워드의 끝: 다음 토큰이 같은 키워드를 잇지 않는 (다음 토큰이 키워드 안의 I-KEY가 아닌) 위치
+    continues = np.zeros_like(inside)
+    continues[:, :-1] = inside[:, 1:] & is_i[:, 1:]
+    is_end = inside & ~continues
+
+    # np.nonzero는 행 우선 순서이고 행마다 시작/끝 개수가 같으므로, 두 배열의 같은 위치가 같은 키워드입니다.
+    rows, starts = np.nonzero(is_b)
+    _, ends = np.nonzero(is_end)
+    counts = np.bincount(rows, minlength=batch)
+
+    if max_keywords is not None:
+        # 행 안에서의 순번(0, 1, 2, ...)이 max_keywords 미만인 구간만 남깁니다.
+        rank = np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts)
+        keep = rank < max_keywords
+        rows, starts, ends = rows[keep], starts[keep], ends[keep]
+        counts = np.minimum(counts, max_keywords)
+    return rows, starts, ends, counts
+
+
+def _split_rows(counts: np.ndarray, *columns: np.ndarray) -> List[List[Tuple[int, ...]]]:
+    """평평한 구간 배열들을 행별 튜플 리스트로 나눕니다."""
+    if len(counts) == 0:
+        return []
+    bounds = np.cumsum(counts)[:-1]
+    split = [np.split(column, bounds) for column in columns]
+    return [list(zip(*(part.tolist() for part in parts))) for parts in zip(*split)]
+
+
+def decode_bio_batch(predictions, mask=None, max_keywords: Optional[int] = None) -> List[List[Tuple[int, int]]]:
+    """
+    행별 키워드 토큰 구간 [(시작, 끝(미포함)), ...]을 반환합니다.
+
+    Args:
+        predictions: [batch, seq] 라벨 ID (O=0, B-KEY=1, I-KEY=2)
+        mask: [batch, seq] True인 토큰만 디코딩 (None이면 전체)
+        max_keywords: 행당 최대 키워드 수 (None이면 제한 없음)
+    """
+    _, starts, ends, counts = _token_spans(predictions, mask, max_keywords)
+    return _split_rows(counts, starts, ends + 1)
+
+
+def decode_char_spans(predictions, offsets, attention_mask=None,
+                      max_keywords: Optional[int] = MAX_KEYWORDS_PER_ANSWER) -> List[List[Tuple[int, int]]]:
+    """
+    fast 토크나이저의 offset_mapping으로 행별 키워드의 원문 문자 구간 [(시작, 끝(미포함)), ...]을 반환합니다.
+    offset이 비어 있는 토큰(특수 토큰 (0, 0), 패딩)은 키워드 경계로만 취급합니다.
+
+    Args:
+        offsets: [batch, seq, 2] 토큰별 (시작, 끝) 문자 위치
+        attention_mask: [batch, seq] (생략 가능, 패딩 offset이 (0, 0)이면 없어도 같은 결과)
+    """
+    offsets = np.asarray(offsets, dtype=np.int64)
+    mask = offsets[..., 1] > offsets[..., 0]
+    if attention_mask is not None:
+        mask &= np.asarray(attention_mask, dtype=bool)
+    rows, starts, ends, counts = _token_spans(predictions, mask, max_keywords)
+    return _split_rows(counts, offsets[rows, starts, 0], offsets[rows, ends, 1])
+
+
+def decode_keywords_batch(texts: Sequence[str], predictions, offsets, attention_mask=None,
+                          max_keywords: Optional[int] = MAX_KEYWORDS_PER_ANSWER) -> List[List[str]]:
+    """행별 키워드 문자열 리스트 (원문에서 그대로 잘라냄)"""
+    char_spans = decode_char_spans(predictions, offsets, attention_mask, max_keywords)
+    return [[text[start:end] for start, end in spans] for text, spans in zip(texts, char_spans)]
+
+
+def pad_rows(predictions_list: Sequence[Sequence[int]], offsets_list: Sequence[Sequence[Tuple[int, int]]]
+             ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    길이가 다른 행들의 예측/offset을 [batch, seq] / [batch, seq, 2] 배열로 채웁니다.
+    패딩 위치의 offset은 (0, 0)이므로 decode_char_spans에서 자동으로 제외됩니다.
+    """
+    seq = max((len(offsets) for offsets in offsets_list), default=0)
+    predictions = np.zeros((len(offsets_list), seq), dtype=np.int64)
+    offsets = np.zeros((len(offsets_list), seq, 2), dtype=np.int64)
+    for row, (row_predictions, row_offsets) in enumerate(zip(predictions_list, offsets_list)):
+        length = len(row_offsets)
+        if length:
+            predictions[row, :length] = np.asarray(row_predictions)[:length]
+            offsets[row, :length] = row_offsets
+    return predictions, offsets
@@ -11,9 +11,44 @@ MAX_DAILY_MEMORY_CHECKS = 1  # 30일 이후 매일 기억 점검 개수
 
 # === 키워드 추출 및 유사도 검사 ===
 MAX_KEYWORDS_PER_ANSWER = 6  # 답변당 최대 키워드 개수
+KEYWORD_MAX_LENGTH = 128  # 키워드 추출 모델 입력 최대 토큰 길이 ([CLS], [SEP] 포함)
+KEYWORD_BATCH_SIZE = 32  # 배치 키워드 추출 시 한 번의 forward pass에 넣는 최대 텍스트 수
+KEYWORD_SLIDING_WINDOW = True  # 최대 길이를 넘는 답변을 겹치는 창으로 나눠 뒷부분까지 키워드 추출
+KEYWORD_WINDOW_STRIDE = 32  # 이웃한 창끼리 겹치는 토큰 수
+KEYWORD_CACHE_ENABLED = True  # 같은 답변 텍스트의 키워드 추출 결과를 메모리 LRU + SQLite에 캐시
+KEYWORD_CACHE_MEMORY_SIZE = 4096  # 메모리 LRU에 보관할 최대 항목 수
+KEYWORD_CACHE_PURGE_BATCH = 500  # 이전 모델 버전의 DB 캐시를 지울 때 한 트랜잭션에서 삭제할 최대 행 수
+KEYWORD_BACKEND = 'torch'  # 키워드 추출 추론 백엔드: 'torch', 'onnx' (fp32), 'onnx-int8' (CPU 서버 권장)
+MODEL_REGISTRY_POLL_SECONDS = 5.0  # 모델 레지스트리 활성 버전 확인 주기 (초), 0이면 자동 교체 끔
 KEYWORD_MATCH_THRESHOLD = 3  # 통과를 위한 최소 키워드 매칭 개수
 SIMILARITY_THRESHOLD = 0.5  # 유사도 임계값 (0~1)
 
+# === 키워드 추출 마이크로 배칭 설정 ===
+INFERENCE_BATCH_WINDOW_MS = 10  # 첫 요청 후 다른 세션의 요청을 더 모으는 최대 대기 시간 (밀리초, 5~20 권장)
+INFERENCE_MAX_BATCH = 32  # 한 번의 forward pass에 넣는 최대 요청 수
+INFERENCE_QUEUE_SIZE = 1000  # 대기 중인 추출 요청 최대 개수
+INFERENCE_TIMEOUT_SECONDS = 10.0  # 요청 하나가 결과를 기다리는 최대 시간 (초)
+
+# === 키워드 추출 사이드카 설정 ===
+KEYWORD_SIDECAR_SOCKET = ''  # 사이드카 Unix 소켓 경로 (예: /run/memory_app/keyword.sock, 다른 사용자가 쓸 수 없는 디렉토리), 빈 문자열이면 사이드카 사용 안 함
+KEYWORD_SIDECAR_TIMEOUT_SECONDS = 30.0  # 사이드카 요청 하나의 최대 대기 시간 (초)
+KEYWORD_SIDECAR_RETRY_SECONDS = 30.0  # 사이드카 연결 실패 후 다시 연결을 시도하기까지 프로세스 내 모델을 쓰는 시간 (초)
+
+# === 사전(lexicon) 기반 빠른 키워드 추출 설정 ===
+KEYWORD_LEXICON_MODE = 'fallback'  # 'off', 'fallback' (모델을 쓸 수 없을 때 사전 사용), 'shed' (fallback + 모델 호출이 몰리면 사전 사용)
+KEYWORD_LEXICON_SHED_IN_FLIGHT = 2  # 'shed' 모드에서 프로세스당 동시에 모델로 보내는 최대 호출 수 (넘치는 호출은 사전으로 처리)
+KEYWORD_LEXICON_MIN_LENGTH = 2  # 사전에 넣을 키워드 최소 글자 수 (한 글자 키워드는 오탐이 많음)
+KEYWORD_LEXICON_MIN_ANSWERS = 2  # 과거 추출 결과의 키워드는 이 개수 이상의 답변에서 나온 것만 사전에 포함
+
+# === 키워드 추출 작업 큐 설정 ===
+KEYWORD_JOB_WORKERS = 1  # Streamlit 프로세스 안에서 KEYWORD_JOBS를 처리하는 워커 스레드 수
+KEYWORD_JOB_BATCH_SIZE = 16  # 워커가 한 번에 가져와 한 배치로 추출하는 작업 수
+KEYWORD_JOB_POLL_SECONDS = 2.0  # 대기열이 비었을 때 다시 확인하는 주기 (초)
+KEYWORD_JOB_LEASE_SECONDS = 120  # 작업 임대 시간 (초). 워커가 죽으면 이 시간 뒤 다른 워커가 다시 처리
+KEYWORD_JOB_MAX_ATTEMPTS = 5  # 이 횟수만큼 실패한 작업은 'failed'로 남김
+KEYWORD_JOB_RETRY_BASE_SECONDS = 10  # 첫 재시도 지연 (초). 실패할 때마다 두 배
+KEYWORD_JOB_RETRY_MAX_SECONDS = 3600  # 재시도 지연 최대값 (초)
+
 # === 이미지 생성 설정 ===
 OPENAI_MODEL = "dall-e-3"  # OpenAI 이미지 생성 모델
 IMAGE_SIZE = "1024x1024"  # 생성될 이미지 크기
@@ -22,6 +57,11 @@ IMAGE_QUALITY = "standard"  # 이미지 품질 (standard, hd)
 # === 데이터베이스 설정 ===
 DATABASE_NAME = 'memory_app.db'
 
+# === 쓰기 지연(write-behind) 설정 ===
+WRITE_BEHIND_ENABLED = False  # True면 답변/기억 점검 저장을 백그라운드 쓰기 스레드에서 묶어서 커밋
+WRITE_BEHIND_QUEUE_SIZE = 1000  # 대기 중인 쓰기 작업 최대 개수 (가득 차면 제출하는 쪽이 대기)
+WRITE_BEHIND_MAX_BATCH = 64  # 한 트랜잭션으로 묶어 커밋할 최대 작업 수
+
 # === 서비스 상태 ===
 SERVICE_STATUS_ACTIVE = 'active'
 SERVICE_STATUS_COMPLETED = 'completed'
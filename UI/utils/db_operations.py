@@ -8,18 +8,9 @@ class DBOperations:
     
     @staticmethod
     def initialize_questions(questions: List[str]) -> None:
-        """CSV에서 로드한 질문들을 DB에 초기화"""
+        """CSV에서 로드한 질문들을 DB에 초기화 (이미 있는 질문은 건너뜀)"""
         database.create_tables()
-        
-        conn = database.get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT COUNT(*) FROM QUESTIONS")
-        count = cursor.fetchone()[0]
-        conn.close()
-        
-        if count == 0:
-            for question_text in questions:
-                database.add_question(question_text, 'csv_import')
+        database.sync_questions(questions, 'csv_import')
     
     @staticmethod
     def get_or_create_user(user_info: dict) -> Optional[int]:
@@ -29,78 +20,45 @@ class DBOperations:
         diagnosis_date = user_info.get('진단일', date.today()).strftime('%Y-%m-%d')
         
         # 동일한 사용자 확인
-        conn = database.get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT user_id FROM USERS 
-            WHERE name = ? AND birth_date = ?
-        """, (name, birth_date))
-        existing_user = cursor.fetchone()
-        conn.close()
+        with database.connection() as conn:
+            existing_user = conn.execute(database.USER_BY_NAME_BIRTH_QUERY, (name, birth_date)).fetchone()
         
         if existing_user:
             return existing_user[0]
         else:
-            # 새 사용자 생성
-            user_id = database.add_user(name, birth_date, diagnosis_date)
-            database.create_or_update_user_progress(
-                user_id,
-                last_activity_date=date.today().strftime('%Y-%m-%d'),
-                current_service_day=1
-            )
+            # 새 사용자 생성 (사용자와 진행 상황을 하나의 트랜잭션으로 저장)
+            with database.transaction():
+                user_id = database.add_user(name, birth_date, diagnosis_date)
+                database.create_or_update_user_progress(
+                    user_id,
+                    last_activity_date=date.today().strftime('%Y-%m-%d'),
+                    current_service_day=1
+                )
             return user_id
     
     @staticmethod
     def get_today_activity_count(user_id: int) -> Tuple[int, int]:
-        """오늘의 활동 현황 확인 - 완료된 활동만 카운트"""
-        today_str = date.today().strftime('%Y-%m-%d')
-        
-        conn = database.get_db_connection()
-        cursor = conn.cursor()
-        
-        # 오늘 답변한 새로운 질문 수
-        cursor.execute("""
-            SELECT COUNT(*) FROM USER_ANSWERS 
-            WHERE user_id = ? AND answer_date = ? AND is_initial_answer = 1
-        """, (user_id, today_str))
-        new_answers_today = cursor.fetchone()[0]
-        
-        # 오늘 완료한 기억 점검 수 (진행 중인 것 제외)
-        # 'requires_image'는 아직 진행 중인 상태이므로 제외
-        cursor.execute("""
-            SELECT COUNT(*) FROM MEMORY_CHECKS 
-            WHERE user_id = ? AND check_date = ? 
-            AND check_result NOT IN ('requires_image', 'pending')
-        """, (user_id, today_str))
-        memory_checks_today = cursor.fetchone()[0]
-        
-        conn.close()
-        return new_answers_today, memory_checks_today
+        """오늘의 활동 현황 확인 - 완료된 활동만 카운트 (일일 활동 집계 테이블 조회)"""
+        return database.get_today_activity_count(user_id)
     
     @staticmethod
     def get_completed_questions(user_id: int) -> Set[int]:
         """기억 확인이 완료된 질문들 가져오기"""
-        conn = database.get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT DISTINCT question_id FROM MEMORY_CHECKS 
-            WHERE user_id = ? AND result IN ('failed_verification', 'complete_failure')
-        """, (user_id,))
-        completed = cursor.fetchall()
-        conn.close()
+        with database.connection() as conn:
+            completed = conn.execute("""
+                SELECT DISTINCT question_id FROM MEMORY_CHECKS 
+                WHERE user_id = ? AND result IN ('failed_verification', 'complete_failure')
+            """, (user_id,)).fetchall()
         return set(row[0] for row in completed)
     
     @staticmethod
     def get_reusable_questions(user_id: int, similarity_threshold: float = 0.7) -> Set[int]:
         """재사용 가능한 질문들 가져오기"""
-        conn = database.get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT DISTINCT question_id FROM MEMORY_CHECKS 
-            WHERE user_id = ? AND result = 'passed' AND similarity_score >= ?
-        """, (user_id, similarity_threshold))
-        reusable = cursor.fetchall()
-        conn.close()
+        with database.connection() as conn:
+            reusable = conn.execute("""
+                SELECT DISTINCT question_id FROM MEMORY_CHECKS 
+                WHERE user_id = ? AND result = 'passed' AND similarity_score >= ?
+            """, (user_id, similarity_threshold)).fetchall()
         return set(row[0] for row in reusable)
     
     @staticmethod
@@ -108,14 +66,11 @@ class DBOperations:
         """진행 중인 기억 점검이 있는지 확인"""
         today_str = date.today().strftime('%Y-%m-%d')
         
-        conn = database.get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT COUNT(*) FROM MEMORY_CHECKS 
-            WHERE user_id = ? AND check_date = ? 
-            AND result IN ('requires_image', 'pending')
-        """, (user_id, today_str))
-        count = cursor.fetchone()[0]
-        conn.close()
+        with database.connection() as conn:
+            count = conn.execute("""
+                SELECT COUNT(*) FROM MEMORY_CHECKS 
+                WHERE user_id = ? AND check_date = ? 
+                AND result IN ('requires_image', 'pending')
+            """, (user_id, today_str)).fetchone()[0]
         
         return count > 0
\ No newline at end of file
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+키워드 추출 결과 2단계 캐시
+1단계: 프로세스 메모리의 LRU, 2단계: SQLite KEYWORD_CACHE 테이블 (프로세스 재시작 후에도 유지)
+키는 (모델 버전 해시, 앞뒤 공백을 제거한 텍스트의 SHA-256, 최대 키워드 수)입니다.
+모델 교체 중이거나 사이드카와 앱 프로세스가 서로 다른 버전을 쓸 수 있으므로, 이전 버전의 DB 캐시는
+캐시를 만들 때 지우지 않고, 레지스트리 감시 스레드가 활성 버전으로 교체한 뒤 purge_other_versions()로 나눠서 지웁니다.
+(수동 정리: python database.py --purge-keyword-cache)
+"""
+
+import hashlib
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import database
+
+try:
+    from utils.constants import KEYWORD_CACHE_MEMORY_SIZE, KEYWORD_CACHE_PURGE_BATCH
+except ImportError:
+    # 단독으로 사용되거나 경로 문제가 있을 경우를 대비한 기본값
+    KEYWORD_CACHE_MEMORY_SIZE = 4096
+    KEYWORD_CACHE_PURGE_BATCH = 500
+
+
+def text_hash(text: str) -> str:
+    """캐시 키로 쓰는 텍스트 해시 (앞뒤 공백 제거 후 SHA-256)"""
+    return hashlib.sha256(text.strip().encode('utf-8')).hexdigest()
+
+
+def _leading_whitespace(text: str) -> int:
+    return len(text) - len(text.lstrip())
+
+
+def _shift_spans(spans: List[Dict], delta: int) -> List[Dict]:
+    """키워드 구간의 문자 위치를 delta만큼 옮긴 복사본"""
+    return [{**span, 'start': span['start'] + delta, 'end': span['end'] + delta} for span in spans]
+
+
+class KeywordCache:
+    """모델 버전 하나에 대한 키워드 추출 결과 캐시"""
+
+    def __init__(self, model_version: str, memory_size: int = KEYWORD_CACHE_MEMORY_SIZE,
+                 persistent: bool = True):
+        """
+        Args:
+            model_version: 모델 가중치와 추론 설정으로 만든 버전 해시
+            memory_size: 메모리 LRU에 보관할 최대 항목 수
+            persistent: False면 SQLite 캐시를 사용하지 않음
+        """
+        self.model_version = model_version
+        self.memory_size = memory_size
+        self.persistent = persistent
+        self._memory: "OrderedDict[Tuple[str, int], List[Dict]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {'memory_hits': 0, 'db_hits': 0, 'misses': 0, 'purged_rows': 0}
+
+    def purge_other_versions(self, batch_size: int = KEYWORD_CACHE_PURGE_BATCH) -> int:
+        """
+        이 캐시의 모델 버전이 아닌 DB 캐시 행을 batch_size행씩 나눠 삭제합니다. 삭제된 행 수 반환
+        배치마다 트랜잭션을 따로 커밋하므로 답변 저장 등 다른 쓰기를 오래 막지 않습니다.
+        다른 프로세스가 아직 이전 버전을 쓰고 있으면 그 캐시도 지워지므로, 모든 프로세스가 교체된 뒤에 호출합니다.
+        """
+        if not self.persistent:
+            return 0
+        purged = 0
+        while True:
+            deleted = database.purge_keyword_cache(keep_model_version=self.model_version, limit=batch_size)
+            purged += deleted
+            if deleted < batch_size:
+                break
+        with self._lock:
+            self.stats['purged_rows'] += purged
+        if purged:
+            print(f"🧹 다른 모델 버전의 키워드 캐시 {purged}건을 삭제했습니다.")
+        return purged
+
+    def get_many(self, texts: List[str], max_keywords: int) -> Dict[int, List[Dict]]:
+        """
+        캐시에 있는 텍스트의 키워드 구간을 반환합니다. (입력 위치 -> 원래 텍스트 기준 구간)
+        DB에서 찾은 항목은 메모리 LRU에도 올립니다.
+        """
+        found: Dict[int, List[Dict]] = {}
+        missing: Dict[str, List[int]] = {}
+        with self._lock:
+            for position, text in enumerate(texts):
+                key = (text_hash(text), max_keywords)
+                spans = self._memory.get(key)
+                if spans is None:
+                    missing.setdefault(key[0], []).append(position)
+                    continue
+                self._memory.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                found[position] = _shift_spans(spans, _leading_whitespace(text))
+
+        if missing and self.persistent:
+            try:
+                stored = database.get_cached_keywords(self.model_version, list(missing), max_keywords)
+            except sqlite3.Error as e:
+                print(f"⚠️ 키워드 캐시 조회 실패: {e}")
+                stored = {}
+            with self._lock:
+                for hash_value, spans in stored.items():
+                    self._remember((hash_value, max_keywords), spans)
+                    for position in missing.pop(hash_value):
+                        self.stats['db_hits'] += 1
+                        found[position] = _shift_spans(spans, _leading_whitespace(texts[position]))
+
+        with self._lock:
+            self.stats['misses'] += sum(len(positions) for positions in missing.values())
+        return found
+
+    def put_many(self, texts: List[str], results: List[List[Dict]], max_keywords: int):
+        """새로 추출한 결과를 메모리와 DB 캐시에 저장합니다."""
+        to_store = {}
+        with self._lock:
+            for text, spans in zip(texts, results):
+                hash_value = text_hash(text)
+                normalized = _shift_spans(spans, -_leading_whitespace(text))
+                self._remember((hash_value, max_keywords), normalized)
+                to_store[hash_value] = normalized
+
+        if to_store and self.persistent:
+            try:
+                database.put_cached_keywords(self.model_version, max_keywords, to_store)
+            except sqlite3.Error as e:
+                print(f"⚠️ 키워드 캐시 저장 실패: {e}")
+
+    def clear(self):
+        """메모리 캐시를 비웁니다. (DB 캐시는 유지)"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+
+    def _remember(self, key: Tuple[str, int], spans: List[Dict]):
+        """메모리 LRU에 넣고, 가득 차면 가장 오래 쓰지 않은 항목을 버립니다. (self._lock 안에서 호출)"""
+        if key in self._memory:
+            self._memory_bytes -= self._entry_size(key, self._memory.pop(key))
+        self._memory[key] = spans
+        self._memory_bytes += self._entry_size(key, spans)
+        while len(self._memory) > self.memory_size:
+            old_key, old_spans = self._memory.popitem(last=False)
+            self._memory_bytes -= self._entry_size(old_key, old_spans)
+
+    @staticmethod
+    def _entry_size(key: Tuple[str, int], spans: List[Dict]) -> int:
+        """항목 하나가 차지하는 대략적인 메모리 (바이트)"""
+        size = sys.getsizeof(key) + sys.getsizeof(key[0]) + sys.getsizeof(spans)
+        for span in spans:
+            size += sys.getsizeof(span) + sys.getsizeof(span['keyword'])
+        return size
+
+    def get_stats(self) -> Dict:
+        """적중률과 메모리 사용량 등 캐시 통계"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['memory_entries'] = len(self._memory)
+            stats['memory_bytes'] = self._memory_bytes
+        lookups = stats['memory_hits'] + stats['db_hits'] + stats['misses']
+        stats['hit_ratio'] = (stats['memory_hits'] + stats['db_hits']) / lookups if lookups else 0.0
+        stats['model_version'] = self.model_version
+        if self.persistent:
+            try:
+                stats['db_entries'] = database.count_cached_keywords(self.model_version)
+            except sqlite3.Error:
+                stats['db_entries'] = None
+        return stats
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+쓰기 지연(write-behind) 큐
+답변/기억 점검 저장 작업을 하나의 쓰기 스레드가 모아서 한 트랜잭션으로 커밋(group commit)합니다.
+"""
+
+import atexit
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+import database
+
+try:
+    from utils.constants import WRITE_BEHIND_ENABLED, WRITE_BEHIND_QUEUE_SIZE, WRITE_BEHIND_MAX_BATCH
+except ImportError:
+    # 단독으로 사용되거나 경로 문제가 있을 경우를 대비한 기본값
+    WRITE_BEHIND_ENABLED = False
+    WRITE_BEHIND_QUEUE_SIZE = 1000
+    WRITE_BEHIND_MAX_BATCH = 64
+
+
+class _WriteOperation:
+    """큐에 들어가는 쓰기 작업 하나 (함수 호출 + 결과를 전달할 Future)"""
+
+    __slots__ = ('func', 'args', 'kwargs', 'db_path', 'future')
+
+    def __init__(self, func: Optional[Callable], args: tuple, kwargs: dict):
+        self.func = func  # None이면 flush/shutdown 표시용 작업
+        self.args = args
+        self.kwargs = kwargs
+        self.db_path = database.current_database()  # 제출한 스레드가 사용하던 DB 파일
+        self.future: Future = Future()
+
+
+class WriteBehindQueue:
+    """하나의 쓰기 스레드가 제한된 크기의 큐를 비우며 작업들을 묶어서 커밋하는 클래스"""
+
+    def __init__(self, max_queue_size: int = WRITE_BEHIND_QUEUE_SIZE, max_batch: int = WRITE_BEHIND_MAX_BATCH):
+        """
+        Args:
+            max_queue_size: 대기 중인 작업 최대 개수. 가득 차면 submit()이 자리가 날 때까지 대기합니다.
+            max_batch: 한 트랜잭션으로 묶어 커밋할 최대 작업 수.
+        """
+        self.max_batch = max_batch
+        self._queue: "queue.Queue[_WriteOperation]" = queue.Queue(maxsize=max_queue_size)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._stop_marker: Optional[_WriteOperation] = None  # shutdown()이 넣는 마지막 flush 표시
+        self.stats = {'committed': 0, 'failed': 0, 'batches': 0}
+        # 쓰기 스레드가 위의 속성을 모두 볼 수 있도록 마지막에 시작
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+
+    def submit(self, func: Callable, *args, **kwargs) -> Future:
+        """
+        쓰기 작업을 큐에 넣고 바로 반환합니다.
+        반환된 Future는 작업이 커밋된 뒤 함수의 반환값(예: 새 행 ID)으로 완료됩니다.
+        """
+        operation = _WriteOperation(func, args, kwargs)
+        # shutdown()도 같은 잠금 안에서 _closed를 설정하고 종료 표시를 넣으므로, 종료 표시 뒤에 들어가는 작업이 없습니다.
+        # (큐가 가득 차서 기다리는 동안에도 쓰기 스레드는 잠금 없이 큐를 비우므로 교착되지 않음)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("쓰기 큐가 이미 종료되었습니다.")
+            self._queue.put(operation)
+        return operation.future
+
+    def flush(self, timeout: Optional[float] = None):
+        """지금까지 제출된 모든 작업이 커밋될 때까지 기다립니다."""
+        with self._lock:
+            if self._closed:
+                marker = self._stop_marker  # 종료 중이면 종료 표시가 처리될 때까지 대기
+            else:
+                marker = _WriteOperation(None, (), {})
+                self._queue.put(marker)
+        marker.future.result(timeout=timeout)
+
+    def shutdown(self, timeout: Optional[float] = None):
+        """새 작업을 더 받지 않고, 남은 작업을 모두 커밋한 뒤 쓰기 스레드를 종료합니다."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._stop_marker = _WriteOperation(None, (), {})
+            self._queue.put(self._stop_marker)
+        self._stop_marker.future.result(timeout=timeout)
+        self._thread.join(timeout=timeout)
+
+    def qsize(self) -> int:
+        """현재 대기 중인 작업 수"""
+        return self._queue.qsize()
+
+    def _run(self):
+        """쓰기 스레드 메인 루프"""
+        while True:
+            batch = [self._queue.get()]
+            # 이미 쌓여 있는 작업을 최대 max_batch개까지 한 번에 가져옵니다.
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            # DB 파일별로 묶어서 커밋 (using_database()로 다른 DB를 쓰던 작업이 섞일 수 있음)
+            writes_by_database: Dict[str, List[_WriteOperation]] = {}
+            for operation in batch:
+                if operation.func is not None:
+                    writes_by_database.setdefault(operation.db_path, []).append(operation)
+            for db_path, writes in writes_by_database.items():
+                with database.using_database(db_path):
+                    self._commit_batch(writes)
+
+            # flush 표시는 앞선 작업들이 모두 커밋된 뒤에 완료 처리
+            for operation in batch:
+                if operation.func is None:
+                    operation.future.set_result(None)
+
+            # 종료 표시는 큐의 마지막 작업이므로, 처리했으면 끝냅니다.
+            if self._stop_marker is not None and any(operation is self._stop_marker for operation in batch):
+                return
+
+    def _commit_batch(self, batch: List[_WriteOperation]):
+        """작업들을 하나의 트랜잭션으로 실행하고, 커밋된 뒤에 각 Future를 완료합니다."""
+        try:
+            results = []
+            with database.transaction():
+                for operation in batch:
+                    results.append(operation.func(*operation.args, **operation.kwargs))
+        except Exception:
+            # 하나라도 실패하면 배치 전체가 롤백되므로, 하나씩 다시 실행하여 실패한 작업만 격리합니다.
+            for operation in batch:
+                self._commit_single(operation)
+            return
+
+        self.stats['batches'] += 1
+        self.stats['committed'] += len(batch)
+        for operation, result in zip(batch, results):
+            operation.future.set_result(result)
+
+    def _commit_single(self, operation: _WriteOperation):
+        """작업 하나를 자체 트랜잭션으로 실행합니다."""
+        try:
+            with database.transaction():
+                result = operation.func(*operation.args, **operation.kwargs)
+        except Exception as e:
+            print(f"❌ 쓰기 작업 실패 ({getattr(operation.func, '__name__', operation.func)}): {e}")
+            self.stats['failed'] += 1
+            operation.future.set_exception(e)
+        else:
+            self.stats['batches'] += 1
+            self.stats['committed'] += 1
+            operation.future.set_result(result)
+
+
+# 싱글톤 패턴으로 쓰기 큐 인스턴스 관리
+_write_queue = None
+_write_queue_lock = threading.Lock()
+
+def get_write_queue() -> WriteBehindQueue:
+    """쓰기 큐 싱글톤 인스턴스 반환. 처음 생성될 때 프로세스 종료 시 flush하도록 등록합니다."""
+    global _write_queue
+    if _write_queue is None:
+        with _write_queue_lock:
+            if _write_queue is None:
+                _write_queue = WriteBehindQueue()
+                atexit.register(_write_queue.shutdown)
+    return _write_queue
+
+def submit_write(func: Callable, *args, **kwargs) -> Future:
+    """
+    쓰기 작업을 실행합니다.
+    WRITE_BEHIND_ENABLED이면 쓰기 큐에 넣고, 아니면 바로 실행한 뒤 완료된 Future를 반환합니다.
+    결과(행 ID 등)가 필요한 호출부는 future.result()로 커밋을 기다릴 수 있습니다.
+    """
+    if WRITE_BEHIND_ENABLED:
+        return get_write_queue().submit(func, *args, **kwargs)
+
+    future: Future = Future()
+    future.set_result(func(*args, **kwargs))
+    return future
+
+def flush_writes(timeout: Optional[float] = None):
+    """
+    지금까지 제출된 쓰기 작업이 모두 커밋될 때까지 기다립니다.
+    방금 제출한 쓰기의 결과(오늘의 점검 수 등)를 다시 읽기 전에 호출합니다. 쓰기 큐를 쓰지 않으면 바로 반환
+    """
+    if _write_queue is not None:
+        _write_queue.flush(timeout=timeout)
+
+def get_write_queue_stats() -> Dict[str, Any]:
+    """쓰기 큐 통계 (큐가 아직 만들어지지 않았으면 빈 통계)"""
+    if _write_queue is None:
+        return {'committed': 0, 'failed': 0, 'batches': 0, 'pending': 0}
+    return {**_write_queue.stats, 'pending': _write_queue.qsize()}
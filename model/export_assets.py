@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+키워드 추출 모델 번들 변환 도구
+훈련된 state_dict(.pt 또는 klue_keyword_extractor_*/pytorch_model.bin)를 UI의 키워드 추출기가
+네트워크 없이 한 번에 읽을 수 있는 번들 디렉토리로 변환합니다.
+
+번들 구성 (<모델 이름>_bundle/):
+    config.json          모델 구조 설정 (층 수는 state_dict에서 읽어 증류 학생 모델도 그대로 지원)
+    model.safetensors    가중치 (메모리 맵으로 읽을 수 있는 형식)
+    토크나이저 파일       vocab.txt, tokenizer.json, tokenizer_config.json 등
+    training_config.json 원본 훈련 설정 (있으면 복사) + 변환 정보
+
+사용법 (model 디렉토리에서, 허브 또는 HF 캐시에 klue/bert-base가 있는 환경에서 한 번만):
+    python export_assets.py --model best_model_20250618_173746.pt
+    python export_assets.py --model klue_keyword_extractor_20250618_173746 --output-dir ../UI/keyword_model_bundle
+"""
+
+import argparse
+import json
+import os
+import re
+from datetime import datetime
+from typing import Dict
+
+import torch
+from safetensors.torch import save_file
+from transformers import AutoConfig, AutoTokenizer
+
+from export_onnx import BASE_MODEL, LABEL2ID, file_sha256, resolve_state_dict_path
+
+WEIGHTS_FILENAME = "model.safetensors"
+LAYER_KEY = re.compile(r"^bert\.encoder\.layer\.(\d+)\.")
+
+
+def default_output_dir(model_path: str) -> str:
+    """best_model_X.pt → best_model_X_bundle, klue_keyword_extractor_X/ → klue_keyword_extractor_X_bundle"""
+    name = os.path.basename(os.path.normpath(model_path))
+    return f"{os.path.splitext(name)[0]}_bundle"
+
+
+def count_layers(state_dict: Dict[str, torch.Tensor]) -> int:
+    """state_dict의 bert.encoder.layer.N 키로 인코더 층 수를 셉니다."""
+    layers = {int(match.group(1)) for key in state_dict if (match := LAYER_KEY.match(key))}
+    if not layers:
+        raise ValueError("state_dict에서 BERT 인코더 층을 찾을 수 없습니다.")
+    return max(layers) + 1
+
+
+def export_bundle(state_dict_path: str, output_dir: str) -> Dict:
+    """state_dict를 config.json + model.safetensors + 토크나이저 번들로 저장합니다."""
+    state_dict = torch.load(state_dict_path, map_location='cpu')
+
+    config = AutoConfig.from_pretrained(BASE_MODEL)
+    config.num_hidden_layers = count_layers(state_dict)
+    vocab_size = state_dict["bert.embeddings.word_embeddings.weight"].shape[0]
+    if vocab_size != config.vocab_size:
+        raise ValueError(f"어휘 크기가 {BASE_MODEL} 설정과 다릅니다: {vocab_size} != {config.vocab_size}")
+
+    os.makedirs(output_dir, exist_ok=True)
+    config.save_pretrained(output_dir)
+    AutoTokenizer.from_pretrained(BASE_MODEL, use_fast=True).save_pretrained(output_dir)
+
+    # safetensors는 연속된 메모리의 텐서만 저장할 수 있습니다. (position_ids 버퍼는 expand된 뷰)
+    weights_path = os.path.join(output_dir, WEIGHTS_FILENAME)
+    save_file({key: tensor.contiguous() for key, tensor in state_dict.items()}, weights_path,
+              metadata={"format": "pt"})
+
+    training_config = {}
+    source_config = os.path.join(os.path.dirname(state_dict_path), "training_config.json")
+    if os.path.exists(source_config):
+        with open(source_config, 'r', encoding='utf-8') as f:
+            training_config = json.load(f)
+    training_config.update({
+        "model_type": training_config.get("model_type", "klue_keyword_extractor"),
+        "base_model": BASE_MODEL,
+        "num_hidden_layers": config.num_hidden_layers,
+        "num_labels": len(LABEL2ID),
+        "label2id": training_config.get("label2id", LABEL2ID),
+        "source_state_dict": os.path.abspath(state_dict_path),
+        "source_sha256": file_sha256(state_dict_path),
+        "bundle_created_at": datetime.now().isoformat(),
+    })
+    with open(os.path.join(output_dir, "training_config.json"), 'w', encoding='utf-8') as f:
+        json.dump(training_config, f, ensure_ascii=False, indent=2)
+
+    size_mb = round(os.path.getsize(weights_path) / 2 ** 20, 1)
+    print(f"✅ 번들 저장 완료: {output_dir}/ (층 {config.num_hidden_layers}개, 가중치 {size_mb}MB)")
+    return training_config
+
+
+def main():
+    parser = argparse.ArgumentParser(description="키워드 추출 모델을 오프라인 번들(config + safetensors + 토크나이저)로 변환")
+    parser.add_argument('--model', required=True, help="state_dict(.pt) 파일 또는 klue_keyword_extractor_* 디렉토리")
+    parser.add_argument('--output-dir', help="결과 디렉토리 (생략 시 <모델 이름>_bundle)")
+    args = parser.parse_args()
+
+    state_dict_path = resolve_state_dict_path(args.model)
+    export_bundle(state_dict_path, args.output_dir or default_output_dir(args.model))
+
+
+if __name__ == "__main__":
+    main()
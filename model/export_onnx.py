@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+키워드 추출 모델 ONNX 변환 도구
+훈련된 state_dict(.pt 또는 klue_keyword_extractor_*/pytorch_model.bin, 증류한 학생 모델 포함)를 ONNX 그래프(fp32)와
+동적 양자화된 int8 그래프로 변환하고, 라벨링 데이터로 torch 경로와 BIO 태그 일치율(parity)과
+백엔드별 CPU 지연 시간을 측정합니다.
+
+사용법 (model 디렉토리에서):
+    python export_onnx.py --model best_model_20250618_173746.pt
+    python export_onnx.py --model klue_keyword_extractor_20250618_173746 --samples 300
+    python export_onnx.py --model best_model_20250618_173746.pt --parity-only   # 이미 변환된 그래프 재검증
+    python export_onnx.py --model klue_keyword_extractor_20250618_173746 --publish   # 레지스트리에 등록
+
+생성 결과 (<모델 이름>_onnx/):
+    model.onnx, model.int8.onnx, 토크나이저 파일, export_config.json, parity_report.json
+
+--publish를 주면 parity를 통과한 뒤 모델 디렉토리와 ONNX 그래프를 묶어 모델 레지스트리에 새 버전으로
+등록하고 활성화합니다. (onnx 백엔드는 활성 버전에 ONNX 그래프가 없으면 시작하지 않음)
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List
+
+import numpy as np
+import torch
+import torch.nn as nn
+from transformers import AutoTokenizer
+
+from improved_klue_training_keywordLimit import KLUEKeywordExtractor
+
+# 체크섬 계산과 버전 등록은 UI의 모델 레지스트리 구현을 그대로 사용
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "UI"))
+from model_registry import DEFAULT_REGISTRY_DIR, ModelRegistry, file_sha256
+
+BASE_MODEL = "klue/bert-base"
+MAX_LENGTH = 128
+OPSET_VERSION = 14
+LABEL2ID = {"O": 0, "B-KEY": 1, "I-KEY": 2}
+LABELED_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "labeled_data")
+
+FP32_FILENAME = "model.onnx"
+INT8_FILENAME = "model.int8.onnx"
+
+
+class _LogitsOnly(nn.Module):
+    """ONNX 그래프 출력이 logits 텐서 하나가 되도록 감싸는 래퍼"""
+
+    def __init__(self, model: nn.Module):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_ids, attention_mask):
+        return self.model(input_ids=input_ids, attention_mask=attention_mask)["logits"]
+
+
+def resolve_state_dict_path(model_path: str) -> str:
+    """모델 디렉토리가 주어지면 그 안의 pytorch_model.bin 경로를 반환합니다."""
+    if os.path.isdir(model_path):
+        model_path = os.path.join(model_path, "pytorch_model.bin")
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(f"모델 파일을 찾을 수 없습니다: {model_path}")
+    return model_path
+
+
+def default_output_dir(model_path: str) -> str:
+    """best_model_X.pt → best_model_X_onnx, klue_keyword_extractor_X/ → klue_keyword_extractor_X_onnx"""
+    name = os.path.basename(os.path.normpath(model_path))
+    return f"{os.path.splitext(name)[0]}_onnx"
+
+
+def count_encoder_layers(state_dict: Dict) -> int:
+    """state_dict에 들어 있는 BERT 인코더 층 수 (bert.encoder.layer.<N>.* 키의 N + 1)"""
+    layers = {int(key.split('.')[3]) for key in state_dict if key.startswith("bert.encoder.layer.")}
+    if not layers:
+        raise ValueError("state_dict에 BERT 인코더 층이 없습니다.")
+    return max(layers) + 1
+
+
+def load_torch_model(model_path: str) -> KLUEKeywordExtractor:
+    """
+    state_dict(.pt) 또는 klue_keyword_extractor_* 디렉토리를 CPU 평가 모드 모델로 조립합니다.
+    층 수는 디렉토리의 training_config.json(num_hidden_layers)을 따르고, 설정이 없는 .pt 파일이면
+    가중치의 인코더 층 수로 정하므로 증류한 학생 모델(best_student_*.pt)도 그대로 변환됩니다.
+    """
+    num_hidden_layers = None
+    if os.path.isdir(model_path):
+        config_path = os.path.join(model_path, "training_config.json")
+        if os.path.exists(config_path):
+            with open(config_path, 'r', encoding='utf-8') as f:
+                num_hidden_layers = json.load(f).get("num_hidden_layers")
+
+    state_dict = torch.load(resolve_state_dict_path(model_path), map_location='cpu')
+    model = KLUEKeywordExtractor(BASE_MODEL, num_labels=len(LABEL2ID),
+                                 num_hidden_layers=num_hidden_layers or count_encoder_layers(state_dict))
+    model.load_state_dict(state_dict)
+    model.eval()
+    return model
+
+
+def export(model: KLUEKeywordExtractor, tokenizer, output_dir: str, source_path: str) -> Dict:
+    """fp32 ONNX 그래프를 내보내고 int8 동적 양자화 그래프를 만듭니다."""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    os.makedirs(output_dir, exist_ok=True)
+    fp32_path = os.path.join(output_dir, FP32_FILENAME)
+    int8_path = os.path.join(output_dir, INT8_FILENAME)
+
+    # 배치 크기와 문장 길이가 달라질 수 있도록 두 축을 동적으로 지정
+    dummy = tokenizer(["ONNX 변환용 예시 문장입니다.", "짧은 문장"], padding=True, return_tensors='pt')
+    print(f"🔄 ONNX(fp32) 변환 중: {fp32_path}")
+    with torch.no_grad():
+        torch.onnx.export(
+            _LogitsOnly(model),
+            (dummy['input_ids'], dummy['attention_mask']),
+            fp32_path,
+            input_names=['input_ids', 'attention_mask'],
+            output_names=['logits'],
+            dynamic_axes={
+                'input_ids': {0: 'batch', 1: 'sequence'},
+                'attention_mask': {0: 'batch', 1: 'sequence'},
+                'logits': {0: 'batch', 1: 'sequence'},
+            },
+            opset_version=OPSET_VERSION,
+            do_constant_folding=True,
+        )
+
+    # 선형 계층 가중치를 int8로 저장하고 활성값은 실행 시점에 양자화 (CPU 전용 서버용)
+    print(f"🔄 int8 동적 양자화 중: {int8_path}")
+    quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+
+    tokenizer.save_pretrained(output_dir)
+    config = {
+        "model_type": "klue_keyword_extractor_onnx",
+        "base_model": BASE_MODEL,
+        "num_hidden_layers": model.bert.config.num_hidden_layers,
+        "source_state_dict": os.path.abspath(source_path),
+        "source_sha256": file_sha256(source_path),
+        "opset_version": OPSET_VERSION,
+        "max_length": MAX_LENGTH,
+        "label2id": LABEL2ID,
+        "files": {
+            "fp32": {"path": FP32_FILENAME, "size_mb": round(os.path.getsize(fp32_path) / 2 ** 20, 1)},
+            "int8": {"path": INT8_FILENAME, "size_mb": round(os.path.getsize(int8_path) / 2 ** 20, 1)},
+        },
+        "created_at": datetime.now().isoformat(),
+    }
+    with open(os.path.join(output_dir, "export_config.json"), 'w', encoding='utf-8') as f:
+        json.dump(config, f, ensure_ascii=False, indent=2)
+
+    print(f"✅ 변환 완료: fp32 {config['files']['fp32']['size_mb']}MB, int8 {config['files']['int8']['size_mb']}MB")
+    return config
+
+
+def publish_with_onnx(model_dir: str, output_dir: str, report: Dict, registry_dir: str = DEFAULT_REGISTRY_DIR,
+                      activate: bool = True) -> str:
+    """모델 디렉토리에 ONNX 그래프와 변환 기록을 더해 레지스트리에 새 버전으로 등록합니다."""
+    extra_files = {name: os.path.join(output_dir, name)
+                   for name in (FP32_FILENAME, INT8_FILENAME, "export_config.json", "parity_report.json")
+                   if os.path.exists(os.path.join(output_dir, name))}
+    return ModelRegistry(registry_dir).publish(model_dir, metrics={"onnx_parity": report.get("parity", {})},
+                                               activate=activate, extra_files=extra_files,
+                                               notes=f"ONNX 변환: {os.path.abspath(output_dir)}")
+
+
+def load_parity_texts(limit: int) -> List[str]:
+    """라벨링 데이터의 원본 답변 (중복 제거)"""
+    texts = []
+    for file_path in sorted(glob.glob(os.path.join(LABELED_DATA_DIR, "KLUE_tokenized_answers*_labeled.json"))):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for sample in json.load(f):
+                text = sample.get('original_answer')
+                if text and text not in texts:
+                    texts.append(text)
+    if not texts:
+        raise FileNotFoundError(f"라벨링 데이터를 찾을 수 없습니다: {LABELED_DATA_DIR}")
+    return texts[:limit]
+
+
+def _percentile_ms(timings: List[float], pct: float) -> float:
+    return round(float(np.percentile(timings, pct)) * 1000, 3)
+
+
+def check_parity_and_latency(model: KLUEKeywordExtractor, tokenizer, output_dir: str, samples: int) -> Dict:
+    """
+    라벨링 데이터의 문장마다 torch / onnx-fp32 / onnx-int8로 BIO 태그를 예측하여
+    torch 대비 토큰 단위 일치율, 문장 단위 완전 일치율, 단건 지연 시간(p50/p95)을 계산합니다.
+    """
+    import onnxruntime as ort
+
+    texts = load_parity_texts(samples)
+    encodings = [tokenizer(text, truncation=True, max_length=MAX_LENGTH, return_tensors='np') for text in texts]
+
+    def run_torch(encoding):
+        with torch.no_grad():
+            logits = model(input_ids=torch.from_numpy(encoding['input_ids']),
+                           attention_mask=torch.from_numpy(encoding['attention_mask']))['logits']
+        return logits.numpy()
+
+    def onnx_runner(filename):
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        session = ort.InferenceSession(os.path.join(output_dir, filename), options,
+                                       providers=['CPUExecutionProvider'])
+        return lambda encoding: session.run(['logits'], {
+            'input_ids': encoding['input_ids'].astype(np.int64),
+            'attention_mask': encoding['attention_mask'].astype(np.int64),
+        })[0]
+
+    backends = {'torch': run_torch, 'onnx': onnx_runner(FP32_FILENAME), 'onnx-int8': onnx_runner(INT8_FILENAME)}
+    tags, latency = {}, {}
+    for name, run in backends.items():
+        run(encodings[0])  # 예열
+        timings, predictions = [], []
+        for encoding in encodings:
+            start = time.perf_counter()
+            logits = run(encoding)
+            timings.append(time.perf_counter() - start)
+            predictions.append(logits[0].argmax(-1)[1:-1])  # [CLS], [SEP] 제외
+        tags[name] = predictions
+        latency[name] = {'p50_ms': _percentile_ms(timings, 50), 'p95_ms': _percentile_ms(timings, 95),
+                         'mean_ms': round(float(np.mean(timings)) * 1000, 3)}
+
+    report = {'samples': len(texts), 'latency': latency, 'parity': {}}
+    total_tokens = sum(len(p) for p in tags['torch'])
+    for name in ('onnx', 'onnx-int8'):
+        same_tokens = sum(int((a == b).sum()) for a, b in zip(tags['torch'], tags[name]))
+        same_sentences = sum(bool((a == b).all()) for a, b in zip(tags['torch'], tags[name]))
+        report['parity'][name] = {
+            'token_agreement': round(same_tokens / max(total_tokens, 1), 5),
+            'sentence_agreement': round(same_sentences / len(texts), 5),
+        }
+
+    with open(os.path.join(output_dir, "parity_report.json"), 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(f"\n📊 백엔드별 결과 ({len(texts)}개 문장, 단건 추론)")
+    for name in backends:
+        line = f"   {name:<10} p50 {latency[name]['p50_ms']:>8.2f}ms  p95 {latency[name]['p95_ms']:>8.2f}ms"
+        if name in report['parity']:
+            parity = report['parity'][name]
+            line += (f"  태그 일치 {parity['token_agreement']:.2%}"
+                     f" (문장 완전 일치 {parity['sentence_agreement']:.2%})")
+        print(line)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="키워드 추출 모델 ONNX(fp32/int8) 변환 및 검증")
+    parser.add_argument('--model', required=True, help="state_dict(.pt) 파일 또는 klue_keyword_extractor_* 디렉토리")
+    parser.add_argument('--output-dir', help="결과 디렉토리 (생략 시 <모델 이름>_onnx)")
+    parser.add_argument('--samples', type=int, default=200, help="parity/지연 시간 측정에 사용할 문장 수")
+    parser.add_argument('--parity-only', action='store_true', help="변환 없이 기존 그래프만 검증")
+    parser.add_argument('--skip-parity', action='store_true', help="변환만 하고 검증 생략")
+    parser.add_argument('--min-agreement', type=float, default=0.999, help="fp32 그래프의 최소 토큰 태그 일치율")
+    parser.add_argument('--min-agreement-int8', type=float, default=0.98, help="int8 그래프의 최소 토큰 태그 일치율")
+    parser.add_argument('--publish', action='store_true',
+                        help="parity 통과 후 모델 디렉토리 + ONNX 그래프를 레지스트리에 새 버전으로 등록하고 활성화")
+    parser.add_argument('--registry-dir', default=DEFAULT_REGISTRY_DIR, help="모델 레지스트리 디렉토리")
+    args = parser.parse_args()
+    if args.publish and (args.skip_parity or not os.path.isdir(args.model)):
+        parser.error("--publish는 klue_keyword_extractor_* 디렉토리와 parity 검증이 필요합니다.")
+
+    state_dict_path = resolve_state_dict_path(args.model)
+    output_dir = args.output_dir or default_output_dir(args.model)
+    model = load_torch_model(args.model)
+    tokenizer = AutoTokenizer.from_pretrained(BASE_MODEL)
+
+    if not args.parity_only:
+        export(model, tokenizer, output_dir, state_dict_path)
+    if args.skip_parity:
+        return
+
+    report = check_parity_and_latency(model, tokenizer, output_dir, args.samples)
+    failures = [
+        f"{name}: {report['parity'][name]['token_agreement']:.2%} < {threshold:.2%}"
+        for name, threshold in (('onnx', args.min_agreement), ('onnx-int8', args.min_agreement_int8))
+        if report['parity'][name]['token_agreement'] < threshold
+    ]
+    if failures:
+        print(f"❌ BIO 태그 일치율 기준 미달: {', '.join(failures)}")
+        raise SystemExit(1)
+    print(f"✅ parity 통과. 리포트: {os.path.join(output_dir, 'parity_report.json')}")
+    if args.publish:
+        publish_with_onnx(args.model, output_dir, report, args.registry_dir)
+
+
+if __name__ == "__main__":
+    main()
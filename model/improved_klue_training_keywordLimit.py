@@ -8,24 +8,35 @@
 import json
 import torch
 import torch.nn as nn
+import torch.nn.functional as F
 import torch.optim as optim
 from torch.utils.data import Dataset, DataLoader
 from transformers import AutoTokenizer, AutoModel, get_linear_schedule_with_warmup
 from torch.optim import AdamW
+from safetensors.torch import save_file
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report, f1_score, precision_recall_fscore_support
 import numpy as np
 import pandas as pd
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional
+import argparse
+import sqlite3
+import time
 import glob
 import re
 from tqdm import tqdm
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
+import sys
 import shutil
 from datetime import datetime
 
+# UI의 모델 레지스트리에 훈련 결과를 등록하기 위해 경로 추가
+# (BIO 디코더도 UI 키워드 추출기와 같은 구현을 사용)
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "UI"))
+from utils.bio_decoder import MAX_KEYWORDS_PER_ANSWER, decode_bio_batch, decode_keywords_batch
+
 def cleanup_previous_training():
     """이전 학습 결과 정리"""
     print("🧹 이전 학습 결과 정리 중...")
@@ -227,14 +238,47 @@ def load_labeled_data():
 class KeywordDataset(Dataset):
     """키워드 추출용 데이터셋"""
     
-    def __init__(self, samples: List[Dict], max_length: int = 128):
-        self.samples = samples
+    def __init__(self, samples: List[Dict], max_length: int = 128, tokenizer=None, stride: int = 32):
+        """
+        Args:
+            tokenizer: 주어지면 max_length를 넘는 샘플을 stride 토큰씩 겹치는 창으로 나눠 뒷부분도 학습합니다.
+                (없으면 기존처럼 max_length에서 자름)
+            stride: 이웃한 창끼리 겹치는 토큰 수
+        """
         self.max_length = max_length
         
         # 라벨 매핑 (단순 키워드 추출)
         self.label2id = {"O": 0, "B-KEY": 1, "I-KEY": 2}
         self.id2label = {v: k for k, v in self.label2id.items()}
         
+        self.samples = []
+        self.windowed_samples = 0
+        for sample in samples:
+            if tokenizer is not None and len(sample["tokens"]) > max_length - 2:
+                self.samples.extend(self._split_into_windows(sample, tokenizer, stride))
+                self.windowed_samples += 1
+            else:
+                self.samples.append(sample)
+    
+    def _split_into_windows(self, sample: Dict, tokenizer, stride: int) -> List[Dict]:
+        """토큰/라벨을 겹치는 창들로 나눠 [CLS] 창 [SEP] 형식의 샘플들을 만듭니다."""
+        content_length = self.max_length - 2
+        step = max(content_length - stride, 1)
+        token_ids = tokenizer.convert_tokens_to_ids(sample["tokens"])
+        
+        windows = []
+        for start in range(0, len(token_ids), step):
+            end = min(start + content_length, len(token_ids))
+            input_ids = [tokenizer.cls_token_id] + token_ids[start:end] + [tokenizer.sep_token_id]
+            windows.append({
+                "input_ids": input_ids,
+                "attention_mask": [1] * len(input_ids),
+                "labels": sample["labels"][start:end],
+            })
+            if end == len(token_ids):
+                break
+        return windows
+        
     def __len__(self):
         return len(self.samples)
     
@@ -270,10 +314,13 @@ class KeywordDataset(Dataset):
 class KLUEKeywordExtractor(nn.Module):
     """KLUE-BERT 기반 단순 키워드 추출 모델"""
     
-    def __init__(self, model_name: str = "klue/bert-base", num_labels: int = 3, dropout_rate: float = 0.3):
+    def __init__(self, model_name: str = "klue/bert-base", num_labels: int = 3, dropout_rate: float = 0.3,
+                 num_hidden_layers: Optional[int] = None):
         super().__init__()
         
-        self.bert = AutoModel.from_pretrained(model_name)
+        # num_hidden_layers를 주면 앞쪽 N개 층만 가진 작은 모델(증류 학생 모델)을 만듭니다.
+        bert_kwargs = {"num_hidden_layers": num_hidden_layers} if num_hidden_layers else {}
+        self.bert = AutoModel.from_pretrained(model_name, **bert_kwargs)
         self.dropout = nn.Dropout(dropout_rate)
         self.classifier = nn.Linear(self.bert.config.hidden_size, num_labels)
         
@@ -297,7 +344,8 @@ class KLUEKeywordExtractor(nn.Module):
         
         return {"loss": loss, "logits": logits}
 
-def create_data_loaders(labeled_data: List[Dict], test_size: float = 0.2, batch_size: int = 16):
+def create_data_loaders(labeled_data: List[Dict], test_size: float = 0.2, batch_size: int = 16,
+                        tokenizer=None, stride: int = 32):
     """데이터 로더 생성"""
     print(f"\n📊 데이터셋 분할 및 데이터 로더 생성...")
     
@@ -306,9 +354,10 @@ def create_data_loaders(labeled_data: List[Dict], test_size: float = 0.2, batch_
     val_data, test_data = train_test_split(temp_data, test_size=0.5, random_state=42)
     
     # 데이터셋 생성
-    train_dataset = KeywordDataset(train_data)
-    val_dataset = KeywordDataset(val_data)
-    test_dataset = KeywordDataset(test_data)
+    # 토크나이저가 주어지면 128 토큰을 넘는 답변은 겹치는 창으로 나눠 뒷부분까지 학습/평가
+    train_dataset = KeywordDataset(train_data, tokenizer=tokenizer, stride=stride)
+    val_dataset = KeywordDataset(val_data, tokenizer=tokenizer, stride=stride)
+    test_dataset = KeywordDataset(test_data, tokenizer=tokenizer, stride=stride)
     
     # 데이터 로더 생성
     train_loader = DataLoader(train_dataset, batch_size=batch_size, shuffle=True)
@@ -320,6 +369,9 @@ def create_data_loaders(labeled_data: List[Dict], test_size: float = 0.2, batch_
     print(f"   검증 데이터: {len(val_data):,}개")
     print(f"   테스트 데이터: {len(test_data):,}개")
     print(f"   배치 크기: {batch_size}")
+    windowed = train_dataset.windowed_samples + val_dataset.windowed_samples + test_dataset.windowed_samples
+    if windowed:
+        print(f"   창으로 나눈 긴 답변: {windowed:,}개 (겹침 {stride} 토큰)")
     
     # 훈련 데이터 라벨 분포 확인
     train_labels = []
@@ -422,8 +474,8 @@ def train_model(model, train_loader, val_loader, timestamp, epochs: int = 5, lea
     print(f"\n🎉 학습 완료! 최고 검증 F1: {best_f1:.4f}")
     return train_losses, val_f1_scores, best_f1, best_model_path
 
-def evaluate_model(model, data_loader, device, epoch=None, data_type="테스트"):
-    """모델 평가"""
+def evaluate_model(model, data_loader, device, epoch=None, data_type="테스트", return_metrics: bool = False):
+    """모델 평가 (return_metrics=True면 F1 대신 정밀도/재현율/F1 딕셔너리 반환)"""
     model.eval()
     all_predictions = []
     all_labels = []
@@ -466,9 +518,12 @@ def evaluate_model(model, data_loader, device, epoch=None, data_type="테스트"
         print(f"\n📊 상세 분류 리포트:")
         print(report)
     
+    if return_metrics:
+        return {"precision": float(precision), "recall": float(recall), "f1": float(f1)}
     return f1
 
-def save_model(model, tokenizer, label2id, id2label, timestamp, save_path_base: str = "klue_keyword_extractor"):
+def save_model(model, tokenizer, label2id, id2label, timestamp, save_path_base: str = "klue_keyword_extractor",
+               extra_config: Optional[Dict] = None):
     """모델 및 설정 저장"""
     save_path = f"{save_path_base}_{timestamp}"
     print(f"\n💾 모델 저장 중: {save_path}")
@@ -479,6 +534,11 @@ def save_model(model, tokenizer, label2id, id2label, timestamp, save_path_base:
         # 모델 가중치 직접 저장 (save_pretrained 대신)
         torch.save(model.state_dict(), f"{save_path}/pytorch_model.bin")
         
+        # UI 키워드 추출기가 네트워크 없이 바로 읽는 번들 형식 (구조 설정 + 메모리 맵 가능한 가중치)
+        model.bert.config.save_pretrained(save_path)
+        save_file({k: v.contiguous() for k, v in model.state_dict().items()}, f"{save_path}/model.safetensors",
+                  metadata={"format": "pt"})
+        
         # 토크나이저 저장
         tokenizer.save_pretrained(save_path)
         
@@ -486,6 +546,7 @@ def save_model(model, tokenizer, label2id, id2label, timestamp, save_path_base:
         config = {
             "model_type": "klue_keyword_extractor",
             "base_model": "klue/bert-base",
+            "num_hidden_layers": model.bert.config.num_hidden_layers,
             "num_labels": 3,
             "label2id": label2id,
             "id2label": id2label,
@@ -496,6 +557,7 @@ def save_model(model, tokenizer, label2id, id2label, timestamp, save_path_base:
             "training_timestamp": timestamp,
             "created_at": datetime.now().isoformat()
         }
+        config.update(extra_config or {})
         
         with open(f"{save_path}/training_config.json", 'w', encoding='utf-8') as f:
             json.dump(config, f, ensure_ascii=False, indent=2)
@@ -503,79 +565,54 @@ def save_model(model, tokenizer, label2id, id2label, timestamp, save_path_base:
         print(f"✅ 모델 저장 완료!")
         print(f"   모델 경로: {save_path}/")
         print(f"   설정 파일: {save_path}/training_config.json")
+        return save_path
         
     except Exception as e:
         print(f"❌ 모델 저장 실패: {e}")
+        return None
+
+def publish_to_registry(model_dir: Optional[str], metrics: Dict, registry_dir: Optional[str] = None,
+                        activate: bool = True, notes: Optional[str] = None) -> Optional[str]:
+    """
+    save_model()이 만든 디렉토리를 UI 모델 레지스트리에 새 버전으로 등록 (실행 중인 서비스는 자동 교체)
+    ONNX 그래프는 들어 있지 않으므로, onnx 백엔드로 서비스하려면 export_onnx.py --publish로 다시 등록합니다.
+    """
+    if not model_dir:
+        return None
+    from model_registry import DEFAULT_REGISTRY_DIR, ModelRegistry
+    try:
+        registry = ModelRegistry(registry_dir or DEFAULT_REGISTRY_DIR)
+        return registry.publish(model_dir, metrics=metrics, activate=activate, notes=notes)
+    except (OSError, ValueError) as e:
+        print(f"❌ 모델 레지스트리 등록 실패: {e}")
+        return None
 
 def test_inference(model, tokenizer, test_texts: List[str], device, id2label):
-    """실제 추론 테스트 (키워드 최대 6개 추출 제한)""" # <<< 주석 수정
-    print(f"\n🧪 추론 테스트 (최대 6개 키워드)") # <<< 출력 메시지 수정
+    """실제 추론 테스트 (UI 키워드 추출기와 같은 디코더로 최대 MAX_KEYWORDS_PER_ANSWER개 추출)"""
+    print(f"\n🧪 추론 테스트 (최대 {MAX_KEYWORDS_PER_ANSWER}개 키워드)")
     print("=" * 50)
     
     model.eval()
     
-    for i, text in enumerate(test_texts):
+    # 전체 문장을 한 배치로 토크나이징 (offset_mapping으로 원문에서 키워드를 그대로 잘라냄)
+    encoding = tokenizer(
+        test_texts,
+        return_tensors='pt',
+        truncation=True,
+        padding=True,
+        max_length=128,
+        return_offsets_mapping=True
+    )
+    
+    with torch.no_grad():
+        outputs = model(input_ids=encoding['input_ids'].to(device),
+                        attention_mask=encoding['attention_mask'].to(device))
+        predictions = torch.argmax(outputs['logits'], dim=-1).cpu()
+    
+    keywords_per_text = decode_keywords_batch(test_texts, predictions, encoding['offset_mapping'],
+                                              encoding['attention_mask'], max_keywords=MAX_KEYWORDS_PER_ANSWER)
+    for i, (text, keywords_found) in enumerate(zip(test_texts, keywords_per_text)):
         print(f"\n테스트 {i+1}: {text}")
-        
-        # 토크나이징
-        encoding = tokenizer(
-            text, 
-            return_tensors='pt', 
-            truncation=True, 
-            padding=True,
-            max_length=128
-        )
-        tokens = tokenizer.tokenize(text)
-        
-        # 예측
-        with torch.no_grad():
-            input_ids = encoding['input_ids'].to(device)
-            attention_mask = encoding['attention_mask'].to(device)
-            
-            outputs = model(input_ids=input_ids, attention_mask=attention_mask)
-            predictions = torch.argmax(outputs['logits'], dim=-1)
-        
-        # 결과 처리 (특수 토큰 제외)
-        pred_labels = [id2label[pred.item()] for pred in predictions[0][1:len(tokens)+1]]
-        
-        print("키워드 추출 결과:")
-        keywords_found = []
-        current_keyword = ""
-        
-        # <<< 수정된 부분 시작 >>>
-        MAX_KEYWORDS = 6 # 최대 키워드 개수 설정
-
-        for token, label in zip(tokens, pred_labels):
-            # 이미 6개의 키워드를 찾았으면 루프 중단
-            if len(keywords_found) >= MAX_KEYWORDS:
-                break
-
-            clean_token = token.replace('##', '')
-            
-            if label == 'B-KEY':
-                if current_keyword: # 이전 키워드 완료
-                    keywords_found.append(current_keyword)
-                    # 추가 후 키워드 개수 확인
-                    if len(keywords_found) >= MAX_KEYWORDS:
-                        current_keyword = "" # 더 이상 새 키워드 만들지 않음
-                        break
-
-                current_keyword = clean_token
-                print(f"  🔑 {token} -> {label}")
-
-            elif label == 'I-KEY' and current_keyword:
-                current_keyword += clean_token
-                print(f"  ↳ {token} -> {label}")
-            else:
-                if current_keyword: # 키워드 완료
-                    keywords_found.append(current_keyword)
-                    current_keyword = ""
-        
-        # 루프가 끝난 후 마지막 키워드 처리
-        if current_keyword and len(keywords_found) < MAX_KEYWORDS:
-            keywords_found.append(current_keyword)
-        # <<< 수정된 부분 끝 >>>
-        
         print(f"🎯 추출된 키워드: {keywords_found}")
 
 # def test_inference(model, tokenizer, test_texts: List[str], device, id2label):
@@ -634,6 +671,291 @@ def test_inference(model, tokenizer, test_texts: List[str], device, id2label):
         
 #         print(f"🎯 추출된 키워드: {keywords_found}")
 
+# ============================================================
+# 지식 증류 (--distill): 12층 교사 모델 → 3~6층 학생 모델
+# ============================================================
+
+class UnlabeledAnswerDataset(Dataset):
+    """라벨이 없는 실제 서비스 답변 (교사 모델의 soft logits만으로 학습)"""
+    
+    def __init__(self, texts: List[str], tokenizer, max_length: int = 128):
+        self.encodings = tokenizer(texts, truncation=True, padding='max_length', max_length=max_length)
+        self.max_length = max_length
+    
+    def __len__(self):
+        return len(self.encodings["input_ids"])
+    
+    def __getitem__(self, idx):
+        return {
+            "input_ids": torch.tensor(self.encodings["input_ids"][idx], dtype=torch.long),
+            "attention_mask": torch.tensor(self.encodings["attention_mask"][idx], dtype=torch.long),
+            "labels": torch.full((self.max_length,), -100, dtype=torch.long)
+        }
+
+def load_unlabeled_answers(db_path: str, limit: int = 20000) -> List[str]:
+    """서비스 DB(USER_ANSWERS)에서 최초 답변 텍스트를 가져옵니다. DB가 없으면 빈 리스트"""
+    if not db_path or not os.path.exists(db_path):
+        print(f"⚠️ 라벨 없는 답변 DB를 찾을 수 없어 라벨링 데이터만 사용합니다: {db_path}")
+        return []
+    
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute("""
+            SELECT DISTINCT answer_text FROM USER_ANSWERS
+            WHERE is_initial_answer = 1 AND length(trim(answer_text)) > 0
+            LIMIT ?
+        """, (limit,)).fetchall()
+    finally:
+        conn.close()
+    
+    texts = [row[0] for row in rows]
+    print(f"✅ 라벨 없는 서비스 답변 {len(texts):,}개 로드: {db_path}")
+    return texts
+
+def load_keyword_model(model_path: str, device) -> KLUEKeywordExtractor:
+    """state_dict(.pt) 또는 save_model()이 만든 디렉토리에서 모델을 조립합니다."""
+    num_hidden_layers = None
+    if os.path.isdir(model_path):
+        config_path = os.path.join(model_path, "training_config.json")
+        if os.path.exists(config_path):
+            with open(config_path, 'r', encoding='utf-8') as f:
+                num_hidden_layers = json.load(f).get("num_hidden_layers")
+        model_path = os.path.join(model_path, "pytorch_model.bin")
+    
+    model = KLUEKeywordExtractor(num_labels=3, num_hidden_layers=num_hidden_layers)
+    model.load_state_dict(torch.load(model_path, map_location=device))
+    model.to(device)
+    model.eval()
+    return model
+
+def distillation_loss(student_logits, teacher_logits, labels, attention_mask, class_weights,
+                      temperature: float, alpha: float):
+    """
+    alpha * (라벨 CE) + (1 - alpha) * T² * KL(교사 soft 분포 || 학생 soft 분포)
+    KL은 패딩이 아닌 모든 토큰에서, CE는 라벨이 있는 토큰(-100 제외)에서만 계산합니다.
+    """
+    mask = attention_mask.bool()
+    student_soft = F.log_softmax(student_logits[mask] / temperature, dim=-1)
+    teacher_soft = F.softmax(teacher_logits[mask] / temperature, dim=-1)
+    kl = F.kl_div(student_soft, teacher_soft, reduction='batchmean') * temperature ** 2
+    
+    if (labels != -100).any():
+        ce = F.cross_entropy(student_logits.view(-1, student_logits.size(-1)), labels.view(-1),
+                             weight=class_weights.to(student_logits.device), ignore_index=-100)
+    else:
+        ce = torch.zeros((), device=student_logits.device)
+    return alpha * ce + (1 - alpha) * kl
+
+def evaluate_span_f1(model, data_loader, device) -> Dict[str, float]:
+    """키워드 구간 단위(span-level) micro 정밀도/재현율/F1 (구간 경계가 정확히 같아야 정답)"""
+    model.eval()
+    true_positive = predicted_total = gold_total = 0
+    
+    with torch.no_grad():
+        for batch in data_loader:
+            input_ids = batch["input_ids"].to(device)
+            attention_mask = batch["attention_mask"].to(device)
+            labels = batch["labels"]
+            
+            predictions = torch.argmax(model(input_ids=input_ids, attention_mask=attention_mask)["logits"], dim=-1).cpu()
+            
+            # 특수 토큰/패딩(-100)은 구간 경계로만 취급하고, 배치 전체를 한 번에 디코딩
+            mask = labels != -100
+            gold_spans = decode_bio_batch(labels, mask)
+            predicted_spans = decode_bio_batch(predictions, mask)
+            for gold, predicted in zip(map(set, gold_spans), map(set, predicted_spans)):
+                true_positive += len(gold & predicted)
+                predicted_total += len(predicted)
+                gold_total += len(gold)
+    
+    precision = true_positive / predicted_total if predicted_total else 0.0
+    recall = true_positive / gold_total if gold_total else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {"precision": precision, "recall": recall, "f1": f1}
+
+def count_parameters(model) -> int:
+    return sum(p.numel() for p in model.parameters())
+
+def measure_cpu_latency(model, tokenizer, texts: List[str], runs: int = 3) -> Dict[str, float]:
+    """CPU에서 문장 하나씩 추론할 때의 지연 시간 (밀리초)"""
+    model.to('cpu')
+    model.eval()
+    encodings = [tokenizer(text, return_tensors='pt', truncation=True, max_length=128) for text in texts]
+    timings = []
+    with torch.no_grad():
+        model(input_ids=encodings[0]['input_ids'], attention_mask=encodings[0]['attention_mask'])  # 예열
+        for _ in range(runs):
+            for encoding in encodings:
+                start = time.perf_counter()
+                model(input_ids=encoding['input_ids'], attention_mask=encoding['attention_mask'])
+                timings.append((time.perf_counter() - start) * 1000)
+    return {"p50_ms": float(np.percentile(timings, 50)), "p95_ms": float(np.percentile(timings, 95))}
+
+def distill_model(student, teacher, train_loader, val_loader, timestamp, epochs: int = 8,
+                  learning_rate: float = 5e-5, temperature: float = 2.0, alpha: float = 0.5):
+    """교사 모델의 soft logits로 학생 모델 학습. 검증 span F1이 가장 높은 가중치를 저장합니다."""
+    print(f"\n🚀 지식 증류 학습 시작!")
+    print(f"   에포크: {epochs}, 학습률: {learning_rate}, 온도: {temperature}, alpha(라벨 CE 비중): {alpha}")
+    
+    device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+    print(f"   사용 장치: {device}")
+    student.to(device)
+    teacher.to(device)
+    teacher.eval()
+    
+    optimizer = AdamW(student.parameters(), lr=learning_rate, weight_decay=0.01)
+    total_steps = len(train_loader) * epochs
+    scheduler = get_linear_schedule_with_warmup(
+        optimizer,
+        num_warmup_steps=int(0.1 * total_steps),
+        num_training_steps=total_steps
+    )
+    
+    train_losses = []
+    val_f1_scores = []
+    best_f1 = -1.0
+    best_model_path = f"best_student_{timestamp}.pt"
+    
+    for epoch in range(epochs):
+        print(f"\n📚 에포크 {epoch + 1}/{epochs}")
+        student.train()
+        total_loss = 0
+        
+        train_bar = tqdm(train_loader, desc=f"증류 {epoch+1}")
+        for batch in train_bar:
+            input_ids = batch["input_ids"].to(device)
+            attention_mask = batch["attention_mask"].to(device)
+            labels = batch["labels"].to(device)
+            
+            with torch.no_grad():
+                teacher_logits = teacher(input_ids=input_ids, attention_mask=attention_mask)["logits"]
+            
+            optimizer.zero_grad()
+            student_logits = student(input_ids=input_ids, attention_mask=attention_mask)["logits"]
+            loss = distillation_loss(student_logits, teacher_logits, labels, attention_mask,
+                                     student.class_weights, temperature, alpha)
+            loss.backward()
+            torch.nn.utils.clip_grad_norm_(student.parameters(), 1.0)
+            optimizer.step()
+            scheduler.step()
+            
+            total_loss += loss.item()
+            train_bar.set_postfix({"Loss": f"{loss.item():.4f}"})
+        
+        avg_loss = total_loss / len(train_loader)
+        train_losses.append(avg_loss)
+        val_f1 = evaluate_span_f1(student, val_loader, device)["f1"]
+        val_f1_scores.append(val_f1)
+        print(f"   증류 손실: {avg_loss:.4f}")
+        print(f"   검증 span F1: {val_f1:.4f}")
+        
+        if val_f1 > best_f1:
+            best_f1 = val_f1
+            torch.save(student.state_dict(), best_model_path)
+            print(f"   🏆 최고 성능 학생 모델 저장 (span F1: {best_f1:.4f}) → {best_model_path}")
+    
+    print(f"\n🎉 증류 완료! 최고 검증 span F1: {best_f1:.4f}")
+    return train_losses, val_f1_scores, best_f1, best_model_path
+
+def distill_main(args):
+    """지식 증류 모드 메인 실행 함수 (교사 모델 파일을 지우지 않도록 이전 결과 정리는 생략)"""
+    print("🎯 지식 증류: KLUE-BERT 교사 모델 → 작은 학생 모델")
+    print("=" * 60)
+    
+    timestamp = generate_timestamp_suffix()
+    print(f"\n🕐 증류 세션 ID: {timestamp}")
+    device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+    
+    # 1. 데이터: 라벨링 데이터 + 라벨 없는 서비스 답변
+    labeled_data = load_labeled_data()
+    if not labeled_data:
+        return
+    tokenizer = AutoTokenizer.from_pretrained("klue/bert-base")
+    train_loader, val_loader, test_loader, label2id, id2label = create_data_loaders(
+        labeled_data, test_size=0.2, batch_size=args.batch_size, tokenizer=tokenizer
+    )
+    unlabeled_texts = load_unlabeled_answers(args.unlabeled_db, args.unlabeled_limit)
+    if unlabeled_texts:
+        combined = torch.utils.data.ConcatDataset([
+            train_loader.dataset, UnlabeledAnswerDataset(unlabeled_texts, tokenizer)
+        ])
+        train_loader = DataLoader(combined, batch_size=args.batch_size, shuffle=True)
+    
+    # 2. 교사 / 학생 모델
+    teacher = load_keyword_model(args.teacher, device)
+    print(f"\n👩‍🏫 교사 모델 로드: {args.teacher} ({teacher.bert.config.num_hidden_layers}층)")
+    student = KLUEKeywordExtractor(num_labels=3, num_hidden_layers=args.student_layers)
+    print(f"🧑‍🎓 학생 모델 생성: {args.student_layers}층 (klue/bert-base 앞쪽 층으로 초기화)")
+    
+    # 3. 증류 학습
+    train_losses, val_f1_scores, best_f1, best_model_path = distill_model(
+        student, teacher, train_loader, val_loader, timestamp,
+        epochs=args.epochs, learning_rate=args.learning_rate,
+        temperature=args.temperature, alpha=args.alpha
+    )
+    student.load_state_dict(torch.load(best_model_path, map_location=device))
+    student.to(device)
+    
+    # 4. 교사 대비 비교: span F1 / 파라미터 수 / CPU 지연 시간
+    teacher_f1 = evaluate_span_f1(teacher, test_loader, device)
+    student_f1 = evaluate_span_f1(student, test_loader, device)
+    latency_texts = list(dict.fromkeys(s["original_answer"] for s in labeled_data if s.get("original_answer")))[:50]
+    teacher_latency = measure_cpu_latency(teacher, tokenizer, latency_texts)
+    student_latency = measure_cpu_latency(student, tokenizer, latency_texts)
+    comparison = {
+        "teacher": {"layers": teacher.bert.config.num_hidden_layers, "parameters": count_parameters(teacher),
+                    "span_f1": teacher_f1, "cpu_latency": teacher_latency},
+        "student": {"layers": student.bert.config.num_hidden_layers, "parameters": count_parameters(student),
+                    "span_f1": student_f1, "cpu_latency": student_latency},
+    }
+    
+    print(f"\n📊 교사 vs 학생 (테스트 데이터)")
+    print(f"{'':10}{'층':>4}{'파라미터':>14}{'span F1':>10}{'CPU p50':>12}{'CPU p95':>12}")
+    for name, row in comparison.items():
+        print(f"{name:10}{row['layers']:>4}{row['parameters']:>14,}{row['span_f1']['f1']:>10.4f}"
+              f"{row['cpu_latency']['p50_ms']:>10.1f}ms{row['cpu_latency']['p95_ms']:>10.1f}ms")
+    speedup = teacher_latency['p50_ms'] / max(student_latency['p50_ms'], 1e-9)
+    print(f"   속도 향상: {speedup:.2f}x, span F1 차이: {student_f1['f1'] - teacher_f1['f1']:+.4f}")
+    
+    # 5. KeywordExtractor가 그대로 읽을 수 있는 형식으로 저장 (training_config.json의 num_hidden_layers 사용)
+    save_path = save_model(student, tokenizer, label2id, id2label, timestamp, save_path_base="klue_keyword_extractor",
+                           extra_config={
+                               "distilled_from": os.path.abspath(args.teacher),
+                               "distillation": {"temperature": args.temperature, "alpha": args.alpha,
+                                                "unlabeled_answers": len(unlabeled_texts)},
+                               "comparison": comparison,
+                           })
+    if not args.no_publish:
+        publish_to_registry(save_path, {
+            "span_f1": student_f1["f1"], "span_precision": student_f1["precision"],
+            "span_recall": student_f1["recall"], "best_val_span_f1": best_f1,
+            "cpu_p50_ms": student_latency["p50_ms"], "teacher_span_f1": teacher_f1["f1"],
+        }, registry_dir=args.registry, activate=not args.no_activate,
+            notes=f"{args.student_layers}층 증류 학생 모델")
+    plot_training_history(train_losses, val_f1_scores, timestamp)
+    return student, tokenizer, comparison, timestamp
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="KLUE-BERT 키워드 추출 모델 학습")
+    parser.add_argument('--distill', action='store_true', help="학습된 교사 모델로 작은 학생 모델을 증류")
+    parser.add_argument('--teacher', help="교사 모델 (best_model_*.pt 또는 klue_keyword_extractor_* 디렉토리)")
+    parser.add_argument('--student-layers', type=int, default=4, choices=range(3, 7), help="학생 모델 층 수 (3~6)")
+    parser.add_argument('--temperature', type=float, default=2.0, help="soft logits 온도")
+    parser.add_argument('--alpha', type=float, default=0.5, help="라벨 CE 손실 비중 (나머지는 KL 증류 손실)")
+    parser.add_argument('--epochs', type=int, default=8, help="증류 에포크 수")
+    parser.add_argument('--learning-rate', type=float, default=5e-5, help="증류 학습률")
+    parser.add_argument('--batch-size', type=int, default=16, help="배치 크기")
+    parser.add_argument('--unlabeled-db', default=os.path.join("..", "UI", "memory_app.db"),
+                        help="라벨 없는 서비스 답변을 가져올 SQLite DB")
+    parser.add_argument('--unlabeled-limit', type=int, default=20000, help="사용할 라벨 없는 답변 최대 개수")
+    parser.add_argument('--registry', help="모델 레지스트리 디렉토리 (생략 시 저장소 루트의 model_registry)")
+    parser.add_argument('--no-publish', action='store_true', help="훈련 결과를 모델 레지스트리에 등록하지 않음")
+    parser.add_argument('--no-activate', action='store_true', help="레지스트리에 등록만 하고 서비스 버전으로 활성화하지 않음")
+    args = parser.parse_args()
+    if args.distill and not args.teacher:
+        parser.error("--distill 모드에는 --teacher가 필요합니다.")
+    return args
+
 def plot_training_history(train_losses, val_f1_scores, timestamp):
     """학습 히스토리 시각화"""
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 4))
@@ -663,7 +985,7 @@ def plot_training_history(train_losses, val_f1_scores, timestamp):
     
     print(f"📊 학습 히스토리 그래프 저장: {history_filename}")
 
-def main():
+def main(args=None):
     """개선된 4단계 메인 실행 함수"""
     print("🎯 개선된 4단계: KLUE-BERT 키워드 추출 모델 학습")
     print("=" * 60)
@@ -689,7 +1011,7 @@ def main():
     
     # 3. 데이터 로더 생성
     train_loader, val_loader, test_loader, label2id, id2label = create_data_loaders(
-        labeled_data, test_size=0.2, batch_size=16
+        labeled_data, test_size=0.2, batch_size=16, tokenizer=tokenizer
     )
     
     # 4. 모델 생성 (매번 새로 초기화)
@@ -708,10 +1030,17 @@ def main():
     print(f"\n📥 최고 성능 모델 로드: {best_model_path}")
     
     # 7. 최종 평가
-    final_f1 = evaluate_model(model, test_loader, device)
+    final_metrics = evaluate_model(model, test_loader, device, return_metrics=True)
+    final_f1 = final_metrics["f1"]
+    span_metrics = evaluate_span_f1(model, test_loader, device)
     
-    # 8. 모델 저장
-    save_model(model, tokenizer, label2id, id2label, timestamp)
+    # 8. 모델 저장 및 레지스트리 등록
+    save_path = save_model(model, tokenizer, label2id, id2label, timestamp)
+    if args is None or not args.no_publish:
+        publish_to_registry(save_path, {
+            **final_metrics, "span_f1": span_metrics["f1"], "span_precision": span_metrics["precision"],
+            "span_recall": span_metrics["recall"], "best_val_f1": best_f1,
+        }, registry_dir=args.registry if args else None, activate=not (args and args.no_activate))
     
     # 9. 추론 테스트
     test_texts = [
@@ -751,5 +1080,9 @@ def main():
     return model, tokenizer, final_f1, timestamp
 
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    if args.distill:
+        distill_main(args)
+    else:
+        main(args)
     
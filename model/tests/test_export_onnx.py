@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+ONNX 변환 점검
+작은 무작위 BERT로 증류 학생 모델과 같은 형식(층 수가 줄어든 state_dict)을 만들어
+export_onnx가 층 수를 맞춰 조립하는지, ONNX Runtime 출력이 torch 출력과 일치하는지 확인합니다.
+torch / transformers / onnxruntime이 없으면 건너뜁니다.
+
+실행 (model 디렉토리에서):
+    python -m pytest -q tests
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+torch = pytest.importorskip("torch")
+transformers = pytest.importorskip("transformers")
+ort = pytest.importorskip("onnxruntime")
+pytest.importorskip("onnx")
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+import export_onnx
+import improved_klue_training_keywordLimit as training
+
+VOCAB = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + list("가나다라마바사아자차카타파하고향학교시장변환용예짧은문장입니") + [".", "ONNX"]
+TEXTS = ["고향 마을 학교", "시장 옆 가게 이야기", "짧은 문장"]
+
+
+@pytest.fixture
+def tiny_bert(monkeypatch):
+    """허브 대신 작은 무작위 BERT를 만들도록 from_pretrained를 바꿈 (층 수 인자는 그대로 반영)"""
+    def from_pretrained(model_name, num_hidden_layers=4):
+        torch.manual_seed(0)
+        config = transformers.BertConfig(vocab_size=len(VOCAB), hidden_size=32, num_hidden_layers=num_hidden_layers,
+                                         num_attention_heads=2, intermediate_size=64, max_position_embeddings=64)
+        return transformers.BertModel(config)
+    monkeypatch.setattr(training.AutoModel, "from_pretrained", from_pretrained)
+
+
+@pytest.fixture
+def tokenizer(tmp_path):
+    vocab_path = tmp_path / "vocab.txt"
+    vocab_path.write_text("\n".join(VOCAB) + "\n", encoding="utf-8")
+    return transformers.BertTokenizerFast(vocab_file=str(vocab_path), do_lower_case=False)
+
+
+def _save_student(tmp_path, layers):
+    """save_model()과 같은 디렉토리 형식과 best_student_*.pt 파일을 함께 만듦"""
+    student = training.KLUEKeywordExtractor(num_labels=3, num_hidden_layers=layers)
+    model_dir = tmp_path / "klue_keyword_extractor_student"
+    model_dir.mkdir()
+    torch.save(student.state_dict(), model_dir / "pytorch_model.bin")
+    with open(model_dir / "training_config.json", 'w', encoding='utf-8') as f:
+        json.dump({"num_hidden_layers": layers}, f)
+    pt_path = tmp_path / "best_student_test.pt"
+    torch.save(student.state_dict(), pt_path)
+    return str(model_dir), str(pt_path)
+
+
+def test_distilled_student_keeps_its_layer_count(tiny_bert, tmp_path):
+    model_dir, pt_path = _save_student(tmp_path, layers=2)
+    assert export_onnx.load_torch_model(model_dir).bert.config.num_hidden_layers == 2
+    assert export_onnx.load_torch_model(pt_path).bert.config.num_hidden_layers == 2
+
+
+def test_onnx_logits_match_torch(tiny_bert, tokenizer, tmp_path):
+    model_dir, _ = _save_student(tmp_path, layers=2)
+    model = export_onnx.load_torch_model(model_dir)
+    output_dir = str(tmp_path / "onnx")
+    config = export_onnx.export(model, tokenizer, output_dir, export_onnx.resolve_state_dict_path(model_dir))
+    assert config["num_hidden_layers"] == 2
+
+    encoding = tokenizer(TEXTS, padding=True, return_tensors='np')
+    with torch.no_grad():
+        expected = model(input_ids=torch.from_numpy(encoding['input_ids']),
+                         attention_mask=torch.from_numpy(encoding['attention_mask']))['logits'].numpy()
+    session = ort.InferenceSession(os.path.join(output_dir, export_onnx.FP32_FILENAME),
+                                   providers=['CPUExecutionProvider'])
+    logits = session.run(['logits'], {'input_ids': encoding['input_ids'].astype('int64'),
+                                      'attention_mask': encoding['attention_mask'].astype('int64')})[0]
+
+    mask = encoding['attention_mask'].astype(bool)
+    assert abs(logits - expected)[mask].max() < 1e-4
+    assert (logits.argmax(-1)[mask] == expected.argmax(-1)[mask]).all()
+
+
+def test_publish_bundles_onnx_graph_into_active_version(tiny_bert, tokenizer, tmp_path):
+    model_dir, _ = _save_student(tmp_path, layers=2)
+    output_dir = str(tmp_path / "onnx")
+    export_onnx.export(export_onnx.load_torch_model(model_dir), tokenizer, output_dir,
+                       export_onnx.resolve_state_dict_path(model_dir))
+
+    registry_dir = str(tmp_path / "registry")
+    version = export_onnx.publish_with_onnx(model_dir, output_dir, {"parity": {}}, registry_dir)
+    registry = export_onnx.ModelRegistry(registry_dir)
+    assert registry.active_version() == version
+    for name in (export_onnx.FP32_FILENAME, export_onnx.INT8_FILENAME, "pytorch_model.bin"):
+        assert os.path.exists(os.path.join(registry.version_path(version), name))
+    registry.verify(version)